@@ -0,0 +1,211 @@
+"""
+Benchmark for the channel sidebar (GET /api/v1/channels/)
+
+Compares the previous per-channel lookups (last message, membership, unread
+count and, for DMs, members and their activity) with the aggregated query on
+the denormalized membership state, for a user in 100 and 1,000 channels,
+against a throwaway SQLite database.
+
+Usage (from the backend directory):
+
+    python benchmarks/bench_channel_sidebar.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="owui-bench-")
+os.environ.setdefault("GLOBAL_LOG_LEVEL", "ERROR")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Imported for its side effect only: it runs the Alembic migrations that
+# create the tables in the throwaway database
+import open_webui.config  # noqa: E402,F401
+from open_webui.internal.db import get_db  # noqa: E402
+from open_webui.models.channels import (  # noqa: E402
+    Channel,
+    ChannelMember,
+    Channels,
+)
+from open_webui.models.messages import Message, Messages  # noqa: E402
+from open_webui.models.users import User, Users  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+CHANNEL_COUNTS = (100, 1000)
+MESSAGES_PER_CHANNEL = 5
+ROUNDS = 3
+
+
+def seed(size: int, user_id: str, peer_ids: list[str]):
+    now = time.time_ns()
+    with get_db() as db:
+        for table in (Message, ChannelMember, Channel):
+            db.query(table).delete()
+
+        for idx in range(size):
+            channel_id = str(uuid.uuid4())
+            channel_type = "dm" if idx % 4 == 0 else "group"
+            peer_id = peer_ids[idx % len(peer_ids)]
+            db.add(
+                Channel(
+                    id=channel_id,
+                    user_id=user_id,
+                    type=channel_type,
+                    name="" if channel_type == "dm" else f"channel-{idx}",
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            last_message_at = None
+            for message_idx in range(MESSAGES_PER_CHANNEL):
+                last_message_at = now + idx * 1000 + message_idx
+                db.add(
+                    Message(
+                        id=str(uuid.uuid4()),
+                        user_id=peer_id if message_idx % 2 else user_id,
+                        channel_id=channel_id,
+                        content=f"message {message_idx}",
+                        created_at=last_message_at,
+                        updated_at=last_message_at,
+                    )
+                )
+            for member_id in (user_id, peer_id):
+                db.add(
+                    ChannelMember(
+                        id=str(uuid.uuid4()),
+                        channel_id=channel_id,
+                        user_id=member_id,
+                        status="joined",
+                        is_active=True,
+                        joined_at=now,
+                        last_read_at=now,
+                        unread_count=MESSAGES_PER_CHANNEL // 2,
+                        last_message_at=last_message_at,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+        db.commit()
+
+
+def per_channel(user_id: str) -> list[tuple]:
+    channel_list = []
+    for channel in Channels.get_channels_by_user_id(user_id):
+        last_message = Messages.get_last_message_by_channel_id(channel.id)
+        member = Channels.get_member_by_channel_and_user_id(channel.id, user_id)
+        unread_count = Messages.get_unread_message_count(
+            channel.id, user_id, member.last_read_at
+        )
+        users = None
+        if channel.type == "dm":
+            user_ids = [
+                member.user_id
+                for member in Channels.get_members_by_channel_id(channel.id)
+            ]
+            users = [
+                (user.id, Users.is_user_active(user.id))
+                for user in Users.get_users_by_user_ids(user_ids)
+            ]
+        channel_list.append((channel.id, last_message.created_at, unread_count, users))
+    return channel_list
+
+
+def aggregated(user_id: str) -> list[tuple]:
+    channels = Channels.get_channel_list_by_user_id(user_id)
+    dm_user_ids = Channels.get_member_user_ids_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"]
+    )
+    dm_users = {
+        user.id: user
+        for user in Users.get_users_by_user_ids(
+            list({uid for user_ids in dm_user_ids.values() for uid in user_ids})
+        )
+    }
+    return [
+        (
+            channel.id,
+            channel.last_message_at,
+            channel.unread_count,
+            (
+                [
+                    (uid, Users.is_active(dm_users[uid]))
+                    for uid in dm_user_ids[channel.id]
+                    if uid in dm_users
+                ]
+                if channel.type == "dm"
+                else None
+            ),
+        )
+        for channel in channels
+    ]
+
+
+def timed(fn, user_id: str, engine) -> tuple[float, int, list]:
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        best = None
+        for _ in range(ROUNDS):
+            statements.clear()
+            start = time.perf_counter()
+            result = fn(user_id)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return best, len(statements), result
+
+
+def main():
+    now = int(time.time())
+    with get_db() as db:
+        for idx in range(8):
+            db.add(
+                User(
+                    id=f"bench-user-{idx}",
+                    name=f"User {idx}",
+                    email=f"user{idx}@example.com",
+                    role="user",
+                    profile_image_url="",
+                    last_active_at=now if idx % 2 else 0,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        db.commit()
+        engine = db.get_bind()
+
+    user_id = "bench-user-0"
+    peer_ids = [f"bench-user-{idx}" for idx in range(1, 8)]
+
+    print(
+        f"{'channels':>8} {'per-channel':>14} {'queries':>8} {'aggregated':>12} {'queries':>8}"
+    )
+    for size in CHANNEL_COUNTS:
+        seed(size, user_id, peer_ids)
+
+        before_ms, before_queries, before = timed(per_channel, user_id, engine)
+        after_ms, after_queries, after = timed(aggregated, user_id, engine)
+
+        def normalize(rows):
+            return sorted(
+                (id, last, unread, sorted(users) if users else users)
+                for id, last, unread, users in rows
+            )
+
+        assert normalize(before) == normalize(after)
+        print(
+            f"{size:>8} {before_ms:>12.1f}ms {before_queries:>8} "
+            f"{after_ms:>10.1f}ms {after_queries:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Microbenchmark for utils.models.get_filtered_models
+
+Compares the previous per-model lookup (one `Models.get_model_by_id` per
+catalog entry) with the bulk access-record path for catalogs of 50, 500 and
+5,000 models, against a throwaway SQLite database.
+
+Usage (from the backend directory):
+
+    python benchmarks/bench_filtered_models.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="owui-bench-")
+os.environ.setdefault("GLOBAL_LOG_LEVEL", "ERROR")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import open_webui.config  # noqa: E402,F401  (runs migrations)
+from open_webui.internal.db import get_db  # noqa: E402
+from open_webui.models.groups import GroupForm, Groups  # noqa: E402
+from open_webui.models.models import Model, Models  # noqa: E402
+from open_webui.models.users import Users  # noqa: E402
+from open_webui.utils.access_control import has_access  # noqa: E402
+from open_webui.utils.models import get_filtered_models  # noqa: E402
+
+CATALOG_SIZES = (50, 500, 5000)
+ROUNDS = 5
+
+
+def seed(size: int, user_id: str, group_ids: list[str]) -> list[dict]:
+    now = int(time.time())
+    with get_db() as db:
+        db.query(Model).delete()
+        for idx in range(size):
+            if idx % 3 == 0:
+                access_control = None
+            elif idx % 3 == 1:
+                access_control = {
+                    "read": {"group_ids": [group_ids[idx % len(group_ids)]]},
+                    "write": {},
+                }
+            else:
+                access_control = {}
+            db.add(
+                Model(
+                    id=f"model-{idx}",
+                    user_id="owner",
+                    name=f"Model {idx}",
+                    params={},
+                    meta={},
+                    access_control=access_control,
+                    is_active=True,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        db.commit()
+
+    return [{"id": f"model-{idx}", "name": f"Model {idx}"} for idx in range(size)]
+
+
+def per_model_lookup(models, user):
+    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    filtered_models = []
+    for model in models:
+        model_info = Models.get_model_by_id(model["id"])
+        if model_info and (
+            user.id == model_info.user_id
+            or has_access(
+                user.id,
+                type="read",
+                access_control=model_info.access_control,
+                user_group_ids=user_group_ids,
+            )
+        ):
+            filtered_models.append(model)
+    return filtered_models
+
+
+def measure(fn, models, user) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(models, user)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    user = Users.insert_new_user(
+        str(uuid.uuid4()), "Bench", "bench@example.com", role="user"
+    )
+    group_ids = []
+    for idx in range(5):
+        group = Groups.insert_new_group(
+            user.id, GroupForm(name=f"group-{idx}", description="")
+        )
+        group_ids.append(group.id)
+    Groups.add_users_to_group(group_ids[0], [user.id])
+
+    print(f"{'models':>8} {'per-model (ms)':>16} {'bulk (ms)':>12} {'speedup':>9}")
+    for size in CATALOG_SIZES:
+        models = seed(size, user.id, group_ids)
+        assert per_model_lookup(models, user) == get_filtered_models(models, user)
+
+        before = measure(per_model_lookup, models, user)
+        after = measure(get_filtered_models, models, user)
+        print(f"{size:>8} {before:>16.2f} {after:>12.2f} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
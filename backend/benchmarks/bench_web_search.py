@@ -0,0 +1,111 @@
+"""
+Benchmark for concurrent web search requests
+
+Runs a burst of concurrent searches against the local testdata stub
+(benchmarks/web_search_stub.py) with the blocking engine clients in the
+threadpool, as `process_web_search` used to, and with the async clients on
+the shared connection pool. Finally repeats the burst through the result
+cache.
+
+Usage (from the backend directory):
+
+    python benchmarks/bench_web_search.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="owui-bench-")
+os.environ.setdefault("GLOBAL_LOG_LEVEL", "ERROR")
+os.environ.setdefault("WEB_SEARCH_ENGINE_RATE_LIMIT", "0")
+os.environ.setdefault("WEB_SEARCH_RESULTS_CACHE_SIZE", "1024")
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+
+from open_webui.retrieval.web import brave  # noqa: E402
+from open_webui.retrieval.web.client import search_with_cache  # noqa: E402
+from open_webui.retrieval.web.searxng import (  # noqa: E402
+    search_searxng,
+    search_searxng_async,
+)
+from open_webui.utils.session_pool import HTTP_SESSION_POOL  # noqa: E402
+from web_search_stub import start_stub_server  # noqa: E402
+
+CONCURRENCY = (16, 64, 256)
+LATENCY = 0.05
+COUNT = 5
+
+
+def get_searches(base_url: str, size: int):
+    brave.BRAVE_SEARCH_URL = f"{base_url}/brave"
+    sync_searches, async_searches = [], []
+    for idx in range(size):
+        query = f"query {idx}"
+        if idx % 2:
+            sync_searches.append(
+                lambda query=query: run_in_threadpool(
+                    brave.search_brave, "key", query, COUNT
+                )
+            )
+            async_searches.append(
+                lambda query=query: brave.search_brave_async(
+                    "key", query, COUNT, url=f"{base_url}/brave"
+                )
+            )
+        else:
+            sync_searches.append(
+                lambda query=query: run_in_threadpool(
+                    search_searxng, f"{base_url}/searxng", query, COUNT
+                )
+            )
+            async_searches.append(
+                lambda query=query: search_searxng_async(
+                    f"{base_url}/searxng", query, COUNT
+                )
+            )
+    return sync_searches, async_searches
+
+
+async def timed(searches) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(search() for search in searches))
+    assert all(results)
+    return (time.perf_counter() - start) * 1000.0
+
+
+async def main():
+    runner, base_url = await start_stub_server(latency=LATENCY)
+    print(f"stub latency {LATENCY * 1000:.0f}ms, {COUNT} results per search")
+    print(f"{'concurrent':>10} {'threadpool':>12} {'async':>10} {'cached':>10}")
+
+    try:
+        for size in CONCURRENCY:
+            sync_searches, async_searches = get_searches(base_url, size)
+
+            threadpool_ms = await timed(sync_searches)
+            async_ms = await timed(async_searches)
+
+            cached = [
+                lambda idx=idx, search=search: search_with_cache(
+                    "bench", f"{size}-{idx}", COUNT, search
+                )
+                for idx, search in enumerate(async_searches)
+            ]
+            await timed(cached)
+            cached_ms = await timed(cached)
+
+            print(
+                f"{size:>10} {threadpool_ms:>10.1f}ms {async_ms:>8.1f}ms {cached_ms:>8.1f}ms"
+            )
+    finally:
+        await HTTP_SESSION_POOL.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
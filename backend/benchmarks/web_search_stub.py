@@ -0,0 +1,77 @@
+"""
+Local stub of the web search engine APIs for benchmarks.
+
+Serves the recorded responses in open_webui/retrieval/web/testdata, one
+engine per path prefix (`/brave`, `/searxng`, `/serper`, ...), after an
+optional artificial latency. Any method and query string is accepted.
+
+Usage (from the backend directory):
+
+    python benchmarks/web_search_stub.py --port 8765 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+from aiohttp import web
+
+TESTDATA_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "open_webui", "retrieval", "web", "testdata"
+)
+
+
+def load_testdata() -> dict[str, bytes]:
+    responses = {}
+    for filename in sorted(os.listdir(TESTDATA_DIR)):
+        engine, ext = os.path.splitext(filename)
+        if ext == ".json":
+            with open(os.path.join(TESTDATA_DIR, filename), "rb") as f:
+                responses[engine] = json.dumps(json.load(f)).encode()
+    return responses
+
+
+def create_stub_app(latency: float = 0.0) -> web.Application:
+    responses = load_testdata()
+    stats = {"requests": 0}
+
+    async def handler(request: web.Request):
+        engine = request.match_info["engine"]
+        if engine not in responses:
+            raise web.HTTPNotFound()
+
+        stats["requests"] += 1
+        if latency:
+            await asyncio.sleep(latency)
+        return web.Response(body=responses[engine], content_type="application/json")
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_route("*", "/{engine}", handler)
+    app.router.add_route("*", "/{engine}/{tail:.*}", handler)
+    return app
+
+
+async def start_stub_server(
+    latency: float = 0.0, host: str = "127.0.0.1", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Start the stub in the running loop and return (runner, base url)."""
+    runner = web.AppRunner(create_stub_app(latency))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    web.run_app(
+        create_stub_app(args.latency), host=args.host, port=args.port, print=None
+    )
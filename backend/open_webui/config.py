@@ -1812,6 +1812,21 @@ JSON format: { "follow_ups": ["Question 1?", "Question 2?", "Question 3?"] }
 {{MESSAGES:END:6}}
 </chat_history>"""
 
+DEFAULT_COMBINED_TASKS_GENERATION_PROMPT_TEMPLATE = """### Task:
+Complete every task listed below for the chat history, and answer with a single JSON object holding one key per task.
+### Tasks:
+{{TASKS}}
+### Guidelines:
+- Use the chat's primary language; default to English if multilingual.
+- Prioritize accuracy over excessive creativity; keep it clear and simple.
+- Your entire response must consist solely of the raw JSON object, without any markdown code fences, introductory or concluding text.
+### Output:
+JSON format: {{OUTPUT}}
+### Chat History:
+<chat_history>
+{{MESSAGES:END:6}}
+</chat_history>"""
+
 ENABLE_FOLLOW_UP_GENERATION = PersistentConfig(
     "ENABLE_FOLLOW_UP_GENERATION",
     "task.follow_up.enable",
@@ -1830,6 +1845,14 @@ ENABLE_TITLE_GENERATION = PersistentConfig(
     os.environ.get("ENABLE_TITLE_GENERATION", "True").lower() == "true",
 )
 
+# Title, tags and follow-ups in one structured-output call when the task
+# model supports JSON schemas and the default templates are in use
+ENABLE_COMBINED_TASKS_GENERATION = PersistentConfig(
+    "ENABLE_COMBINED_TASKS_GENERATION",
+    "task.combined.enable",
+    os.environ.get("ENABLE_COMBINED_TASKS_GENERATION", "True").lower() == "true",
+)
+
 
 ENABLE_SEARCH_QUERY_GENERATION = PersistentConfig(
     "ENABLE_SEARCH_QUERY_GENERATION",
@@ -2947,6 +2970,14 @@ BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = PersistentConfig(
     os.getenv("BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL", "False").lower() == "true",
 )
 
+# Rank fetched pages in process instead of writing them to a throwaway
+# vector DB collection.
+ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL = PersistentConfig(
+    "ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL",
+    "rag.web.search.ephemeral_retrieval",
+    os.getenv("ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL", "False").lower() == "true",
+)
+
 
 BYPASS_WEB_SEARCH_WEB_LOADER = PersistentConfig(
     "BYPASS_WEB_SEARCH_WEB_LOADER",
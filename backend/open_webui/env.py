@@ -395,6 +395,16 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# Running tasks are re-announced every interval; tasks not heard from for
+# three intervals belong to a dead worker and are reaped
+TASK_HEARTBEAT_INTERVAL = os.environ.get("TASK_HEARTBEAT_INTERVAL", "10")
+try:
+    TASK_HEARTBEAT_INTERVAL = float(TASK_HEARTBEAT_INTERVAL)
+    if TASK_HEARTBEAT_INTERVAL <= 0:
+        TASK_HEARTBEAT_INTERVAL = 10.0
+except ValueError:
+    TASK_HEARTBEAT_INTERVAL = 10.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -409,6 +419,58 @@ except ValueError:
     UVICORN_WORKERS = 1
     log.info(f"Invalid UVICORN_WORKERS value, defaulting to {UVICORN_WORKERS}")
 
+####################################
+# ADMISSION CONTROL
+####################################
+
+# Bounds the concurrent chat streams, background tasks, embedding and file
+# processing jobs each worker accepts; excess work is queued or gets a 429
+ENABLE_ADMISSION_CONTROL = (
+    os.environ.get("ENABLE_ADMISSION_CONTROL", "False").lower() == "true"
+)
+
+# Budget shared by all classes, 0 for none
+ADMISSION_MAX_CONCURRENCY = os.environ.get("ADMISSION_MAX_CONCURRENCY", "0")
+try:
+    ADMISSION_MAX_CONCURRENCY = max(int(ADMISSION_MAX_CONCURRENCY), 0)
+except ValueError:
+    ADMISSION_MAX_CONCURRENCY = 0
+
+# Per-class overrides, e.g.
+# {"interactive": {"limit": 32, "max_queue": 64, "queue_timeout": 10}}
+ADMISSION_CONTROL_BUDGETS = os.environ.get("ADMISSION_CONTROL_BUDGETS", "")
+if ADMISSION_CONTROL_BUDGETS == "":
+    ADMISSION_CONTROL_BUDGETS = None
+else:
+    try:
+        ADMISSION_CONTROL_BUDGETS = json.loads(ADMISSION_CONTROL_BUDGETS)
+    except Exception:
+        log.warning("Invalid ADMISSION_CONTROL_BUDGETS, using the defaults")
+        ADMISSION_CONTROL_BUDGETS = None
+
+####################################
+# TASK HISTORY
+####################################
+
+# Tokens of chat history sent with title, tags, follow-up and query prompts,
+# per task, e.g. {"title_generation": 1000, "follow_up_generation": 3000};
+# 0 sends the whole history
+TASK_HISTORY_TOKEN_BUDGETS = os.environ.get("TASK_HISTORY_TOKEN_BUDGETS", "")
+if TASK_HISTORY_TOKEN_BUDGETS == "":
+    TASK_HISTORY_TOKEN_BUDGETS = None
+else:
+    try:
+        TASK_HISTORY_TOKEN_BUDGETS = json.loads(TASK_HISTORY_TOKEN_BUDGETS)
+    except Exception:
+        log.warning("Invalid TASK_HISTORY_TOKEN_BUDGETS, using the defaults")
+        TASK_HISTORY_TOKEN_BUDGETS = None
+
+# Older turns that don't fit the budget are kept as a short summary instead
+# of being dropped
+ENABLE_TASK_HISTORY_SUMMARIES = (
+    os.environ.get("ENABLE_TASK_HISTORY_SUMMARIES", "True").lower() == "true"
+)
+
 ####################################
 # WEBUI_AUTH (Required for security)
 ####################################
@@ -593,6 +655,32 @@ else:
         CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = 30
 
 
+TOOL_CALL_MAX_CONCURRENCY = os.environ.get("TOOL_CALL_MAX_CONCURRENCY", "8")
+try:
+    TOOL_CALL_MAX_CONCURRENCY = max(int(TOOL_CALL_MAX_CONCURRENCY), 1)
+except ValueError:
+    TOOL_CALL_MAX_CONCURRENCY = 8
+
+TOOL_CALL_MAX_CONCURRENCY_PER_TOOL = os.environ.get(
+    "TOOL_CALL_MAX_CONCURRENCY_PER_TOOL", "4"
+)
+try:
+    TOOL_CALL_MAX_CONCURRENCY_PER_TOOL = max(int(TOOL_CALL_MAX_CONCURRENCY_PER_TOOL), 1)
+except ValueError:
+    TOOL_CALL_MAX_CONCURRENCY_PER_TOOL = 4
+
+# Seconds a single tool call may run; unset leaves tool calls unbounded
+TOOL_CALL_TIMEOUT = os.environ.get("TOOL_CALL_TIMEOUT", "")
+
+if TOOL_CALL_TIMEOUT == "":
+    TOOL_CALL_TIMEOUT = None
+else:
+    try:
+        TOOL_CALL_TIMEOUT = int(TOOL_CALL_TIMEOUT)
+    except Exception:
+        TOOL_CALL_TIMEOUT = None
+
+
 CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = os.environ.get(
     "CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE", ""
 )
@@ -662,6 +750,20 @@ try:
 except ValueError:
     WEBSOCKET_SERVER_PING_INTERVAL = 25
 
+WEBSOCKET_STATE_CACHE_SIZE = os.environ.get("WEBSOCKET_STATE_CACHE_SIZE", "10000")
+try:
+    WEBSOCKET_STATE_CACHE_SIZE = int(WEBSOCKET_STATE_CACHE_SIZE)
+except ValueError:
+    WEBSOCKET_STATE_CACHE_SIZE = 10000
+
+# Seconds between checks of the shared model catalog for changes made by
+# other workers; lookups in between are served from the local copy
+MODELS_CACHE_CHECK_INTERVAL = os.environ.get("MODELS_CACHE_CHECK_INTERVAL", "1")
+try:
+    MODELS_CACHE_CHECK_INTERVAL = float(MODELS_CACHE_CHECK_INTERVAL)
+except ValueError:
+    MODELS_CACHE_CHECK_INTERVAL = 1.0
+
 
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
@@ -678,6 +780,35 @@ AIOHTTP_CLIENT_SESSION_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_SSL", "True").lower() == "true"
 )
 
+# Connection pool shared by the OpenAI / Ollama upstream sessions
+AIOHTTP_CLIENT_POOL_LIMIT = os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "100")
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(AIOHTTP_CLIENT_POOL_LIMIT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT = 100
+
+AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0"
+)
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT", "30"
+)
+try:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT = 30.0
+
+AIOHTTP_CLIENT_POOL_DNS_TTL = os.environ.get("AIOHTTP_CLIENT_POOL_DNS_TTL", "300")
+try:
+    AIOHTTP_CLIENT_POOL_DNS_TTL = int(AIOHTTP_CLIENT_POOL_DNS_TTL)
+except ValueError:
+    AIOHTTP_CLIENT_POOL_DNS_TTL = 300
+
 AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST",
     os.environ.get("AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST", "10"),
@@ -711,6 +842,136 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+MCP_SESSION_POOL_IDLE_TIMEOUT = os.environ.get("MCP_SESSION_POOL_IDLE_TIMEOUT", "300")
+try:
+    MCP_SESSION_POOL_IDLE_TIMEOUT = int(MCP_SESSION_POOL_IDLE_TIMEOUT)
+except ValueError:
+    MCP_SESSION_POOL_IDLE_TIMEOUT = 300
+
+MCP_SESSION_POOL_KEEPALIVE_INTERVAL = os.environ.get(
+    "MCP_SESSION_POOL_KEEPALIVE_INTERVAL", "60"
+)
+try:
+    MCP_SESSION_POOL_KEEPALIVE_INTERVAL = int(MCP_SESSION_POOL_KEEPALIVE_INTERVAL)
+except ValueError:
+    MCP_SESSION_POOL_KEEPALIVE_INTERVAL = 60
+
+MCP_TOOL_SPECS_CACHE_TTL = os.environ.get("MCP_TOOL_SPECS_CACHE_TTL", "300")
+try:
+    MCP_TOOL_SPECS_CACHE_TTL = int(MCP_TOOL_SPECS_CACHE_TTL)
+except ValueError:
+    MCP_TOOL_SPECS_CACHE_TTL = 300
+
+
+WEB_SEARCH_RESULTS_CACHE_TTL = os.environ.get("WEB_SEARCH_RESULTS_CACHE_TTL", "300")
+try:
+    WEB_SEARCH_RESULTS_CACHE_TTL = int(WEB_SEARCH_RESULTS_CACHE_TTL)
+except ValueError:
+    WEB_SEARCH_RESULTS_CACHE_TTL = 300
+
+WEB_SEARCH_RESULTS_CACHE_SIZE = os.environ.get("WEB_SEARCH_RESULTS_CACHE_SIZE", "128")
+try:
+    WEB_SEARCH_RESULTS_CACHE_SIZE = int(WEB_SEARCH_RESULTS_CACHE_SIZE)
+except ValueError:
+    WEB_SEARCH_RESULTS_CACHE_SIZE = 128
+
+# Raw result lists per (engine, query, count), kept apart from the processed
+# results cached under WEB_SEARCH_RESULTS_CACHE_*
+WEB_SEARCH_ENGINE_CACHE_TTL = os.environ.get("WEB_SEARCH_ENGINE_CACHE_TTL", "300")
+try:
+    WEB_SEARCH_ENGINE_CACHE_TTL = int(WEB_SEARCH_ENGINE_CACHE_TTL)
+except ValueError:
+    WEB_SEARCH_ENGINE_CACHE_TTL = 300
+
+WEB_SEARCH_ENGINE_CACHE_SIZE = os.environ.get("WEB_SEARCH_ENGINE_CACHE_SIZE", "256")
+try:
+    WEB_SEARCH_ENGINE_CACHE_SIZE = int(WEB_SEARCH_ENGINE_CACHE_SIZE)
+except ValueError:
+    WEB_SEARCH_ENGINE_CACHE_SIZE = 256
+
+# Requests per second allowed against each web search engine, 0 = unlimited
+WEB_SEARCH_ENGINE_RATE_LIMIT = os.environ.get("WEB_SEARCH_ENGINE_RATE_LIMIT", "10")
+try:
+    WEB_SEARCH_ENGINE_RATE_LIMIT = float(WEB_SEARCH_ENGINE_RATE_LIMIT)
+except ValueError:
+    WEB_SEARCH_ENGINE_RATE_LIMIT = 10.0
+
+WEB_SEARCH_ENGINE_FAILURE_THRESHOLD = os.environ.get(
+    "WEB_SEARCH_ENGINE_FAILURE_THRESHOLD", "5"
+)
+try:
+    WEB_SEARCH_ENGINE_FAILURE_THRESHOLD = int(WEB_SEARCH_ENGINE_FAILURE_THRESHOLD)
+except ValueError:
+    WEB_SEARCH_ENGINE_FAILURE_THRESHOLD = 5
+
+WEB_SEARCH_ENGINE_RETRY_AFTER = os.environ.get("WEB_SEARCH_ENGINE_RETRY_AFTER", "30")
+try:
+    WEB_SEARCH_ENGINE_RETRY_AFTER = int(WEB_SEARCH_ENGINE_RETRY_AFTER)
+except ValueError:
+    WEB_SEARCH_ENGINE_RETRY_AFTER = 30
+
+
+# Fetched web pages (parsed text and metadata), revalidated with
+# ETag / Last-Modified once older than the TTL. A max size of 0 disables it.
+WEB_LOADER_CACHE_DIR = os.environ.get(
+    "WEB_LOADER_CACHE_DIR", str(DATA_DIR / "web_pages")
+)
+
+WEB_LOADER_CACHE_MAX_SIZE = os.environ.get(
+    "WEB_LOADER_CACHE_MAX_SIZE", str(256 * 1024 * 1024)
+)
+try:
+    WEB_LOADER_CACHE_MAX_SIZE = int(WEB_LOADER_CACHE_MAX_SIZE)
+except ValueError:
+    WEB_LOADER_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+WEB_LOADER_CACHE_TTL = os.environ.get("WEB_LOADER_CACHE_TTL", "900")
+try:
+    WEB_LOADER_CACHE_TTL = int(WEB_LOADER_CACHE_TTL)
+except ValueError:
+    WEB_LOADER_CACHE_TTL = 900
+
+
+# Workers of the process pool running local document extraction (PyPDF,
+# docx2txt, Unstructured, ...). 0, the default, extracts in the request
+# thread as before.
+DOCUMENT_EXTRACTION_WORKERS = os.environ.get("DOCUMENT_EXTRACTION_WORKERS", "0")
+try:
+    DOCUMENT_EXTRACTION_WORKERS = int(DOCUMENT_EXTRACTION_WORKERS)
+except ValueError:
+    DOCUMENT_EXTRACTION_WORKERS = 0
+
+DOCUMENT_EXTRACTION_TIMEOUT = os.environ.get("DOCUMENT_EXTRACTION_TIMEOUT", "300")
+try:
+    DOCUMENT_EXTRACTION_TIMEOUT = int(DOCUMENT_EXTRACTION_TIMEOUT)
+except ValueError:
+    DOCUMENT_EXTRACTION_TIMEOUT = 300
+
+# Address space limit of each extraction worker in MB, 0 = unlimited
+DOCUMENT_EXTRACTION_MEMORY_LIMIT = os.environ.get(
+    "DOCUMENT_EXTRACTION_MEMORY_LIMIT", "0"
+)
+try:
+    DOCUMENT_EXTRACTION_MEMORY_LIMIT = int(DOCUMENT_EXTRACTION_MEMORY_LIMIT)
+except ValueError:
+    DOCUMENT_EXTRACTION_MEMORY_LIMIT = 0
+
+# PDFs with more pages are split into jobs of this many pages
+DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB = os.environ.get(
+    "DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB", "32"
+)
+try:
+    DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB = int(DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB)
+except ValueError:
+    DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB = 32
+
+# Chunks embedded and inserted together while a file is indexed page by page
+DOCUMENT_INDEXING_BATCH_SIZE = os.environ.get("DOCUMENT_INDEXING_BATCH_SIZE", "64")
+try:
+    DOCUMENT_INDEXING_BATCH_SIZE = max(int(DOCUMENT_INDEXING_BATCH_SIZE), 1)
+except ValueError:
+    DOCUMENT_INDEXING_BATCH_SIZE = 64
+
 
 ####################################
 # SENTENCE TRANSFORMERS
@@ -62,8 +62,8 @@ from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
     MODELS,
+    SESSION_POOL,
     app as socket_app,
-    periodic_usage_pool_cleanup,
     get_event_emitter,
     get_models_in_use,
 )
@@ -287,6 +287,7 @@ from open_webui.config import (
     ENABLE_WEB_SEARCH,
     WEB_SEARCH_ENGINE,
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
+    ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL,
     BYPASS_WEB_SEARCH_WEB_LOADER,
     WEB_SEARCH_RESULT_COUNT,
     WEB_SEARCH_CONCURRENT_REQUESTS,
@@ -421,6 +422,7 @@ from open_webui.config import (
     ENABLE_TAGS_GENERATION,
     ENABLE_TITLE_GENERATION,
     ENABLE_FOLLOW_UP_GENERATION,
+    ENABLE_COMBINED_TASKS_GENERATION,
     ENABLE_SEARCH_QUERY_GENERATION,
     ENABLE_RETRIEVAL_QUERY_GENERATION,
     ENABLE_AUTOCOMPLETE_GENERATION,
@@ -488,6 +490,12 @@ from open_webui.utils.chat import (
     chat_action as chat_action_handler,
 )
 from open_webui.utils.embeddings import generate_embeddings
+from open_webui.utils.admission import (
+    ADMISSION_CONTROLLER,
+    AdmissionRejected,
+    EMBEDDINGS,
+    INTERACTIVE,
+)
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
 from open_webui.utils.access_control import has_access
 
@@ -509,9 +517,14 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.file_status import FILE_STATUS_BROKER
+from open_webui.utils.session_pool import HTTP_SESSION_POOL
+from open_webui.retrieval.loaders.extraction_pool import EXTRACTION_POOL
+from open_webui.utils.mcp.pool import MCP_SESSION_POOL
 
 from open_webui.tasks import (
     redis_task_command_listener,
+    stop_heartbeat,
     list_task_ids_by_item_id,
     create_task,
     stop_task,
@@ -595,12 +608,13 @@ async def lifespan(app: FastAPI):
             redis_task_command_listener(app)
         )
 
+    await FILE_STATUS_BROKER.start(app.state.redis)
+    MCP_SESSION_POOL.start()
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
-    asyncio.create_task(periodic_usage_pool_cleanup())
-
     # Initialize pricing database if empty
     try:
         from open_webui.models.pricing import Pricings
@@ -650,6 +664,13 @@ async def lifespan(app: FastAPI):
 
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
+    stop_heartbeat()
+
+    await FILE_STATUS_BROKER.stop()
+    await HTTP_SESSION_POOL.close()
+    await MCP_SESSION_POOL.close()
+    EXTRACTION_POOL.close()
+    await SESSION_POOL.close()
 
 
 app = FastAPI(
@@ -954,6 +975,9 @@ app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL = (
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
 )
 app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER = BYPASS_WEB_SEARCH_WEB_LOADER
+app.state.config.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL = (
+    ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL
+)
 
 app.state.config.ENABLE_GOOGLE_DRIVE_INTEGRATION = ENABLE_GOOGLE_DRIVE_INTEGRATION
 app.state.config.ENABLE_ONEDRIVE_INTEGRATION = ENABLE_ONEDRIVE_INTEGRATION
@@ -1212,6 +1236,7 @@ app.state.config.ENABLE_AUTOCOMPLETE_GENERATION = ENABLE_AUTOCOMPLETE_GENERATION
 app.state.config.ENABLE_TAGS_GENERATION = ENABLE_TAGS_GENERATION
 app.state.config.ENABLE_TITLE_GENERATION = ENABLE_TITLE_GENERATION
 app.state.config.ENABLE_FOLLOW_UP_GENERATION = ENABLE_FOLLOW_UP_GENERATION
+app.state.config.ENABLE_COMBINED_TASKS_GENERATION = ENABLE_COMBINED_TASKS_GENERATION
 
 
 app.state.config.TITLE_GENERATION_PROMPT_TEMPLATE = TITLE_GENERATION_PROMPT_TEMPLATE
@@ -1539,7 +1564,11 @@ async def embeddings(
     if not request.app.state.MODELS:
         await get_all_models(request, user=user)
     # Use generic dispatcher in utils.embeddings
-    return await generate_embeddings(request, form_data, user)
+    try:
+        async with ADMISSION_CONTROLLER.slot(EMBEDDINGS):
+            return await generate_embeddings(request, form_data, user)
+    except AdmissionRejected as e:
+        raise e.http_exception()
 
 
 @app.post("/api/chat/completions")
@@ -1647,7 +1676,25 @@ async def chat_completion(
             detail=str(e),
         )
 
+    # Admit before anything is queued, so a busy worker answers 429 right away
+    try:
+        await ADMISSION_CONTROLLER.acquire(INTERACTIVE)
+    except AdmissionRejected as e:
+        raise e.http_exception()
+    release_interactive = ADMISSION_CONTROLLER.lease(INTERACTIVE, time.monotonic())
+
     async def process_chat(request, form_data, user, metadata, model):
+        response = None
+        try:
+            response = await process_chat_with_events(
+                request, form_data, user, metadata, model
+            )
+            return response
+        finally:
+            # Streamed responses hold the slot until the last chunk is sent
+            ADMISSION_CONTROLLER.release_after(release_interactive, response)
+
+    async def process_chat_with_events(request, form_data, user, metadata, model):
         try:
             form_data, metadata, events = await process_chat_payload(
                 request, form_data, user, metadata, model
@@ -1669,7 +1716,15 @@ async def chat_completion(
                     pass
 
             return await process_chat_response(
-                request, response, form_data, user, metadata, model, events, tasks
+                request,
+                response,
+                form_data,
+                user,
+                metadata,
+                model,
+                events,
+                tasks,
+                release_interactive,
             )
         except asyncio.CancelledError:
             log.info("Chat processing was cancelled")
@@ -1712,14 +1767,6 @@ async def chat_completion(
 
                 except:
                     pass
-        finally:
-            try:
-                if mcp_clients := metadata.get("mcp_clients"):
-                    for client in reversed(mcp_clients.values()):
-                        await client.disconnect()
-            except Exception as e:
-                log.debug(f"Error cleaning up: {e}")
-                pass
 
     if (
         metadata.get("session_id")
@@ -1727,11 +1774,14 @@ async def chat_completion(
         and metadata.get("message_id")
     ):
         # Asynchronous Chat Processing
-        task_id, _ = await create_task(
+        task_id, task = await create_task(
             request.app.state.redis,
             process_chat(request, form_data, user, metadata, model),
             id=metadata["chat_id"],
         )
+        # A task cancelled before its first step never reaches the release in
+        # process_chat
+        task.add_done_callback(lambda _: release_interactive())
         return {"status": True, "task_id": task_id}
     else:
         return await process_chat(request, form_data, user, metadata, model)
@@ -2223,7 +2273,7 @@ async def get_current_usage(user=Depends(get_verified_user)):
     """
     try:
         return {
-            "model_ids": get_models_in_use(),
+            "model_ids": await get_models_in_use(),
             "user_count": Users.get_active_user_count(),
         }
     except Exception as e:
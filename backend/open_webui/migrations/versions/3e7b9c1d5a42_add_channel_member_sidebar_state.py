@@ -0,0 +1,61 @@
+"""Add channel member sidebar state
+
+Revision ID: 3e7b9c1d5a42
+Revises: 8a1d4f6c2b37
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "3e7b9c1d5a42"
+down_revision = "8a1d4f6c2b37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("channel_member") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "unread_count", sa.BigInteger(), nullable=False, server_default="0"
+            )
+        )
+        batch_op.add_column(
+            sa.Column("last_message_at", sa.BigInteger(), nullable=True)
+        )
+
+    op.create_index(
+        "channel_member_user_id_channel_id_idx",
+        "channel_member",
+        ["user_id", "channel_id"],
+    )
+    op.create_index("channel_member_channel_id_idx", "channel_member", ["channel_id"])
+
+    # Backfill from the existing messages, as the sidebar used to count them
+    op.execute(
+        """
+        UPDATE channel_member SET
+            last_message_at = (
+                SELECT MAX(message.created_at) FROM message
+                WHERE message.channel_id = channel_member.channel_id
+            ),
+            unread_count = (
+                SELECT COUNT(*) FROM message
+                WHERE message.channel_id = channel_member.channel_id
+                AND message.parent_id IS NULL
+                AND message.created_at > COALESCE(channel_member.last_read_at, 0)
+                AND message.user_id != channel_member.user_id
+            )
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("channel_member_channel_id_idx", table_name="channel_member")
+    op.drop_index("channel_member_user_id_channel_id_idx", table_name="channel_member")
+
+    with op.batch_alter_table("channel_member") as batch_op:
+        batch_op.drop_column("last_message_at")
+        batch_op.drop_column("unread_count")
@@ -0,0 +1,29 @@
+"""Add file listing indexes
+
+Revision ID: 5c4b2e7a9d10
+Revises: e1b2c3d4e5f6
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "5c4b2e7a9d10"
+down_revision = "e1b2c3d4e5f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "file_user_id_created_at_id_idx", "file", ["user_id", "created_at", "id"]
+    )
+    op.create_index("file_created_at_id_idx", "file", ["created_at", "id"])
+    op.create_index("file_filename_lower_idx", "file", [sa.text("lower(filename)")])
+
+
+def downgrade():
+    op.drop_index("file_filename_lower_idx", table_name="file")
+    op.drop_index("file_created_at_id_idx", table_name="file")
+    op.drop_index("file_user_id_created_at_id_idx", table_name="file")
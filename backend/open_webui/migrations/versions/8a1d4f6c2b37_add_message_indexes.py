@@ -0,0 +1,36 @@
+"""Add message page indexes
+
+Revision ID: 8a1d4f6c2b37
+Revises: 5c4b2e7a9d10
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+revision = "8a1d4f6c2b37"
+down_revision = "5c4b2e7a9d10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "message_channel_id_parent_id_created_at_id_idx",
+        "message",
+        ["channel_id", "parent_id", "created_at", "id"],
+    )
+    op.create_index(
+        "message_parent_id_created_at_idx", "message", ["parent_id", "created_at"]
+    )
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
+    op.drop_index("message_parent_id_created_at_idx", table_name="message")
+    op.drop_index(
+        "message_channel_id_parent_id_created_at_id_idx", table_name="message"
+    )
@@ -10,7 +10,17 @@ from pydantic import BaseModel, ConfigDict
 from sqlalchemy.dialects.postgresql import JSONB
 
 
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, case, cast
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Index,
+    String,
+    Text,
+    JSON,
+    case,
+    cast,
+)
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -103,9 +113,20 @@ class ChannelMember(Base):
 
     last_read_at = Column(BigInteger, nullable=True)
 
+    # Sidebar state, maintained on message insert/delete and on read
+    unread_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_message_at = Column(BigInteger, nullable=True)
+
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE user_id = ? (channel list of a user)
+        Index("channel_member_user_id_channel_id_idx", "user_id", "channel_id"),
+        # WHERE channel_id = ? (members of a channel)
+        Index("channel_member_channel_id_idx", "channel_id"),
+    )
+
 
 class ChannelMemberModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -133,6 +154,9 @@ class ChannelMemberModel(BaseModel):
 
     last_read_at: Optional[int] = None  # timestamp in epoch (time_ns)
 
+    unread_count: int = 0
+    last_message_at: Optional[int] = None  # timestamp in epoch (time_ns)
+
     created_at: Optional[int] = None  # timestamp in epoch (time_ns)
     updated_at: Optional[int] = None  # timestamp in epoch (time_ns)
 
@@ -176,6 +200,11 @@ class ChannelWebhookModel(BaseModel):
 ####################
 
 
+class ChannelListItemModel(ChannelModel):
+    last_message_at: Optional[int] = None  # timestamp in epoch (time_ns)
+    unread_count: int = 0
+
+
 class ChannelResponse(ChannelModel):
     is_manager: bool = False
     write_access: bool = False
@@ -375,6 +404,96 @@ class ChannelTable:
             all_channels = membership_channels + standard_channels
             return [ChannelModel.model_validate(c) for c in all_channels]
 
+    def get_channel_list_by_user_id(self, user_id: str) -> list[ChannelListItemModel]:
+        """
+        Same channels as `get_channels_by_user_id`, with the sidebar state of
+        the user (last message time and unread count) read from their
+        membership rows instead of being counted per channel.
+        """
+        from open_webui.models.messages import Message
+
+        with get_db() as db:
+            user_group_ids = [
+                group.id for group in Groups.get_groups_by_member_id(user_id)
+            ]
+
+            # Memberships created before any message, and channels the user
+            # has not joined, fall back to the latest message of the channel.
+            last_message_at = func.coalesce(
+                ChannelMember.last_message_at,
+                select(func.max(Message.created_at))
+                .where(Message.channel_id == Channel.id)
+                .correlate(Channel)
+                .scalar_subquery(),
+            ).label("last_message_at")
+            unread_count = func.coalesce(ChannelMember.unread_count, 0).label(
+                "unread_count"
+            )
+            member_of_channel = and_(
+                ChannelMember.channel_id == Channel.id,
+                ChannelMember.user_id == user_id,
+            )
+
+            membership_channels = (
+                db.query(Channel, last_message_at, unread_count)
+                .join(ChannelMember, member_of_channel)
+                .filter(
+                    Channel.deleted_at.is_(None),
+                    Channel.archived_at.is_(None),
+                    Channel.type.in_(["group", "dm"]),
+                    ChannelMember.is_active.is_(True),
+                )
+                .all()
+            )
+
+            query = (
+                db.query(Channel, last_message_at, unread_count)
+                .outerjoin(ChannelMember, member_of_channel)
+                .filter(
+                    Channel.deleted_at.is_(None),
+                    Channel.archived_at.is_(None),
+                    or_(
+                        Channel.type.is_(None),  # True NULL/None
+                        Channel.type == "",  # Empty string
+                        and_(Channel.type != "group", Channel.type != "dm"),
+                    ),
+                )
+            )
+            query = self._has_permission(
+                db, query, {"user_id": user_id, "group_ids": user_group_ids}
+            )
+
+            standard_channels = query.all()
+
+            return [
+                ChannelListItemModel(
+                    **ChannelModel.model_validate(channel).model_dump(),
+                    last_message_at=last_message_at,
+                    unread_count=unread_count,
+                )
+                for channel, last_message_at, unread_count in (
+                    membership_channels + standard_channels
+                )
+            ]
+
+    def get_member_user_ids_by_channel_ids(
+        self, channel_ids: list[str]
+    ) -> dict[str, list[str]]:
+        if not channel_ids:
+            return {}
+
+        with get_db() as db:
+            rows = (
+                db.query(ChannelMember.channel_id, ChannelMember.user_id)
+                .filter(ChannelMember.channel_id.in_(channel_ids))
+                .all()
+            )
+
+            user_ids = {channel_id: [] for channel_id in channel_ids}
+            for channel_id, member_user_id in rows:
+                user_ids[channel_id].append(member_user_id)
+            return user_ids
+
     def get_dm_channel_by_user_ids(self, user_ids: list[str]) -> Optional[ChannelModel]:
         with get_db() as db:
             # Ensure uniqueness in case a list with duplicates is passed
@@ -599,6 +718,7 @@ class ChannelTable:
                 return False
 
             membership.last_read_at = int(time.time_ns())
+            membership.unread_count = 0
             membership.updated_at = int(time.time_ns())
 
             db.commit()
@@ -625,6 +745,25 @@ class ChannelTable:
             db.commit()
             return True
 
+    def reactivate_members(self, channel_id: str) -> int:
+        with get_db() as db:
+            result = (
+                db.query(ChannelMember)
+                .filter(
+                    ChannelMember.channel_id == channel_id,
+                    ChannelMember.is_active.is_(False),
+                )
+                .update(
+                    {
+                        ChannelMember.is_active: True,
+                        ChannelMember.updated_at: int(time.time_ns()),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return result  # number of rows reactivated
+
     def is_user_channel_member(self, channel_id: str, user_id: str) -> bool:
         with get_db() as db:
             membership = (
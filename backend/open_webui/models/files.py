@@ -1,11 +1,12 @@
 import logging
 import time
-from typing import Optional
+from fnmatch import fnmatch
+from typing import Iterator, Optional
 
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, Index, String, Text, JSON, and_, func, or_
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -32,6 +33,17 @@ class File(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE user_id = ... ORDER BY created_at DESC, id DESC
+        Index("file_user_id_created_at_id_idx", "user_id", "created_at", "id"),
+        # ORDER BY created_at DESC, id DESC (admin listing)
+        Index("file_created_at_id_idx", "created_at", "id"),
+    )
+
+
+# WHERE lower(filename) LIKE ...
+Index("file_filename_lower_idx", func.lower(File.filename))
+
 
 class FileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -104,6 +116,40 @@ class FileUpdateForm(BaseModel):
     meta: Optional[dict] = None
 
 
+def glob_to_like(pattern: str) -> tuple[str, bool]:
+    """
+    Translate an fnmatch-style glob into a SQL LIKE pattern escaped with "\\".
+
+    Returns the LIKE pattern and whether it is exact. Character classes such as
+    "[abc]" have no LIKE equivalent, so they are widened to "_" and the caller
+    must re-check matches with fnmatch.
+    """
+    like = []
+    exact = True
+
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            like.append("%")
+        elif char == "?":
+            like.append("_")
+        elif char == "[" and "]" in pattern[i + 2 :]:
+            like.append("_")
+            exact = False
+            i = pattern.index("]", i + 2)
+        elif char in ("%", "_", "\\"):
+            like.append("\\" + char)
+        else:
+            like.append(char)
+        i += 1
+
+    return "".join(like), exact
+
+
+FILE_LIST_BATCH_SIZE = 500
+
+
 class FilesTable:
     def insert_new_file(self, user_id: str, form_data: FileForm) -> Optional[FileModel]:
         with get_db() as db:
@@ -203,6 +249,127 @@ class FilesTable:
                 .all()
             ]
 
+    def get_file_list(
+        self,
+        user_id: Optional[str] = None,
+        filename: Optional[str] = None,
+        cursor: Optional[tuple[int, str]] = None,
+        limit: Optional[int] = None,
+        content: bool = True,
+    ) -> tuple[list[FileModel], Optional[tuple[int, str]]]:
+        """
+        Keyset-paginated file listing ordered by (created_at, id) descending.
+
+        `user_id` restricts the listing to one owner (None lists every file),
+        `filename` is a case-insensitive glob and `cursor` is the
+        (created_at, id) of the last row of the previous page. With
+        `content=False` only the status fields of `data` are selected, so the
+        extracted text never leaves the database.
+
+        Returns the page and the cursor of the next page, if any.
+        """
+        with get_db() as db:
+            if content:
+                columns = [File]
+            else:
+                columns = [
+                    File.id,
+                    File.user_id,
+                    File.hash,
+                    File.filename,
+                    File.path,
+                    File.meta,
+                    File.access_control,
+                    File.created_at,
+                    File.updated_at,
+                    File.data["status"].as_string().label("status"),
+                    File.data["error"].as_string().label("error"),
+                ]
+
+            query = db.query(*columns)
+
+            if user_id is not None:
+                query = query.filter(File.user_id == user_id)
+
+            exact = True
+            if filename:
+                like, exact = glob_to_like(filename.lower())
+                query = query.filter(func.lower(File.filename).like(like, escape="\\"))
+
+            if cursor:
+                created_at, id = cursor
+                query = query.filter(
+                    or_(
+                        File.created_at < created_at,
+                        and_(File.created_at == created_at, File.id < id),
+                    )
+                )
+
+            query = query.order_by(File.created_at.desc(), File.id.desc())
+            if limit:
+                query = query.limit(limit)
+
+            rows = query.all()
+
+        files = []
+        for row in rows:
+            if content:
+                file = FileModel.model_validate(row)
+            else:
+                file = FileModel(
+                    id=row.id,
+                    user_id=row.user_id,
+                    hash=row.hash,
+                    filename=row.filename,
+                    path=row.path,
+                    data={
+                        key: value
+                        for key, value in (
+                            ("status", row.status),
+                            ("error", row.error),
+                        )
+                        if value is not None
+                    },
+                    meta=row.meta,
+                    access_control=row.access_control,
+                    created_at=row.created_at,
+                    updated_at=row.updated_at,
+                )
+
+            if not exact and not fnmatch(file.filename.lower(), filename.lower()):
+                continue
+            files.append(file)
+
+        next_cursor = None
+        if limit and len(rows) == limit:
+            next_cursor = (rows[-1].created_at, rows[-1].id)
+
+        return files, next_cursor
+
+    def iter_files(
+        self,
+        user_id: Optional[str] = None,
+        filename: Optional[str] = None,
+        content: bool = True,
+        batch_size: int = FILE_LIST_BATCH_SIZE,
+    ) -> Iterator[FileModel]:
+        """
+        Yield every matching file, fetching keyset pages of `batch_size` rows so
+        memory stays bounded regardless of the number of files.
+        """
+        cursor = None
+        while True:
+            files, cursor = self.get_file_list(
+                user_id=user_id,
+                filename=filename,
+                cursor=cursor,
+                limit=batch_size,
+                content=content,
+            )
+            yield from files
+            if cursor is None:
+                break
+
     def get_files_by_user_id(self, user_id: str) -> list[FileModel]:
         with get_db() as db:
             return [
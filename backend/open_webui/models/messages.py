@@ -10,8 +10,8 @@ from open_webui.models.channels import Channels, ChannelMember
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, JSON
+from sqlalchemy import or_, case, func, select, and_, text
 from sqlalchemy.sql import exists
 
 ####################
@@ -27,6 +27,11 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (
+        # WHERE message_id IN (...) (reactions of a page)
+        Index("message_reaction_message_id_idx", "message_id"),
+    )
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -60,6 +65,19 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # WHERE channel_id = ... AND parent_id ... ORDER BY created_at DESC, id DESC
+        Index(
+            "message_channel_id_parent_id_created_at_id_idx",
+            "channel_id",
+            "parent_id",
+            "created_at",
+            "id",
+        ),
+        # WHERE parent_id IN (...) GROUP BY parent_id (thread reply counts)
+        Index("message_parent_id_created_at_idx", "parent_id", "created_at"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -152,6 +170,24 @@ class MessageTable:
             result = Message(**message.model_dump())
 
             db.add(result)
+
+            # Keep the sidebar state of every member in step, in the same
+            # transaction; only top-level messages count as unread.
+            unread_increment = (
+                case((ChannelMember.user_id != user_id, 1), else_=0)
+                if form_data.parent_id is None
+                else 0
+            )
+            db.query(ChannelMember).filter(
+                ChannelMember.channel_id == channel_id
+            ).update(
+                {
+                    ChannelMember.last_message_at: ts,
+                    ChannelMember.unread_count: ChannelMember.unread_count
+                    + unread_increment,
+                },
+                synchronize_session=False,
+            )
             db.commit()
             db.refresh(result)
             return MessageModel.model_validate(result) if result else None
@@ -161,31 +197,9 @@ class MessageTable:
             message = db.get(Message, id)
             if not message:
                 return None
+            message = MessageModel.model_validate(message)
 
-            reply_to_message = (
-                self.get_message_by_id(message.reply_to_id)
-                if message.reply_to_id
-                else None
-            )
-
-            reactions = self.get_reactions_by_message_id(id)
-            thread_replies = self.get_thread_replies_by_message_id(id)
-
-            user = Users.get_user_by_id(message.user_id)
-            return MessageResponse.model_validate(
-                {
-                    **MessageModel.model_validate(message).model_dump(),
-                    "user": user.model_dump() if user else None,
-                    "reply_to_message": (
-                        reply_to_message.model_dump() if reply_to_message else None
-                    ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
-                    "reactions": reactions,
-                }
-            )
+        return self.get_message_page([message])[0]
 
     def get_thread_replies_by_message_id(self, id: str) -> list[MessageReplyToResponse]:
         with get_db() as db:
@@ -224,82 +238,202 @@ class MessageTable:
                 for message in db.query(Message).filter_by(parent_id=id).all()
             ]
 
-    def get_messages_by_channel_id(
-        self, channel_id: str, skip: int = 0, limit: int = 50
-    ) -> list[MessageReplyToResponse]:
+    def get_message_page(
+        self, messages: list[MessageModel], thread_stats: bool = True
+    ) -> list[MessageResponse]:
+        """
+        Attach authors, replied-to messages, grouped reactions and (with
+        `thread_stats`) thread reply counts and latest reply times to a page of
+        messages, in a constant number of queries regardless of its size.
+        """
+        if not messages:
+            return []
+
+        ids = [message.id for message in messages]
+
         with get_db() as db:
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
+            reply_to_ids = {
+                message.reply_to_id for message in messages if message.reply_to_id
+            }
+            reply_to_messages = {
+                message.id: MessageModel.model_validate(message)
+                for message in (
+                    db.query(Message).filter(Message.id.in_(reply_to_ids)).all()
+                    if reply_to_ids
+                    else []
+                )
+            }
+
+            user_ids = {message.user_id for message in messages} | {
+                message.user_id for message in reply_to_messages.values()
+            }
+            users = {
+                row.id: UserNameResponse(id=row.id, name=row.name, role=row.role)
+                for row in db.query(User.id, User.name, User.role)
+                .filter(User.id.in_(user_ids))
                 .all()
-            )
+            }
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
+            replies = {}
+            if thread_stats:
+                replies = {
+                    row.parent_id: (row.count, row.latest_reply_at)
+                    for row in db.query(
+                        Message.parent_id,
+                        func.count(Message.id).label("count"),
+                        func.max(Message.created_at).label("latest_reply_at"),
                     )
-                )
-            return messages
+                    .filter(Message.parent_id.in_(ids))
+                    .group_by(Message.parent_id)
+                    .all()
+                }
 
-    def get_messages_by_parent_id(
-        self, channel_id: str, parent_id: str, skip: int = 0, limit: int = 50
-    ) -> list[MessageReplyToResponse]:
+            reactions = {}
+            for row in (
+                db.query(
+                    MessageReaction.message_id,
+                    MessageReaction.name,
+                    User.id.label("user_id"),
+                    User.name.label("user_name"),
+                )
+                .join(User, MessageReaction.user_id == User.id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .order_by(MessageReaction.created_at)
+                .all()
+            ):
+                reaction = reactions.setdefault(row.message_id, {}).setdefault(
+                    row.name, {"name": row.name, "users": [], "count": 0}
+                )
+                reaction["users"].append({"id": row.user_id, "name": row.user_name})
+                reaction["count"] += 1
+
+        page = []
+        for message in messages:
+            reply_to_message = reply_to_messages.get(message.reply_to_id)
+            reply_count, latest_reply_at = replies.get(message.id, (0, None))
+            page.append(
+                MessageResponse(
+                    **message.model_dump(),
+                    user=users.get(message.user_id),
+                    reply_to_message=(
+                        MessageUserResponse(
+                            **reply_to_message.model_dump(),
+                            user=users.get(reply_to_message.user_id),
+                        )
+                        if reply_to_message
+                        else None
+                    ),
+                    reply_count=reply_count,
+                    latest_reply_at=latest_reply_at,
+                    reactions=[
+                        Reactions(**reaction)
+                        for reaction in reactions.get(message.id, {}).values()
+                    ],
+                )
+            )
+        return page
+
+    def _get_keyset_page(
+        self,
+        query,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
+    ) -> tuple[list[MessageModel], Optional[tuple[int, str]]]:
+        if cursor:
+            created_at, id = cursor
+            query = query.filter(
+                or_(
+                    Message.created_at < created_at,
+                    and_(Message.created_at == created_at, Message.id < id),
+                )
+            )
+        elif skip:
+            query = query.offset(skip)
+
+        messages = [
+            MessageModel.model_validate(message)
+            for message in query.order_by(Message.created_at.desc(), Message.id.desc())
+            .limit(limit)
+            .all()
+        ]
+
+        next_cursor = None
+        if limit and len(messages) == limit:
+            next_cursor = (messages[-1].created_at, messages[-1].id)
+        return messages, next_cursor
+
+    def get_message_page_by_channel_id(
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
+    ) -> tuple[list[MessageResponse], Optional[tuple[int, str]]]:
+        """
+        Top-level messages of a channel, newest first. `cursor` is the
+        (created_at, id) of the last message of the previous page and takes
+        precedence over `skip`. Returns the page and the next cursor, if any.
+        """
         with get_db() as db:
-            message = db.get(Message, parent_id)
-
-            if not message:
-                return []
+            messages, next_cursor = self._get_keyset_page(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=None),
+                skip,
+                limit,
+                cursor,
+            )
+        return self.get_message_page(messages), next_cursor
 
-            all_messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id, parent_id=parent_id)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+    def get_messages_by_channel_id(
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
+    ) -> list[MessageResponse]:
+        return self.get_message_page_by_channel_id(channel_id, skip, limit, cursor)[0]
+
+    def get_message_page_by_parent_id(
+        self,
+        channel_id: str,
+        parent_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
+    ) -> tuple[list[MessageResponse], Optional[tuple[int, str]]]:
+        """
+        Replies of a thread, newest first, followed by the parent message once
+        the last page is reached. Paginated like `get_message_page_by_channel_id`.
+        """
+        with get_db() as db:
+            parent = db.get(Message, parent_id)
+            if not parent:
+                return [], None
+
+            messages, next_cursor = self._get_keyset_page(
+                db.query(Message).filter_by(channel_id=channel_id, parent_id=parent_id),
+                skip,
+                limit,
+                cursor,
             )
 
-            # If length of all_messages is less than limit, then add the parent message
-            if len(all_messages) < limit:
-                all_messages.append(message)
+        # If length of messages is less than limit, then add the parent message
+        if len(messages) < limit:
+            messages.append(MessageModel.model_validate(parent))
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(message.reply_to_id)
-                    if message.reply_to_id
-                    else None
-                )
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+        return self.get_message_page(messages, thread_stats=False), next_cursor
+
+    def get_messages_by_parent_id(
+        self,
+        channel_id: str,
+        parent_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[tuple[int, str]] = None,
+    ) -> list[MessageResponse]:
+        return self.get_message_page_by_parent_id(
+            channel_id, parent_id, skip, limit, cursor
+        )[0]
 
     def get_last_message_by_channel_id(self, channel_id: str) -> Optional[MessageModel]:
         with get_db() as db:
@@ -313,7 +447,7 @@ class MessageTable:
 
     def get_pinned_messages_by_channel_id(
         self, channel_id: str, skip: int = 0, limit: int = 50
-    ) -> list[MessageModel]:
+    ) -> list[MessageResponse]:
         with get_db() as db:
             all_messages = (
                 db.query(Message)
@@ -323,7 +457,10 @@ class MessageTable:
                 .limit(limit)
                 .all()
             )
-            return [MessageModel.model_validate(message) for message in all_messages]
+            messages = [
+                MessageModel.model_validate(message) for message in all_messages
+            ]
+        return self.get_message_page(messages, thread_stats=False)
 
     def update_message_by_id(
         self, id: str, form_data: MessageForm
@@ -442,19 +579,48 @@ class MessageTable:
             db.commit()
             return True
 
+    def _update_member_last_message_at(self, db, channel_id: str):
+        db.query(ChannelMember).filter(ChannelMember.channel_id == channel_id).update(
+            {
+                ChannelMember.last_message_at: select(func.max(Message.created_at))
+                .where(Message.channel_id == channel_id)
+                .scalar_subquery()
+            },
+            synchronize_session=False,
+        )
+
     def delete_replies_by_id(self, id: str) -> bool:
         with get_db() as db:
+            reply = db.query(Message).filter_by(parent_id=id).first()
             db.query(Message).filter_by(parent_id=id).delete()
+            if reply:
+                self._update_member_last_message_at(db, reply.channel_id)
             db.commit()
             return True
 
     def delete_message_by_id(self, id: str) -> bool:
         with get_db() as db:
+            message = db.get(Message, id)
             db.query(Message).filter_by(id=id).delete()
 
             # Delete all reactions to this message
             db.query(MessageReaction).filter_by(message_id=id).delete()
 
+            if message:
+                if message.parent_id is None:
+                    # Members who had not read it yet counted it as unread
+                    db.query(ChannelMember).filter(
+                        ChannelMember.channel_id == message.channel_id,
+                        ChannelMember.user_id != message.user_id,
+                        func.coalesce(ChannelMember.last_read_at, 0)
+                        < message.created_at,
+                        ChannelMember.unread_count > 0,
+                    ).update(
+                        {ChannelMember.unread_count: ChannelMember.unread_count - 1},
+                        synchronize_session=False,
+                    )
+                self._update_member_last_message_at(db, message.channel_id)
+
             db.commit()
             return True
 
@@ -359,6 +359,20 @@ class ModelsTable:
         except Exception:
             return None
 
+    def get_model_access_records(self) -> dict[str, tuple[str, Optional[dict]]]:
+        """
+        Owner and access control of every model, keyed by model id, loaded in a
+        single query. Used to filter whole model catalogs without a lookup per
+        model.
+        """
+        with get_db() as db:
+            return {
+                id: (user_id, access_control)
+                for id, user_id, access_control in db.query(
+                    Model.id, Model.user_id, Model.access_control
+                ).all()
+            }
+
     def toggle_model_by_id(self, id: str) -> Optional[ModelModel]:
         with get_db() as db:
             try:
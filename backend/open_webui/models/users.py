@@ -705,14 +705,17 @@ class UsersTable:
             )
             return count
 
+    def is_active(self, user) -> bool:
+        if user and user.last_active_at:
+            # Consider user active if last_active_at within the last 3 minutes
+            three_minutes_ago = int(time.time()) - 180
+            return user.last_active_at >= three_minutes_ago
+        return False
+
     def is_user_active(self, user_id: str) -> bool:
         with get_db() as db:
             user = db.query(User).filter_by(id=user_id).first()
-            if user and user.last_active_at:
-                # Consider user active if last_active_at within the last 3 minutes
-                three_minutes_ago = int(time.time()) - 180
-                return user.last_active_at >= three_minutes_ago
-            return False
+            return self.is_active(user)
 
 
 Users = UsersTable()
@@ -0,0 +1,114 @@
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+class TTLCache:
+    """
+    A small LRU cache whose entries expire after `ttl` seconds.
+
+    Used for throwaway per-query results (e.g. ranked web search chunks), so
+    identical requests issued within a few minutes are answered without
+    searching, fetching and embedding again.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def rank_top_k(query_vectors, chunk_vectors, k: int) -> list[tuple[int, float]]:
+    """
+    Return `(chunk index, score)` of the `k` chunks most similar to any query.
+
+    Cosine similarities of all queries against all chunks are computed in one
+    matrix product; a chunk's score is its best match over the queries.
+    """
+    queries = np.asarray(query_vectors, dtype=np.float32)
+    chunks = np.asarray(chunk_vectors, dtype=np.float32)
+    if queries.size == 0 or chunks.size == 0 or k <= 0:
+        return []
+
+    queries = normalize(np.atleast_2d(queries))
+    chunks = normalize(np.atleast_2d(chunks))
+
+    scores = (queries @ chunks.T).max(axis=0)
+
+    k = min(k, len(scores))
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    return [(int(idx), float(scores[idx])) for idx in top]
+
+
+async def rank_docs(
+    queries: list[str],
+    docs: list[Document],
+    embedding_function: Callable[..., Awaitable[list]],
+    k: int,
+    query_prefix: Optional[str] = None,
+    content_prefix: Optional[str] = None,
+) -> list[Document]:
+    """
+    Embed already split `docs` and `queries` and return the `k` best matching
+    docs, best first, with the similarity stored as `metadata["score"]`.
+    Nothing is written to the vector DB.
+    """
+    if not docs or not queries:
+        return []
+
+    chunk_vectors = await embedding_function(
+        [doc.page_content.replace("\n", " ") for doc in docs],
+        prefix=content_prefix,
+    )
+    query_vectors = await embedding_function(queries, prefix=query_prefix)
+
+    return [
+        Document(
+            page_content=docs[idx].page_content,
+            metadata={**docs[idx].metadata, "score": score},
+        )
+        for idx, score in rank_top_k(query_vectors, chunk_vectors, k)
+    ]
@@ -0,0 +1,415 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterator, Optional
+
+from langchain_core.documents import Document
+from opentelemetry import metrics
+
+from open_webui.env import (
+    DOCUMENT_EXTRACTION_MEMORY_LIMIT,
+    DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB,
+    DOCUMENT_EXTRACTION_TIMEOUT,
+    DOCUMENT_EXTRACTION_WORKERS,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+meter = metrics.get_meter(__name__)
+
+extraction_jobs_counter = meter.create_counter(
+    name="webui.extraction.jobs",
+    description="Document extraction jobs by outcome",
+    unit="1",
+)
+extraction_documents_counter = meter.create_counter(
+    name="webui.extraction.documents",
+    description="Documents (e.g. PDF pages) produced by the extraction workers",
+    unit="1",
+)
+extraction_queue_wait_histogram = meter.create_histogram(
+    name="webui.extraction.queue_wait",
+    description="Time an extraction job waited for a free worker",
+    unit="ms",
+)
+extraction_duration_histogram = meter.create_histogram(
+    name="webui.extraction.duration",
+    description="Time a worker spent extracting a job",
+    unit="ms",
+)
+extraction_pending_counter = meter.create_up_down_counter(
+    name="webui.extraction.pending",
+    description="Extraction jobs submitted and not yet finished",
+    unit="1",
+)
+
+
+class ExtractionTimeoutError(TimeoutError):
+    pass
+
+
+class ExtractionWorkerError(RuntimeError):
+    pass
+
+
+####################################
+#
+# Worker side
+#
+####################################
+
+
+def init_worker(memory_limit: int):
+    if memory_limit > 0:
+        import resource
+
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def extract_file(
+    filename: str,
+    file_content_type: str,
+    file_path: str,
+    engine: str = "",
+    loader_kwargs: Optional[dict] = None,
+) -> tuple[float, list[Document]]:
+    """
+    Load a file with the loader the calling `Loader(engine, **loader_kwargs)`
+    picked, so offloaded files yield the same documents as in process.
+    """
+    started_at = time.time()
+
+    from open_webui.retrieval.loaders.main import Loader, fix_documents
+
+    loader = Loader(engine, **(loader_kwargs or {}))._get_loader(
+        filename, file_content_type, file_path
+    )
+    return started_at, fix_documents(loader.load())
+
+
+def extract_pdf_pages(
+    file_path: str, start: int, stop: int, extract_images: bool
+) -> tuple[float, list[Document]]:
+    """
+    Extract pages [start, stop) the way `PyPDFLoader` does for a whole file,
+    so that split jobs yield the same documents and metadata: the pages are
+    copied into a PDF of their own for `PyPDFParser`, then numbered as in the
+    whole file.
+    """
+    started_at = time.time()
+
+    import io
+
+    import pypdf
+    from langchain_community.document_loaders.parsers import PyPDFParser
+    from langchain_core.documents.base import Blob
+    from open_webui.retrieval.loaders.main import fix_documents
+
+    reader = pypdf.PdfReader(file_path)
+    page_numbers = range(start, min(stop, len(reader.pages)))
+
+    writer = pypdf.PdfWriter()
+    for page_number in page_numbers:
+        writer.add_page(reader.pages[page_number])
+    writer.add_metadata(reader.metadata or {})
+    data = io.BytesIO()
+    writer.write(data)
+
+    parser = PyPDFParser(extract_images=extract_images, extraction_mode="plain")
+    docs = list(parser.lazy_parse(Blob.from_data(data.getvalue(), path=file_path)))
+    for page_number, doc in zip(page_numbers, docs):
+        doc.metadata.update(
+            {
+                "total_pages": len(reader.pages),
+                "page": page_number,
+                "page_label": reader.page_labels[page_number],
+            }
+        )
+        # The copy is stamped with pypdf as its producer when the file has none
+        if "/Producer" not in (reader.metadata or {}):
+            doc.metadata["producer"] = "PyPDF"
+    return started_at, fix_documents(docs)
+
+
+####################################
+#
+# Pool
+#
+####################################
+
+
+class ExtractionPool:
+    """
+    Runs CPU-heavy document extraction in worker processes.
+
+    Parsing a large PDF in the web worker holds the GIL and stalls unrelated
+    chat streams; here it only costs a pool slot. Each worker process is an
+    executor of its own, driven by one dispatch thread, so a job that runs
+    past the timeout or crashes its worker only fails itself: that worker is
+    killed and replaced while the other jobs carry on. Workers can also be
+    given a memory limit. Large PDFs are split into page ranges extracted in
+    parallel.
+    """
+
+    def __init__(
+        self,
+        workers: int = DOCUMENT_EXTRACTION_WORKERS,
+        timeout: int = DOCUMENT_EXTRACTION_TIMEOUT,
+        memory_limit: int = DOCUMENT_EXTRACTION_MEMORY_LIMIT,
+        pdf_pages_per_job: int = DOCUMENT_EXTRACTION_PDF_PAGES_PER_JOB,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.pdf_pages_per_job = pdf_pages_per_job
+
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+        # One entry per worker, taken by the dispatch thread running a job;
+        # None until the worker is first needed or after it was killed
+        self._workers: queue.SimpleQueue = queue.SimpleQueue()
+        for _ in range(max(workers, 0)):
+            self._workers.put(None)
+        self._lock = threading.Lock()
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "crashed": 0,
+            "restarts": 0,
+            "pending": 0,
+            "documents": 0,
+            "queue_wait_ms": 0.0,
+            "duration_ms": 0.0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_dispatcher(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="extraction"
+                )
+            return self._dispatcher
+
+    def _start_worker(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            # Forking a threaded server process is unsafe.
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(self.memory_limit,),
+        )
+
+    def _kill_worker(self, executor: ProcessPoolExecutor):
+        self._record("restarts")
+        for process in list((executor._processes or {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, outcome: str, count: int = 1):
+        with self._lock:
+            self.stats[outcome] += count
+        if outcome != "restarts":
+            extraction_jobs_counter.add(count, {"outcome": outcome})
+
+    def _run_job(self, fn: Callable, args: tuple, submitted_at: float) -> Any:
+        # There are as many workers as dispatch threads, so one is always free
+        executor = self._workers.get()
+        try:
+            if executor is None:
+                executor = self._start_worker()
+            future = executor.submit(fn, *args)
+            try:
+                started_at, result = future.result(timeout=self.timeout)
+            except FuturesTimeoutError:
+                self._record("timed_out")
+                self._kill_worker(executor)
+                executor = None
+                raise ExtractionTimeoutError(
+                    f"Document extraction took longer than {self.timeout} seconds"
+                )
+            except BrokenProcessPool as e:
+                self._record("crashed")
+                self._kill_worker(executor)
+                executor = None
+                raise ExtractionWorkerError("Document extraction worker crashed") from e
+            except Exception:
+                self._record("failed")
+                raise
+        finally:
+            self._workers.put(executor)
+
+        queue_wait_ms = max(started_at - submitted_at, 0) * 1000.0
+        duration_ms = (time.time() - started_at) * 1000.0
+        with self._lock:
+            self.stats["queue_wait_ms"] += queue_wait_ms
+            self.stats["duration_ms"] += duration_ms
+        extraction_queue_wait_histogram.record(queue_wait_ms)
+        extraction_duration_histogram.record(duration_ms)
+        self._record("completed")
+        return result
+
+    def _submit(self, fn: Callable, args: tuple) -> Future:
+        future = self._get_dispatcher().submit(self._run_job, fn, args, time.time())
+        with self._lock:
+            self.stats["submitted"] += 1
+            self.stats["pending"] += 1
+        extraction_pending_counter.add(1)
+        future.add_done_callback(lambda _: self._finish())
+        return future
+
+    def _finish(self):
+        with self._lock:
+            self.stats["pending"] -= 1
+        extraction_pending_counter.add(-1)
+
+    def iter_run(
+        self, jobs: list[tuple[Callable, tuple]], window: Optional[int] = None
+    ) -> Iterator[Any]:
+        """
+        Run `jobs` (picklable `(fn, args)` pairs returning `(started_at,
+        result)`) in the pool and yield their results in order. At most
+        `window` jobs are in flight (all of them by default), which bounds the
+        results held in memory when the consumer is slower than the workers.
+        Each job must finish within `timeout` seconds of starting.
+        """
+        window = window or len(jobs)
+        pending = deque()
+        next_job = 0
+
+        try:
+            while pending or next_job < len(jobs):
+                while next_job < len(jobs) and len(pending) < window:
+                    pending.append(self._submit(*jobs[next_job]))
+                    next_job += 1
+                yield pending.popleft().result()
+        finally:
+            # Jobs not started yet are dropped; running ones finish on their own
+            for future in pending:
+                future.cancel()
+
+    def run(self, jobs: list[tuple[Callable, tuple]]) -> list[Any]:
+        return list(self.iter_run(jobs))
+
+    def get_pdf_page_count(self, file_path: str) -> int:
+        try:
+            import pypdf
+
+            return len(pypdf.PdfReader(file_path).pages)
+        except Exception as e:
+            log.debug(f"Unable to count PDF pages of {file_path}: {e}")
+            return 0
+
+    def get_pdf_page_jobs(
+        self, file_path: str, extract_images: bool
+    ) -> list[tuple[Callable, tuple]]:
+        page_count = self.get_pdf_page_count(file_path)
+        pages_per_job = self.pdf_pages_per_job or page_count
+        return [
+            (
+                extract_pdf_pages,
+                (file_path, start, start + pages_per_job, extract_images),
+            )
+            for start in range(0, page_count, max(pages_per_job, 1))
+        ]
+
+    def _count_documents(self, docs: list[Document]) -> list[Document]:
+        with self._lock:
+            self.stats["documents"] += len(docs)
+        extraction_documents_counter.add(len(docs))
+        return docs
+
+    def extract(
+        self,
+        filename: str,
+        file_content_type: str,
+        file_path: str,
+        extract_images: bool = False,
+        is_pdf: bool = False,
+        engine: str = "",
+        loader_kwargs: Optional[dict] = None,
+    ) -> list[Document]:
+        jobs = None
+        if is_pdf and self.pdf_pages_per_job > 0:
+            page_jobs = self.get_pdf_page_jobs(file_path, extract_images)
+            if len(page_jobs) > 1:
+                jobs = page_jobs
+
+        if jobs is None:
+            jobs = [
+                (
+                    extract_file,
+                    (
+                        filename,
+                        file_content_type,
+                        file_path,
+                        engine,
+                        {**(loader_kwargs or {}), "PDF_EXTRACT_IMAGES": extract_images},
+                    ),
+                )
+            ]
+
+        return self._count_documents(
+            [doc for result in self.run(jobs) for doc in result]
+        )
+
+    def iter_pdf_pages(
+        self, file_path: str, extract_images: bool = False
+    ) -> Iterator[Document]:
+        """
+        Yield the pages of a PDF in order while later page ranges are still
+        being extracted. Only `workers` ranges are in flight at a time, so
+        memory stays bounded regardless of the document size.
+        """
+        jobs = self.get_pdf_page_jobs(file_path, extract_images)
+        if not jobs:
+            # Unreadable here; let the worker surface the parser error.
+            jobs = [(extract_pdf_pages, (file_path, 0, 0, extract_images))]
+
+        for docs in self.iter_run(jobs, window=self.workers):
+            yield from self._count_documents(docs)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+        finished = stats["completed"]
+        return {
+            **stats,
+            "workers": self.workers,
+            "running": self._dispatcher is not None,
+            "avg_queue_wait_ms": (
+                stats["queue_wait_ms"] / finished if finished else 0.0
+            ),
+            "avg_duration_ms": stats["duration_ms"] / finished if finished else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.shutdown(wait=False, cancel_futures=True)
+        for _ in range(max(self.workers, 0)):
+            try:
+                executor = self._workers.get_nowait()
+            except queue.Empty:
+                break
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._workers.put(None)
+
+
+EXTRACTION_POOL = ExtractionPool()
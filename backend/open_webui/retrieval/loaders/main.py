@@ -3,6 +3,7 @@ import logging
 import ftfy
 import sys
 import json
+from typing import Iterator
 
 from azure.identity import DefaultAzureCredential
 from langchain_community.document_loaders import (
@@ -24,6 +25,7 @@ from langchain_community.document_loaders import (
 from langchain_core.documents import Document
 
 from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
+from open_webui.retrieval.loaders.extraction_pool import EXTRACTION_POOL
 
 from open_webui.retrieval.loaders.mistral import MistralLoader
 from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
@@ -184,6 +186,31 @@ class DoclingLoader:
             raise Exception(f"Error calling Docling: {error_msg}")
 
 
+# Loaders that parse the file in process (as opposed to calling an
+# extraction service) and are therefore run in the extraction pool.
+LOCAL_LOADERS = (
+    BSHTMLLoader,
+    CSVLoader,
+    Docx2txtLoader,
+    OutlookMessageLoader,
+    PyPDFLoader,
+    TextLoader,
+    UnstructuredEPubLoader,
+    UnstructuredExcelLoader,
+    UnstructuredODTLoader,
+    UnstructuredPowerPointLoader,
+    UnstructuredRSTLoader,
+    UnstructuredXMLLoader,
+)
+
+
+def fix_documents(docs: list[Document]) -> list[Document]:
+    return [
+        Document(page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata)
+        for doc in docs
+    ]
+
+
 class Loader:
     def __init__(self, engine: str = "", **kwargs):
         self.engine = engine
@@ -194,14 +221,49 @@ class Loader:
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
         loader = self._get_loader(filename, file_content_type, file_path)
-        docs = loader.load()
+        return self._load(loader, filename, file_content_type, file_path)
 
-        return [
-            Document(
-                page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
+    def lazy_load(
+        self, filename: str, file_content_type: str, file_path: str
+    ) -> Iterator[Document]:
+        """
+        Yield documents as they are extracted. PDFs parsed locally are yielded
+        page by page, so callers can start indexing before the whole file is
+        read; other loaders yield their documents once fully loaded.
+        """
+        loader = self._get_loader(filename, file_content_type, file_path)
+
+        if isinstance(loader, PyPDFLoader):
+            if EXTRACTION_POOL.enabled:
+                yield from EXTRACTION_POOL.iter_pdf_pages(
+                    file_path,
+                    extract_images=bool(self.kwargs.get("PDF_EXTRACT_IMAGES")),
+                )
+            else:
+                for doc in loader.lazy_load():
+                    yield from fix_documents([doc])
+        else:
+            yield from self._load(loader, filename, file_content_type, file_path)
+
+    def _load(
+        self, loader, filename: str, file_content_type: str, file_path: str
+    ) -> list[Document]:
+        if EXTRACTION_POOL.enabled and isinstance(loader, LOCAL_LOADERS):
+            return EXTRACTION_POOL.extract(
+                filename,
+                file_content_type,
+                file_path,
+                extract_images=bool(self.kwargs.get("PDF_EXTRACT_IMAGES")),
+                is_pdf=isinstance(loader, PyPDFLoader),
+                # The worker picks its loader again from the same settings;
+                # the user is only needed by remote loaders
+                engine=self.engine,
+                loader_kwargs={
+                    key: value for key, value in self.kwargs.items() if key != "user"
+                },
             )
-            for doc in docs
-        ]
+
+        return fix_documents(loader.load())
 
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
@@ -172,6 +172,14 @@ class ChromaClient(VectorDBBase):
             ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
         )
 
+    def update_metadata(self, collection_name: str, metadatas: dict) -> bool:
+        collection = self.client.get_collection(name=collection_name)
+        collection.update(
+            ids=list(metadatas),
+            metadatas=[process_metadata(metadata) for metadata in metadatas.values()],
+        )
+        return True
+
     def delete(
         self,
         collection_name: str,
@@ -274,6 +274,36 @@ class ElasticsearchClient(VectorDBBase):
             ]
             bulk(self.client, actions)
 
+    # Documents live in the index of their vector size, so look their index up
+    # before updating just their metadata.
+    def update_metadata(self, collection_name: str, metadatas: dict) -> bool:
+        result = self.client.search(
+            index=f"{self.index_prefix}*",
+            body={
+                "query": {
+                    "bool": {
+                        "filter": [
+                            {"term": {"collection": collection_name}},
+                            {"terms": {"_id": list(metadatas)}},
+                        ]
+                    }
+                },
+                "_source": False,
+            },
+            size=len(metadatas),
+        )
+        actions = [
+            {
+                "_op_type": "update",
+                "_index": hit["_index"],
+                "_id": hit["_id"],
+                "doc": {"metadata": process_metadata(metadatas[hit["_id"]])},
+            }
+            for hit in result["hits"]["hits"]
+        ]
+        bulk(self.client, actions)
+        return True
+
     # Delete specific documents from a collection by filtering on both collection and document IDs.
     def delete(
         self,
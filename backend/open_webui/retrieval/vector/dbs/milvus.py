@@ -333,6 +333,29 @@ class MilvusClient(VectorDBBase):
             ],
         )
 
+    def update_metadata(self, collection_name: str, metadatas: dict) -> bool:
+        # Milvus rewrites whole rows, so write the stored vectors back with the
+        # new metadata instead of embedding the texts again.
+        collection_name = collection_name.replace("-", "_")
+        rows = self.client.get(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=list(metadatas),
+            output_fields=["id", "vector", "data"],
+        )
+        self.client.upsert(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            data=[
+                {
+                    "id": row["id"],
+                    "vector": row["vector"],
+                    "data": row["data"],
+                    "metadata": process_metadata(metadatas[row["id"]]),
+                }
+                for row in rows
+            ],
+        )
+        return True
+
     def delete(
         self,
         collection_name: str,
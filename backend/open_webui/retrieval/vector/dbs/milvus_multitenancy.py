@@ -200,6 +200,37 @@ class MilvusClient(VectorDBBase):
             ids=ids, documents=documents, metadatas=metadatas, distances=distances
         )
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        mt_collection, resource_id = self._get_collection_and_resource_id(
+            collection_name
+        )
+        if not utility.has_collection(mt_collection):
+            return False
+
+        collection = Collection(mt_collection)
+        collection.load()
+
+        # Rows are rewritten whole, so the stored vectors are written back with
+        # the new metadata instead of embedding the texts again
+        id_list_str = ", ".join([f"'{id_val}'" for id_val in metadatas])
+        rows = collection.query(
+            expr=f"{RESOURCE_ID_FIELD} == '{resource_id}' and id in [{id_list_str}]",
+            output_fields=["id", "vector", "text"],
+        )
+        collection.upsert(
+            [
+                {
+                    "id": row["id"],
+                    "vector": row["vector"],
+                    "text": row["text"],
+                    "metadata": metadatas[row["id"]],
+                    RESOURCE_ID_FIELD: resource_id,
+                }
+                for row in rows
+            ]
+        )
+        return True
+
     def delete(
         self,
         collection_name: str,
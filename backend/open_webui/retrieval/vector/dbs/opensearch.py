@@ -232,6 +232,20 @@ class OpenSearchClient(VectorDBBase):
             bulk(self.client, actions)
         self.client.indices.refresh(self._get_index_name(collection_name))
 
+    def update_metadata(self, collection_name: str, metadatas: dict) -> bool:
+        actions = [
+            {
+                "_op_type": "update",
+                "_index": self._get_index_name(collection_name),
+                "_id": id,
+                "doc": {"metadata": process_metadata(metadata)},
+            }
+            for id, metadata in metadatas.items()
+        ]
+        bulk(self.client, actions)
+        self.client.indices.refresh(self._get_index_name(collection_name))
+        return True
+
     def delete(
         self,
         collection_name: str,
@@ -522,6 +522,49 @@ class Oracle23aiClient(VectorDBBase):
                 log.exception(f"Error during upsert: {e}")
                 raise
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        """
+        Replace the metadata of existing items, keeping their text and vectors.
+
+        Args:
+            collection_name (str): Name of the collection
+            metadatas (Dict[str, Any]): New metadata, keyed by item ID
+
+        Returns:
+            bool: True once the metadata is updated
+
+        Raises:
+            Exception: If the update fails
+        """
+        log.info(
+            f"Updating metadata of {len(metadatas)} items in collection '{collection_name}'."
+        )
+
+        with self.get_connection() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    for id, metadata in metadatas.items():
+                        cursor.execute(
+                            """
+                            UPDATE document_chunk
+                            SET vmetadata = :metadata
+                            WHERE id = :id AND collection_name = :collection_name
+                        """,
+                            {
+                                "id": id,
+                                "collection_name": collection_name,
+                                "metadata": self._metadata_to_json(metadata),
+                            },
+                        )
+
+                connection.commit()
+                return True
+
+            except Exception as e:
+                connection.rollback()
+                log.exception(f"Error during metadata update: {e}")
+                raise
+
     def search(
         self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
     ) -> Optional[SearchResult]:
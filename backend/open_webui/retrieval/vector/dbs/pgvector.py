@@ -640,6 +640,40 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        try:
+            for id, metadata in metadatas.items():
+                if PGVECTOR_PGCRYPTO:
+                    self.session.execute(
+                        text(
+                            """
+                            UPDATE document_chunk
+                            SET vmetadata = pgp_sym_encrypt(:metadata_text, :key)
+                            WHERE id = :id AND collection_name = :collection_name
+                        """
+                        ),
+                        {
+                            "id": id,
+                            "collection_name": collection_name,
+                            "metadata_text": json.dumps(metadata),
+                            "key": PGVECTOR_PGCRYPTO_KEY,
+                        },
+                    )
+                else:
+                    self.session.query(DocumentChunk).filter(
+                        DocumentChunk.collection_name == collection_name,
+                        DocumentChunk.id == id,
+                    ).update(
+                        {DocumentChunk.vmetadata: process_metadata(metadata)},
+                        synchronize_session=False,
+                    )
+            self.session.commit()
+            return True
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during metadata update: {e}")
+            raise
+
     def delete(
         self,
         collection_name: str,
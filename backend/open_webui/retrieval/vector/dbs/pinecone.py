@@ -510,6 +510,23 @@ class PineconeClient(VectorDBBase):
             log.error(f"Error getting collection '{collection_name}': {e}")
             return None
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        """Merge new metadata into existing vectors, keeping their values."""
+        collection_name_with_prefix = self._get_collection_name_with_prefix(
+            collection_name
+        )
+        for id, metadata in metadatas.items():
+            metadata = {**metadata, "collection_name": collection_name_with_prefix}
+            self._retry_pinecone_operation(
+                lambda: self.index.update(
+                    id=id, set_metadata=process_metadata(metadata)
+                )
+            )
+        log.info(
+            f"Updated metadata of {len(metadatas)} vectors in '{collection_name_with_prefix}'"
+        )
+        return True
+
     def delete(
         self,
         collection_name: str,
@@ -213,6 +213,21 @@ class QdrantClient(VectorDBBase):
         points = self._create_points(items)
         return self.client.upsert(f"{self.collection_prefix}_{collection_name}", points)
 
+    def update_metadata(self, collection_name: str, metadatas: dict) -> bool:
+        # Overwrite only the metadata of each point, keeping its text and vector
+        self.client.batch_update_points(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            update_operations=[
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(
+                        payload={"metadata": metadata}, points=[id]
+                    )
+                )
+                for id, metadata in metadatas.items()
+            ],
+        )
+        return True
+
     def delete(
         self,
         collection_name: str,
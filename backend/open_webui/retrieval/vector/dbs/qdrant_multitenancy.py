@@ -255,6 +255,27 @@ class QdrantClient(VectorDBBase):
             ),
         )
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        """
+        Overwrite the metadata of points of a collection, keeping their text,
+        vectors and tenant ID.
+        """
+        if not self.client:
+            return False
+        mt_collection, _ = self._get_collection_and_tenant_id(collection_name)
+        self.client.batch_update_points(
+            collection_name=mt_collection,
+            update_operations=[
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(
+                        payload={"metadata": metadata}, points=[id]
+                    )
+                )
+                for id, metadata in metadatas.items()
+            ],
+        )
+        return True
+
     def search(
         self, collection_name: str, vectors: List[List[float | int]], limit: int
     ) -> Optional[SearchResult]:
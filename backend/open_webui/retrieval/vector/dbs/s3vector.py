@@ -596,6 +596,52 @@ class S3VectorClient(VectorDBBase):
                     return GetResult(ids=[[]], documents=[[]], metadatas=[[]])
             raise
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        """
+        Replace the metadata of existing vectors. S3 Vectors only writes whole
+        vectors, so the stored data is read back and put again with the new
+        metadata, without embedding the texts again.
+        """
+        keys = list(metadatas)
+        try:
+            # GetVectors takes up to 100 keys per call
+            for i in range(0, len(keys), 100):
+                response = self.client.get_vectors(
+                    vectorBucketName=self.bucket_name,
+                    indexName=collection_name,
+                    keys=keys[i : i + 100],
+                    returnData=True,
+                    returnMetadata=True,
+                )
+                vectors = []
+                for vector in response.get("vectors", []):
+                    metadata = process_metadata(
+                        {
+                            **metadatas[vector["key"]],
+                            "text": vector.get("metadata", {}).get("text", ""),
+                        }
+                    )
+                    vectors.append(
+                        {
+                            "key": vector["key"],
+                            "data": vector["data"],
+                            "metadata": self._filter_metadata(metadata, vector["key"]),
+                        }
+                    )
+                if vectors:
+                    self.client.put_vectors(
+                        vectorBucketName=self.bucket_name,
+                        indexName=collection_name,
+                        vectors=vectors,
+                    )
+            log.info(
+                f"Updated metadata of {len(keys)} vectors in index '{collection_name}'."
+            )
+            return True
+        except Exception as e:
+            log.error(f"Error updating vector metadata: {e}")
+            raise
+
     def delete(
         self,
         collection_name: str,
@@ -297,6 +297,16 @@ class WeaviateClient(VectorDBBase):
         except Exception:
             return None
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        sane_collection_name = self._sanitize_collection_name(collection_name)
+        collection = self.client.collections.get(sane_collection_name)
+
+        for item_id, metadata in metadatas.items():
+            properties = _convert_uuids_to_strings(process_metadata(metadata))
+            properties.pop("text", None)
+            collection.data.update(uuid=item_id, properties=properties)
+        return True
+
     def delete(
         self,
         collection_name: str,
@@ -70,6 +70,14 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def update_metadata(self, collection_name: str, metadatas: Dict[str, Any]) -> bool:
+        """
+        Replace the metadata of existing items, keyed by id, keeping their
+        text and vectors. Returns False if the backend can't update metadata
+        in place, in which case callers re-insert the items instead.
+        """
+        return False
+
     @abstractmethod
     def delete(
         self,
@@ -3,6 +3,7 @@ import os
 from pprint import pprint
 from typing import Optional
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 import argparse
@@ -14,6 +15,22 @@ Documentation: https://docs.microsoft.com/en-us/bing/search-apis/bing-web-search
 """
 
 
+def parse_bing_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    results = json_response.get("webPages", {}).get("value", [])
+    if filter_list:
+        results = get_filtered_results(results, filter_list)
+    return [
+        SearchResult(
+            link=result["url"],
+            title=result.get("name"),
+            snippet=result.get("snippet"),
+        )
+        for result in results
+    ]
+
+
 def search_bing(
     subscription_key: str,
     endpoint: str,
@@ -29,23 +46,29 @@ def search_bing(
     try:
         response = requests.get(endpoint, headers=headers, params=params)
         response.raise_for_status()
-        json_response = response.json()
-        results = json_response.get("webPages", {}).get("value", [])
-        if filter_list:
-            results = get_filtered_results(results, filter_list)
-        return [
-            SearchResult(
-                link=result["url"],
-                title=result.get("name"),
-                snippet=result.get("snippet"),
-            )
-            for result in results
-        ]
+        return parse_bing_results(response.json(), count, filter_list)
     except Exception as ex:
         log.error(f"Error: {ex}")
         raise ex
 
 
+async def search_bing_async(
+    subscription_key: str,
+    endpoint: str,
+    locale: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+) -> list[SearchResult]:
+    json_response = await fetch_json(
+        "GET",
+        endpoint,
+        headers={"Ocp-Apim-Subscription-Key": subscription_key},
+        params={"q": query, "mkt": locale, "count": count},
+    )
+    return await parse_results(parse_bing_results, json_response, count, filter_list)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Search Bing from the command line.")
     parser.add_argument(
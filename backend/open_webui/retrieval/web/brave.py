@@ -2,34 +2,27 @@ import logging
 from typing import Optional
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+BRAVE_SEARCH_URL = "https://api.search.brave.com/res/v1/web/search"
 
-def search_brave(
-    api_key: str, query: str, count: int, filter_list: Optional[list[str]] = None
-) -> list[SearchResult]:
-    """Search using Brave's Search API and return the results as a list of SearchResult objects.
 
-    Args:
-        api_key (str): A Brave Search API key
-        query (str): The query to search for
-    """
-    url = "https://api.search.brave.com/res/v1/web/search"
-    headers = {
+def get_brave_headers(api_key: str) -> dict:
+    return {
         "Accept": "application/json",
         "Accept-Encoding": "gzip",
         "X-Subscription-Token": api_key,
     }
-    params = {"q": query, "count": count}
 
-    response = requests.get(url, headers=headers, params=params)
-    response.raise_for_status()
 
-    json_response = response.json()
+def parse_brave_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
     results = json_response.get("web", {}).get("results", [])
     if filter_list:
         results = get_filtered_results(results, filter_list)
@@ -42,3 +35,38 @@ def search_brave(
         )
         for result in results[:count]
     ]
+
+
+def search_brave(
+    api_key: str, query: str, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    """Search using Brave's Search API and return the results as a list of SearchResult objects.
+
+    Args:
+        api_key (str): A Brave Search API key
+        query (str): The query to search for
+    """
+    params = {"q": query, "count": count}
+
+    response = requests.get(
+        BRAVE_SEARCH_URL, headers=get_brave_headers(api_key), params=params
+    )
+    response.raise_for_status()
+
+    return parse_brave_results(response.json(), count, filter_list)
+
+
+async def search_brave_async(
+    api_key: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    url: str = BRAVE_SEARCH_URL,
+) -> list[SearchResult]:
+    json_response = await fetch_json(
+        "GET",
+        url,
+        headers=get_brave_headers(api_key),
+        params={"q": query, "count": count},
+    )
+    return await parse_results(parse_brave_results, json_response, count, filter_list)
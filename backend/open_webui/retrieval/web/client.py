@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    WEB_SEARCH_ENGINE_CACHE_SIZE,
+    WEB_SEARCH_ENGINE_CACHE_TTL,
+    WEB_SEARCH_ENGINE_FAILURE_THRESHOLD,
+    WEB_SEARCH_ENGINE_RATE_LIMIT,
+    WEB_SEARCH_ENGINE_RETRY_AFTER,
+)
+from open_webui.retrieval.ephemeral import TTLCache
+from open_webui.retrieval.web.main import SearchResult
+from open_webui.services.fallback_handler import CircuitBreakerState
+from open_webui.utils.session_pool import get_pooled_session
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+meter = metrics.get_meter(__name__)
+
+search_requests_counter = meter.create_counter(
+    name="webui.web_search.requests",
+    description="Web search engine requests by outcome",
+    unit="1",
+)
+search_latency_histogram = meter.create_histogram(
+    name="webui.web_search.latency",
+    description="Latency of web search engine requests",
+    unit="ms",
+)
+
+
+class SearchEngineUnavailable(Exception):
+    pass
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to
+    `burst` requests. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(rate, 1)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1
+                self._updated_at = time.monotonic()
+
+            self._tokens -= 1
+
+
+class SearchEngineClient:
+    """
+    Per-engine guard around web search requests.
+
+    Requests are rate limited so a burst of concurrent chats does not run
+    into the provider's quota, and a circuit breaker stops calling an engine
+    that keeps failing until `retry_after` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        engine: str,
+        rate_limit: float = WEB_SEARCH_ENGINE_RATE_LIMIT,
+        failure_threshold: int = WEB_SEARCH_ENGINE_FAILURE_THRESHOLD,
+        retry_after: int = WEB_SEARCH_ENGINE_RETRY_AFTER,
+    ):
+        self.engine = engine
+        self.limiter = RateLimiter(rate_limit)
+        self.breaker = CircuitBreakerState(
+            failure_threshold=failure_threshold, timeout_seconds=retry_after
+        )
+        self.stats = {
+            "requests": 0,
+            "failures": 0,
+            "rejected": 0,
+            "cache_hits": 0,
+            "latency_ms": 0.0,
+        }
+
+    def _record(self, outcome: str):
+        search_requests_counter.add(1, {"engine": self.engine, "outcome": outcome})
+
+    async def run(
+        self, search: Callable[[], Awaitable[list[SearchResult]]]
+    ) -> list[SearchResult]:
+        if not self.breaker.can_attempt():
+            self.stats["rejected"] += 1
+            self._record("rejected")
+            raise SearchEngineUnavailable(
+                f"Web search engine {self.engine} is temporarily unavailable after repeated failures"
+            )
+
+        await self.limiter.acquire()
+
+        start = time.perf_counter()
+        self.stats["requests"] += 1
+        try:
+            results = await search()
+        except Exception:
+            self.stats["failures"] += 1
+            self.breaker.record_failure()
+            self._record("error")
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            self.stats["latency_ms"] += elapsed_ms
+            search_latency_histogram.record(elapsed_ms, {"engine": self.engine})
+
+        self.breaker.record_success()
+        self._record("success")
+        return results
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "state": self.breaker.get_state(),
+            "failure_count": self.breaker.failure_count,
+        }
+
+
+SEARCH_CLIENTS: dict[str, SearchEngineClient] = {}
+
+SEARCH_RESULTS_CACHE = TTLCache(
+    maxsize=WEB_SEARCH_ENGINE_CACHE_SIZE, ttl=WEB_SEARCH_ENGINE_CACHE_TTL
+)
+
+
+def get_search_client(engine: str) -> SearchEngineClient:
+    client = SEARCH_CLIENTS.get(engine)
+    if client is None:
+        client = SEARCH_CLIENTS[engine] = SearchEngineClient(engine)
+    return client
+
+
+async def search_with_cache(
+    engine: str,
+    query: str,
+    count: int,
+    search: Callable[[], Awaitable[list[SearchResult]]],
+    filter_list: Optional[list[str]] = None,
+    scope: str = "",
+) -> list[SearchResult]:
+    """
+    Run `search` through the engine's client, reusing results of an identical
+    (engine, query, count) search from the last few minutes. `scope` tells
+    apart searches with the same query that may return different results,
+    e.g. through another endpoint or API key of the engine.
+    """
+    key = f"{engine}:{scope}:{count}:{sorted(filter_list or [])}:{query}"
+    client = get_search_client(engine)
+
+    results = SEARCH_RESULTS_CACHE.get(key)
+    if results is not None:
+        client.stats["cache_hits"] += 1
+        client._record("cache_hit")
+        return results
+
+    results = await client.run(search)
+    SEARCH_RESULTS_CACHE.set(key, results)
+    return results
+
+
+async def fetch_json(method: str, url: str, **kwargs) -> Any:
+    """Request `url` on the shared web search session pool and decode JSON."""
+    session = get_pooled_session("web_search", url)
+    async with session.request(method, url, **kwargs) as response:
+        response.raise_for_status()
+        return await response.json(content_type=None)
+
+
+async def parse_results(
+    parse: Callable[..., list[SearchResult]],
+    json_response: Any,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+) -> list[SearchResult]:
+    if filter_list:
+        # Domain filtering resolves hostnames, keep it off the event loop.
+        return await asyncio.to_thread(parse, json_response, count, filter_list)
+    return parse(json_response, count, filter_list)
+
+
+def get_stats() -> dict:
+    return {
+        "engines": {
+            engine: client.get_stats() for engine, client in SEARCH_CLIENTS.items()
+        },
+        "cache": {
+            "size": len(SEARCH_RESULTS_CACHE),
+            "maxsize": SEARCH_RESULTS_CACHE.maxsize,
+            "ttl": SEARCH_RESULTS_CACHE.ttl,
+        },
+    }
@@ -2,12 +2,43 @@ import logging
 from typing import Optional
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+GOOGLE_PSE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+
+def get_google_pse_params(
+    api_key: str, search_engine_id: str, query: str, count: int, start_index: int
+) -> dict:
+    return {
+        "cx": search_engine_id,
+        "q": query,
+        "key": api_key,
+        "num": min(count, 10),  # Google PSE max results per page is 10
+        "start": start_index,
+    }
+
+
+def parse_google_pse_results(
+    all_results: list[dict], count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    if filter_list:
+        all_results = get_filtered_results(all_results, filter_list)
+
+    return [
+        SearchResult(
+            link=result["link"],
+            title=result.get("title"),
+            snippet=result.get("snippet"),
+        )
+        for result in all_results
+    ]
+
 
 def search_google_pse(
     api_key: str,
@@ -30,8 +61,6 @@ def search_google_pse(
     Returns:
         list[SearchResult]: A list of SearchResult objects.
     """
-    url = "https://www.googleapis.com/customsearch/v1"
-
     headers = {"Content-Type": "application/json"}
     if referer:
         headers["Referer"] = referer
@@ -40,15 +69,12 @@ def search_google_pse(
     start_index = 1  # Google PSE start parameter is 1-based
 
     while count > 0:
-        num_results_this_page = min(count, 10)  # Google PSE max results per page is 10
-        params = {
-            "cx": search_engine_id,
-            "q": query,
-            "key": api_key,
-            "num": num_results_this_page,
-            "start": start_index,
-        }
-        response = requests.request("GET", url, headers=headers, params=params)
+        params = get_google_pse_params(
+            api_key, search_engine_id, query, count, start_index
+        )
+        response = requests.request(
+            "GET", GOOGLE_PSE_SEARCH_URL, headers=headers, params=params
+        )
         response.raise_for_status()
         json_response = response.json()
         results = json_response.get("items", [])
@@ -61,14 +87,42 @@ def search_google_pse(
         else:
             break  # No more results from Google PSE, break the loop
 
-    if filter_list:
-        all_results = get_filtered_results(all_results, filter_list)
+    return parse_google_pse_results(all_results, count, filter_list)
 
-    return [
-        SearchResult(
-            link=result["link"],
-            title=result.get("title"),
-            snippet=result.get("snippet"),
+
+async def search_google_pse_async(
+    api_key: str,
+    search_engine_id: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    referer: Optional[str] = None,
+    url: str = GOOGLE_PSE_SEARCH_URL,
+) -> list[SearchResult]:
+    headers = {"Content-Type": "application/json"}
+    if referer:
+        headers["Referer"] = referer
+
+    all_results = []
+    start_index = 1
+    remaining = count
+
+    while remaining > 0:
+        json_response = await fetch_json(
+            "GET",
+            url,
+            headers=headers,
+            params=get_google_pse_params(
+                api_key, search_engine_id, query, remaining, start_index
+            ),
         )
-        for result in all_results
-    ]
+        results = json_response.get("items", [])
+        if not results:
+            break
+        all_results.extend(results)
+        remaining -= len(results)
+        start_index += 10
+
+    return await parse_results(
+        parse_google_pse_results, all_results, count, filter_list
+    )
@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    WEB_LOADER_CACHE_DIR,
+    WEB_LOADER_CACHE_MAX_SIZE,
+    WEB_LOADER_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+meter = metrics.get_meter(__name__)
+
+page_cache_requests_counter = meter.create_counter(
+    name="webui.web_loader.cache.requests",
+    description="Web page loads by cache outcome (hit, revalidated, miss)",
+    unit="1",
+)
+page_cache_bytes_saved_counter = meter.create_counter(
+    name="webui.web_loader.cache.bytes_saved",
+    description="Page bytes not downloaded thanks to the web page cache",
+    unit="By",
+)
+
+
+class PageCache:
+    """
+    Disk-backed cache of fetched web pages, holding the parsed text and
+    metadata plus the validators (ETag / Last-Modified) of the response.
+
+    Entries younger than `ttl` are served as is; older ones are revalidated
+    with a conditional request, so an unchanged page costs a 304 instead of
+    a download and a parse. The cache is bounded by the total size of its
+    entry files and evicts the least recently used first. The bound is kept
+    per process; workers sharing the directory may briefly exceed it.
+    """
+
+    def __init__(self, directory: str, max_size: int, ttl: int):
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._size = 0
+        self._index_lock = asyncio.Lock()
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _get_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        entries = []
+        if self.directory.exists():
+            for path in self.directory.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        # Oldest first, so that eviction starts with the least recently stored
+        return OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    async def _get_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            async with self._index_lock:
+                if self._index is None:
+                    index = await asyncio.to_thread(self._load_index)
+                    self._size = sum(index.values())
+                    self._index = index
+        return self._index
+
+    def _read(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._get_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, entry: dict) -> int:
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def _remove(self, keys: list[str]):
+        for key in keys:
+            try:
+                self._get_path(key).unlink()
+            except OSError:
+                pass
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    async def get(self, url: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        index = await self._get_index()
+        key = self._get_key(url)
+        if key not in index:
+            return None
+
+        entry = await asyncio.to_thread(self._read, key)
+        if entry is None or entry.get("url") != url:
+            self._forget(key)
+            return None
+
+        index.move_to_end(key)
+        return entry
+
+    async def set(self, url: str, entry: dict):
+        if not self.enabled:
+            return
+
+        index = await self._get_index()
+        key = self._get_key(url)
+        try:
+            size = await asyncio.to_thread(self._write, key, {**entry, "url": url})
+        except OSError as e:
+            log.warning(f"Unable to cache web page {url}: {e}")
+            return
+
+        self._forget(key)
+        index[key] = size
+        self._size += size
+
+        evicted = []
+        while self._size > self.max_size and len(index) > 1:
+            evicted_key, evicted_size = index.popitem(last=False)
+            self._size -= evicted_size
+            evicted.append(evicted_key)
+
+        if evicted:
+            self.stats["evictions"] += len(evicted)
+            await asyncio.to_thread(self._remove, evicted)
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def get_conditional_headers(self, entry: Optional[dict]) -> dict:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, outcome: str, entry: Optional[dict] = None):
+        """Count a page load as `hit`, `revalidated` or `miss`."""
+        self.stats[{"hit": "hits", "miss": "misses"}.get(outcome, outcome)] += 1
+        page_cache_requests_counter.add(1, {"outcome": outcome})
+
+        if entry and outcome != "miss":
+            saved = entry.get("content_length", 0)
+            self.stats["bytes_saved"] += saved
+            page_cache_bytes_saved_counter.add(saved, {"outcome": outcome})
+
+    def get_stats(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": (
+                (self.stats["hits"] + self.stats["revalidated"]) / lookups
+                if lookups
+                else 0.0
+            ),
+            "entries": len(self._index or {}),
+            "size": self._size,
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+
+class DomainConcurrencyLimiter:
+    """
+    Caps concurrent requests per domain across all loaders in the process,
+    so popular sites are not hit by every concurrent web search at once
+    while fetches of different sites still run in parallel.
+    """
+
+    def __init__(self):
+        self._slots: dict[str, list] = {}
+
+    @asynccontextmanager
+    async def limit(self, url: str, max_concurrency: int):
+        domain = urlparse(url).netloc
+        slot = self._slots.get(domain)
+        if slot is None:
+            slot = self._slots[domain] = [asyncio.Semaphore(max(max_concurrency, 1)), 0]
+
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0 and self._slots.get(domain) is slot:
+                del self._slots[domain]
+
+
+WEB_PAGE_CACHE = PageCache(
+    WEB_LOADER_CACHE_DIR, WEB_LOADER_CACHE_MAX_SIZE, WEB_LOADER_CACHE_TTL
+)
+WEB_DOMAIN_LIMITER = DomainConcurrencyLimiter()
@@ -3,12 +3,33 @@ from typing import Optional
 from urllib.parse import urlencode
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+SEARCHAPI_SEARCH_URL = "https://www.searchapi.io/api/v1/search"
+
+
+def parse_searchapi_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    results = sorted(
+        json_response.get("organic_results", []), key=lambda x: x.get("position", 0)
+    )
+    if filter_list:
+        results = get_filtered_results(results, filter_list)
+    return [
+        SearchResult(
+            link=result["link"],
+            title=result.get("title"),
+            snippet=result.get("snippet"),
+        )
+        for result in results[:count]
+    ]
+
 
 def search_searchapi(
     api_key: str,
@@ -23,28 +44,29 @@ def search_searchapi(
       api_key (str): A searchapi.io API key
       query (str): The query to search for
     """
-    url = "https://www.searchapi.io/api/v1/search"
-
     engine = engine or "google"
 
     payload = {"engine": engine, "q": query, "api_key": api_key}
 
-    url = f"{url}?{urlencode(payload)}"
+    url = f"{SEARCHAPI_SEARCH_URL}?{urlencode(payload)}"
     response = requests.request("GET", url)
 
     json_response = response.json()
     log.info(f"results from searchapi search: {json_response}")
 
-    results = sorted(
-        json_response.get("organic_results", []), key=lambda x: x.get("position", 0)
+    return parse_searchapi_results(json_response, count, filter_list)
+
+
+async def search_searchapi_async(
+    api_key: str,
+    engine: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    url: str = SEARCHAPI_SEARCH_URL,
+) -> list[SearchResult]:
+    payload = {"engine": engine or "google", "q": query, "api_key": api_key}
+    json_response = await fetch_json("GET", f"{url}?{urlencode(payload)}")
+    return await parse_results(
+        parse_searchapi_results, json_response, count, filter_list
     )
-    if filter_list:
-        results = get_filtered_results(results, filter_list)
-    return [
-        SearchResult(
-            link=result["link"],
-            title=result.get("title"),
-            snippet=result.get("snippet"),
-        )
-        for result in results[:count]
-    ]
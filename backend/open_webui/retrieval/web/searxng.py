@@ -2,43 +2,23 @@ import logging
 from typing import Optional
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+SEARXNG_HEADERS = {
+    "User-Agent": "Open WebUI (https://github.com/open-webui/open-webui) RAG Bot",
+    "Accept": "text/html",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Connection": "keep-alive",
+}
 
-def search_searxng(
-    query_url: str,
-    query: str,
-    count: int,
-    filter_list: Optional[list[str]] = None,
-    **kwargs,
-) -> list[SearchResult]:
-    """
-    Search a SearXNG instance for a given query and return the results as a list of SearchResult objects.
-
-    The function allows passing additional parameters such as language or time_range to tailor the search result.
-
-    Args:
-        query_url (str): The base URL of the SearXNG server.
-        query (str): The search term or question to find in the SearXNG database.
-        count (int): The maximum number of results to retrieve from the search.
-
-    Keyword Args:
-        language (str): Language filter for the search results; e.g., "en-US". Defaults to an empty string.
-        safesearch (int): Safe search filter for safer web results; 0 = off, 1 = moderate, 2 = strict. Defaults to 1 (moderate).
-        time_range (str): Time range for filtering results by date; e.g., "2023-04-05..today" or "all-time". Defaults to ''.
-        categories: (Optional[list[str]]): Specific categories within which the search should be performed, defaulting to an empty string if not provided.
-
-    Returns:
-        list[SearchResult]: A list of SearchResults sorted by relevance score in descending order.
-
-    Raise:
-        requests.exceptions.RequestException: If a request error occurs during the search process.
-    """
 
+def get_searxng_request(query_url: str, query: str, **kwargs) -> tuple[str, dict]:
     # Default values for optional parameters are provided as empty strings or None when not specified.
     language = kwargs.get("language", "en-US")
     safesearch = kwargs.get("safesearch", "1")
@@ -62,23 +42,12 @@ def search_searxng(
         # Strip all query parameters from the URL
         query_url = query_url.split("?")[0]
 
-    log.debug(f"searching {query_url}")
-
-    response = requests.get(
-        query_url,
-        headers={
-            "User-Agent": "Open WebUI (https://github.com/open-webui/open-webui) RAG Bot",
-            "Accept": "text/html",
-            "Accept-Encoding": "gzip, deflate",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Connection": "keep-alive",
-        },
-        params=params,
-    )
+    return query_url, params
 
-    response.raise_for_status()  # Raise an exception for HTTP errors.
 
-    json_response = response.json()
+def parse_searxng_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
     results = json_response.get("results", [])
     sorted_results = sorted(results, key=lambda x: x.get("score", 0), reverse=True)
     if filter_list:
@@ -89,3 +58,60 @@ def search_searxng(
         )
         for result in sorted_results[:count]
     ]
+
+
+def search_searxng(
+    query_url: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    **kwargs,
+) -> list[SearchResult]:
+    """
+    Search a SearXNG instance for a given query and return the results as a list of SearchResult objects.
+
+    The function allows passing additional parameters such as language or time_range to tailor the search result.
+
+    Args:
+        query_url (str): The base URL of the SearXNG server.
+        query (str): The search term or question to find in the SearXNG database.
+        count (int): The maximum number of results to retrieve from the search.
+
+    Keyword Args:
+        language (str): Language filter for the search results; e.g., "en-US". Defaults to an empty string.
+        safesearch (int): Safe search filter for safer web results; 0 = off, 1 = moderate, 2 = strict. Defaults to 1 (moderate).
+        time_range (str): Time range for filtering results by date; e.g., "2023-04-05..today" or "all-time". Defaults to ''.
+        categories: (Optional[list[str]]): Specific categories within which the search should be performed, defaulting to an empty string if not provided.
+
+    Returns:
+        list[SearchResult]: A list of SearchResults sorted by relevance score in descending order.
+
+    Raise:
+        requests.exceptions.RequestException: If a request error occurs during the search process.
+    """
+    query_url, params = get_searxng_request(query_url, query, **kwargs)
+
+    log.debug(f"searching {query_url}")
+
+    response = requests.get(query_url, headers=SEARXNG_HEADERS, params=params)
+
+    response.raise_for_status()  # Raise an exception for HTTP errors.
+
+    return parse_searxng_results(response.json(), count, filter_list)
+
+
+async def search_searxng_async(
+    query_url: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    **kwargs,
+) -> list[SearchResult]:
+    query_url, params = get_searxng_request(query_url, query, **kwargs)
+
+    log.debug(f"searching {query_url}")
+
+    # aiohttp manages keep-alive on the pooled connector itself.
+    headers = {k: v for k, v in SEARXNG_HEADERS.items() if k != "Connection"}
+    json_response = await fetch_json("GET", query_url, headers=headers, params=params)
+    return await parse_results(parse_searxng_results, json_response, count, filter_list)
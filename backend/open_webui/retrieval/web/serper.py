@@ -3,12 +3,33 @@ import logging
 from typing import Optional
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+
+
+def parse_serper_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    results = sorted(
+        json_response.get("organic", []), key=lambda x: x.get("position", 0)
+    )
+    if filter_list:
+        results = get_filtered_results(results, filter_list)
+    return [
+        SearchResult(
+            link=result["link"],
+            title=result.get("title"),
+            snippet=result.get("description"),
+        )
+        for result in results[:count]
+    ]
+
 
 def search_serper(
     api_key: str, query: str, count: int, filter_list: Optional[list[str]] = None
@@ -19,25 +40,28 @@ def search_serper(
         api_key (str): A serper.dev API key
         query (str): The query to search for
     """
-    url = "https://google.serper.dev/search"
-
     payload = json.dumps({"q": query})
     headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
 
-    response = requests.request("POST", url, headers=headers, data=payload)
+    response = requests.request(
+        "POST", SERPER_SEARCH_URL, headers=headers, data=payload
+    )
     response.raise_for_status()
 
-    json_response = response.json()
-    results = sorted(
-        json_response.get("organic", []), key=lambda x: x.get("position", 0)
+    return parse_serper_results(response.json(), count, filter_list)
+
+
+async def search_serper_async(
+    api_key: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    url: str = SERPER_SEARCH_URL,
+) -> list[SearchResult]:
+    json_response = await fetch_json(
+        "POST",
+        url,
+        headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
+        json={"q": query},
     )
-    if filter_list:
-        results = get_filtered_results(results, filter_list)
-    return [
-        SearchResult(
-            link=result["link"],
-            title=result.get("title"),
-            snippet=result.get("description"),
-        )
-        for result in results[:count]
-    ]
+    return await parse_results(parse_serper_results, json_response, count, filter_list)
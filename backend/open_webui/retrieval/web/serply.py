@@ -3,35 +3,25 @@ from typing import Optional
 from urllib.parse import urlencode
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+SERPLY_SEARCH_URL = "https://api.serply.io/v1/search/"
 
-def search_serply(
+
+def get_serply_request(
     api_key: str,
     query: str,
-    count: int,
     hl: str = "us",
     limit: int = 10,
     device_type: str = "desktop",
     proxy_location: str = "US",
-    filter_list: Optional[list[str]] = None,
-) -> list[SearchResult]:
-    """Search using serper.dev's API and return the results as a list of SearchResult objects.
-
-    Args:
-        api_key (str): A serply.io API key
-        query (str): The query to search for
-        hl (str): Host Language code to display results in (reference https://developers.google.com/custom-search/docs/xml_results?hl=en#wsInterfaceLanguages)
-        limit (int): The maximum number of results to return [10-100, defaults to 10]
-    """
-    log.info("Searching with Serply")
-
-    url = "https://api.serply.io/v1/search/"
-
+    url: str = SERPLY_SEARCH_URL,
+) -> tuple[str, dict]:
     query_payload = {
         "q": query,
         "language": "en",
@@ -47,13 +37,12 @@ def search_serply(
         "User-Agent": "open-webui",
         "X-Proxy-Location": proxy_location,
     }
+    return url, headers
 
-    response = requests.request("GET", url, headers=headers)
-    response.raise_for_status()
-
-    json_response = response.json()
-    log.info(f"results from serply search: {json_response}")
 
+def parse_serply_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
     results = sorted(
         json_response.get("results", []), key=lambda x: x.get("realPosition", 0)
     )
@@ -67,3 +56,54 @@ def search_serply(
         )
         for result in results[:count]
     ]
+
+
+def search_serply(
+    api_key: str,
+    query: str,
+    count: int,
+    hl: str = "us",
+    limit: int = 10,
+    device_type: str = "desktop",
+    proxy_location: str = "US",
+    filter_list: Optional[list[str]] = None,
+) -> list[SearchResult]:
+    """Search using serper.dev's API and return the results as a list of SearchResult objects.
+
+    Args:
+        api_key (str): A serply.io API key
+        query (str): The query to search for
+        hl (str): Host Language code to display results in (reference https://developers.google.com/custom-search/docs/xml_results?hl=en#wsInterfaceLanguages)
+        limit (int): The maximum number of results to return [10-100, defaults to 10]
+    """
+    log.info("Searching with Serply")
+
+    url, headers = get_serply_request(
+        api_key, query, hl, limit, device_type, proxy_location
+    )
+
+    response = requests.request("GET", url, headers=headers)
+    response.raise_for_status()
+
+    json_response = response.json()
+    log.info(f"results from serply search: {json_response}")
+
+    return parse_serply_results(json_response, count, filter_list)
+
+
+async def search_serply_async(
+    api_key: str,
+    query: str,
+    count: int,
+    hl: str = "us",
+    limit: int = 10,
+    device_type: str = "desktop",
+    proxy_location: str = "US",
+    filter_list: Optional[list[str]] = None,
+    url: str = SERPLY_SEARCH_URL,
+) -> list[SearchResult]:
+    url, headers = get_serply_request(
+        api_key, query, hl, limit, device_type, proxy_location, url
+    )
+    json_response = await fetch_json("GET", url, headers=headers)
+    return await parse_results(parse_serply_results, json_response, count, filter_list)
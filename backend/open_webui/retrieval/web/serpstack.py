@@ -2,6 +2,7 @@ import logging
 from typing import Optional
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -9,6 +10,26 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
+def get_serpstack_url(https_enabled: bool = True) -> str:
+    return f"{'https' if https_enabled else 'http'}://api.serpstack.com/search"
+
+
+def parse_serpstack_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    results = sorted(
+        json_response.get("organic_results", []), key=lambda x: x.get("position", 0)
+    )
+    if filter_list:
+        results = get_filtered_results(results, filter_list)
+    return [
+        SearchResult(
+            link=result["url"], title=result.get("title"), snippet=result.get("snippet")
+        )
+        for result in results[:count]
+    ]
+
+
 def search_serpstack(
     api_key: str,
     query: str,
@@ -23,7 +44,7 @@ def search_serpstack(
         query (str): The query to search for
         https_enabled (bool): Whether to use HTTPS or HTTP for the API request
     """
-    url = f"{'https' if https_enabled else 'http'}://api.serpstack.com/search"
+    url = get_serpstack_url(https_enabled)
 
     headers = {"Content-Type": "application/json"}
     params = {
@@ -34,15 +55,23 @@ def search_serpstack(
     response = requests.request("POST", url, headers=headers, params=params)
     response.raise_for_status()
 
-    json_response = response.json()
-    results = sorted(
-        json_response.get("organic_results", []), key=lambda x: x.get("position", 0)
+    return parse_serpstack_results(response.json(), count, filter_list)
+
+
+async def search_serpstack_async(
+    api_key: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    https_enabled: bool = True,
+    url: Optional[str] = None,
+) -> list[SearchResult]:
+    json_response = await fetch_json(
+        "POST",
+        url or get_serpstack_url(https_enabled),
+        headers={"Content-Type": "application/json"},
+        params={"access_key": api_key, "query": query},
+    )
+    return await parse_results(
+        parse_serpstack_results, json_response, count, filter_list
     )
-    if filter_list:
-        results = get_filtered_results(results, filter_list)
-    return [
-        SearchResult(
-            link=result["url"], title=result.get("title"), snippet=result.get("snippet")
-        )
-        for result in results[:count]
-    ]
@@ -2,12 +2,39 @@ import logging
 from typing import Optional
 
 import requests
+from open_webui.retrieval.web.client import fetch_json, parse_results
 from open_webui.retrieval.web.main import SearchResult, get_filtered_results
 from open_webui.env import SRC_LOG_LEVELS
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+def get_tavily_headers(api_key: str) -> dict:
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+
+
+def parse_tavily_results(
+    json_response: dict, count: int, filter_list: Optional[list[str]] = None
+) -> list[SearchResult]:
+    results = json_response.get("results", [])
+    if filter_list:
+        results = get_filtered_results(results, filter_list)
+
+    return [
+        SearchResult(
+            link=result["url"],
+            title=result.get("title", ""),
+            snippet=result.get("content"),
+        )
+        for result in results
+    ]
+
 
 def search_tavily(
     api_key: str,
@@ -26,26 +53,26 @@ def search_tavily(
     Returns:
         list[SearchResult]: A list of search results
     """
-    url = "https://api.tavily.com/search"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
     data = {"query": query, "max_results": count}
-    response = requests.post(url, headers=headers, json=data)
+    response = requests.post(
+        TAVILY_SEARCH_URL, headers=get_tavily_headers(api_key), json=data
+    )
     response.raise_for_status()
 
-    json_response = response.json()
+    return parse_tavily_results(response.json(), count, filter_list)
 
-    results = json_response.get("results", [])
-    if filter_list:
-        results = get_filtered_results(results, filter_list)
 
-    return [
-        SearchResult(
-            link=result["url"],
-            title=result.get("title", ""),
-            snippet=result.get("content"),
-        )
-        for result in results
-    ]
+async def search_tavily_async(
+    api_key: str,
+    query: str,
+    count: int,
+    filter_list: Optional[list[str]] = None,
+    url: str = TAVILY_SEARCH_URL,
+) -> list[SearchResult]:
+    json_response = await fetch_json(
+        "POST",
+        url,
+        headers=get_tavily_headers(api_key),
+        json={"query": query, "max_results": count},
+    )
+    return await parse_results(parse_tavily_results, json_response, count, filter_list)
@@ -42,7 +42,9 @@ from open_webui.config import (
     WEB_FETCH_FILTER_LIST,
 )
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.web.page_cache import WEB_DOMAIN_LIMITER, WEB_PAGE_CACHE
 from open_webui.utils.misc import is_string_allowed
+from open_webui.utils.session_pool import get_pooled_session
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -547,7 +549,13 @@ class SafePlaywrightURLLoader(PlaywrightURLLoader, RateLimitMixin, URLProcessing
 
 
 class SafeWebBaseLoader(WebBaseLoader):
-    """WebBaseLoader with enhanced error handling for URLs."""
+    """
+    WebBaseLoader with enhanced error handling for URLs.
+
+    Pages are fetched on a shared session pool with at most
+    `requests_per_second` concurrent requests per domain, and parsed pages
+    are kept in the web page cache and revalidated with conditional requests.
+    """
 
     def __init__(self, trust_env: bool = False, *args, **kwargs):
         """Initialize SafeWebBaseLoader
@@ -558,37 +566,104 @@ class SafeWebBaseLoader(WebBaseLoader):
         super().__init__(*args, **kwargs)
         self.trust_env = trust_env
 
+    async def _request(
+        self,
+        url: str,
+        headers: Optional[dict] = None,
+        retries: int = 3,
+        cooldown: int = 2,
+        backoff: float = 1.5,
+    ) -> tuple[aiohttp.ClientResponse, bytes]:
+        session = get_pooled_session(
+            "web_loader" if self.trust_env else "web_loader_direct",
+            trust_env=self.trust_env,
+        )
+        for i in range(retries):
+            try:
+                kwargs: Dict = dict(
+                    headers={**self.session.headers, **(headers or {})},
+                    cookies=self.session.cookies.get_dict(),
+                )
+                if not self.session.verify:
+                    kwargs["ssl"] = False
+
+                async with session.get(
+                    url,
+                    **(self.requests_kwargs | kwargs),
+                    allow_redirects=False,
+                ) as response:
+                    if self.raise_for_status:
+                        response.raise_for_status()
+                    return response, await response.read()
+            except aiohttp.ClientConnectionError as e:
+                if i == retries - 1:
+                    raise
+                else:
+                    log.warning(
+                        f"Error fetching {url} with attempt "
+                        f"{i + 1}/{retries}: {e}. Retrying..."
+                    )
+                    await asyncio.sleep(cooldown * backoff**i)
+        raise ValueError("retry count exceeded")
+
     async def _fetch(
         self, url: str, retries: int = 3, cooldown: int = 2, backoff: float = 1.5
     ) -> str:
-        async with aiohttp.ClientSession(trust_env=self.trust_env) as session:
-            for i in range(retries):
-                try:
-                    kwargs: Dict = dict(
-                        headers=self.session.headers,
-                        cookies=self.session.cookies.get_dict(),
-                    )
-                    if not self.session.verify:
-                        kwargs["ssl"] = False
-
-                    async with session.get(
-                        url,
-                        **(self.requests_kwargs | kwargs),
-                        allow_redirects=False,
-                    ) as response:
-                        if self.raise_for_status:
-                            response.raise_for_status()
-                        return await response.text()
-                except aiohttp.ClientConnectionError as e:
-                    if i == retries - 1:
-                        raise
-                    else:
-                        log.warning(
-                            f"Error fetching {url} with attempt "
-                            f"{i + 1}/{retries}: {e}. Retrying..."
-                        )
-                        await asyncio.sleep(cooldown * backoff**i)
-        raise ValueError("retry count exceeded")
+        response, body = await self._request(
+            url, retries=retries, cooldown=cooldown, backoff=backoff
+        )
+        return body.decode(response.get_encoding(), errors="replace")
+
+    def _parse(self, url: str, html: str) -> Document:
+        soup = self._unpack_fetch_results([html], [url])[0]
+        return Document(
+            page_content=soup.get_text(**self.bs_get_text_kwargs),
+            metadata=extract_metadata(soup, url),
+        )
+
+    async def _aload_url(self, url: str) -> Document:
+        entry = await WEB_PAGE_CACHE.get(url)
+        if entry and WEB_PAGE_CACHE.is_fresh(entry):
+            WEB_PAGE_CACHE.record("hit", entry)
+            return Document(page_content=entry["text"], metadata=entry["metadata"])
+
+        try:
+            async with WEB_DOMAIN_LIMITER.limit(url, self.requests_per_second):
+                response, body = await self._request(
+                    url, headers=WEB_PAGE_CACHE.get_conditional_headers(entry)
+                )
+        except Exception as e:
+            if not self.continue_on_failure:
+                raise
+            log.warning(f"Error fetching {url}, skipping: {e}")
+            return Document(page_content="", metadata={"source": url})
+
+        if entry and response.status == 304:
+            WEB_PAGE_CACHE.record("revalidated", entry)
+            await WEB_PAGE_CACHE.set(
+                url, {**entry, "fetched_at": datetime.now().timestamp()}
+            )
+            return Document(page_content=entry["text"], metadata=entry["metadata"])
+
+        WEB_PAGE_CACHE.record("miss")
+        html = body.decode(response.get_encoding(), errors="replace")
+        document = await asyncio.to_thread(self._parse, url, html)
+
+        if response.status == 200 and "no-store" not in response.headers.get(
+            "Cache-Control", ""
+        ):
+            await WEB_PAGE_CACHE.set(
+                url,
+                {
+                    "text": document.page_content,
+                    "metadata": document.metadata,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "content_length": len(body),
+                    "fetched_at": datetime.now().timestamp(),
+                },
+            )
+        return document
 
     def _unpack_fetch_results(
         self, results: Any, urls: List[str], parser: Union[str, None] = None
@@ -632,19 +707,11 @@ class SafeWebBaseLoader(WebBaseLoader):
 
     async def alazy_load(self) -> AsyncIterator[Document]:
         """Async lazy load text from the url(s) in web_path."""
-        results = await self.ascrape_all(self.web_paths)
-        for path, soup in zip(self.web_paths, results):
-            text = soup.get_text(**self.bs_get_text_kwargs)
-            metadata = {"source": path}
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text()
-            if description := soup.find("meta", attrs={"name": "description"}):
-                metadata["description"] = description.get(
-                    "content", "No description found."
-                )
-            if html := soup.find("html"):
-                metadata["language"] = html.get("lang", "No language found.")
-            yield Document(page_content=text, metadata=metadata)
+        documents = await asyncio.gather(
+            *(self._aload_url(path) for path in self.web_paths)
+        )
+        for document in documents:
+            yield document
 
     async def aload(self) -> list[Document]:
         """Load data into Document objects."""
@@ -3,14 +3,23 @@ import logging
 from typing import Optional
 
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+    BackgroundTasks,
+)
 from pydantic import BaseModel
 
 
 from open_webui.socket.main import (
+    CHANNEL_BROADCAST,
     emit_to_users,
     enter_room_for_users,
-    sio,
     get_user_ids_from_room,
 )
 from open_webui.models.users import (
@@ -59,6 +68,7 @@ from open_webui.utils.access_control import (
     has_permission,
 )
 from open_webui.utils.webhook import post_webhook
+from open_webui.utils.pagination import decode_cursor, encode_cursor
 from open_webui.utils.channels import extract_mentions, replace_mentions
 
 log = logging.getLogger(__name__)
@@ -89,33 +99,34 @@ async def get_channels(request: Request, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.UNAUTHORIZED,
         )
 
-    channels = Channels.get_channels_by_user_id(user.id)
-    channel_list = []
-    for channel in channels:
-        last_message = Messages.get_last_message_by_channel_id(channel.id)
-        last_message_at = last_message.created_at if last_message else None
+    channels = Channels.get_channel_list_by_user_id(user.id)
 
-        channel_member = Channels.get_member_by_channel_and_user_id(channel.id, user.id)
-        unread_count = (
-            Messages.get_unread_message_count(
-                channel.id, user.id, channel_member.last_read_at
-            )
-            if channel_member
-            else 0
+    # Members of all DM channels in one query, and their users in another
+    dm_user_ids = Channels.get_member_user_ids_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"]
+    )
+    dm_users = {
+        dm_user.id: dm_user
+        for dm_user in Users.get_users_by_user_ids(
+            list({uid for user_ids in dm_user_ids.values() for uid in user_ids})
         )
+    }
 
+    channel_list = []
+    for channel in channels:
         user_ids = None
         users = None
         if channel.type == "dm":
-            user_ids = [
-                member.user_id
-                for member in Channels.get_members_by_channel_id(channel.id)
-            ]
+            user_ids = dm_user_ids.get(channel.id, [])
             users = [
                 UserIdNameStatusResponse(
-                    **{**user.model_dump(), "is_active": Users.is_user_active(user.id)}
+                    **{
+                        **dm_users[uid].model_dump(),
+                        "is_active": Users.is_active(dm_users[uid]),
+                    }
                 )
-                for user in Users.get_users_by_user_ids(user_ids)
+                for uid in dict.fromkeys(user_ids)
+                if uid in dm_users
             ]
 
         channel_list.append(
@@ -123,8 +134,6 @@ async def get_channels(request: Request, user=Depends(get_verified_user)):
                 **channel.model_dump(),
                 user_ids=user_ids,
                 users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
             )
         )
 
@@ -173,6 +182,7 @@ async def get_dm_channel_by_user_id(
             )
 
             Channels.update_member_active_status(existing_channel.id, user.id, True)
+            await CHANNEL_BROADCAST.invalidate(existing_channel.id)
             return ChannelModel(**existing_channel.model_dump())
 
         channel = Channels.insert_new_channel(
@@ -253,6 +263,7 @@ async def create_new_channel(
                 )
 
                 Channels.update_member_active_status(existing_channel.id, user.id, True)
+                await CHANNEL_BROADCAST.invalidate(existing_channel.id)
                 return ChannelModel(**existing_channel.model_dump())
 
         channel = Channels.insert_new_channel(form_data, user.id)
@@ -486,6 +497,7 @@ async def update_is_active_member_by_id_and_user_id(
         )
 
     Channels.update_member_active_status(channel.id, user.id, form_data.is_active)
+    await CHANNEL_BROADCAST.invalidate(channel.id)
     return True
 
 
@@ -529,6 +541,7 @@ async def add_members_by_id(
         memberships = Channels.add_members_to_channel(
             channel.id, user.id, form_data.user_ids, form_data.group_ids
         )
+        await CHANNEL_BROADCAST.invalidate(channel.id)
 
         return memberships
     except Exception as e:
@@ -575,6 +588,7 @@ async def remove_members_by_id(
 
     try:
         deleted = Channels.remove_members_from_channel(channel.id, form_data.user_ids)
+        await CHANNEL_BROADCAST.invalidate(channel.id)
 
         return deleted
     except Exception as e:
@@ -652,6 +666,7 @@ async def delete_channel_by_id(
 
     try:
         Channels.delete_channel_by_id(id)
+        await CHANNEL_BROADCAST.invalidate(id)
         return True
     except Exception as e:
         log.exception(e)
@@ -671,8 +686,18 @@ class MessageUserResponse(MessageResponse):
 
 @router.get("/{id}/messages", response_model=list[MessageUserResponse])
 async def get_channel_messages(
-    id: str, skip: int = 0, limit: int = 50, user=Depends(get_verified_user)
+    id: str,
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = Query(None),
+    user=Depends(get_verified_user),
 ):
+    """
+    A page of top-level messages, newest first. Pass the `X-Next-Cursor`
+    header of the previous page as `cursor` to continue below it; `skip` is
+    kept for older clients.
+    """
     channel = Channels.get_channel_by_id(id)
     if not channel:
         raise HTTPException(
@@ -692,36 +717,17 @@ async def get_channel_messages(
                 status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
             )
 
-        channel_member = Channels.join_channel(
-            id, user.id
-        )  # Ensure user is a member of the channel
-
-    message_list = Messages.get_messages_by_channel_id(id, skip, limit)
-    users = {}
+        # Ensure user is a member of the channel
+        if not Channels.is_user_channel_member(id, user.id):
+            Channels.join_channel(id, user.id)
+            await CHANNEL_BROADCAST.invalidate(id)
 
-    messages = []
-    for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
-
-        messages.append(
-            MessageUserResponse(
-                **{
-                    **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
-                }
-            )
-        )
+    messages, next_cursor = Messages.get_message_page_by_channel_id(
+        id, skip, limit, decode_cursor(cursor)
+    )
 
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_cursor)
     return messages
 
 
@@ -759,26 +765,7 @@ async def get_pinned_channel_messages(
     skip = (page - 1) * PAGE_ITEM_COUNT_PINNED
     limit = PAGE_ITEM_COUNT_PINNED
 
-    message_list = Messages.get_pinned_messages_by_channel_id(id, skip, limit)
-    users = {}
-
-    messages = []
-    for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        messages.append(
-            MessageWithReactionsResponse(
-                **{
-                    **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
-                }
-            )
-        )
-
-    return messages
+    return Messages.get_pinned_messages_by_channel_id(id, skip, limit)
 
 
 ############################
@@ -787,28 +774,31 @@ async def get_pinned_channel_messages(
 
 
 async def send_notification(name, webui_url, channel, message, active_user_ids):
-    users = get_users_with_access("read", channel.access_control)
+    # Only members who are not looking at the channel right now
+    members = await CHANNEL_BROADCAST.get_members(channel.id)
+    user_ids = set(members["user_ids"]) - set(active_user_ids)
+    if not user_ids:
+        return True
+
+    users = get_users_with_access("read", channel.access_control, user_ids=user_ids)
 
     for user in users:
-        if (user.id not in active_user_ids) and Channels.is_user_channel_member(
-            channel.id, user.id
-        ):
-            if user.settings:
-                webhook_url = user.settings.ui.get("notifications", {}).get(
-                    "webhook_url", None
+        if user.settings:
+            webhook_url = user.settings.ui.get("notifications", {}).get(
+                "webhook_url", None
+            )
+            if webhook_url:
+                await post_webhook(
+                    name,
+                    webhook_url,
+                    f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
+                    {
+                        "action": "channel",
+                        "message": message.content,
+                        "title": channel.name,
+                        "url": f"{webui_url}/channels/{channel.id}",
+                    },
                 )
-                if webhook_url:
-                    await post_webhook(
-                        name,
-                        webhook_url,
-                        f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
-                        {
-                            "action": "channel",
-                            "message": message.content,
-                            "title": channel.name,
-                            "url": f"{webui_url}/channels/{channel.id}",
-                        },
-                    )
 
     return True
 
@@ -1012,13 +1002,7 @@ async def new_message_handler(
     try:
         message = Messages.insert_new_message(form_data, channel.id, user.id)
         if message:
-            if channel.type in ["group", "dm"]:
-                members = Channels.get_members_by_channel_id(channel.id)
-                for member in members:
-                    if not member.is_active:
-                        Channels.update_member_active_status(
-                            channel.id, member.user_id, True
-                        )
+            await CHANNEL_BROADCAST.on_new_message(channel, user.id)
 
             message = Messages.get_message_by_id(message.id)
             event_data = {
@@ -1032,10 +1016,10 @@ async def new_message_handler(
                 "channel": channel.model_dump(),
             }
 
-            await sio.emit(
+            await CHANNEL_BROADCAST.emit(
                 "events:channel",
                 event_data,
-                to=f"channel:{channel.id}",
+                channel.id,
             )
 
             if message.parent_id:
@@ -1043,7 +1027,7 @@ async def new_message_handler(
                 parent_message = Messages.get_message_by_id(message.parent_id)
 
                 if parent_message:
-                    await sio.emit(
+                    await CHANNEL_BROADCAST.emit(
                         "events:channel",
                         {
                             "channel_id": channel.id,
@@ -1055,7 +1039,7 @@ async def new_message_handler(
                             "user": UserNameResponse(**user.model_dump()).model_dump(),
                             "channel": channel.model_dump(),
                         },
-                        to=f"channel:{channel.id}",
+                        channel.id,
                     )
             return message, channel
         else:
@@ -1078,7 +1062,7 @@ async def post_new_message(
 
     try:
         message, channel = await new_message_handler(request, id, form_data, user)
-        active_user_ids = get_user_ids_from_room(f"channel:{channel.id}")
+        active_user_ids = await get_user_ids_from_room(f"channel:{channel.id}")
 
         async def background_handler():
             await model_response_handler(request, channel, message, user)
@@ -1226,8 +1210,10 @@ async def pin_channel_message(
 async def get_channel_thread_messages(
     id: str,
     message_id: str,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = Query(None),
     user=Depends(get_verified_user),
 ):
     channel = Channels.get_channel_by_id(id)
@@ -1249,27 +1235,12 @@ async def get_channel_thread_messages(
                 status_code=status.HTTP_403_FORBIDDEN, detail=ERROR_MESSAGES.DEFAULT()
             )
 
-    message_list = Messages.get_messages_by_parent_id(id, message_id, skip, limit)
-    users = {}
-
-    messages = []
-    for message in message_list:
-        if message.user_id not in users:
-            user = Users.get_user_by_id(message.user_id)
-            users[message.user_id] = user
-
-        messages.append(
-            MessageUserResponse(
-                **{
-                    **message.model_dump(),
-                    "reply_count": 0,
-                    "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(message.id),
-                    "user": UserNameResponse(**users[message.user_id].model_dump()),
-                }
-            )
-        )
+    messages, next_cursor = Messages.get_message_page_by_parent_id(
+        id, message_id, skip, limit, decode_cursor(cursor)
+    )
 
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_cursor)
     return messages
 
 
@@ -1323,7 +1294,7 @@ async def update_message_by_id(
         message = Messages.get_message_by_id(message_id)
 
         if message:
-            await sio.emit(
+            await CHANNEL_BROADCAST.emit(
                 "events:channel",
                 {
                     "channel_id": channel.id,
@@ -1335,7 +1306,7 @@ async def update_message_by_id(
                     "user": UserNameResponse(**user.model_dump()).model_dump(),
                     "channel": channel.model_dump(),
                 },
-                to=f"channel:{channel.id}",
+                channel.id,
             )
 
         return MessageModel(**message.model_dump())
@@ -1393,7 +1364,7 @@ async def add_reaction_to_message(
         Messages.add_reaction_to_message(message_id, user.id, form_data.name)
         message = Messages.get_message_by_id(message_id)
 
-        await sio.emit(
+        await CHANNEL_BROADCAST.emit(
             "events:channel",
             {
                 "channel_id": channel.id,
@@ -1408,7 +1379,7 @@ async def add_reaction_to_message(
                 "user": UserNameResponse(**user.model_dump()).model_dump(),
                 "channel": channel.model_dump(),
             },
-            to=f"channel:{channel.id}",
+            channel.id,
         )
 
         return True
@@ -1465,7 +1436,7 @@ async def remove_reaction_by_id_and_user_id_and_name(
 
         message = Messages.get_message_by_id(message_id)
 
-        await sio.emit(
+        await CHANNEL_BROADCAST.emit(
             "events:channel",
             {
                 "channel_id": channel.id,
@@ -1480,7 +1451,7 @@ async def remove_reaction_by_id_and_user_id_and_name(
                 "user": UserNameResponse(**user.model_dump()).model_dump(),
                 "channel": channel.model_dump(),
             },
-            to=f"channel:{channel.id}",
+            channel.id,
         )
 
         return True
@@ -1539,7 +1510,7 @@ async def delete_message_by_id(
 
     try:
         Messages.delete_message_by_id(message_id)
-        await sio.emit(
+        await CHANNEL_BROADCAST.emit(
             "events:channel",
             {
                 "channel_id": channel.id,
@@ -1554,7 +1525,7 @@ async def delete_message_by_id(
                 "user": UserNameResponse(**user.model_dump()).model_dump(),
                 "channel": channel.model_dump(),
             },
-            to=f"channel:{channel.id}",
+            channel.id,
         )
 
         if message.parent_id:
@@ -1562,7 +1533,7 @@ async def delete_message_by_id(
             parent_message = Messages.get_message_by_id(message.parent_id)
 
             if parent_message:
-                await sio.emit(
+                await CHANNEL_BROADCAST.emit(
                     "events:channel",
                     {
                         "channel_id": channel.id,
@@ -1574,7 +1545,7 @@ async def delete_message_by_id(
                         "user": UserNameResponse(**user.model_dump()).model_dump(),
                         "channel": channel.model_dump(),
                     },
-                    to=f"channel:{channel.id}",
+                    channel.id,
                 )
 
         return True
@@ -2,6 +2,7 @@ import logging
 import os
 import uuid
 import json
+import time
 from fnmatch import fnmatch
 from pathlib import Path
 from typing import Optional
@@ -16,10 +17,12 @@ from fastapi import (
     Form,
     HTTPException,
     Request,
+    Response,
     UploadFile,
     status,
     Query,
 )
+from fastapi.concurrency import run_in_threadpool
 
 from fastapi.responses import FileResponse, StreamingResponse
 
@@ -47,6 +50,13 @@ from open_webui.storage.provider import Storage
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.admission import ADMISSION_CONTROLLER, AdmissionRejected, FILES
+from open_webui.utils.pagination import decode_cursor, encode_cursor
+from open_webui.utils.file_status import (
+    FILE_STATUS_BROKER,
+    FILE_STATUS_TERMINAL,
+    update_file_status,
+)
 
 from pydantic import BaseModel
 
@@ -99,6 +109,33 @@ def has_access_to_file(
 ############################
 
 
+async def process_uploaded_file_in_background(
+    request, file, file_path, file_item, file_metadata, user
+):
+    # Queue on the event loop, so uploads waiting for a slot don't hold
+    # threadpool workers
+    try:
+        await ADMISSION_CONTROLLER.acquire(FILES)
+    except AdmissionRejected as e:
+        log.warning(f"Not processing file {file_item.id}: {e}")
+        update_file_status(file_item.id, "failed", "The server is busy")
+        return
+    admitted_at = time.monotonic()
+
+    try:
+        await run_in_threadpool(
+            process_uploaded_file,
+            request,
+            file,
+            file_path,
+            file_item,
+            file_metadata,
+            user,
+        )
+    finally:
+        ADMISSION_CONTROLLER.release(FILES, time.monotonic() - admitted_at)
+
+
 def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
     try:
         if file.content_type:
@@ -140,12 +177,10 @@ def process_uploaded_file(request, file, file_path, file_item, file_metadata, us
             process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
     except Exception as e:
         log.error(f"Error processing file: {file_item.id}")
-        Files.update_file_data_by_id(
+        update_file_status(
             file_item.id,
-            {
-                "status": "failed",
-                "error": str(e.detail) if hasattr(e, "detail") else str(e),
-            },
+            "failed",
+            str(e.detail) if hasattr(e, "detail") else str(e),
         )
 
 
@@ -191,6 +226,19 @@ def upload_file_handler(
             )
     file_metadata = metadata if metadata else {}
 
+    release_files = None
+    if process:
+        # Refuse before storing the file when processing is backed up
+        try:
+            if background_tasks and process_in_background:
+                ADMISSION_CONTROLLER.check(FILES)
+            else:
+                # Processed on this thread, which must not wait for a slot
+                ADMISSION_CONTROLLER.try_acquire(FILES)
+                release_files = ADMISSION_CONTROLLER.lease(FILES, time.monotonic())
+        except AdmissionRejected as e:
+            raise e.http_exception()
+
     try:
         unsanitized_filename = file.filename
         filename = os.path.basename(unsanitized_filename)
@@ -250,7 +298,7 @@ def upload_file_handler(
         if process:
             if background_tasks and process_in_background:
                 background_tasks.add_task(
-                    process_uploaded_file,
+                    process_uploaded_file_in_background,
                     request,
                     file,
                     file_path,
@@ -284,6 +332,9 @@ def upload_file_handler(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=ERROR_MESSAGES.DEFAULT("Error uploading file"),
         )
+    finally:
+        if release_files:
+            release_files()
 
 
 ############################
@@ -291,19 +342,68 @@ def upload_file_handler(
 ############################
 
 
+def get_file_page(
+    response: Response,
+    user,
+    filename: Optional[str],
+    content: bool,
+    cursor: Optional[str],
+    limit: Optional[int],
+) -> list[FileModel]:
+    files, next_cursor = Files.get_file_list(
+        user_id=None if user.role == "admin" else user.id,
+        filename=filename,
+        cursor=decode_cursor(cursor),
+        limit=limit,
+        content=content,
+    )
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_cursor)
+    return files
+
+
 @router.get("/", response_model=list[FileModelResponse])
-async def list_files(user=Depends(get_verified_user), content: bool = Query(True)):
-    if user.role == "admin":
-        files = Files.get_files()
-    else:
-        files = Files.get_files_by_user_id(user.id)
+async def list_files(
+    response: Response,
+    user=Depends(get_verified_user),
+    content: bool = Query(True),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+):
+    """
+    List files, newest first. With `limit` set the listing is paginated and
+    the cursor of the next page is returned in the `X-Next-Cursor` header.
+    """
+    return await run_in_threadpool(
+        get_file_page, response, user, None, content, cursor, limit
+    )
 
-    if not content:
-        for file in files:
-            if "content" in file.data:
-                del file.data["content"]
 
-    return files
+@router.get("/export")
+async def export_files(
+    user=Depends(get_verified_user),
+    content: bool = Query(False),
+):
+    """
+    Stream every accessible file as a JSON array without materializing the
+    whole listing in memory.
+    """
+
+    def generator():
+        yield "["
+        for idx, file in enumerate(
+            Files.iter_files(
+                user_id=None if user.role == "admin" else user.id,
+                content=content,
+            )
+        ):
+            yield ("," if idx else "") + FileModelResponse.model_validate(
+                file.model_dump()
+            ).model_dump_json()
+        yield "]"
+
+    return StreamingResponse(generator(), media_type="application/json")
 
 
 ############################
@@ -313,38 +413,29 @@ async def list_files(user=Depends(get_verified_user), content: bool = Query(True
 
 @router.get("/search", response_model=list[FileModelResponse])
 async def search_files(
+    response: Response,
     filename: str = Query(
         ...,
         description="Filename pattern to search for. Supports wildcards such as '*.txt'",
     ),
     content: bool = Query(True),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
     user=Depends(get_verified_user),
 ):
     """
     Search for files by filename with support for wildcard patterns.
     """
-    # Get files according to user role
-    if user.role == "admin":
-        files = Files.get_files()
-    else:
-        files = Files.get_files_by_user_id(user.id)
-
-    # Get matching files
-    matching_files = [
-        file for file in files if fnmatch(file.filename.lower(), filename.lower())
-    ]
+    matching_files = await run_in_threadpool(
+        get_file_page, response, user, filename, content, cursor, limit
+    )
 
-    if not matching_files:
+    if not matching_files and not cursor and "X-Next-Cursor" not in response.headers:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No files found matching the pattern.",
         )
 
-    if not content:
-        for file in matching_files:
-            if "content" in file.data:
-                del file.data["content"]
-
     return matching_files
 
 
@@ -403,6 +494,117 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
         )
 
 
+MAX_FILE_PROCESSING_DURATION = 3600 * 2
+
+
+def get_file_status_event(file: FileModel) -> Optional[dict]:
+    data = file.data or {}
+    file_status = data.get("status")
+    if not file_status:
+        # Legacy
+        return None
+
+    event = {"file_id": file.id, "status": file_status}
+    if file_status == "failed":
+        event["error"] = data.get("error")
+    if data.get("progress"):
+        event["progress"] = data["progress"]
+    return event
+
+
+def file_status_event_stream(files: list[FileModel], include_file_id: bool = True):
+    """
+    Stream status events for the given files until every one of them reaches a
+    terminal state. Transitions are pushed by `update_file_status`, so the
+    database is read exactly once per file, when the stream starts.
+    """
+    file_ids = [file.id for file in files]
+    # Subscribe before reading the current state so no transition is missed.
+    queue = FILE_STATUS_BROKER.subscribe(file_ids)
+
+    def format_event(event: dict) -> str:
+        if not include_file_id:
+            event = {k: v for k, v in event.items() if k != "file_id"}
+        return f"data: {json.dumps(event)}\n\n"
+
+    async def event_stream():
+        try:
+            pending = set(file_ids)
+            for file in files:
+                event = get_file_status_event(file)
+                if event is None or event["status"] in FILE_STATUS_TERMINAL:
+                    pending.discard(file.id)
+                if event is not None:
+                    yield format_event(event)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + MAX_FILE_PROCESSING_DURATION
+            while pending:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                if event.get("file_id") not in pending:
+                    continue
+
+                yield format_event(event)
+                if event.get("status") in FILE_STATUS_TERMINAL:
+                    pending.discard(event["file_id"])
+        finally:
+            FILE_STATUS_BROKER.unsubscribe(queue, file_ids)
+
+    return event_stream()
+
+
+@router.get("/process/status")
+async def get_files_process_status(
+    file_ids: list[str] = Query(..., alias="ids"),
+    stream: bool = Query(False),
+    user=Depends(get_verified_user),
+):
+    """
+    Status for several files at once. With `stream=true` a single event stream
+    carries the transitions of every requested file, tagged by `file_id`.
+    """
+    file_ids = list(dict.fromkeys(file_ids))
+    files = [
+        file
+        for file in Files.get_files_by_ids(file_ids)
+        if file.user_id == user.id
+        or user.role == "admin"
+        or has_access_to_file(file.id, "read", user)
+    ]
+
+    if not files:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ERROR_MESSAGES.NOT_FOUND,
+        )
+
+    if stream:
+        return StreamingResponse(
+            file_status_event_stream(files),
+            media_type="text/event-stream",
+        )
+    else:
+        return {
+            file.id: {
+                "status": (file.data or {}).get("status", "pending"),
+                **(
+                    {"progress": file.data["progress"]}
+                    if (file.data or {}).get("progress")
+                    else {}
+                ),
+            }
+            for file in files
+        }
+
+
 @router.get("/{id}/process/status")
 async def get_file_process_status(
     id: str, stream: bool = Query(False), user=Depends(get_verified_user)
@@ -421,38 +623,19 @@ async def get_file_process_status(
         or has_access_to_file(id, "read", user)
     ):
         if stream:
-            MAX_FILE_PROCESSING_DURATION = 3600 * 2
-
-            async def event_stream(file_item):
-                if file_item:
-                    for _ in range(MAX_FILE_PROCESSING_DURATION):
-                        file_item = Files.get_file_by_id(file_item.id)
-                        if file_item:
-                            data = file_item.model_dump().get("data", {})
-                            status = data.get("status")
-
-                            if status:
-                                event = {"status": status}
-                                if status == "failed":
-                                    event["error"] = data.get("error")
-
-                                yield f"data: {json.dumps(event)}\n\n"
-                                if status in ("completed", "failed"):
-                                    break
-                            else:
-                                # Legacy
-                                break
-
-                        await asyncio.sleep(0.5)
-                else:
-                    yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
-
             return StreamingResponse(
-                event_stream(file),
+                file_status_event_stream([file], include_file_id=False),
                 media_type="text/event-stream",
             )
         else:
-            return {"status": file.data.get("status", "pending")}
+            return {
+                "status": file.data.get("status", "pending"),
+                **(
+                    {"progress": file.data["progress"]}
+                    if file.data.get("progress")
+                    else {}
+                ),
+            }
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
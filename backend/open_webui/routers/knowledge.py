@@ -372,12 +372,7 @@ def update_file_from_knowledge_by_id(
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    # Remove content from the vector database
-    VECTOR_DB_CLIENT.delete(
-        collection_name=knowledge.id, filter={"file_id": form_data.file_id}
-    )
-
-    # Add content to the vector database
+    # Re-embeds only the chunks that changed since the file was added
     try:
         process_file(
             request,
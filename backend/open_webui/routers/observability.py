@@ -250,6 +250,194 @@ async def reset_circuit_breaker(
     return {"message": f"Circuit breaker reset for {provider}"}
 
 
+@router.get("/http-client-pools")
+async def get_http_client_pool_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Connection reuse and saturation of the pooled upstream HTTP sessions.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.utils.session_pool import HTTP_SESSION_POOL
+
+    return HTTP_SESSION_POOL.get_stats()
+
+
+@router.get("/model-connections")
+async def get_model_connection_states(
+    user=Depends(get_verified_user)
+):
+    """
+    Health and last refresh of every connection used for model discovery.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.routers.ollama import OLLAMA_MODELS_CACHE
+    from open_webui.routers.openai import OPENAI_MODELS_CACHE
+
+    return {
+        "openai": OPENAI_MODELS_CACHE.get_connections(),
+        "ollama": OLLAMA_MODELS_CACHE.get_connections(),
+    }
+
+
+@router.get("/mcp-sessions")
+async def get_mcp_session_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Pooled MCP sessions, tool listing cache hits and latency per server.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.utils.mcp.pool import MCP_SESSION_POOL
+
+    return MCP_SESSION_POOL.get_stats()
+
+
+@router.get("/web-search")
+async def get_web_search_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Request counts, circuit breaker state and result cache usage per web
+    search engine.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.retrieval.web.client import get_stats
+
+    return get_stats()
+
+
+@router.get("/web-page-cache")
+async def get_web_page_cache_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Hits, revalidations, bytes saved and size of the fetched web page cache.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.retrieval.web.page_cache import WEB_PAGE_CACHE
+
+    return WEB_PAGE_CACHE.get_stats()
+
+
+@router.get("/document-extraction")
+async def get_document_extraction_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Jobs, failures, restarts and timings of the document extraction pool.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.retrieval.loaders.extraction_pool import EXTRACTION_POOL
+
+    return EXTRACTION_POOL.get_stats()
+
+
+@router.get("/socket-state")
+async def get_socket_state_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Near-cache hits and invalidations of the shared socket session state.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.socket.main import SESSION_POOL
+
+    return SESSION_POOL.get_stats()
+
+
+@router.get("/models-cache")
+async def get_models_cache_stats(user=Depends(get_verified_user)):
+    """
+    Reads, version checks and reloads of the worker's copy of the model
+    catalog.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.socket.main import MODELS
+
+    if not hasattr(MODELS, "get_stats"):
+        return {"shared": False}
+    return {"shared": True, **MODELS.get_stats()}
+
+
+@router.get("/channel-broadcast")
+async def get_channel_broadcast_stats(user=Depends(get_verified_user)):
+    """
+    Per-message fan-out of channel events: members reached, emits, database
+    writes and member cache usage.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.socket.main import CHANNEL_BROADCAST
+
+    return CHANNEL_BROADCAST.get_stats()
+
+
+@router.get("/admission")
+async def get_admission_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Budgets, active work, queue depth, queue wait and rejections per
+    admission class on this worker.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.utils.admission import ADMISSION_CONTROLLER
+
+    return ADMISSION_CONTROLLER.get_stats()
+
+
+@router.get("/combined-tasks")
+async def get_combined_tasks_stats(
+    user=Depends(get_verified_user)
+):
+    """
+    Calls, answered tasks, upstream requests and prompt tokens saved by
+    combined title/tags/follow-up generation on this worker.
+    Admin only.
+    """
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    from open_webui.routers.tasks import COMBINED_TASKS_STATS
+
+    stats = dict(COMBINED_TASKS_STATS)
+    stats["answer_rate"] = (
+        stats["tasks_answered"] / stats["tasks_requested"]
+        if stats["tasks_requested"] else 0.0
+    )
+    return stats
+
+
 @router.get("/rag/logs/{request_id}")
 async def get_rag_log(
     request_id: str,
@@ -14,7 +14,6 @@ from datetime import datetime
 from typing import Optional, Union
 from urllib.parse import urlparse
 import aiohttp
-from aiocache import cached
 import requests
 
 from open_webui.utils.headers import include_user_info_headers
@@ -41,6 +40,7 @@ from starlette.background import BackgroundTask
 
 
 from open_webui.models.models import Models
+from open_webui.models.groups import Groups
 from open_webui.utils.misc import (
     calculate_sha256,
 )
@@ -51,6 +51,8 @@ from open_webui.utils.payload import (
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
+from open_webui.utils.session_pool import get_pooled_session, release_response
+from open_webui.utils.model_discovery import ModelDiscoveryCache, get_models_cache_key
 
 
 from open_webui.config import (
@@ -61,7 +63,6 @@ from open_webui.env import (
     SRC_LOG_LEVELS,
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     BYPASS_MODEL_ACCESS_CONTROL,
 )
@@ -71,6 +72,9 @@ log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 
 
+OLLAMA_MODELS_CACHE = ModelDiscoveryCache("Ollama", ttl=MODELS_CACHE_TTL)
+
+
 ##########################################
 #
 # Utility functions
@@ -81,37 +85,28 @@ log.setLevel(SRC_LOG_LEVELS["OLLAMA"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                "Content-Type": "application/json",
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        session = get_pooled_session("ollama", url)
+        headers = {
+            "Content-Type": "application/json",
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with session.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
-    if response:
-        response.close()
-    if session:
-        await session.close()
-
-
 async def send_post_request(
     url: str,
     payload: Union[str, bytes],
@@ -123,10 +118,9 @@ async def send_post_request(
 ):
 
     r = None
+    streaming = False
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = get_pooled_session("ollama", url)
 
         headers = {
             "Content-Type": "application/json",
@@ -148,7 +142,7 @@ async def send_post_request(
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await release_response(r)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -167,13 +161,12 @@ async def send_post_request(
             if content_type:
                 response_headers["Content-Type"] = content_type
 
+            streaming = True
             return StreamingResponse(
                 r.content,
                 status_code=r.status,
                 headers=response_headers,
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(release_response, response=r),
             )
         else:
             res = await r.json()
@@ -189,8 +182,8 @@ async def send_post_request(
             detail=detail if e else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not stream:
-            await cleanup_response(r, session)
+        if not streaming:
+            await release_response(r)
 
 
 def get_api_key(idx, url, configs):
@@ -298,6 +291,8 @@ async def update_config(
         if key in keys
     }
 
+    OLLAMA_MODELS_CACHE.invalidate()
+
     return {
         "ENABLE_OLLAMA_API": request.app.state.config.ENABLE_OLLAMA_API,
         "OLLAMA_BASE_URLS": request.app.state.config.OLLAMA_BASE_URLS,
@@ -322,11 +317,18 @@ def merge_ollama_models_lists(model_lists):
     return list(merged_models.values())
 
 
-@cached(
-    ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"ollama_all_models_{user.id}" if user else "ollama_all_models",
-)
 async def get_all_models(request: Request, user: UserModel = None):
+    """
+    Merged model list of every Ollama connection, served stale-while-revalidate
+    from a cache shared by all users.
+    """
+    return await OLLAMA_MODELS_CACHE.get(
+        get_models_cache_key("ollama_all_models", user),
+        lambda: fetch_all_models(request, user),
+    )
+
+
+async def fetch_all_models(request: Request, user: UserModel = None):
     log.info("get_all_models()")
     if request.app.state.config.ENABLE_OLLAMA_API:
         request_tasks = []
@@ -334,7 +336,11 @@ async def get_all_models(request: Request, user: UserModel = None):
             if (str(idx) not in request.app.state.config.OLLAMA_API_CONFIGS) and (
                 url not in request.app.state.config.OLLAMA_API_CONFIGS  # Legacy support
             ):
-                request_tasks.append(send_get_request(f"{url}/api/tags", user=user))
+                request_tasks.append(
+                    OLLAMA_MODELS_CACHE.fetch_connection(
+                        idx, url, send_get_request(f"{url}/api/tags", user=user)
+                    )
+                )
             else:
                 api_config = request.app.state.config.OLLAMA_API_CONFIGS.get(
                     str(idx),
@@ -348,7 +354,11 @@ async def get_all_models(request: Request, user: UserModel = None):
 
                 if enable:
                     request_tasks.append(
-                        send_get_request(f"{url}/api/tags", key, user=user)
+                        OLLAMA_MODELS_CACHE.fetch_connection(
+                            idx,
+                            url,
+                            send_get_request(f"{url}/api/tags", key, user=user),
+                        )
                     )
                 else:
                     request_tasks.append(asyncio.ensure_future(asyncio.sleep(0, None)))
@@ -426,11 +436,17 @@ async def get_all_models(request: Request, user: UserModel = None):
 async def get_filtered_models(models, user):
     # Filter models based on user access control
     filtered_models = []
+    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    model_access_records = Models.get_model_access_records()
     for model in models.get("models", []):
-        model_info = Models.get_model_by_id(model["model"])
-        if model_info:
-            if user.id == model_info.user_id or has_access(
-                user.id, type="read", access_control=model_info.access_control
+        model_access = model_access_records.get(model["model"])
+        if model_access:
+            owner_id, access_control = model_access
+            if user.id == owner_id or has_access(
+                user.id,
+                type="read",
+                access_control=access_control,
+                user_group_ids=user_group_ids,
             ):
                 filtered_models.append(model)
     return filtered_models
@@ -5,7 +5,6 @@ import logging
 from typing import Optional
 
 import aiohttp
-from aiocache import cached
 import requests
 
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
@@ -21,13 +20,13 @@ from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
 from open_webui.models.models import Models
+from open_webui.models.groups import Groups
 from open_webui.config import (
     CACHE_DIR,
 )
 from open_webui.env import (
     MODELS_CACHE_TTL,
     AIOHTTP_CLIENT_SESSION_SSL,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST,
     ENABLE_FORWARD_USER_INFO_HEADERS,
     BYPASS_MODEL_ACCESS_CONTROL,
@@ -50,12 +49,17 @@ from open_webui.utils.misc import (
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.session_pool import get_pooled_session, release_response
+from open_webui.utils.model_discovery import ModelDiscoveryCache, get_models_cache_key
 
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 
 
+OPENAI_MODELS_CACHE = ModelDiscoveryCache("OpenAI", ttl=MODELS_CACHE_TTL)
+
+
 ##########################################
 #
 # Utility functions
@@ -66,36 +70,27 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        session = get_pooled_session("openai", url)
+        headers = {
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with session.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
-    if response:
-        response.close()
-    if session:
-        await session.close()
-
-
 def openai_reasoning_model_handler(payload):
     """
     Handle reasoning model specific parameters
@@ -259,6 +254,8 @@ async def update_config(
         if key in keys
     }
 
+    OPENAI_MODELS_CACHE.invalidate()
+
     return {
         "ENABLE_OPENAI_API": request.app.state.config.ENABLE_OPENAI_API,
         "OPENAI_API_BASE_URLS": request.app.state.config.OPENAI_API_BASE_URLS,
@@ -365,10 +362,14 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             url not in request.app.state.config.OPENAI_API_CONFIGS  # Legacy support
         ):
             request_tasks.append(
-                send_get_request(
-                    f"{url}/models",
-                    request.app.state.config.OPENAI_API_KEYS[idx],
-                    user=user,
+                OPENAI_MODELS_CACHE.fetch_connection(
+                    idx,
+                    url,
+                    send_get_request(
+                        f"{url}/models",
+                        request.app.state.config.OPENAI_API_KEYS[idx],
+                        user=user,
+                    ),
                 )
             )
         else:
@@ -385,10 +386,14 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
             if enable:
                 if len(model_ids) == 0:
                     request_tasks.append(
-                        send_get_request(
-                            f"{url}/models",
-                            request.app.state.config.OPENAI_API_KEYS[idx],
-                            user=user,
+                        OPENAI_MODELS_CACHE.fetch_connection(
+                            idx,
+                            url,
+                            send_get_request(
+                                f"{url}/models",
+                                request.app.state.config.OPENAI_API_KEYS[idx],
+                                user=user,
+                            ),
                         )
                     )
                 else:
@@ -458,21 +463,34 @@ async def get_all_models_responses(request: Request, user: UserModel) -> list:
 async def get_filtered_models(models, user):
     # Filter models based on user access control
     filtered_models = []
+    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    model_access_records = Models.get_model_access_records()
     for model in models.get("data", []):
-        model_info = Models.get_model_by_id(model["id"])
-        if model_info:
-            if user.id == model_info.user_id or has_access(
-                user.id, type="read", access_control=model_info.access_control
+        model_access = model_access_records.get(model["id"])
+        if model_access:
+            owner_id, access_control = model_access
+            if user.id == owner_id or has_access(
+                user.id,
+                type="read",
+                access_control=access_control,
+                user_group_ids=user_group_ids,
             ):
                 filtered_models.append(model)
     return filtered_models
 
 
-@cached(
-    ttl=MODELS_CACHE_TTL,
-    key=lambda _, user: f"openai_all_models_{user.id}" if user else "openai_all_models",
-)
 async def get_all_models(request: Request, user: UserModel) -> dict[str, list]:
+    """
+    Merged model list of every OpenAI connection, served stale-while-revalidate
+    from a cache shared by all users.
+    """
+    return await OPENAI_MODELS_CACHE.get(
+        get_models_cache_key("openai_all_models", user),
+        lambda: fetch_all_models(request, user),
+    )
+
+
+async def fetch_all_models(request: Request, user: UserModel) -> dict[str, list]:
     log.info("get_all_models()")
 
     if not request.app.state.config.ENABLE_OPENAI_API:
@@ -927,9 +945,7 @@ async def generate_chat_completion(
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = get_pooled_session("openai", url)
 
         r = await session.request(
             method="POST",
@@ -947,9 +963,7 @@ async def generate_chat_completion(
                 stream_chunks_handler(r.content),
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(release_response, response=r),
             )
         else:
             try:
@@ -974,7 +988,7 @@ async def generate_chat_completion(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await release_response(r)
 
 
 @router.post("/chat/completions/smart")
@@ -1120,13 +1134,14 @@ async def embeddings(request: Request, form_data: dict, user):
         request, url, key, api_config, user=user
     )
     try:
-        session = aiohttp.ClientSession(trust_env=True)
+        session = get_pooled_session("openai", url)
         r = await session.request(
             method="POST",
             url=f"{url}/embeddings",
             data=body,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.client.DEFAULT_TIMEOUT,
         )
 
         if "text/event-stream" in r.headers.get("Content-Type", ""):
@@ -1135,9 +1150,7 @@ async def embeddings(request: Request, form_data: dict, user):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(release_response, response=r),
             )
         else:
             try:
@@ -1162,7 +1175,7 @@ async def embeddings(request: Request, form_data: dict, user):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await release_response(r)
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -1210,13 +1223,14 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         else:
             request_url = f"{url}/{path}"
 
-        session = aiohttp.ClientSession(trust_env=True)
+        session = get_pooled_session("openai", url)
         r = await session.request(
             method=request.method,
             url=request_url,
             data=body,
             headers=headers,
             cookies=cookies,
+            timeout=aiohttp.client.DEFAULT_TIMEOUT,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
         )
 
@@ -1227,9 +1241,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(release_response, response=r),
             )
         else:
             try:
@@ -1255,4 +1267,4 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await release_response(r)
@@ -6,10 +6,20 @@ import shutil
 import asyncio
 
 import re
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import (
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 
 from fastapi import (
     Depends,
@@ -48,28 +58,32 @@ from open_webui.retrieval.web.main import SearchResult
 from open_webui.retrieval.web.utils import get_web_loader
 from open_webui.retrieval.web.ollama import search_ollama_cloud
 from open_webui.retrieval.web.perplexity_search import search_perplexity_search
-from open_webui.retrieval.web.brave import search_brave
+from open_webui.retrieval.web.brave import search_brave, search_brave_async
 from open_webui.retrieval.web.kagi import search_kagi
 from open_webui.retrieval.web.mojeek import search_mojeek
 from open_webui.retrieval.web.bocha import search_bocha
 from open_webui.retrieval.web.duckduckgo import search_duckduckgo
-from open_webui.retrieval.web.google_pse import search_google_pse
+from open_webui.retrieval.web.google_pse import (
+    search_google_pse,
+    search_google_pse_async,
+)
 from open_webui.retrieval.web.jina_search import search_jina
-from open_webui.retrieval.web.searchapi import search_searchapi
-from open_webui.retrieval.web.serpapi import search_serpapi
-from open_webui.retrieval.web.searxng import search_searxng
+from open_webui.retrieval.web.searchapi import search_searchapi, search_searchapi_async
+from open_webui.retrieval.web.serpapi import search_serpapi, search_serpapi_async
+from open_webui.retrieval.web.searxng import search_searxng, search_searxng_async
 from open_webui.retrieval.web.yacy import search_yacy
-from open_webui.retrieval.web.serper import search_serper
-from open_webui.retrieval.web.serply import search_serply
-from open_webui.retrieval.web.serpstack import search_serpstack
-from open_webui.retrieval.web.tavily import search_tavily
-from open_webui.retrieval.web.bing import search_bing
+from open_webui.retrieval.web.serper import search_serper, search_serper_async
+from open_webui.retrieval.web.serply import search_serply, search_serply_async
+from open_webui.retrieval.web.serpstack import search_serpstack, search_serpstack_async
+from open_webui.retrieval.web.tavily import search_tavily, search_tavily_async
+from open_webui.retrieval.web.bing import search_bing, search_bing_async
 from open_webui.retrieval.web.azure import search_azure
 from open_webui.retrieval.web.exa import search_exa
 from open_webui.retrieval.web.perplexity import search_perplexity
 from open_webui.retrieval.web.sougou import search_sougou
 from open_webui.retrieval.web.firecrawl import search_firecrawl
 from open_webui.retrieval.web.external import search_external
+from open_webui.retrieval.web.client import get_search_client, search_with_cache
 
 from open_webui.retrieval.utils import (
     get_content_from_url,
@@ -82,10 +96,13 @@ from open_webui.retrieval.utils import (
     query_doc_with_hybrid_search,
 )
 from open_webui.retrieval.vector.utils import filter_metadata
+from open_webui.retrieval.ephemeral import TTLCache, rank_docs
 from open_webui.utils.misc import (
     calculate_sha256_string,
 )
+from open_webui.utils.admission import ADMISSION_CONTROLLER, AdmissionRejected, FILES
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.file_status import update_file_status
 
 from open_webui.config import (
     ENV,
@@ -106,6 +123,9 @@ from open_webui.env import (
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
+    WEB_SEARCH_RESULTS_CACHE_SIZE,
+    WEB_SEARCH_RESULTS_CACHE_TTL,
+    DOCUMENT_INDEXING_BATCH_SIZE,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -505,6 +525,7 @@ async def get_rag_config(request: Request, user=Depends(get_admin_user)):
             "WEB_SEARCH_DOMAIN_FILTER_LIST": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             "BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL": request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
             "BYPASS_WEB_SEARCH_WEB_LOADER": request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER,
+            "ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL": request.app.state.config.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL,
             "OLLAMA_CLOUD_WEB_SEARCH_API_KEY": request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             "SEARXNG_QUERY_URL": request.app.state.config.SEARXNG_QUERY_URL,
             "YACY_QUERY_URL": request.app.state.config.YACY_QUERY_URL,
@@ -563,6 +584,7 @@ class WebConfig(BaseModel):
     WEB_SEARCH_DOMAIN_FILTER_LIST: Optional[List[str]] = []
     BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL: Optional[bool] = None
     BYPASS_WEB_SEARCH_WEB_LOADER: Optional[bool] = None
+    ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL: Optional[bool] = None
     OLLAMA_CLOUD_WEB_SEARCH_API_KEY: Optional[str] = None
     SEARXNG_QUERY_URL: Optional[str] = None
     YACY_QUERY_URL: Optional[str] = None
@@ -1020,6 +1042,10 @@ async def update_rag_config(
         request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER = (
             form_data.web.BYPASS_WEB_SEARCH_WEB_LOADER
         )
+        if form_data.web.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL is not None:
+            request.app.state.config.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL = (
+                form_data.web.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL
+            )
         request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY = (
             form_data.web.OLLAMA_CLOUD_WEB_SEARCH_API_KEY
         )
@@ -1175,6 +1201,7 @@ async def update_rag_config(
             "WEB_SEARCH_DOMAIN_FILTER_LIST": request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
             "BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL": request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL,
             "BYPASS_WEB_SEARCH_WEB_LOADER": request.app.state.config.BYPASS_WEB_SEARCH_WEB_LOADER,
+            "ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL": request.app.state.config.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL,
             "OLLAMA_CLOUD_WEB_SEARCH_API_KEY": request.app.state.config.OLLAMA_CLOUD_WEB_SEARCH_API_KEY,
             "SEARXNG_QUERY_URL": request.app.state.config.SEARXNG_QUERY_URL,
             "YACY_QUERY_URL": request.app.state.config.YACY_QUERY_URL,
@@ -1230,6 +1257,78 @@ async def update_rag_config(
 ####################################
 
 
+def split_docs(request: Request, docs: list[Document]) -> list[Document]:
+    """Split documents into chunks using the configured text splitter."""
+    if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "token":
+        log.info(
+            f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
+        )
+
+        tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
+        text_splitter = TokenTextSplitter(
+            encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
+            chunk_size=request.app.state.config.CHUNK_SIZE,
+            chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+            add_start_index=True,
+        )
+        docs = text_splitter.split_documents(docs)
+    elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
+        log.info("Using markdown header text splitter")
+
+        # Define headers to split on - covering most common markdown header levels
+        headers_to_split_on = [
+            ("#", "Header 1"),
+            ("##", "Header 2"),
+            ("###", "Header 3"),
+            ("####", "Header 4"),
+            ("#####", "Header 5"),
+            ("######", "Header 6"),
+        ]
+
+        markdown_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=headers_to_split_on,
+            strip_headers=False,  # Keep headers in content for context
+        )
+
+        md_split_docs = []
+        for doc in docs:
+            md_header_splits = markdown_splitter.split_text(doc.page_content)
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=request.app.state.config.CHUNK_SIZE,
+                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+                add_start_index=True,
+            )
+            md_header_splits = text_splitter.split_documents(md_header_splits)
+
+            # Convert back to Document objects, preserving original metadata
+            for split_chunk in md_header_splits:
+                headings_list = []
+                # Extract header values in order based on headers_to_split_on
+                for _, header_meta_key_name in headers_to_split_on:
+                    if header_meta_key_name in split_chunk.metadata:
+                        headings_list.append(split_chunk.metadata[header_meta_key_name])
+
+                md_split_docs.append(
+                    Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata, "headings": headings_list},
+                    )
+                )
+
+        docs = md_split_docs
+    else:
+        raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+    return docs
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1274,78 +1373,76 @@ def save_docs_to_vector_db(
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
     if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
+        docs = split_docs(request, docs)
 
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
+    if len(docs) == 0:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
 
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
+    try:
+        if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+            log.info(f"collection {collection_name} already exists")
 
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
+            if overwrite:
+                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                log.info(f"deleting existing collection {collection_name}")
+            elif add is False:
+                log.info(
+                    f"collection {collection_name} already exists, overwrite is False and add is False"
                 )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
+                return True
 
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+        log.info(f"generating embeddings for {collection_name}")
+        embedding_function = get_request_embedding_function(request)
+        insert_docs_to_vector_db(
+            request, docs, collection_name, embedding_function, metadata, user
+        )
+        return True
+    except Exception as e:
+        log.exception(e)
+        raise e
 
-    if len(docs) == 0:
-        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
 
+def get_request_embedding_function(request: Request):
+    return get_embedding_function(
+        request.app.state.config.RAG_EMBEDDING_ENGINE,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        request.app.state.ef,
+        (
+            request.app.state.config.RAG_OPENAI_API_BASE_URL
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_BASE_URL
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
+            )
+        ),
+        (
+            request.app.state.config.RAG_OPENAI_API_KEY
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
+            else (
+                request.app.state.config.RAG_OLLAMA_API_KEY
+                if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
+                else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
+            )
+        ),
+        request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        azure_api_version=(
+            request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
+            if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
+            else None
+        ),
+    )
+
+
+def insert_docs_to_vector_db(
+    request: Request,
+    docs: list[Document],
+    collection_name: str,
+    embedding_function,
+    metadata: Optional[dict] = None,
+    user=None,
+) -> int:
+    """Embed already split documents and insert them into the collection."""
     texts = [doc.page_content for doc in docs]
     metadatas = [
         {
@@ -1355,85 +1452,229 @@ def save_docs_to_vector_db(
                 "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
                 "model": request.app.state.config.RAG_EMBEDDING_MODEL,
             },
+            "chunk_hash": calculate_sha256_string(doc.page_content),
         }
         for doc in docs
     ]
 
-    try:
-        if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
-            log.info(f"collection {collection_name} already exists")
+    # Run async embedding in sync context
+    embeddings = asyncio.run(
+        embedding_function(
+            list(map(lambda x: x.replace("\n", " "), texts)),
+            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+            user=user,
+        )
+    )
+    log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
 
-            if overwrite:
-                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
-                log.info(f"deleting existing collection {collection_name}")
-            elif add is False:
-                log.info(
-                    f"collection {collection_name} already exists, overwrite is False and add is False"
-                )
-                return True
+    items = [
+        {
+            "id": str(uuid.uuid4()),
+            "text": text,
+            "vector": embeddings[idx],
+            "metadata": metadatas[idx],
+        }
+        for idx, text in enumerate(texts)
+    ]
 
-        log.info(f"generating embeddings for {collection_name}")
-        embedding_function = get_embedding_function(
-            request.app.state.config.RAG_EMBEDDING_ENGINE,
-            request.app.state.config.RAG_EMBEDDING_MODEL,
-            request.app.state.ef,
-            (
-                request.app.state.config.RAG_OPENAI_API_BASE_URL
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_BASE_URL
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_BASE_URL
-                )
-            ),
-            (
-                request.app.state.config.RAG_OPENAI_API_KEY
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "openai"
-                else (
-                    request.app.state.config.RAG_OLLAMA_API_KEY
-                    if request.app.state.config.RAG_EMBEDDING_ENGINE == "ollama"
-                    else request.app.state.config.RAG_AZURE_OPENAI_API_KEY
-                )
-            ),
-            request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
-            azure_api_version=(
-                request.app.state.config.RAG_AZURE_OPENAI_API_VERSION
-                if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
-                else None
-            ),
+    log.info(f"adding to collection {collection_name}")
+    VECTOR_DB_CLIENT.insert(
+        collection_name=collection_name,
+        items=items,
+    )
+
+    log.info(f"added {len(items)} items to collection {collection_name}")
+    return len(items)
+
+
+# Chunks of one file read back when syncing it; a file with more falls back
+# to being replaced, as some backends silently cap or truncate larger reads
+VECTOR_SYNC_QUERY_LIMIT = 10000
+
+
+def sync_docs_to_vector_db(
+    request: Request,
+    docs: list[Document],
+    collection_name: str,
+    file_id: str,
+    metadata: Optional[dict] = None,
+    split: bool = True,
+    user=None,
+) -> dict:
+    """
+    Bring the chunks of `file_id` in `collection_name` in line with `docs`,
+    matching them by content hash: new or edited chunks are embedded and
+    inserted, chunks that are gone are deleted, and unchanged chunks keep
+    their vectors, with `metadata` (e.g. the new file hash) merged into
+    theirs. Chunks embedded with another embedding engine or model than the
+    configured one are embedded again. When the existing chunks can't all be
+    read back, or the backend can't update metadata in place, the file's
+    chunks are replaced instead. Returns the number of chunks kept, added
+    and removed.
+    """
+    if split:
+        docs = split_docs(request, docs)
+
+    if len(docs) == 0:
+        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+    def replace_docs(existing_count: int) -> dict:
+        VECTOR_DB_CLIENT.delete(
+            collection_name=collection_name, filter={"file_id": file_id}
         )
+        insert_docs_to_vector_db(
+            request,
+            docs,
+            collection_name,
+            get_request_embedding_function(request),
+            metadata,
+            user,
+        )
+        log.info(
+            f"replaced file {file_id} in collection {collection_name}: "
+            f"{existing_count} removed, {len(docs)} added"
+        )
+        return {"kept": 0, "added": len(docs), "removed": existing_count}
+
+    existing = {}
+    existing_metadata = {}
+    outdated_ids = []
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=collection_name,
+        filter={"file_id": file_id},
+        limit=VECTOR_SYNC_QUERY_LIMIT,
+    )
+    if result is not None and result.ids:
+        if len(result.ids[0]) >= VECTOR_SYNC_QUERY_LIMIT:
+            return replace_docs(len(result.ids[0]))
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
-            )
+        for id, text, item_metadata in zip(
+            result.ids[0], result.documents[0], result.metadatas[0]
+        ):
+            existing_metadata[id] = item_metadata or {}
+            # Most backends store the config as a string (see process_metadata)
+            if existing_metadata[id].get("embedding_config", embedding_config) not in (
+                embedding_config,
+                str(embedding_config),
+            ):
+                outdated_ids.append(id)
+                continue
+            # Chunks indexed before chunk hashes were stored
+            chunk_hash = existing_metadata[id].get(
+                "chunk_hash"
+            ) or calculate_sha256_string(text)
+            existing.setdefault(chunk_hash, []).append(id)
+
+    new_docs = []
+    kept_ids = []
+    for doc in docs:
+        ids = existing.get(calculate_sha256_string(doc.page_content))
+        if ids:
+            kept_ids.append(ids.pop())
+        else:
+            new_docs.append(doc)
+    removed_ids = outdated_ids + [id for ids in existing.values() for id in ids]
+
+    # Kept chunks still carry the file-level metadata of the old version
+    stale_metadata = {
+        id: {**existing_metadata[id], **metadata}
+        for id in kept_ids
+        if metadata
+        and any(
+            existing_metadata[id].get(key) != value for key, value in metadata.items()
         )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
+    }
+    if stale_metadata and not VECTOR_DB_CLIENT.update_metadata(
+        collection_name=collection_name, metadatas=stale_metadata
+    ):
+        return replace_docs(len(existing_metadata))
+
+    # Insert before deleting so the file never disappears from search
+    if new_docs:
+        insert_docs_to_vector_db(
+            request,
+            new_docs,
+            collection_name,
+            get_request_embedding_function(request),
+            metadata,
+            user,
+        )
+    if removed_ids:
+        VECTOR_DB_CLIENT.delete(collection_name=collection_name, ids=removed_ids)
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+    log.info(
+        f"synced file {file_id} in collection {collection_name}: "
+        f"{len(kept_ids)} kept, {len(new_docs)} added, {len(removed_ids)} removed"
+    )
+    return {"kept": len(kept_ids), "added": len(new_docs), "removed": len(removed_ids)}
 
-        log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
+
+def save_doc_stream_to_vector_db(
+    request: Request,
+    docs: Iterable[Document],
+    collection_name: str,
+    metadata: Optional[dict] = None,
+    user=None,
+    batch_size: int = DOCUMENT_INDEXING_BATCH_SIZE,
+    on_progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Split, embed and insert documents while they are still being produced
+    (e.g. PDF pages from `Loader.lazy_load`). Chunks are written in batches of
+    `batch_size`, so the first ones are searchable long before a large file
+    is fully read, and only one batch of chunks and vectors is held at once.
+    Any existing collection is replaced; a partially written one is removed
+    on failure. Returns the indexing progress, which is also passed to
+    `on_progress` after every batch.
+    """
+    start = time.perf_counter()
+    progress = {"pages": 0, "chunks": 0, "first_chunk_ms": None}
+
+    if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        log.info(f"deleting existing collection {collection_name}")
+        VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+
+    embedding_function = get_request_embedding_function(request)
+
+    def flush(batch: list[Document]):
+        progress["chunks"] += insert_docs_to_vector_db(
+            request, batch, collection_name, embedding_function, metadata, user
         )
+        if progress["first_chunk_ms"] is None:
+            progress["first_chunk_ms"] = round((time.perf_counter() - start) * 1000)
+            log.info(
+                f"first chunks of {collection_name} searchable after {progress['first_chunk_ms']}ms"
+            )
+        if on_progress:
+            on_progress(dict(progress))
 
-        log.info(f"added {len(items)} items to collection {collection_name}")
-        return True
-    except Exception as e:
-        log.exception(e)
-        raise e
+    try:
+        batch = []
+        for doc in docs:
+            progress["pages"] += 1
+            # Splitters work per document, so splitting page by page yields the
+            # same chunks as splitting the whole file at once.
+            batch.extend(split_docs(request, [doc]))
+            while len(batch) >= batch_size:
+                flush(batch[:batch_size])
+                batch = batch[batch_size:]
+
+        if batch:
+            flush(batch)
+
+        if progress["chunks"] == 0:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    except Exception:
+        if progress["chunks"]:
+            VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+        raise
+
+    progress["total_ms"] = round((time.perf_counter() - start) * 1000)
+    return progress
 
 
 class ProcessFileForm(BaseModel):
@@ -1442,7 +1683,98 @@ class ProcessFileForm(BaseModel):
     collection_name: Optional[str] = None
 
 
-@router.post("/process/file")
+def process_file_stream(
+    request: Request,
+    file: FileModel,
+    loader: Loader,
+    file_path: str,
+    collection_name: str,
+    user=None,
+) -> dict:
+    """
+    Extract and index an uploaded file page by page, reporting progress (and
+    the latency until the first chunks are searchable) in the file status.
+    The file content and hash are stored as soon as the last page is read,
+    before its chunks are indexed. Chunks inserted before then get the hash
+    added afterwards.
+    """
+    pages = []
+    metadata = {"file_id": file.id, "name": file.filename}
+
+    def get_docs() -> Iterator[Document]:
+        for doc in loader.lazy_load(
+            file.filename, file.meta.get("content_type"), file_path
+        ):
+            pages.append(doc.page_content)
+            yield Document(
+                page_content=doc.page_content,
+                metadata={
+                    **filter_metadata(doc.metadata),
+                    "name": file.filename,
+                    "created_by": file.user_id,
+                    "file_id": file.id,
+                    "source": file.filename,
+                },
+            )
+
+        text_content = " ".join(pages)
+        Files.update_file_data_by_id(file.id, {"content": text_content})
+        # Batches flushed from here on carry the hash
+        metadata["hash"] = calculate_sha256_string(text_content)
+        Files.update_file_hash_by_id(file.id, metadata["hash"])
+
+    progress = save_doc_stream_to_vector_db(
+        request,
+        get_docs(),
+        collection_name,
+        metadata=metadata,
+        user=user,
+        on_progress=lambda progress: update_file_status(
+            file.id, "pending", progress=progress
+        ),
+    )
+    log.info(f"added {progress['chunks']} items to collection {collection_name}")
+
+    result = VECTOR_DB_CLIENT.get(collection_name=collection_name)
+    if result is not None and result.ids:
+        unhashed = {
+            id: {**result.metadatas[0][idx], "hash": metadata["hash"]}
+            for idx, id in enumerate(result.ids[0])
+            if result.metadatas[0][idx].get("hash") != metadata["hash"]
+        }
+        if unhashed and not VECTOR_DB_CLIENT.update_metadata(
+            collection_name=collection_name, metadatas=unhashed
+        ):
+            # Insert before deleting so the file never disappears from search
+            insert_docs_to_vector_db(
+                request,
+                [
+                    Document(
+                        page_content=result.documents[0][idx],
+                        metadata=result.metadatas[0][idx],
+                    )
+                    for idx, id in enumerate(result.ids[0])
+                    if id in unhashed
+                ],
+                collection_name,
+                get_request_embedding_function(request),
+                metadata,
+                user,
+            )
+            VECTOR_DB_CLIENT.delete(collection_name=collection_name, ids=list(unhashed))
+
+    text_content = " ".join(pages)
+    Files.update_file_metadata_by_id(file.id, {"collection_name": collection_name})
+    update_file_status(file.id, "completed", progress=progress)
+
+    return {
+        "status": True,
+        "collection_name": collection_name,
+        "filename": file.filename,
+        "content": text_content,
+    }
+
+
 def process_file(
     request: Request,
     form_data: ProcessFileForm,
@@ -1464,18 +1796,15 @@ def process_file(
             if collection_name is None:
                 collection_name = f"file-{file.id}"
 
+            sync = False
+
             if form_data.content:
                 # Update the content in the file
                 # Usage: /files/{file_id}/data/content/update, /files/ (audio file upload pipeline)
 
-                try:
-                    # /files/{file_id}/data/content/update
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=f"file-{file.id}"
-                    )
-                except:
-                    # Audio file upload pipeline
-                    pass
+                # /files/{file_id}/data/content/update only re-embeds the
+                # chunks that changed; the audio pipeline has no collection yet
+                sync = VECTOR_DB_CLIENT.has_collection(collection_name=collection_name)
 
                 docs = [
                     Document(
@@ -1495,6 +1824,14 @@ def process_file(
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
+                # On update the file is already part of the collection
+                existing = VECTOR_DB_CLIENT.query(
+                    collection_name=collection_name,
+                    filter={"file_id": file.id},
+                    limit=1,
+                )
+                sync = existing is not None and len(existing.ids[0]) > 0
+
                 result = VECTOR_DB_CLIENT.query(
                     collection_name=f"file-{file.id}", filter={"file_id": file.id}
                 )
@@ -1559,6 +1896,12 @@ def process_file(
                         MINERU_API_KEY=request.app.state.config.MINERU_API_KEY,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
+
+                    if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
+                        return process_file_stream(
+                            request, file, loader, file_path, collection_name, user
+                        )
+
                     docs = loader.load(
                         file.filename, file.meta.get("content_type"), file_path
                     )
@@ -1600,7 +1943,7 @@ def process_file(
             Files.update_file_hash_by_id(file.id, hash)
 
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
-                Files.update_file_data_by_id(file.id, {"status": "completed"})
+                update_file_status(file.id, "completed")
                 return {
                     "status": True,
                     "collection_name": None,
@@ -1609,19 +1952,52 @@ def process_file(
                 }
             else:
                 try:
-                    result = save_docs_to_vector_db(
-                        request,
-                        docs=docs,
-                        collection_name=collection_name,
-                        metadata={
-                            "file_id": file.id,
-                            "name": file.filename,
-                            "hash": hash,
-                        },
-                        add=(True if form_data.collection_name else False),
-                        user=user,
-                    )
-                    log.info(f"added {len(docs)} items to collection {collection_name}")
+                    metadata = {
+                        "file_id": file.id,
+                        "name": file.filename,
+                        "hash": hash,
+                    }
+
+                    if sync:
+                        sync_docs_to_vector_db(
+                            request,
+                            docs,
+                            collection_name,
+                            file.id,
+                            metadata=metadata,
+                            user=user,
+                        )
+                        result = True
+                    else:
+                        result = save_docs_to_vector_db(
+                            request,
+                            docs=docs,
+                            collection_name=collection_name,
+                            metadata=metadata,
+                            add=(True if form_data.collection_name else False),
+                            user=user,
+                        )
+                        log.info(
+                            f"added {len(docs)} items to collection {collection_name}"
+                        )
+
+                    if form_data.content:
+                        # Apply the same chunk diff to the knowledge bases
+                        # holding the file, instead of re-embedding it there
+                        for knowledge in Knowledges.get_knowledges_by_file_id(file.id):
+                            try:
+                                sync_docs_to_vector_db(
+                                    request,
+                                    docs,
+                                    knowledge.id,
+                                    file.id,
+                                    metadata=metadata,
+                                    user=user,
+                                )
+                            except Exception as e:
+                                log.exception(
+                                    f"Error updating file {file.id} in knowledge {knowledge.id}: {e}"
+                                )
 
                     if result:
                         Files.update_file_metadata_by_id(
@@ -1631,10 +2007,7 @@ def process_file(
                             },
                         )
 
-                        Files.update_file_data_by_id(
-                            file.id,
-                            {"status": "completed"},
-                        )
+                        update_file_status(file.id, "completed")
 
                         return {
                             "status": True,
@@ -1649,9 +2022,10 @@ def process_file(
 
         except Exception as e:
             log.exception(e)
-            Files.update_file_data_by_id(
+            update_file_status(
                 file.id,
-                {"status": "failed"},
+                "failed",
+                str(e.detail) if hasattr(e, "detail") else str(e),
             )
 
             if "No pandoc was found" in str(e):
@@ -1671,6 +2045,22 @@ def process_file(
         )
 
 
+@router.post("/process/file")
+async def process_file_handler(
+    request: Request,
+    form_data: ProcessFileForm,
+    user=Depends(get_verified_user),
+):
+    """
+    Process a file within the worker's file processing budget, like uploads.
+    """
+    try:
+        async with ADMISSION_CONTROLLER.slot(FILES):
+            return await run_in_threadpool(process_file, request, form_data, user)
+    except AdmissionRejected as e:
+        raise e.http_exception()
+
+
 class ProcessTextForm(BaseModel):
     name: str
     content: str
@@ -2053,6 +2443,214 @@ def search_web(
         raise Exception("No search engine API key found in environment variables")
 
 
+def get_async_search(
+    request: Request, engine: str, query: str
+) -> Optional[Callable[[], Awaitable[list[SearchResult]]]]:
+    """
+    Return a coroutine function searching `engine` on the shared connection
+    pool, or None for engines that are only available as blocking clients
+    (or are not configured, so that `search_web` reports the error).
+    """
+    config = request.app.state.config
+    count = config.WEB_SEARCH_RESULT_COUNT
+    filter_list = config.WEB_SEARCH_DOMAIN_FILTER_LIST
+
+    if engine == "searxng" and config.SEARXNG_QUERY_URL:
+        return lambda: search_searxng_async(
+            config.SEARXNG_QUERY_URL, query, count, filter_list
+        )
+    elif (
+        engine == "google_pse"
+        and config.GOOGLE_PSE_API_KEY
+        and config.GOOGLE_PSE_ENGINE_ID
+    ):
+        return lambda: search_google_pse_async(
+            config.GOOGLE_PSE_API_KEY,
+            config.GOOGLE_PSE_ENGINE_ID,
+            query,
+            count,
+            filter_list,
+            referer=config.WEBUI_URL,
+        )
+    elif engine == "brave" and config.BRAVE_SEARCH_API_KEY:
+        return lambda: search_brave_async(
+            config.BRAVE_SEARCH_API_KEY, query, count, filter_list
+        )
+    elif engine == "serpstack" and config.SERPSTACK_API_KEY:
+        return lambda: search_serpstack_async(
+            config.SERPSTACK_API_KEY,
+            query,
+            count,
+            filter_list,
+            https_enabled=config.SERPSTACK_HTTPS,
+        )
+    elif engine == "serper" and config.SERPER_API_KEY:
+        return lambda: search_serper_async(
+            config.SERPER_API_KEY, query, count, filter_list
+        )
+    elif engine == "serply" and config.SERPLY_API_KEY:
+        return lambda: search_serply_async(
+            config.SERPLY_API_KEY, query, count, filter_list=filter_list
+        )
+    elif engine == "tavily" and config.TAVILY_API_KEY:
+        return lambda: search_tavily_async(
+            config.TAVILY_API_KEY, query, count, filter_list
+        )
+    elif engine == "searchapi" and config.SEARCHAPI_API_KEY:
+        return lambda: search_searchapi_async(
+            config.SEARCHAPI_API_KEY,
+            config.SEARCHAPI_ENGINE,
+            query,
+            count,
+            filter_list,
+        )
+    elif engine == "serpapi" and config.SERPAPI_API_KEY:
+        return lambda: search_serpapi_async(
+            config.SERPAPI_API_KEY, config.SERPAPI_ENGINE, query, count, filter_list
+        )
+    elif engine == "bing":
+        return lambda: search_bing_async(
+            config.BING_SEARCH_V7_SUBSCRIPTION_KEY,
+            config.BING_SEARCH_V7_ENDPOINT,
+            str(DEFAULT_LOCALE),
+            query,
+            count,
+            filter_list,
+        )
+    return None
+
+
+# Engines sent the user and chat of the search, whose results may differ per
+# request and so are never cached
+UNCACHED_SEARCH_ENGINES = {"external"}
+
+
+# Settings that change what an engine returns for the same query
+SEARCH_ENGINE_CONFIG_KEYS = {
+    "ollama_cloud": ["OLLAMA_CLOUD_WEB_SEARCH_API_KEY"],
+    "perplexity_search": ["PERPLEXITY_API_KEY", "PERPLEXITY_SEARCH_API_URL"],
+    "searxng": ["SEARXNG_QUERY_URL"],
+    "yacy": ["YACY_QUERY_URL", "YACY_USERNAME", "YACY_PASSWORD"],
+    "google_pse": ["GOOGLE_PSE_API_KEY", "GOOGLE_PSE_ENGINE_ID"],
+    "brave": ["BRAVE_SEARCH_API_KEY"],
+    "kagi": ["KAGI_SEARCH_API_KEY"],
+    "mojeek": ["MOJEEK_SEARCH_API_KEY"],
+    "bocha": ["BOCHA_SEARCH_API_KEY"],
+    "serpstack": ["SERPSTACK_API_KEY", "SERPSTACK_HTTPS"],
+    "serper": ["SERPER_API_KEY"],
+    "serply": ["SERPLY_API_KEY"],
+    "tavily": ["TAVILY_API_KEY"],
+    "exa": ["EXA_API_KEY"],
+    "searchapi": ["SEARCHAPI_API_KEY", "SEARCHAPI_ENGINE"],
+    "serpapi": ["SERPAPI_API_KEY", "SERPAPI_ENGINE"],
+    "jina": ["JINA_API_KEY"],
+    "bing": ["BING_SEARCH_V7_SUBSCRIPTION_KEY", "BING_SEARCH_V7_ENDPOINT"],
+    "azure": [
+        "AZURE_AI_SEARCH_API_KEY",
+        "AZURE_AI_SEARCH_ENDPOINT",
+        "AZURE_AI_SEARCH_INDEX_NAME",
+    ],
+    "perplexity": [
+        "PERPLEXITY_API_KEY",
+        "PERPLEXITY_MODEL",
+        "PERPLEXITY_SEARCH_CONTEXT_USAGE",
+    ],
+    "sougou": ["SOUGOU_API_SID", "SOUGOU_API_SK"],
+    "firecrawl": ["FIRECRAWL_API_BASE_URL", "FIRECRAWL_API_KEY"],
+}
+
+
+def get_search_engine_scope(request: Request, engine: str) -> str:
+    """
+    Digest of the engine's settings, so cached results are not reused once
+    the engine points to another endpoint or account.
+    """
+    config = request.app.state.config
+    return calculate_sha256_string(
+        json.dumps(
+            {
+                key: getattr(config, key)
+                for key in SEARCH_ENGINE_CONFIG_KEYS.get(engine, [])
+            },
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
+async def search_web_async(
+    request: Request, engine: str, query: str, user=None
+) -> list[SearchResult]:
+    """
+    Search the web without tying up a worker thread where the engine has an
+    async client, falling back to `search_web` in the threadpool otherwise.
+    Every engine is rate limited and circuit broken, and results are cached
+    per (engine settings, query, count) unless they may be user specific.
+    """
+    search = get_async_search(request, engine, query)
+    if search is None:
+        search = lambda: run_in_threadpool(search_web, request, engine, query, user)
+
+    if engine in UNCACHED_SEARCH_ENGINES:
+        return await get_search_client(engine).run(search)
+
+    return await search_with_cache(
+        engine,
+        query,
+        request.app.state.config.WEB_SEARCH_RESULT_COUNT,
+        search,
+        filter_list=request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
+        scope=get_search_engine_scope(request, engine),
+    )
+
+
+WEB_SEARCH_RESULTS_CACHE = TTLCache(
+    maxsize=WEB_SEARCH_RESULTS_CACHE_SIZE, ttl=WEB_SEARCH_RESULTS_CACHE_TTL
+)
+
+
+def get_web_search_cache_key(request: Request, queries: list[str]) -> str:
+    config = request.app.state.config
+    return calculate_sha256_string(
+        json.dumps(
+            {
+                "engine": config.WEB_SEARCH_ENGINE,
+                "queries": sorted(queries),
+                "result_count": config.WEB_SEARCH_RESULT_COUNT,
+                "bypass_web_loader": config.BYPASS_WEB_SEARCH_WEB_LOADER,
+                "embedding_engine": config.RAG_EMBEDDING_ENGINE,
+                "embedding_model": config.RAG_EMBEDDING_MODEL,
+                "text_splitter": config.TEXT_SPLITTER,
+                "chunk_size": config.CHUNK_SIZE,
+                "chunk_overlap": config.CHUNK_OVERLAP,
+                "top_k": config.TOP_K,
+            },
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
+async def get_ephemeral_web_search_docs(
+    request: Request, queries: list[str], docs: list[Document], user=None
+) -> list[Document]:
+    """
+    Chunk, embed and rank the loaded pages in process rather than round
+    tripping them through a throwaway vector DB collection.
+    """
+    chunks = await run_in_threadpool(split_docs, request, docs)
+    return await rank_docs(
+        queries,
+        chunks,
+        lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
+            query, prefix=prefix, user=user
+        ),
+        k=request.app.state.config.TOP_K,
+        query_prefix=RAG_EMBEDDING_QUERY_PREFIX,
+        content_prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+    )
+
+
 @router.post("/process/web/search")
 async def process_web_search(
     request: Request, form_data: SearchForm, user=Depends(get_verified_user)
@@ -2061,14 +2659,24 @@ async def process_web_search(
     urls = []
     result_items = []
 
+    ephemeral = (
+        request.app.state.config.ENABLE_WEB_SEARCH_EPHEMERAL_RETRIEVAL
+        and not request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL
+    )
+    if ephemeral:
+        cache_key = get_web_search_cache_key(request, form_data.queries)
+        cached = WEB_SEARCH_RESULTS_CACHE.get(cache_key)
+        if cached is not None:
+            log.debug(f"web search results served from cache: {form_data.queries}")
+            return cached
+
     try:
         logging.debug(
             f"trying to web search with {request.app.state.config.WEB_SEARCH_ENGINE, form_data.queries}"
         )
 
         search_tasks = [
-            run_in_threadpool(
-                search_web,
+            search_web_async(
                 request,
                 request.app.state.config.WEB_SEARCH_ENGINE,
                 query,
@@ -2153,6 +2761,32 @@ async def process_web_search(
                 ],
                 "loaded_count": len(docs),
             }
+        elif ephemeral:
+            try:
+                ranked_docs = await get_ephemeral_web_search_docs(
+                    request, form_data.queries, docs, user=user
+                )
+            except Exception as e:
+                log.warning(f"error ranking web search results, returning pages: {e}")
+                ranked_docs = docs
+
+            result = {
+                "status": True,
+                "collection_name": None,
+                "filenames": urls,
+                "items": result_items,
+                "docs": [
+                    {
+                        "content": doc.page_content,
+                        "metadata": doc.metadata,
+                    }
+                    for doc in ranked_docs
+                ],
+                "loaded_count": len(docs),
+            }
+            if ranked_docs is not docs:
+                WEB_SEARCH_RESULTS_CACHE.set(cache_key, result)
+            return result
         else:
             # Create a single collection for all documents
             collection_name = (
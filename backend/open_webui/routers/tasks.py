@@ -16,6 +16,12 @@ from open_webui.utils.task import (
     tags_generation_template,
     emoji_generation_template,
     moa_response_generation_template,
+    combined_tasks_generation_template,
+    combined_tasks_response_format,
+    parse_combined_tasks_output,
+    supports_json_schema_output,
+    get_task_history_budget,
+    window_messages,
 )
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.constants import TASKS
@@ -28,6 +34,7 @@ from open_webui.config import (
     DEFAULT_TITLE_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_TAGS_GENERATION_PROMPT_TEMPLATE,
+    DEFAULT_COMBINED_TASKS_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_QUERY_GENERATION_PROMPT_TEMPLATE,
     DEFAULT_AUTOCOMPLETE_GENERATION_PROMPT_TEMPLATE,
@@ -43,6 +50,17 @@ log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 router = APIRouter()
 
+# Prompt tokens and upstream requests saved by combined task generation
+COMBINED_TASKS_STATS = {
+    "calls": 0,
+    "tasks_requested": 0,
+    "tasks_answered": 0,
+    "requests_saved": 0,
+    "prompt_tokens": 0,
+    "estimated_prompt_tokens_saved": 0,
+    "unsupported": 0,
+}
+
 
 ##################################
 #
@@ -63,6 +81,7 @@ async def get_task_config(request: Request, user=Depends(get_verified_user)):
         "TAGS_GENERATION_PROMPT_TEMPLATE": request.app.state.config.TAGS_GENERATION_PROMPT_TEMPLATE,
         "FOLLOW_UP_GENERATION_PROMPT_TEMPLATE": request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
+        "ENABLE_COMBINED_TASKS_GENERATION": request.app.state.config.ENABLE_COMBINED_TASKS_GENERATION,
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_TITLE_GENERATION": request.app.state.config.ENABLE_TITLE_GENERATION,
         "ENABLE_SEARCH_QUERY_GENERATION": request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION,
@@ -84,6 +103,7 @@ class TaskConfigForm(BaseModel):
     TAGS_GENERATION_PROMPT_TEMPLATE: str
     FOLLOW_UP_GENERATION_PROMPT_TEMPLATE: str
     ENABLE_FOLLOW_UP_GENERATION: bool
+    ENABLE_COMBINED_TASKS_GENERATION: Optional[bool] = None
     ENABLE_TAGS_GENERATION: bool
     ENABLE_SEARCH_QUERY_GENERATION: bool
     ENABLE_RETRIEVAL_QUERY_GENERATION: bool
@@ -109,6 +129,10 @@ async def update_task_config(
     request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE = (
         form_data.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
     )
+    if form_data.ENABLE_COMBINED_TASKS_GENERATION is not None:
+        request.app.state.config.ENABLE_COMBINED_TASKS_GENERATION = (
+            form_data.ENABLE_COMBINED_TASKS_GENERATION
+        )
 
     request.app.state.config.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE = (
         form_data.IMAGE_PROMPT_GENERATION_PROMPT_TEMPLATE
@@ -155,6 +179,7 @@ async def update_task_config(
         "ENABLE_TAGS_GENERATION": request.app.state.config.ENABLE_TAGS_GENERATION,
         "ENABLE_FOLLOW_UP_GENERATION": request.app.state.config.ENABLE_FOLLOW_UP_GENERATION,
         "FOLLOW_UP_GENERATION_PROMPT_TEMPLATE": request.app.state.config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+        "ENABLE_COMBINED_TASKS_GENERATION": request.app.state.config.ENABLE_COMBINED_TASKS_GENERATION,
         "ENABLE_SEARCH_QUERY_GENERATION": request.app.state.config.ENABLE_SEARCH_QUERY_GENERATION,
         "ENABLE_RETRIEVAL_QUERY_GENERATION": request.app.state.config.ENABLE_RETRIEVAL_QUERY_GENERATION,
         "QUERY_GENERATION_PROMPT_TEMPLATE": request.app.state.config.QUERY_GENERATION_PROMPT_TEMPLATE,
@@ -206,7 +231,10 @@ async def generate_title(
     else:
         template = DEFAULT_TITLE_GENERATION_PROMPT_TEMPLATE
 
-    content = title_generation_template(template, form_data["messages"], user)
+    messages = window_messages(
+        form_data["messages"], get_task_history_budget(TASKS.TITLE_GENERATION)
+    )
+    content = title_generation_template(template, messages, user)
 
     max_tokens = (
         models[task_model_id].get("info", {}).get("params", {}).get("max_tokens", 1000)
@@ -290,7 +318,10 @@ async def generate_follow_ups(
     else:
         template = DEFAULT_FOLLOW_UP_GENERATION_PROMPT_TEMPLATE
 
-    content = follow_up_generation_template(template, form_data["messages"], user)
+    messages = window_messages(
+        form_data["messages"], get_task_history_budget(TASKS.FOLLOW_UP_GENERATION)
+    )
+    content = follow_up_generation_template(template, messages, user)
 
     payload = {
         "model": task_model_id,
@@ -363,7 +394,10 @@ async def generate_chat_tags(
     else:
         template = DEFAULT_TAGS_GENERATION_PROMPT_TEMPLATE
 
-    content = tags_generation_template(template, form_data["messages"], user)
+    messages = window_messages(
+        form_data["messages"], get_task_history_budget(TASKS.TAGS_GENERATION)
+    )
+    content = tags_generation_template(template, messages, user)
 
     payload = {
         "model": task_model_id,
@@ -393,6 +427,173 @@ async def generate_chat_tags(
         )
 
 
+def get_combinable_tasks(request: Request) -> dict:
+    """
+    Tasks that can be generated in a combined call: enabled, and using the
+    default prompt template, with the template each would use on its own.
+    """
+    config = request.app.state.config
+    tasks = {
+        TASKS.TITLE_GENERATION: (
+            config.ENABLE_TITLE_GENERATION,
+            config.TITLE_GENERATION_PROMPT_TEMPLATE,
+            DEFAULT_TITLE_GENERATION_PROMPT_TEMPLATE,
+            title_generation_template,
+        ),
+        TASKS.TAGS_GENERATION: (
+            config.ENABLE_TAGS_GENERATION,
+            config.TAGS_GENERATION_PROMPT_TEMPLATE,
+            DEFAULT_TAGS_GENERATION_PROMPT_TEMPLATE,
+            tags_generation_template,
+        ),
+        TASKS.FOLLOW_UP_GENERATION: (
+            config.ENABLE_FOLLOW_UP_GENERATION,
+            config.FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+            DEFAULT_FOLLOW_UP_GENERATION_PROMPT_TEMPLATE,
+            follow_up_generation_template,
+        ),
+    }
+    return {
+        task: (default_template, template_fn)
+        for task, (enabled, template, default_template, template_fn) in tasks.items()
+        if enabled and template == ""
+    }
+
+
+@router.post("/combined/completions")
+async def generate_combined_tasks(
+    request: Request, form_data: dict, user=Depends(get_verified_user)
+):
+    """
+    Title, tags and follow-ups of a chat in one structured-output call, instead
+    of one call per task each re-sending the chat history. `tasks` lists the
+    wanted tasks; those that are disabled or use a custom prompt template are
+    left out, for the caller to generate separately.
+    """
+    if not request.app.state.config.ENABLE_COMBINED_TASKS_GENERATION:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Combined task generation is disabled",
+        )
+
+    if getattr(request.state, "direct", False) and hasattr(request.state, "model"):
+        models = {
+            request.state.model["id"]: request.state.model,
+        }
+    else:
+        models = request.app.state.MODELS
+
+    model_id = form_data["model"]
+    if model_id not in models:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    # Check if the user has a custom task model
+    # If the user has a custom task model, use that model
+    task_model_id = get_task_model_id(
+        model_id,
+        request.app.state.config.TASK_MODEL,
+        request.app.state.config.TASK_MODEL_EXTERNAL,
+        models,
+    )
+
+    if not supports_json_schema_output(models[task_model_id]):
+        COMBINED_TASKS_STATS["unsupported"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The task model does not support structured output",
+        )
+
+    combinable_tasks = get_combinable_tasks(request)
+    tasks = [task for task in combinable_tasks if task in form_data.get("tasks", [])]
+    if not tasks:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No tasks to generate",
+        )
+
+    log.debug(
+        f"generating {', '.join(tasks)} using model {task_model_id} for user {user.email} "
+    )
+
+    messages = window_messages(
+        form_data["messages"], get_task_history_budget(TASKS.COMBINED_GENERATION)
+    )
+    content = combined_tasks_generation_template(
+        DEFAULT_COMBINED_TASKS_GENERATION_PROMPT_TEMPLATE,
+        tasks,
+        messages,
+        user,
+    )
+
+    payload = {
+        "model": task_model_id,
+        "messages": [{"role": "user", "content": content}],
+        "stream": False,
+        "response_format": combined_tasks_response_format(tasks),
+        "metadata": {
+            **(request.state.metadata if hasattr(request.state, "metadata") else {}),
+            "task": str(TASKS.COMBINED_GENERATION),
+            "task_body": form_data,
+            "chat_id": form_data.get("chat_id", None),
+        },
+    }
+
+    # Process the payload through the pipeline
+    try:
+        payload = await process_pipeline_inlet_filter(request, payload, user, models)
+    except Exception as e:
+        raise e
+
+    try:
+        res = await generate_chat_completion(request, form_data=payload, user=user)
+    except Exception as e:
+        log.error("Exception occurred", exc_info=True)
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "An internal error has occurred."},
+        )
+
+    if isinstance(res, dict) and len(res.get("choices", [])) == 1:
+        message = res["choices"][0].get("message", {})
+        answered = parse_combined_tasks_output(
+            message.get("content") or message.get("reasoning_content") or "", tasks
+        )
+
+        # Prompts the answered tasks would have sent on their own, scaled by
+        # the tokens the combined prompt actually took
+        prompt_tokens = (res.get("usage") or {}).get("prompt_tokens") or (
+            len(content) // 4
+        )
+        separate_chars = sum(
+            len(
+                template_fn(
+                    default_template,
+                    window_messages(
+                        form_data["messages"], get_task_history_budget(task)
+                    ),
+                    user,
+                )
+            )
+            for task, (default_template, template_fn) in combinable_tasks.items()
+            if task in answered
+        )
+        separate_tokens = prompt_tokens * separate_chars / max(len(content), 1)
+
+        COMBINED_TASKS_STATS["calls"] += 1
+        COMBINED_TASKS_STATS["tasks_requested"] += len(tasks)
+        COMBINED_TASKS_STATS["tasks_answered"] += len(answered)
+        COMBINED_TASKS_STATS["requests_saved"] += max(len(answered) - 1, 0)
+        COMBINED_TASKS_STATS["prompt_tokens"] += prompt_tokens
+        COMBINED_TASKS_STATS["estimated_prompt_tokens_saved"] += max(
+            int(separate_tokens) - prompt_tokens, 0
+        )
+
+    return res
+
+
 @router.post("/image_prompt/completions")
 async def generate_image_prompt(
     request: Request, form_data: dict, user=Depends(get_verified_user)
@@ -514,7 +715,10 @@ async def generate_queries(
     else:
         template = DEFAULT_QUERY_GENERATION_PROMPT_TEMPLATE
 
-    content = query_generation_template(template, form_data["messages"], user)
+    messages = window_messages(
+        form_data["messages"], get_task_history_budget(TASKS.QUERY_GENERATION)
+    )
+    content = query_generation_template(template, messages, user)
 
     payload = {
         "model": task_model_id,
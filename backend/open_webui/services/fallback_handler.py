@@ -60,7 +60,9 @@ class CircuitBreakerState:
         self.failure_count += 1
         self.last_failure_time = time.time()
 
-        if self.state == "closed" and self.failure_count >= self.failure_threshold:
+        if self.state == "half_open" or (
+            self.state == "closed" and self.failure_count >= self.failure_threshold
+        ):
             self.state = "open"
             self.opened_at = time.time()
             logger.warning(
@@ -1,10 +1,8 @@
 import asyncio
-import random
 
 import socketio
 import logging
 import sys
-import time
 from typing import Dict, Set
 from redis import asyncio as aioredis
 import pycrdt as Y
@@ -28,7 +26,6 @@ from open_webui.env import (
     WEBSOCKET_MANAGER,
     WEBSOCKET_REDIS_URL,
     WEBSOCKET_REDIS_CLUSTER,
-    WEBSOCKET_REDIS_LOCK_TIMEOUT,
     WEBSOCKET_SENTINEL_PORT,
     WEBSOCKET_SENTINEL_HOSTS,
     REDIS_KEY_PREFIX,
@@ -37,9 +34,18 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    WEBSOCKET_STATE_CACHE_SIZE,
+    MODELS_CACHE_CHECK_INTERVAL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    AsyncLocalDict,
+    AsyncRedisDict,
+    ChannelBroadcast,
+    ModelUsageTracker,
+    VersionedRedisDict,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -119,43 +125,34 @@ if WEBSOCKET_MANAGER == "redis":
         WEBSOCKET_SENTINEL_HOSTS, WEBSOCKET_SENTINEL_PORT
     )
 
-    MODELS = RedisDict(
+    # Models are looked up on every chat request, and rarely written
+    MODELS = VersionedRedisDict(
         f"{REDIS_KEY_PREFIX}:models",
         redis_url=WEBSOCKET_REDIS_URL,
         redis_sentinels=redis_sentinels,
         redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        check_interval=MODELS_CACHE_CHECK_INTERVAL,
     )
 
-    SESSION_POOL = RedisDict(
+    # Sessions are read on every socket event, and rarely written. The
+    # near-cache is invalidated over plain pub/sub, which isn't supported on
+    # Redis Cluster.
+    state_cache_size = 0 if WEBSOCKET_REDIS_CLUSTER else WEBSOCKET_STATE_CACHE_SIZE
+    SESSION_POOL = AsyncRedisDict(
         f"{REDIS_KEY_PREFIX}:session_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
-    )
-    USAGE_POOL = RedisDict(
-        f"{REDIS_KEY_PREFIX}:usage_pool",
-        redis_url=WEBSOCKET_REDIS_URL,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+        REDIS,
+        cache_size=state_cache_size,
     )
-
-    clean_up_lock = RedisLock(
-        redis_url=WEBSOCKET_REDIS_URL,
-        lock_name=f"{REDIS_KEY_PREFIX}:usage_cleanup_lock",
-        timeout_secs=WEBSOCKET_REDIS_LOCK_TIMEOUT,
-        redis_sentinels=redis_sentinels,
-        redis_cluster=WEBSOCKET_REDIS_CLUSTER,
+    CHANNEL_MEMBERS = AsyncRedisDict(
+        f"{REDIS_KEY_PREFIX}:channel_members",
+        REDIS,
+        cache_size=state_cache_size,
     )
-    aquire_func = clean_up_lock.aquire_lock
-    renew_func = clean_up_lock.renew_lock
-    release_func = clean_up_lock.release_lock
 else:
     MODELS = {}
 
-    SESSION_POOL = {}
-    USAGE_POOL = {}
-
-    aquire_func = release_func = renew_func = lambda: True
+    SESSION_POOL = AsyncLocalDict()
+    CHANNEL_MEMBERS = AsyncLocalDict()
 
 
 YDOC_MANAGER = YdocManager(
@@ -163,57 +160,18 @@ YDOC_MANAGER = YdocManager(
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
 )
 
+USAGE_TRACKER = ModelUsageTracker(
+    redis=REDIS,
+    redis_key_prefix=f"{REDIS_KEY_PREFIX}:usage",
+    timeout=TIMEOUT_DURATION,
+)
 
-async def periodic_usage_pool_cleanup():
-    max_retries = 2
-    retry_delay = random.uniform(
-        WEBSOCKET_REDIS_LOCK_TIMEOUT / 2, WEBSOCKET_REDIS_LOCK_TIMEOUT
-    )
-    for attempt in range(max_retries + 1):
-        if aquire_func():
-            break
-        else:
-            if attempt < max_retries:
-                log.debug(
-                    f"Cleanup lock already exists. Retry {attempt + 1} after {retry_delay}s..."
-                )
-                await asyncio.sleep(retry_delay)
-            else:
-                log.warning(
-                    "Failed to acquire cleanup lock after retries. Skipping cleanup."
-                )
-                return
-
-    log.debug("Running periodic_cleanup")
-    try:
-        while True:
-            if not renew_func():
-                log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
-                raise Exception("Unable to renew usage pool cleanup lock.")
-
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
-            await asyncio.sleep(TIMEOUT_DURATION)
-    finally:
-        release_func()
+CHANNEL_BROADCAST = ChannelBroadcast(
+    sio,
+    CHANNEL_MEMBERS,
+    load_members=Channels.get_members_by_channel_id,
+    reactivate_members=Channels.reactivate_members,
+)
 
 
 app = socketio.ASGIApp(
@@ -222,14 +180,14 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
+    models_in_use = await USAGE_TRACKER.get_models_in_use()
     return models_in_use
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
@@ -244,11 +202,18 @@ def get_session_ids_from_room(room):
     return [session_id[0] for session_id in active_session_ids]
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = get_session_ids_from_room(room)
 
+    # One batched lookup for the whole room
     active_user_ids = list(
-        set([SESSION_POOL.get(session_id)["id"] for session_id in active_session_ids])
+        set(
+            [
+                user["id"]
+                for user in await SESSION_POOL.get_many(active_session_ids)
+                if user
+            ]
+        )
     )
     return active_user_ids
 
@@ -263,8 +228,7 @@ async def emit_to_users(event: str, data: dict, user_ids: list[str]):
         user_ids (list[str]): The target users' IDs.
     """
     try:
-        for user_id in user_ids:
-            await sio.emit(event, data, room=f"user:{user_id}")
+        await CHANNEL_BROADCAST.emit_to_users(event, data, user_ids)
     except Exception as e:
         log.debug(f"Failed to emit event {event} to users {user_ids}: {e}")
 
@@ -287,16 +251,9 @@ async def enter_room_for_users(room: str, user_ids: list[str]):
 
 @sio.on("usage")
 async def usage(sid, data):
-    if sid in SESSION_POOL:
-        model_id = data["model"]
+    if await SESSION_POOL.contains(sid):
         # Record the timestamp for the last update
-        current_time = int(time.time())
-
-        # Store the new usage data and task
-        USAGE_POOL[model_id] = {
-            **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-            sid: {"updated_at": current_time},
-        }
+        await USAGE_TRACKER.touch(data["model"])
 
 
 @sio.event
@@ -309,8 +266,8 @@ async def connect(sid, environ, auth):
             user = Users.get_user_by_id(data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump(
-                exclude=["date_of_birth", "bio", "gender"]
+            await SESSION_POOL.set(
+                sid, user.model_dump(exclude=["date_of_birth", "bio", "gender"])
             )
             await sio.enter_room(sid, f"user:{user.id}")
 
@@ -330,14 +287,17 @@ async def user_join(sid, data):
     if not user:
         return
 
-    SESSION_POOL[sid] = user.model_dump(
-        exclude=[
-            "profile_image_url",
-            "profile_banner_image_url",
-            "date_of_birth",
-            "bio",
-            "gender",
-        ]
+    await SESSION_POOL.set(
+        sid,
+        user.model_dump(
+            exclude=[
+                "profile_image_url",
+                "profile_banner_image_url",
+                "date_of_birth",
+                "bio",
+                "gender",
+            ]
+        ),
     )
 
     await sio.enter_room(sid, f"user:{user.id}")
@@ -353,7 +313,7 @@ async def user_join(sid, data):
 
 @sio.on("heartbeat")
 async def heartbeat(sid, data):
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
     if user:
         Users.update_last_active_by_id(user["id"])
 
@@ -425,7 +385,7 @@ async def channel_events(sid, data):
     event_data = data["data"]
     event_type = event_data["type"]
 
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     if not user:
         return
@@ -448,7 +408,7 @@ async def channel_events(sid, data):
 @sio.on("ydoc:document:join")
 async def ydoc_document_join(sid, data):
     """Handle user joining a document"""
-    user = SESSION_POOL.get(sid)
+    user = await SESSION_POOL.get(sid)
 
     try:
         document_id = data["document_id"]
@@ -618,7 +578,7 @@ async def yjs_document_update(sid, data):
         async def debounced_save():
             await asyncio.sleep(0.5)
             await document_save_handler(
-                document_id, data.get("data", {}), SESSION_POOL.get(sid)
+                document_id, data.get("data", {}), await SESSION_POOL.get(sid)
             )
 
         if data.get("data"):
@@ -683,9 +643,7 @@ async def yjs_awareness_update(sid, data):
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
+    if await SESSION_POOL.delete(sid):
         await YDOC_MANAGER.remove_user_from_all_documents(sid)
     else:
         pass
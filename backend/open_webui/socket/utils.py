@@ -1,9 +1,36 @@
+import asyncio
+import copy
 import json
+import logging
+import time
 import uuid
+from collections import OrderedDict
 from open_webui.utils.redis import get_redis_connection
-from open_webui.env import REDIS_KEY_PREFIX
-from typing import Optional, List, Tuple
+from open_webui.env import REDIS_KEY_PREFIX, SRC_LOG_LEVELS
+from typing import Any, Callable, Optional, List, Tuple
 import pycrdt as Y
+from opentelemetry import metrics
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
+
+meter = metrics.get_meter(__name__)
+
+channel_fanout_members_histogram = meter.create_histogram(
+    name="webui.channels.fanout.members",
+    description="Channel members reached by a new message",
+    unit="1",
+)
+channel_fanout_emits_counter = meter.create_counter(
+    name="webui.channels.fanout.emits",
+    description="Socket emits made to fan channel events out",
+    unit="1",
+)
+channel_fanout_db_writes_counter = meter.create_counter(
+    name="webui.channels.fanout.db_writes",
+    description="Database writes made while fanning channel messages out",
+    unit="1",
+)
 
 
 class RedisLock:
@@ -117,6 +144,469 @@ class RedisDict:
         return self[key]
 
 
+class VersionedRedisDict(RedisDict):
+    """
+    `RedisDict` served from a per-worker snapshot of the whole hash.
+
+    Every write bumps a generation counter at `{name}:version` in the same
+    pipeline. Reads compare it with the generation of the snapshot, at most
+    once every `check_interval` seconds, and reload the hash with a single
+    HGETALL only when it moved, so lookups are plain dict reads and workers
+    pick up each other's writes within `check_interval`.
+    """
+
+    def __init__(self, name, redis_url, check_interval: float = 1.0, **kwargs):
+        super().__init__(name, redis_url, **kwargs)
+        self.version_key = f"{name}:version"
+        self.check_interval = check_interval
+
+        self._snapshot = {}
+        self._version = None
+        self._checked_at = 0.0
+        self.stats = {"reads": 0, "version_checks": 0, "reloads": 0}
+
+    def _get_snapshot(self) -> dict:
+        self.stats["reads"] += 1
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        self.stats["version_checks"] += 1
+        version = self.redis.get(self.version_key)
+        self._checked_at = now
+        if self._version is not None and version == self._version:
+            return self._snapshot
+
+        # Read the counter with the hash so a concurrent write is not missed.
+        # A hash that was never written through this class has no counter
+        # yet; start it so the snapshot is not reloaded on every read.
+        pipe = self.redis.pipeline()
+        pipe.setnx(self.version_key, 0)
+        pipe.get(self.version_key)
+        pipe.hgetall(self.name)
+        _, version, values = pipe.execute()
+
+        self.stats["reloads"] += 1
+        self._snapshot = {k: json.loads(v) for k, v in values.items()}
+        self._version = version
+        return self._snapshot
+
+    def _write(self, pipe, snapshot: dict, replace: bool = False) -> list:
+        """
+        Run `pipe` with the counter bump and, when it is known to be exact,
+        keep `snapshot` as the worker's copy of the hash.
+        """
+        pipe.incr(self.version_key)
+        results = pipe.execute()
+        version = str(results[-1])
+
+        # A partial update is only exact if no other worker wrote in between
+        if replace or (
+            self._version is not None and int(version) == int(self._version) + 1
+        ):
+            self._snapshot = snapshot
+            self._version = version
+            self._checked_at = time.monotonic()
+        else:
+            self._version = None
+        return results
+
+    def __setitem__(self, key, value):
+        pipe = self.redis.pipeline()
+        pipe.hset(self.name, key, json.dumps(value))
+        self._write(pipe, {**self._snapshot, key: value})
+
+    def __getitem__(self, key):
+        return self._get_snapshot()[key]
+
+    def __delitem__(self, key):
+        pipe = self.redis.pipeline()
+        pipe.hdel(self.name, key)
+        results = self._write(
+            pipe, {k: v for k, v in self._snapshot.items() if k != key}
+        )
+        if results[0] == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._get_snapshot()
+
+    def __len__(self):
+        return len(self._get_snapshot())
+
+    def keys(self):
+        return list(self._get_snapshot().keys())
+
+    def values(self):
+        return list(self._get_snapshot().values())
+
+    def items(self):
+        return list(self._get_snapshot().items())
+
+    def set(self, mapping: dict):
+        pipe = self.redis.pipeline()
+        pipe.delete(self.name)
+        if mapping:
+            pipe.hset(self.name, mapping={k: json.dumps(v) for k, v in mapping.items()})
+        self._write(pipe, dict(mapping), replace=True)
+
+    def clear(self):
+        pipe = self.redis.pipeline()
+        pipe.delete(self.name)
+        self._write(pipe, {}, replace=True)
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "size": len(self._snapshot),
+            "version": self._version,
+        }
+
+
+class AsyncRedisDict:
+    """
+    Async counterpart of `RedisDict` for state read from socket handlers and
+    request paths, so a lookup never blocks the event loop.
+
+    Batches go through a single HMGET. With `cache_size` > 0 reads are served
+    from a per-worker near-cache: every write publishes the key on
+    `{name}:invalidate` and the other workers drop their copy. The cache is
+    only used while that subscription is live, so a lost connection falls
+    back to Redis reads instead of serving stale values. Invalidations use
+    plain (not sharded) pub/sub, so the near-cache is not supported on Redis
+    Cluster; keep `cache_size` at 0 there.
+    """
+
+    def __init__(self, name: str, redis, cache_size: int = 0):
+        self.name = name
+        self.redis = redis
+        self.cache_size = cache_size
+
+        self._channel = f"{name}:invalidate"
+        self._origin = uuid.uuid4().hex
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._invalidations = 0
+        self._subscribed = False
+        self._listener: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _use_cache(self) -> bool:
+        if self.cache_size <= 0:
+            return False
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return self._subscribed
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(self._channel)
+                self._subscribed = True
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    origin, _, key = message["data"].partition(":")
+                    if origin != self._origin:
+                        self._drop(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"Lost invalidations for {self.name}: {e}")
+            finally:
+                self._subscribed = False
+                self._drop("")
+            await asyncio.sleep(1)
+
+    def _drop(self, key: str):
+        # An empty key drops everything
+        self._invalidations += 1
+        self.stats["invalidations"] += 1
+        if key:
+            self._cache.pop(key, None)
+        else:
+            self._cache.clear()
+
+    def _store(self, key: str, value: str, invalidations: int):
+        # Skip values read before an invalidation that arrived meanwhile
+        if invalidations != self._invalidations:
+            return
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _invalidate(self, key: str):
+        self._drop(key)
+        if self.cache_size > 0:
+            await self.redis.publish(self._channel, f"{self._origin}:{key}")
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        use_cache = self._use_cache()
+        values = {}
+        for key in keys:
+            if use_cache and key in self._cache:
+                self._cache.move_to_end(key)
+                values[key] = self._cache[key]
+                self.stats["hits"] += 1
+
+        missing = [key for key in dict.fromkeys(keys) if key not in values]
+        if missing:
+            self.stats["misses"] += len(missing)
+            invalidations = self._invalidations
+            for key, value in zip(missing, await self.redis.hmget(self.name, missing)):
+                values[key] = value
+                if use_cache and value is not None:
+                    self._store(key, value, invalidations)
+
+        return [
+            json.loads(values[key]) if values[key] is not None else None for key in keys
+        ]
+
+    async def get(self, key: str, default=None):
+        (value,) = await self.get_many([key])
+        return default if value is None else value
+
+    async def set(self, key: str, value):
+        serialized_value = json.dumps(value)
+        await self.redis.hset(self.name, key, serialized_value)
+        await self._invalidate(key)
+        if self._use_cache():
+            self._store(key, serialized_value, self._invalidations)
+
+    async def delete(self, key: str) -> bool:
+        result = await self.redis.hdel(self.name, key)
+        await self._invalidate(key)
+        return result > 0
+
+    async def contains(self, key: str) -> bool:
+        if self._use_cache() and key in self._cache:
+            return True
+        return bool(await self.redis.hexists(self.name, key))
+
+    async def keys(self) -> list[str]:
+        return await self.redis.hkeys(self.name)
+
+    async def items(self) -> list[tuple[str, Any]]:
+        return [
+            (key, json.loads(value))
+            for key, value in (await self.redis.hgetall(self.name)).items()
+        ]
+
+    async def clear(self):
+        await self.redis.delete(self.name)
+        await self._invalidate("")
+
+    def get_stats(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+            "cached": len(self._cache),
+            "cache_size": self.cache_size,
+            "subscribed": self._subscribed,
+        }
+
+    async def close(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+
+class AsyncLocalDict:
+    """
+    Single-worker `AsyncRedisDict` backed by a plain dict. Values are copied
+    in and out, so callers can't change the stored state without `set`, just
+    as with the Redis-backed store.
+    """
+
+    def __init__(self):
+        self._data: dict[str, Any] = {}
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        return [copy.deepcopy(self._data.get(key)) for key in keys]
+
+    async def get(self, key: str, default=None):
+        if key not in self._data:
+            return default
+        return copy.deepcopy(self._data[key])
+
+    async def set(self, key: str, value):
+        self._data[key] = copy.deepcopy(value)
+
+    async def delete(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    async def contains(self, key: str) -> bool:
+        return key in self._data
+
+    async def keys(self) -> list[str]:
+        return list(self._data.keys())
+
+    async def items(self) -> list[tuple[str, Any]]:
+        return copy.deepcopy(list(self._data.items()))
+
+    async def clear(self):
+        self._data.clear()
+
+    def get_stats(self) -> dict:
+        return {"entries": len(self._data)}
+
+    async def close(self):
+        pass
+
+
+class ModelUsageTracker:
+    """
+    Models in use, as a sorted set of model ids scored by their latest usage
+    heartbeat.
+
+    A heartbeat is a single ZADD and expiry trims by score on read, so there
+    is no sweep over all sessions and no lock between workers. Without Redis
+    the same layout is kept in a local dict.
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:usage",
+        timeout: int = 3,
+    ):
+        self._redis = redis
+        self._models_key = f"{redis_key_prefix}:models"
+        self.timeout = timeout
+        self._models: dict[str, float] = {}
+
+    async def touch(self, model_id: str):
+        now = time.time()
+        if self._redis:
+            await self._redis.zadd(self._models_key, {model_id: now})
+        else:
+            self._models[model_id] = now
+
+    async def get_models_in_use(self) -> list[str]:
+        cutoff = time.time() - self.timeout
+        if self._redis:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.zremrangebyscore(self._models_key, "-inf", f"({cutoff}")
+            pipe.zrange(self._models_key, 0, -1)
+            _, model_ids = await pipe.execute()
+            return list(model_ids)
+
+        for model_id in [
+            model_id for model_id, at in self._models.items() if at < cutoff
+        ]:
+            del self._models[model_id]
+        return list(self._models)
+
+
+class ChannelBroadcast:
+    """
+    Fans channel events out to the channel members.
+
+    The member list of each channel is cached in `members` (shared by the
+    workers through Redis, or local) and dropped whenever the membership
+    changes, so posting a message does not re-read it. Inactive members,
+    e.g. of a hidden DM, are reactivated with a single UPDATE, and events go
+    out as one emit to the channel room or to a list of user rooms rather
+    than one emit per user.
+    """
+
+    def __init__(
+        self,
+        sio,
+        members,
+        load_members: Callable[[str], list],
+        reactivate_members: Callable[[str], int],
+        ttl: int = 300,
+    ):
+        self.sio = sio
+        self.members = members
+        self.ttl = ttl
+        self._load_members = load_members
+        self._reactivate_members = reactivate_members
+        self.stats = {
+            "messages": 0,
+            "members": 0,
+            "emits": 0,
+            "db_writes": 0,
+            "member_loads": 0,
+        }
+
+    async def get_members(self, channel_id: str) -> dict:
+        """
+        `{"user_ids": [...], "inactive_user_ids": [...]}` of the channel.
+        """
+        entry = await self.members.get(channel_id)
+        if entry and time.time() - entry["loaded_at"] < self.ttl:
+            return entry
+
+        self.stats["member_loads"] += 1
+        members = self._load_members(channel_id)
+        entry = {
+            "user_ids": [member.user_id for member in members],
+            "inactive_user_ids": [
+                member.user_id for member in members if not member.is_active
+            ],
+            "loaded_at": time.time(),
+        }
+        await self.members.set(channel_id, entry)
+        return entry
+
+    async def invalidate(self, channel_id: str):
+        await self.members.delete(channel_id)
+
+    async def on_new_message(self, channel, user_id: str) -> dict:
+        """
+        Bring the membership up to date after `user_id` posted in `channel`:
+        posting joins standard channels, and reactivates every member of
+        group and DM channels.
+        """
+        members = await self.get_members(channel.id)
+        if user_id not in members["user_ids"]:
+            await self.invalidate(channel.id)
+            members = await self.get_members(channel.id)
+
+        if channel.type in ["group", "dm"] and members["inactive_user_ids"]:
+            self._reactivate_members(channel.id)
+            self._record("db_writes", 1)
+            await self.invalidate(channel.id)
+            members = {**members, "inactive_user_ids": []}
+
+        self.stats["messages"] += 1
+        self.stats["members"] += len(members["user_ids"])
+        channel_fanout_members_histogram.record(len(members["user_ids"]))
+        return members
+
+    def _record(self, stat: str, count: int):
+        self.stats[stat] += count
+        if stat == "emits":
+            channel_fanout_emits_counter.add(count)
+        elif stat == "db_writes":
+            channel_fanout_db_writes_counter.add(count)
+
+    async def emit(self, event: str, data: dict, channel_id: str):
+        await self.sio.emit(event, data, to=f"channel:{channel_id}")
+        self._record("emits", 1)
+
+    async def emit_to_users(self, event: str, data: dict, user_ids: list[str]):
+        if not user_ids:
+            return
+        # Each client is in its own user room; a list of rooms is one emit
+        await self.sio.emit(event, data, to=[f"user:{uid}" for uid in user_ids])
+        self._record("emits", 1)
+
+    def get_stats(self) -> dict:
+        messages = self.stats["messages"]
+        return {
+            **self.stats,
+            "avg_members_per_message": (
+                self.stats["members"] / messages if messages else 0.0
+            ),
+            "cache": self.members.get_stats(),
+        }
+
+
 class YdocManager:
     def __init__(
         self,
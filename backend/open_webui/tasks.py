@@ -4,11 +4,13 @@ from typing import Dict
 from uuid import uuid4
 import json
 import logging
+import time
 from redis.asyncio import Redis
+from redis.exceptions import WatchError
 from fastapi import Request
 from typing import Dict, List, Optional
 
-from open_webui.env import SRC_LOG_LEVELS, REDIS_KEY_PREFIX
+from open_webui.env import SRC_LOG_LEVELS, REDIS_KEY_PREFIX, TASK_HEARTBEAT_INTERVAL
 
 
 log = logging.getLogger(__name__)
@@ -18,16 +20,34 @@ log.setLevel(SRC_LOG_LEVELS["MAIN"])
 tasks: Dict[str, asyncio.Task] = {}
 item_tasks = {}
 
+# Redis connection each local task is registered in, for heartbeats
+task_registrations: Dict[str, tuple] = {}
+# Redis connections tasks have been registered in, reaped even when idle
+heartbeat_connections: List[Redis] = []
+heartbeat_task: Optional[asyncio.Task] = None
 
-REDIS_TASKS_KEY = f"{REDIS_KEY_PREFIX}:tasks"
-REDIS_ITEM_TASKS_KEY = f"{REDIS_KEY_PREFIX}:tasks:item"
+# Identifies this process as the owner of the tasks it runs
+WORKER_ID = str(uuid4())
+
+TASK_HEARTBEAT_TIMEOUT = TASK_HEARTBEAT_INTERVAL * 3
+
+# Last heartbeat of every task, by task id
+REDIS_TASKS_KEY = f"{REDIS_KEY_PREFIX}:tasks:heartbeats"
+# Owning worker and item of every task, by task id
+REDIS_TASK_OWNERS_KEY = f"{REDIS_KEY_PREFIX}:tasks:owners"
+# Last heartbeat of the tasks of one item, e.g. a chat
+REDIS_ITEM_TASKS_KEY = f"{REDIS_KEY_PREFIX}:tasks:items"
 REDIS_PUBSUB_CHANNEL = f"{REDIS_KEY_PREFIX}:tasks:commands"
 
 
 async def redis_task_command_listener(app):
     redis: Redis = app.state.redis
+    ensure_heartbeat(redis)
+
     pubsub = redis.pubsub()
-    await pubsub.subscribe(REDIS_PUBSUB_CHANNEL)
+    # Commands are sent to the owning worker; the shared channel is kept for
+    # workers still broadcasting during a rolling upgrade
+    await pubsub.subscribe(REDIS_PUBSUB_CHANNEL, f"{REDIS_PUBSUB_CHANNEL}:{WORKER_ID}")
 
     async for message in pubsub.listen():
         if message["type"] != "message":
@@ -48,34 +68,152 @@ async def redis_task_command_listener(app):
 ### ------------------------------
 
 
+def get_item_tasks_key(item_id: str) -> str:
+    return f"{REDIS_ITEM_TASKS_KEY}:{item_id}"
+
+
+def redis_add_heartbeats(pipe, registrations: Dict[str, Optional[str]]):
+    now = time.time()
+    pipe.zadd(REDIS_TASKS_KEY, {task_id: now for task_id in registrations})
+    pipe.hset(
+        REDIS_TASK_OWNERS_KEY,
+        mapping={
+            task_id: json.dumps({"worker_id": WORKER_ID, "item_id": item_id})
+            for task_id, item_id in registrations.items()
+        },
+    )
+    for task_id, item_id in registrations.items():
+        if item_id:
+            pipe.zadd(get_item_tasks_key(item_id), {task_id: now})
+            pipe.expire(get_item_tasks_key(item_id), int(TASK_HEARTBEAT_TIMEOUT) + 1)
+
+
 async def redis_save_task(redis: Redis, task_id: str, item_id: Optional[str]):
     pipe = redis.pipeline()
-    pipe.hset(REDIS_TASKS_KEY, task_id, item_id or "")
-    if item_id:
-        pipe.sadd(f"{REDIS_ITEM_TASKS_KEY}:{item_id}", task_id)
+    redis_add_heartbeats(pipe, {task_id: item_id})
     await pipe.execute()
 
 
 async def redis_cleanup_task(redis: Redis, task_id: str, item_id: Optional[str]):
     pipe = redis.pipeline()
-    pipe.hdel(REDIS_TASKS_KEY, task_id)
+    pipe.zrem(REDIS_TASKS_KEY, task_id)
+    pipe.hdel(REDIS_TASK_OWNERS_KEY, task_id)
     if item_id:
-        pipe.srem(f"{REDIS_ITEM_TASKS_KEY}:{item_id}", task_id)
-        if (await pipe.scard(f"{REDIS_ITEM_TASKS_KEY}:{item_id}").execute())[-1] == 0:
-            pipe.delete(f"{REDIS_ITEM_TASKS_KEY}:{item_id}")  # Remove if empty set
+        # Redis drops the set along with its last member
+        pipe.zrem(get_item_tasks_key(item_id), task_id)
     await pipe.execute()
 
 
 async def redis_list_tasks(redis: Redis) -> List[str]:
-    return list(await redis.hkeys(REDIS_TASKS_KEY))
+    cutoff = time.time() - TASK_HEARTBEAT_TIMEOUT
+    return list(await redis.zrangebyscore(REDIS_TASKS_KEY, cutoff, "+inf"))
 
 
 async def redis_list_item_tasks(redis: Redis, item_id: str) -> List[str]:
-    return list(await redis.smembers(f"{REDIS_ITEM_TASKS_KEY}:{item_id}"))
+    cutoff = time.time() - TASK_HEARTBEAT_TIMEOUT
+    return list(await redis.zrangebyscore(get_item_tasks_key(item_id), cutoff, "+inf"))
+
+
+async def redis_get_task_owner(redis: Redis, task_id: str) -> Optional[dict]:
+    """
+    `{"worker_id": ..., "item_id": ...}` of a live task, None if the task is
+    unknown or its worker stopped sending heartbeats.
+    """
+    pipe = redis.pipeline()
+    pipe.zscore(REDIS_TASKS_KEY, task_id)
+    pipe.hget(REDIS_TASK_OWNERS_KEY, task_id)
+    heartbeat, owner = await pipe.execute()
+
+    if heartbeat is None or owner is None:
+        return None
+    if heartbeat < time.time() - TASK_HEARTBEAT_TIMEOUT:
+        return None
+    return json.loads(owner)
 
 
-async def redis_send_command(redis: Redis, command: dict):
-    await redis.publish(REDIS_PUBSUB_CHANNEL, json.dumps(command))
+# Attempts at reaping before leaving it to the next heartbeat round
+REAP_ATTEMPTS = 3
+
+
+async def redis_reap_tasks(redis: Redis) -> int:
+    """
+    Remove the tasks of workers that stopped sending heartbeats.
+
+    The heartbeats are WATCHed while the stale tasks are read, so a task
+    whose worker sends a heartbeat before they are deleted keeps its entries:
+    the transaction is dropped and the tasks are read again.
+    """
+    async with redis.pipeline() as pipe:
+        for _ in range(REAP_ATTEMPTS):
+            try:
+                await pipe.watch(REDIS_TASKS_KEY)
+                cutoff = time.time() - TASK_HEARTBEAT_TIMEOUT
+                task_ids = await pipe.zrangebyscore(
+                    REDIS_TASKS_KEY, "-inf", f"({cutoff}"
+                )
+                if not task_ids:
+                    return 0
+
+                owners = await pipe.hmget(REDIS_TASK_OWNERS_KEY, task_ids)
+
+                pipe.multi()
+                pipe.zrem(REDIS_TASKS_KEY, *task_ids)
+                pipe.hdel(REDIS_TASK_OWNERS_KEY, *task_ids)
+                for task_id, owner in zip(task_ids, owners):
+                    item_id = json.loads(owner).get("item_id") if owner else None
+                    if item_id:
+                        pipe.zrem(get_item_tasks_key(item_id), task_id)
+                await pipe.execute()
+            except WatchError:
+                continue
+
+            log.info(f"Reaped {len(task_ids)} orphaned tasks")
+            return len(task_ids)
+
+    return 0
+
+
+async def redis_send_command(redis: Redis, command: dict, worker_id: str):
+    await redis.publish(f"{REDIS_PUBSUB_CHANNEL}:{worker_id}", json.dumps(command))
+
+
+async def redis_task_heartbeat():
+    """
+    Refresh the heartbeats of the tasks running here and reap the tasks of
+    dead workers, every `TASK_HEARTBEAT_INTERVAL` seconds.
+    """
+    while True:
+        await asyncio.sleep(TASK_HEARTBEAT_INTERVAL)
+
+        connections = {}
+        for task_id, (redis, item_id) in list(task_registrations.items()):
+            connections.setdefault(id(redis), (redis, {}))[1][task_id] = item_id
+        for redis in heartbeat_connections:
+            connections.setdefault(id(redis), (redis, {}))
+
+        for redis, registrations in connections.values():
+            try:
+                if registrations:
+                    pipe = redis.pipeline()
+                    redis_add_heartbeats(pipe, registrations)
+                    await pipe.execute()
+                await redis_reap_tasks(redis)
+            except Exception as e:
+                log.exception(f"Error sending task heartbeats: {e}")
+
+
+def ensure_heartbeat(redis: Redis):
+    global heartbeat_task
+
+    if not any(redis is connection for connection in heartbeat_connections):
+        heartbeat_connections.append(redis)
+    if heartbeat_task is None or heartbeat_task.done():
+        heartbeat_task = asyncio.create_task(redis_task_heartbeat())
+
+
+def stop_heartbeat():
+    if heartbeat_task is not None:
+        heartbeat_task.cancel()
 
 
 async def cleanup_task(redis, task_id: str, id=None):
@@ -86,6 +224,7 @@ async def cleanup_task(redis, task_id: str, id=None):
         await redis_cleanup_task(redis, task_id, id)
 
     tasks.pop(task_id, None)  # Remove the task if it exists
+    task_registrations.pop(task_id, None)
 
     # If an ID is provided, remove the task from the item_tasks dictionary
     if id and task_id in item_tasks.get(id, []):
@@ -114,7 +253,9 @@ async def create_task(redis, coroutine, id=None):
         item_tasks[id] = [task_id]
 
     if redis:
+        task_registrations[task_id] = (redis, id)
         await redis_save_task(redis, task_id, id)
+        ensure_heartbeat(redis)
 
     return task_id, task
 
@@ -141,16 +282,20 @@ async def stop_task(redis, task_id: str):
     """
     Cancel a running task and remove it from the global task list.
     """
-    if redis:
-        # PUBSUB: All instances check if they have this task, and stop if so.
+    if redis and task_id not in tasks:
+        owner = await redis_get_task_owner(redis, task_id)
+        if owner is None:
+            return {"status": False, "message": f"Task with ID {task_id} not found."}
+
+        # PUBSUB: Only the worker running the task gets the command
         await redis_send_command(
             redis,
             {
                 "action": "stop",
                 "task_id": task_id,
             },
+            owner["worker_id"],
         )
-        # Optionally check if task_id still in Redis a few moments later for feedback?
         return {"status": True, "message": f"Stop signal sent for {task_id}"}
 
     task = tasks.pop(task_id, None)
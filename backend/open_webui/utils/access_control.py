@@ -145,16 +145,28 @@ def has_access(
     permitted_group_ids = permitted_ids.get("group_ids", [])
     permitted_user_ids = permitted_ids.get("user_ids", [])
 
-    return user_id in permitted_user_ids or any(
-        group_id in permitted_group_ids for group_id in user_group_ids
+    return user_id in permitted_user_ids or not set(permitted_group_ids).isdisjoint(
+        user_group_ids
     )
 
 
 # Get all users with access to a resource
 def get_users_with_access(
-    type: str = "write", access_control: Optional[dict] = None
+    type: str = "write",
+    access_control: Optional[dict] = None,
+    user_ids: Optional[Set[str]] = None,
 ) -> list[UserModel]:
+    """
+    Users with `type` access, optionally only among `user_ids`, which avoids
+    loading every user when the caller only cares about a few.
+    """
     if access_control is None:
+        if user_ids is not None:
+            return [
+                user
+                for user in Users.get_users_by_user_ids(list(user_ids))
+                if user.role != "pending"
+            ]
         result = Users.get_users(filter={"roles": ["!pending"]})
         return result.get("users", [])
 
@@ -168,7 +180,12 @@ def get_users_with_access(
     user_ids_with_access = set(permitted_user_ids)
 
     group_user_ids_map = Groups.get_group_user_ids_by_ids(permitted_group_ids)
-    for user_ids in group_user_ids_map.values():
-        user_ids_with_access.update(user_ids)
+    for group_user_ids in group_user_ids_map.values():
+        user_ids_with_access.update(group_user_ids)
+
+    if user_ids is not None:
+        user_ids_with_access &= set(user_ids)
+        if not user_ids_with_access:
+            return []
 
     return Users.get_users_by_user_ids(list(user_ids_with_access))
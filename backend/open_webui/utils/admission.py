@@ -0,0 +1,385 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    ENABLE_ADMISSION_CONTROL,
+    ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_CONTROL_BUDGETS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+
+admitted_counter = meter.create_counter(
+    name="webui.admission.admitted",
+    description="Work admitted per admission class",
+    unit="1",
+)
+rejected_counter = meter.create_counter(
+    name="webui.admission.rejected",
+    description="Work rejected per admission class, by reason",
+    unit="1",
+)
+queue_wait_histogram = meter.create_histogram(
+    name="webui.admission.queue_wait",
+    description="Time spent queued before admission",
+    unit="ms",
+)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+EMBEDDINGS = "embeddings"
+FILES = "files"
+
+# Lower priority values are served first when the worker-wide budget frees up
+DEFAULT_BUDGETS = {
+    INTERACTIVE: {"priority": 0, "limit": 64, "max_queue": 256, "queue_timeout": 15},
+    EMBEDDINGS: {"priority": 1, "limit": 16, "max_queue": 256, "queue_timeout": 30},
+    FILES: {"priority": 2, "limit": 4, "max_queue": 512, "queue_timeout": 600},
+    BACKGROUND: {"priority": 3, "limit": 8, "max_queue": 64, "queue_timeout": 30},
+}
+
+# Type of each budget field, which overrides are coerced to
+BUDGET_FIELDS = {
+    "priority": int,
+    "limit": int,
+    "max_queue": int,
+    "queue_timeout": float,
+}
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, request_class: str, reason: str, retry_after: int):
+        super().__init__(f"{request_class} work rejected: {reason}")
+        self.request_class = request_class
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def http_exception(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="The server is busy, please try again shortly.",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+class _Waiter:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+        self.queued_at = time.monotonic()
+
+    def grant(self):
+        self.granted = True
+        self.loop.call_soon_threadsafe(
+            lambda: self.future.done() or self.future.set_result(None)
+        )
+
+
+class _AdmissionClass:
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        limit: int,
+        max_queue: int,
+        queue_timeout: float,
+    ):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.active = 0
+        self.waiters: deque[_Waiter] = deque()
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "waited": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "queue_wait_ms": 0.0,
+            "hold_ms": 0.0,
+            "completed": 0,
+        }
+
+
+class AdmissionController:
+    """
+    Bounds the work a worker accepts, per class of work.
+
+    Each class (interactive chat, background tasks, embeddings, file
+    processing) has its own concurrency budget and a FIFO queue. An optional
+    worker-wide budget is shared by all classes and handed out by priority,
+    so interactive streams go ahead of queued background work. Work that
+    would find the queue full is rejected right away, and work queued for
+    longer than the class' `queue_timeout` is rejected, both with a
+    Retry-After estimated from the recent service time.
+
+    Only coroutines queue for a slot (`slot`): threadpool code would hold a
+    worker thread while it waits, so it either gets a slot right away or is
+    rejected (`try_acquire`). Slots can be released from any thread. With
+    `enabled` False nothing waits or is rejected, but the per-class
+    counters are still kept.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[dict] = None,
+        max_concurrency: int = 0,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self._lock = threading.Lock()
+
+        self.classes: dict[str, _AdmissionClass] = {}
+        for name, default in DEFAULT_BUDGETS.items():
+            override = (budgets or {}).get(name) or {}
+            budget = {
+                key: self._budget_field(name, key, override.get(key, value), value)
+                for key, value in default.items()
+            }
+            self.classes[name] = _AdmissionClass(name, **budget)
+        self._by_priority = sorted(self.classes.values(), key=lambda c: c.priority)
+
+    @staticmethod
+    def _budget_field(name: str, key: str, value, default):
+        try:
+            return BUDGET_FIELDS[key](value)
+        except (TypeError, ValueError):
+            log.warning(
+                f"Invalid {key} {value!r} for {name} admission, using {default}"
+            )
+            return BUDGET_FIELDS[key](default)
+
+    def _can_run(self, admission_class: _AdmissionClass) -> bool:
+        if not self.enabled:
+            return True
+        if admission_class.limit and admission_class.active >= admission_class.limit:
+            return False
+        return not self.max_concurrency or self.active < self.max_concurrency
+
+    def _admit(self, admission_class: _AdmissionClass):
+        admission_class.active += 1
+        self.active += 1
+        admission_class.stats["admitted"] += 1
+        admitted_counter.add(1, {"class": admission_class.name})
+
+    def _dispatch(self):
+        for admission_class in self._by_priority:
+            while admission_class.waiters and self._can_run(admission_class):
+                waiter = admission_class.waiters.popleft()
+                self._admit(admission_class)
+                waiter.grant()
+
+    def _retry_after(self, admission_class: _AdmissionClass) -> int:
+        completed = admission_class.stats["completed"]
+        hold_seconds = (
+            admission_class.stats["hold_ms"] / completed / 1000.0 if completed else 1.0
+        )
+        slots = admission_class.limit or self.max_concurrency or 1
+        waves = (len(admission_class.waiters) + 1) / slots
+        return min(max(math.ceil(waves * hold_seconds), 1), 60)
+
+    def _reject(self, admission_class: _AdmissionClass, reason: str):
+        stat = "timed_out" if reason == "queue_timeout" else "rejected"
+        admission_class.stats[stat] += 1
+        rejected_counter.add(1, {"class": admission_class.name, "reason": reason})
+        raise AdmissionRejected(
+            admission_class.name, reason, self._retry_after(admission_class)
+        )
+
+    def _enqueue(self, name: str, waiter: _Waiter) -> bool:
+        """
+        Admit right away (True) or queue `waiter` (False); raises when the
+        queue is full.
+        """
+        admission_class = self.classes[name]
+        with self._lock:
+            if not admission_class.waiters and self._can_run(admission_class):
+                self._admit(admission_class)
+                return True
+            if len(admission_class.waiters) >= admission_class.max_queue:
+                self._reject(admission_class, "queue_full")
+            admission_class.waiters.append(waiter)
+            admission_class.stats["queued"] += 1
+            return False
+
+    def _abandon(self, name: str, waiter: _Waiter) -> bool:
+        """
+        Take `waiter` out of the queue; False if it was admitted meanwhile.
+        """
+        admission_class = self.classes[name]
+        with self._lock:
+            if waiter.granted:
+                return False
+            admission_class.waiters.remove(waiter)
+            return True
+
+    def _record_wait(self, name: str, waiter: _Waiter):
+        wait_ms = (time.monotonic() - waiter.queued_at) * 1000.0
+        self.classes[name].stats["waited"] += 1
+        self.classes[name].stats["queue_wait_ms"] += wait_ms
+        queue_wait_histogram.record(wait_ms, {"class": name})
+
+    def check(self, name: str):
+        """
+        Reject early, before doing any work, if the class' queue is full.
+        """
+        admission_class = self.classes[name]
+        with self._lock:
+            if (
+                self.enabled
+                and admission_class.waiters
+                and len(admission_class.waiters) >= admission_class.max_queue
+            ):
+                self._reject(admission_class, "queue_full")
+
+    async def acquire(self, name: str):
+        waiter = _Waiter(asyncio.get_running_loop())
+        if self._enqueue(name, waiter):
+            return
+
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter.future), self.classes[name].queue_timeout
+            )
+        except asyncio.TimeoutError:
+            if self._abandon(name, waiter):
+                with self._lock:
+                    self._reject(self.classes[name], "queue_timeout")
+        except asyncio.CancelledError:
+            if not self._abandon(name, waiter):
+                self.release(name, 0.0)
+            raise
+        self._record_wait(name, waiter)
+
+    def try_acquire(self, name: str):
+        """
+        Take a slot only if one is free and nobody is queued for it, and
+        reject otherwise, without waiting.
+        """
+        admission_class = self.classes[name]
+        with self._lock:
+            if admission_class.waiters or not self._can_run(admission_class):
+                self._reject(admission_class, "busy")
+            self._admit(admission_class)
+
+    def release(self, name: str, held_seconds: float):
+        admission_class = self.classes[name]
+        with self._lock:
+            admission_class.active -= 1
+            self.active -= 1
+            admission_class.stats["completed"] += 1
+            admission_class.stats["hold_ms"] += held_seconds * 1000.0
+            self._dispatch()
+
+    def lease(self, name: str, start: float) -> Callable[[], None]:
+        """
+        Release for the slot taken at `start` that is safe to call from every
+        place the work can end: only the first call gives the slot back.
+        """
+        released = False
+        lock = threading.Lock()
+
+        def release():
+            nonlocal released
+            with lock:
+                if released:
+                    return
+                released = True
+            self.release(name, time.monotonic() - start)
+
+        return release
+
+    def release_after(self, release: Callable[[], None], response):
+        """
+        Call `release` once `response` is sent: at the end of the body for
+        streaming responses, right away otherwise. `release` must be safe to
+        call more than once (see `lease`): a body that is never iterated,
+        because the client left before it started, is also covered by the
+        response's background task and, failing that, by the response being
+        garbage collected.
+        """
+        body_iterator = getattr(response, "body_iterator", None)
+        if body_iterator is None:
+            release()
+            return response
+
+        async def release_when_done():
+            try:
+                async for chunk in body_iterator:
+                    yield chunk
+            finally:
+                release()
+
+        background = response.background
+
+        async def release_then_background():
+            release()
+            if background is not None:
+                await background()
+
+        response.body_iterator = release_when_done()
+        response.background = release_then_background
+        weakref.finalize(response, release)
+        return response
+
+    @asynccontextmanager
+    async def slot(self, name: str):
+        await self.acquire(name)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(name, time.monotonic() - start)
+
+    def get_stats(self) -> dict:
+        classes = {}
+        for admission_class in self._by_priority:
+            stats = admission_class.stats
+            classes[admission_class.name] = {
+                "priority": admission_class.priority,
+                "limit": admission_class.limit,
+                "max_queue": admission_class.max_queue,
+                "queue_timeout": admission_class.queue_timeout,
+                "active": admission_class.active,
+                "queue_depth": len(admission_class.waiters),
+                **stats,
+                "avg_queue_wait_ms": (
+                    stats["queue_wait_ms"] / stats["waited"] if stats["waited"] else 0.0
+                ),
+                "avg_hold_ms": (
+                    stats["hold_ms"] / stats["completed"] if stats["completed"] else 0.0
+                ),
+            }
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "active": self.active,
+            "classes": classes,
+        }
+
+
+ADMISSION_CONTROLLER = AdmissionController(
+    budgets=ADMISSION_CONTROL_BUDGETS,
+    max_concurrency=ADMISSION_MAX_CONCURRENCY,
+    enabled=ENABLE_ADMISSION_CONTROL,
+)
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import Optional
+
+from open_webui.env import SRC_LOG_LEVELS, REDIS_KEY_PREFIX
+from open_webui.models.files import Files
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+REDIS_FILE_STATUS_CHANNEL = f"{REDIS_KEY_PREFIX}:files:status"
+
+FILE_STATUS_TERMINAL = ("completed", "failed")
+
+# Seconds between attempts to re-subscribe after the Redis connection drops
+REDIS_LISTENER_MIN_BACKOFF = 1
+REDIS_LISTENER_MAX_BACKOFF = 30
+
+
+class FileStatusBroker:
+    """
+    In-process pub/sub for file processing status transitions.
+
+    `process_file` runs in a worker thread, while the SSE endpoints wait on the
+    event loop, so `publish` is safe to call from any thread. When Redis is
+    configured every status is published on a shared channel and each worker
+    fans it out to its own local subscribers, so a client connected to worker A
+    still sees files processed on worker B.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    async def start(self, redis=None):
+        self._loop = asyncio.get_running_loop()
+        self._redis = redis
+
+        if self._redis is not None:
+            self._listener = asyncio.create_task(self._redis_listener())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        self._loop = None
+
+    async def _redis_listener(self):
+        backoff = REDIS_LISTENER_MIN_BACKOFF
+        reconnecting = False
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(REDIS_FILE_STATUS_CHANNEL)
+                if reconnecting:
+                    await self._resync()
+                backoff = REDIS_LISTENER_MIN_BACKOFF
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        self._dispatch(json.loads(message["data"]))
+                    except Exception as e:
+                        log.exception(f"Error handling file status event: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(
+                    f"File status subscription lost, reconnecting in {backoff}s: {e}"
+                )
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+            reconnecting = True
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, REDIS_LISTENER_MAX_BACKOFF)
+
+    async def _resync(self):
+        """
+        Replay the terminal status of every subscribed file after a reconnect,
+        since transitions published while unsubscribed were never seen.
+        """
+        with self._lock:
+            file_ids = list(self._subscribers)
+        if not file_ids:
+            return
+
+        files = await asyncio.to_thread(Files.get_files_by_ids, file_ids)
+        for file in files:
+            data = file.data or {}
+            if data.get("status") not in FILE_STATUS_TERMINAL:
+                continue
+            event = {"file_id": file.id, "status": data["status"]}
+            if data.get("error") is not None:
+                event["error"] = data["error"]
+            if data.get("progress") is not None:
+                event["progress"] = data["progress"]
+            self._dispatch(event)
+
+    def subscribe(self, file_ids: list[str]) -> asyncio.Queue:
+        """
+        Register a single queue for one or more file ids, so a client can
+        multiplex many uploads over one stream.
+        """
+        queue = asyncio.Queue()
+        with self._lock:
+            for file_id in file_ids:
+                self._subscribers.setdefault(file_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, file_ids: list[str]):
+        with self._lock:
+            for file_id in file_ids:
+                queues = self._subscribers.get(file_id)
+                if queues is None:
+                    continue
+                queues.discard(queue)
+                if not queues:
+                    self._subscribers.pop(file_id, None)
+
+    def _dispatch(self, event: dict):
+        with self._lock:
+            queues = list(self._subscribers.get(event.get("file_id"), ()))
+        for queue in queues:
+            queue.put_nowait(event)
+
+    async def _publish(self, event: dict):
+        if self._redis is not None:
+            try:
+                await self._redis.publish(REDIS_FILE_STATUS_CHANNEL, json.dumps(event))
+                return
+            except Exception as e:
+                log.warning(f"Failed to publish file status to Redis: {e}")
+        self._dispatch(event)
+
+    def publish(
+        self,
+        file_id: str,
+        status: str,
+        error: Optional[str] = None,
+        progress: Optional[dict] = None,
+    ):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # Not started (e.g. CLI usage); nobody can be listening.
+            return
+
+        event = {"file_id": file_id, "status": status}
+        if error is not None:
+            event["error"] = error
+        if progress is not None:
+            event["progress"] = progress
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            loop.create_task(self._publish(event))
+        else:
+            asyncio.run_coroutine_threadsafe(self._publish(event), loop)
+
+
+FILE_STATUS_BROKER = FileStatusBroker()
+
+
+def update_file_status(
+    file_id: str,
+    status: str,
+    error: Optional[str] = None,
+    progress: Optional[dict] = None,
+):
+    """
+    Persist a processing status transition and notify any status streams.
+    `progress` (e.g. pages and chunks indexed so far) may accompany both
+    intermediate and terminal statuses.
+    """
+    data = {"status": status}
+    if error is not None:
+        data["error"] = error
+    if progress is not None:
+        data["progress"] = progress
+
+    file = Files.update_file_data_by_id(file_id, data)
+    FILE_STATUS_BROKER.publish(file_id, status, error, progress)
+    return file
@@ -0,0 +1,459 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Callable, Optional
+
+import anyio
+from mcp import types
+from mcp.shared.exceptions import McpError
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    MCP_SESSION_POOL_IDLE_TIMEOUT,
+    MCP_SESSION_POOL_KEEPALIVE_INTERVAL,
+    MCP_TOOL_SPECS_CACHE_TTL,
+)
+from open_webui.utils.mcp.client import MCPClient
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+
+sessions_opened_counter = meter.create_counter(
+    name="webui.mcp.sessions.opened",
+    description="MCP sessions opened by the pool (first connects and reconnects)",
+    unit="1",
+)
+sessions_reused_counter = meter.create_counter(
+    name="webui.mcp.sessions.reused",
+    description="Chat requests served by an already connected MCP session",
+    unit="1",
+)
+sessions_closed_counter = meter.create_counter(
+    name="webui.mcp.sessions.closed",
+    description="MCP sessions closed by the pool, by reason",
+    unit="1",
+)
+request_duration_histogram = meter.create_histogram(
+    name="webui.mcp.request.duration",
+    description="Latency of MCP operations per server",
+    unit="ms",
+)
+
+# Errors raised when the underlying streams are already gone: the request
+# never reached the server, so it is safe to reconnect and try again.
+CLOSED_SESSION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+def is_connection_closed_error(e: Exception) -> bool:
+    if isinstance(e, CLOSED_SESSION_ERRORS):
+        return True
+    return (
+        isinstance(e, McpError)
+        and getattr(e.error, "code", None) == types.CONNECTION_CLOSED
+    )
+
+
+class MCPSession:
+    """
+    A single pooled MCP connection.
+
+    The streamable HTTP transport runs inside anyio task groups whose cancel
+    scopes must be entered and exited by the same task, so every session is
+    owned by a dedicated task that connects, waits until the pool closes it
+    and then disconnects. Requests from chat handlers only talk to the
+    already initialized `ClientSession`.
+    """
+
+    def __init__(self, server_id: str, url: str, headers: Optional[dict]):
+        self.server_id = server_id
+        self.url = url
+        self.headers = headers
+
+        self.client: Optional[MCPClient] = None
+        self.error: Optional[Exception] = None
+        self.ready = asyncio.Event()
+
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.last_ping_at = self.created_at
+        self.in_flight = 0
+
+        self.tool_specs: Optional[list] = None
+        self.tool_specs_at: Optional[float] = None
+
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.client is not None and not self._closing.is_set()
+
+    async def _handle_message(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            log.debug(f"MCP server {self.server_id} tool list changed")
+            self.tool_specs = None
+
+    async def _run(self, client_factory: Callable[[], MCPClient]):
+        client = client_factory()
+        try:
+            await client.connect(
+                url=self.url,
+                headers=self.headers,
+                message_handler=self._handle_message,
+            )
+        except BaseException as e:
+            self.error = e if isinstance(e, Exception) else RuntimeError(str(e))
+            self.ready.set()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        self.client = client
+        self.ready.set()
+        try:
+            await self._closing.wait()
+        finally:
+            self.client = None
+            try:
+                await client.disconnect()
+            except Exception as e:
+                log.debug(f"Error disconnecting MCP server {self.server_id}: {e}")
+
+    def start(self, client_factory: Callable[[], MCPClient]):
+        self._task = asyncio.create_task(self._run(client_factory))
+
+    async def close(self):
+        self._closing.set()
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class PooledMCPClient:
+    """
+    Per-request handle to a pooled MCP session, with the same `list_tool_specs`
+    and `call_tool` interface as `MCPClient`. Every call goes through the pool,
+    so a session that dropped in between is transparently reconnected.
+    """
+
+    def __init__(
+        self,
+        pool: "MCPSessionPool",
+        server_id: str,
+        url: str,
+        headers: Optional[dict] = None,
+    ):
+        self.pool = pool
+        self.server_id = server_id
+        self.url = url
+        self.headers = headers
+
+    async def _session(self) -> MCPSession:
+        return await self.pool.acquire(self.server_id, self.url, self.headers)
+
+    async def list_tool_specs(self) -> Optional[list]:
+        session = await self._session()
+        if session.tool_specs is not None and not self.pool.tool_specs_expired(session):
+            self.pool.record(self.server_id, "tool_specs_cache_hits")
+            return list(session.tool_specs)
+
+        self.pool.record(self.server_id, "tool_specs_cache_misses")
+        try:
+            tool_specs = await self.pool.timed(
+                session, "list_tools", session.client.list_tool_specs()
+            )
+        except Exception as e:
+            if not is_connection_closed_error(e):
+                raise
+            # Listing is read-only, always safe to retry on a fresh session.
+            await self.pool.discard(session, reason="error")
+            session = await self._session()
+            tool_specs = await self.pool.timed(
+                session, "list_tools", session.client.list_tool_specs()
+            )
+
+        session.tool_specs = tool_specs
+        session.tool_specs_at = time.monotonic()
+        return list(tool_specs)
+
+    async def call_tool(self, function_name: str, function_args: dict):
+        session = await self._session()
+        try:
+            return await self.pool.timed(
+                session,
+                "call_tool",
+                session.client.call_tool(function_name, function_args),
+            )
+        except CLOSED_SESSION_ERRORS:
+            # The call was never sent, reconnect and send it once more.
+            await self.pool.discard(session, reason="error")
+            session = await self._session()
+            return await self.pool.timed(
+                session,
+                "call_tool",
+                session.client.call_tool(function_name, function_args),
+            )
+        except McpError as e:
+            # The connection dropped mid-call: the tool may have run, so do not
+            # retry, but make sure the next call starts from a fresh session.
+            if is_connection_closed_error(e):
+                await self.pool.discard(session, reason="error")
+            raise
+
+
+class MCPSessionPool:
+    """
+    Long-lived MCP sessions shared between chat requests.
+
+    Sessions are keyed by server id, URL and a hash of the request headers, so
+    every distinct auth identity (bearer key, user session, OAuth token) gets
+    its own connection. Tool listings are cached per session until the server
+    sends a `tools/list_changed` notification or `tool_specs_ttl` expires.
+    `start` runs a maintenance loop that pings idle sessions to keep them
+    alive and reaps the ones unused for `idle_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: int = MCP_SESSION_POOL_IDLE_TIMEOUT,
+        keepalive_interval: int = MCP_SESSION_POOL_KEEPALIVE_INTERVAL,
+        tool_specs_ttl: int = MCP_TOOL_SPECS_CACHE_TTL,
+        client_factory: Callable[[], MCPClient] = MCPClient,
+    ):
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.tool_specs_ttl = tool_specs_ttl
+        self.client_factory = client_factory
+
+        self._sessions: dict[tuple[str, str, str], MCPSession] = {}
+        self._locks: dict[tuple[str, str, str], asyncio.Lock] = {}
+        self._stats: dict[str, dict] = {}
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_key(
+        server_id: str, url: str, headers: Optional[dict]
+    ) -> tuple[str, str, str]:
+        identity = hashlib.sha256(
+            json.dumps(headers or {}, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return (server_id, url, identity)
+
+    def _server_stats(self, server_id: str) -> dict:
+        return self._stats.setdefault(
+            server_id,
+            {
+                "connects": 0,
+                "reconnects": 0,
+                "reused": 0,
+                "reaped": 0,
+                "errors": 0,
+                "tool_specs_cache_hits": 0,
+                "tool_specs_cache_misses": 0,
+                "latency_ms": {},
+            },
+        )
+
+    def record(self, server_id: str, name: str, value: int = 1):
+        self._server_stats(server_id)[name] += value
+
+    def record_latency(self, server_id: str, operation: str, elapsed_ms: float):
+        latency = self._server_stats(server_id)["latency_ms"].setdefault(
+            operation, {"count": 0, "total": 0.0, "last": None}
+        )
+        latency["count"] += 1
+        latency["total"] += elapsed_ms
+        latency["last"] = round(elapsed_ms, 2)
+        request_duration_histogram.record(
+            elapsed_ms, {"server": server_id, "operation": operation}
+        )
+
+    def tool_specs_expired(self, session: MCPSession) -> bool:
+        if not self.tool_specs_ttl or session.tool_specs_at is None:
+            return False
+        return time.monotonic() - session.tool_specs_at >= self.tool_specs_ttl
+
+    async def timed(self, session: MCPSession, operation: str, awaitable):
+        session.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        except Exception:
+            self.record(session.server_id, "errors")
+            raise
+        finally:
+            session.in_flight -= 1
+            session.last_used_at = time.monotonic()
+            self.record_latency(
+                session.server_id,
+                operation,
+                (time.perf_counter() - start) * 1000.0,
+            )
+
+    async def acquire(
+        self, server_id: str, url: str, headers: Optional[dict] = None
+    ) -> MCPSession:
+        key = self.get_key(server_id, url, headers)
+
+        session = self._sessions.get(key)
+        if session is not None and session.alive:
+            session.last_used_at = time.monotonic()
+            return session
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            session = self._sessions.get(key)
+            if session is not None and session.alive:
+                session.last_used_at = time.monotonic()
+                return session
+
+            if session is not None:
+                # The previous session died; replace it.
+                self.record(server_id, "reconnects")
+                await self.discard(session, reason="error")
+
+            session = MCPSession(server_id, url, headers)
+            start = time.perf_counter()
+            session.start(self.client_factory)
+            await session.ready.wait()
+            self.record_latency(
+                server_id, "connect", (time.perf_counter() - start) * 1000.0
+            )
+
+            if session.error is not None:
+                self.record(server_id, "errors")
+                await session.close()
+                raise session.error
+
+            self.record(server_id, "connects")
+            sessions_opened_counter.add(1, {"server": server_id})
+            self._sessions[key] = session
+            return session
+
+    async def get_client(
+        self, server_id: str, url: str, headers: Optional[dict] = None
+    ) -> PooledMCPClient:
+        """
+        Return a client for `server_id`, connecting only if no live session
+        exists yet for this auth identity. Connection errors are raised here.
+        """
+        key = self.get_key(server_id, url, headers)
+        session = self._sessions.get(key)
+        if session is not None and session.alive:
+            self.record(server_id, "reused")
+            sessions_reused_counter.add(1, {"server": server_id})
+
+        await self.acquire(server_id, url, headers)
+        return PooledMCPClient(self, server_id, url, headers)
+
+    async def discard(self, session: MCPSession, reason: str = "closed"):
+        for key, pooled in list(self._sessions.items()):
+            if pooled is session:
+                del self._sessions[key]
+                if not self._locks[key].locked():
+                    self._locks.pop(key, None)
+        sessions_closed_counter.add(1, {"server": session.server_id, "reason": reason})
+        await session.close()
+
+    async def reap(self):
+        """
+        Close idle sessions and ping the remaining ones that have been quiet
+        for `keepalive_interval`, dropping those that no longer answer.
+        """
+        now = time.monotonic()
+        for session in list(self._sessions.values()):
+            if session.in_flight:
+                continue
+
+            if not session.alive:
+                await self.discard(session, reason="error")
+            elif self.idle_timeout and now - session.last_used_at >= self.idle_timeout:
+                self.record(session.server_id, "reaped")
+                await self.discard(session, reason="idle")
+            elif (
+                self.keepalive_interval
+                and now - max(session.last_used_at, session.last_ping_at)
+                >= self.keepalive_interval
+            ):
+                session.last_ping_at = now
+                start = time.perf_counter()
+                try:
+                    with anyio.fail_after(10):
+                        await session.client.ping()
+                    self.record_latency(
+                        session.server_id,
+                        "ping",
+                        (time.perf_counter() - start) * 1000.0,
+                    )
+                except Exception as e:
+                    log.debug(f"MCP server {session.server_id} keep-alive failed: {e}")
+                    self.record(session.server_id, "errors")
+                    await self.discard(session, reason="error")
+
+    async def _maintain(self):
+        intervals = [i for i in (self.idle_timeout, self.keepalive_interval) if i]
+        sweep_interval = max(1, min(intervals) / 2) if intervals else 60
+        while True:
+            await asyncio.sleep(sweep_interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                log.exception(f"MCP session pool maintenance failed: {e}")
+
+    def start(self):
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def close(self):
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            await asyncio.gather(self._maintenance_task, return_exceptions=True)
+            self._maintenance_task = None
+
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._locks.clear()
+        await asyncio.gather(
+            *(session.close() for session in sessions), return_exceptions=True
+        )
+
+    def get_stats(self) -> dict:
+        stats = {}
+        for server_id, values in self._stats.items():
+            stats[server_id] = {
+                **{key: value for key, value in values.items() if key != "latency_ms"},
+                "sessions": 0,
+                "in_flight": 0,
+                "latency_ms": {
+                    operation: {
+                        "count": latency["count"],
+                        "avg": (
+                            round(latency["total"] / latency["count"], 2)
+                            if latency["count"]
+                            else None
+                        ),
+                        "last": latency["last"],
+                    }
+                    for operation, latency in values["latency_ms"].items()
+                },
+            }
+
+        for session in self._sessions.values():
+            server = stats.get(session.server_id)
+            if server is not None:
+                server["sessions"] += 1
+                server["in_flight"] += session.in_flight
+        return stats
+
+
+MCP_SESSION_POOL = MCPSessionPool()
@@ -39,6 +39,7 @@ from open_webui.routers.tasks import (
     generate_follow_ups,
     generate_image_prompt,
     generate_chat_tags,
+    generate_combined_tasks,
 )
 from open_webui.routers.retrieval import (
     process_web_search,
@@ -57,6 +58,11 @@ from open_webui.routers.pipelines import (
 from open_webui.routers.memories import query_memory, QueryMemoryForm
 
 from open_webui.utils.webhook import post_webhook
+from open_webui.utils.admission import (
+    ADMISSION_CONTROLLER,
+    AdmissionRejected,
+    BACKGROUND,
+)
 from open_webui.utils.files import (
     convert_markdown_base64_images,
     get_file_url_from_base64,
@@ -73,7 +79,9 @@ from open_webui.retrieval.utils import get_sources_from_items
 
 from open_webui.utils.chat import generate_chat_completion
 from open_webui.utils.task import (
+    COMBINED_TASK_OUTPUTS,
     get_task_model_id,
+    parse_combined_tasks_output,
     rag_template,
     tools_function_calling_generation_template,
 )
@@ -91,7 +99,11 @@ from open_webui.utils.misc import (
     convert_logit_bias_input_to_json,
     get_content_from_message,
 )
-from open_webui.utils.tools import get_tools, get_updated_tool_function
+from open_webui.utils.tools import (
+    execute_tool_calls,
+    get_tools,
+    get_updated_tool_function,
+)
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
@@ -99,7 +111,8 @@ from open_webui.utils.filter import (
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
-from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.pool import MCP_SESSION_POOL
+from open_webui.utils.payload_stages import StageGraph
 
 
 from open_webui.config import (
@@ -375,26 +388,17 @@ async def chat_completion_tools_handler(
 
             result = json.loads(content)
 
-            async def tool_call_handler(tool_call):
-                nonlocal skip_files
-
+            def get_tool_call_invocation(tool_call):
                 log.debug(f"{tool_call=}")
 
                 tool_function_name = tool_call.get("name", None)
                 if tool_function_name not in tools:
-                    return body, {}
+                    return None
 
+                tool = tools[tool_function_name]
                 tool_function_params = tool_call.get("parameters", {})
 
-                tool = None
-                tool_type = ""
-                direct_tool = False
-
                 try:
-                    tool = tools[tool_function_name]
-                    tool_type = tool.get("type", "")
-                    direct_tool = tool.get("direct", False)
-
                     spec = tool.get("spec", {})
                     allowed_params = (
                         spec.get("parameters", {}).get("properties", {}).keys()
@@ -404,9 +408,17 @@ async def chat_completion_tools_handler(
                         for k, v in tool_function_params.items()
                         if k in allowed_params
                     }
+                except Exception as e:
+                    error = e
+
+                    async def invoke():
+                        raise error
 
+                    return tool_function_name, tool_function_params, invoke
+
+                async def invoke():
                     if tool.get("direct", False):
-                        tool_result = await event_caller(
+                        return await event_caller(
                             {
                                 "type": "execute:tool",
                                 "data": {
@@ -420,10 +432,18 @@ async def chat_completion_tools_handler(
                         )
                     else:
                         tool_function = tool["callable"]
-                        tool_result = await tool_function(**tool_function_params)
+                        return await tool_function(**tool_function_params)
 
-                except Exception as e:
-                    tool_result = str(e)
+                return tool_function_name, tool_function_params, invoke
+
+            async def tool_result_handler(
+                tool_function_name, tool_function_params, tool_result
+            ):
+                nonlocal skip_files
+
+                tool = tools[tool_function_name]
+                tool_type = tool.get("type", "")
+                direct_tool = tool.get("direct", False)
 
                 tool_result, tool_result_files, tool_result_embeds = (
                     process_tool_result(
@@ -459,7 +479,6 @@ async def chat_completion_tools_handler(
                         )
 
                 if tool_result:
-                    tool = tools[tool_function_name]
                     tool_id = tool.get("tool_id", "")
 
                     tool_name = (
@@ -485,19 +504,35 @@ async def chat_completion_tools_handler(
                         }
                     )
 
-                    if (
-                        tools[tool_function_name]
-                        .get("metadata", {})
-                        .get("file_handler", False)
-                    ):
+                    if tool.get("metadata", {}).get("file_handler", False):
                         skip_files = True
 
             # check if "tool_calls" in result
-            if result.get("tool_calls"):
-                for tool_call in result.get("tool_calls"):
-                    await tool_call_handler(tool_call)
-            else:
-                await tool_call_handler(result)
+            tool_calls = (
+                result.get("tool_calls") if result.get("tool_calls") else [result]
+            )
+
+            invocations = [
+                invocation
+                for invocation in map(get_tool_call_invocation, tool_calls)
+                if invocation
+            ]
+
+            # Independent calls run concurrently; results are handled in the
+            # order the model requested them.
+            tool_results = await execute_tool_calls(
+                [
+                    (tools[tool_function_name], tool_function_name, invoke)
+                    for tool_function_name, _, invoke in invocations
+                ]
+            )
+
+            for (tool_function_name, tool_function_params, _), tool_result in zip(
+                invocations, tool_results
+            ):
+                await tool_result_handler(
+                    tool_function_name, tool_function_params, tool_result
+                )
 
         except Exception as e:
             log.debug(f"Error: {e}")
@@ -514,9 +549,7 @@ async def chat_completion_tools_handler(
     return body, {"sources": sources}
 
 
-async def chat_memory_handler(
-    request: Request, form_data: dict, extra_params: dict, user
-):
+async def get_memory_context(request: Request, form_data: dict, user) -> str:
     try:
         results = await query_memory(
             request,
@@ -546,6 +579,14 @@ async def chat_memory_handler(
 
                 user_context += f"{doc_idx + 1}. [{created_at_date}] {doc}\n"
 
+    return user_context
+
+
+async def chat_memory_handler(
+    request: Request, form_data: dict, extra_params: dict, user
+):
+    user_context = await get_memory_context(request, form_data, user)
+
     form_data["messages"] = add_or_update_system_message(
         f"User Context:\n{user_context}\n", form_data["messages"], append=True
     )
@@ -752,13 +793,13 @@ def get_image_urls(delta_images, request, metadata, user) -> list[str]:
     return image_urls
 
 
-async def chat_image_generation_handler(
+async def get_image_generation_context(
     request: Request, form_data: dict, extra_params: dict, user
-):
+) -> str:
     metadata = extra_params.get("__metadata__", {})
     chat_id = metadata.get("chat_id", None)
     if not chat_id:
-        return form_data
+        return ""
 
     __event_emitter__ = extra_params["__event_emitter__"]
 
@@ -922,6 +963,16 @@ async def chat_image_generation_handler(
 
             system_message_content = f"<context>Image generation was attempted but failed because of an error. The system is currently unable to generate the image. Tell the user that the following error occurred: {error_message}</context>"
 
+    return system_message_content
+
+
+async def chat_image_generation_handler(
+    request: Request, form_data: dict, extra_params: dict, user
+):
+    system_message_content = await get_image_generation_context(
+        request, form_data, extra_params, user
+    )
+
     if system_message_content:
         form_data["messages"] = add_or_update_system_message(
             system_message_content, form_data["messages"]
@@ -1099,10 +1150,155 @@ def apply_params_to_form_data(form_data, model):
     return form_data
 
 
+async def get_mcp_tools(
+    request: Request,
+    tool_ids: list[str],
+    user: UserModel,
+    extra_params: dict,
+    event_emitter,
+) -> dict:
+    mcp_clients = {}
+    mcp_tools_dict = {}
+
+    for tool_id in tool_ids:
+        if tool_id.startswith("server:mcp:"):
+            try:
+                server_id = tool_id[len("server:mcp:") :]
+
+                mcp_server_connection = None
+                for (
+                    server_connection
+                ) in request.app.state.config.TOOL_SERVER_CONNECTIONS:
+                    if (
+                        server_connection.get("type", "") == "mcp"
+                        and server_connection.get("info", {}).get("id") == server_id
+                    ):
+                        mcp_server_connection = server_connection
+                        break
+
+                if not mcp_server_connection:
+                    log.error(f"MCP server with id {server_id} not found")
+                    continue
+
+                auth_type = mcp_server_connection.get("auth_type", "")
+                headers = {}
+                if auth_type == "bearer":
+                    headers["Authorization"] = (
+                        f"Bearer {mcp_server_connection.get('key', '')}"
+                    )
+                elif auth_type == "none":
+                    # No authentication
+                    pass
+                elif auth_type == "session":
+                    headers["Authorization"] = (
+                        f"Bearer {request.state.token.credentials}"
+                    )
+                elif auth_type == "system_oauth":
+                    oauth_token = extra_params.get("__oauth_token__", None)
+                    if oauth_token:
+                        headers["Authorization"] = (
+                            f"Bearer {oauth_token.get('access_token', '')}"
+                        )
+                elif auth_type == "oauth_2.1":
+                    try:
+                        splits = server_id.split(":")
+                        server_id = splits[-1] if len(splits) > 1 else server_id
+
+                        oauth_token = await request.app.state.oauth_client_manager.get_oauth_token(
+                            user.id, f"mcp:{server_id}"
+                        )
+
+                        if oauth_token:
+                            headers["Authorization"] = (
+                                f"Bearer {oauth_token.get('access_token', '')}"
+                            )
+                    except Exception as e:
+                        log.error(f"Error getting OAuth token: {e}")
+                        oauth_token = None
+
+                connection_headers = mcp_server_connection.get("headers", None)
+                if connection_headers and isinstance(connection_headers, dict):
+                    for key, value in connection_headers.items():
+                        headers[key] = value
+
+                # Pooled per auth identity: reuses a live session and its
+                # cached tool listing instead of a handshake per request.
+                mcp_clients[server_id] = await MCP_SESSION_POOL.get_client(
+                    server_id,
+                    mcp_server_connection.get("url", ""),
+                    headers=headers if headers else None,
+                )
+
+                function_name_filter_list = mcp_server_connection.get("config", {}).get(
+                    "function_name_filter_list", ""
+                )
+
+                if isinstance(function_name_filter_list, str):
+                    function_name_filter_list = function_name_filter_list.split(",")
+
+                tool_specs = await mcp_clients[server_id].list_tool_specs()
+                for tool_spec in tool_specs:
+
+                    def make_tool_function(client, function_name):
+                        async def tool_function(**kwargs):
+                            return await client.call_tool(
+                                function_name,
+                                function_args=kwargs,
+                            )
+
+                        return tool_function
+
+                    if function_name_filter_list:
+                        if not is_string_allowed(
+                            tool_spec["name"], function_name_filter_list
+                        ):
+                            # Skip this function
+                            continue
+
+                    tool_function = make_tool_function(
+                        mcp_clients[server_id], tool_spec["name"]
+                    )
+
+                    mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
+                        "spec": {
+                            **tool_spec,
+                            "name": f"{server_id}_{tool_spec['name']}",
+                        },
+                        "callable": tool_function,
+                        "type": "mcp",
+                        "client": mcp_clients[server_id],
+                        "direct": False,
+                        "metadata": {
+                            "parallel": mcp_server_connection.get("config", {}).get(
+                                "parallel_tool_calls", True
+                            ),
+                        },
+                    }
+            except Exception as e:
+                log.debug(e)
+                if event_emitter:
+                    await event_emitter(
+                        {
+                            "type": "chat:message:error",
+                            "data": {
+                                "error": {
+                                    "content": f"Failed to connect to MCP server '{server_id}'"
+                                }
+                            },
+                        }
+                    )
+                continue
+
+    return mcp_tools_dict
+
+
 async def process_chat_payload(request, form_data, user, metadata, model):
     # Pipeline Inlet -> Filter Inlet -> Chat Memory -> Chat Web Search -> Chat Image Generation
     # -> Chat Code Interpreter (Form Data Update) -> (Default) Chat Tools Function Calling
     # -> Chat Files
+    # Memory, web search, image generation and MCP tool loading run
+    # concurrently, as do tool loading / calling and file retrieval.
+    payload_started_at = time.perf_counter()
 
     form_data = apply_params_to_form_data(form_data, model)
     log.debug(f"form_data: {form_data}")
@@ -1246,46 +1442,92 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     except Exception as e:
         raise Exception(f"{e}")
 
-    features = form_data.pop("features", None)
-    if features:
-        if "voice" in features and features["voice"]:
-            if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != None:
-                if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != "":
-                    template = request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE
-                else:
-                    template = DEFAULT_VOICE_MODE_PROMPT_TEMPLATE
-
-                form_data["messages"] = add_or_update_system_message(
-                    template,
-                    form_data["messages"],
-                )
+    features = form_data.pop("features", None) or {}
+    if features.get("voice"):
+        if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != None:
+            if request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE != "":
+                template = request.app.state.config.VOICE_MODE_PROMPT_TEMPLATE
+            else:
+                template = DEFAULT_VOICE_MODE_PROMPT_TEMPLATE
 
-        if "memory" in features and features["memory"]:
-            form_data = await chat_memory_handler(
-                request, form_data, extra_params, user
+            form_data["messages"] = add_or_update_system_message(
+                template,
+                form_data["messages"],
             )
 
-        if "web_search" in features and features["web_search"]:
-            form_data = await chat_web_search_handler(
-                request, form_data, extra_params, user
-            )
+    # Server side tools
+    tool_ids = form_data.pop("tool_ids", None)
+    # Client side tools
+    direct_tool_servers = metadata.get("tool_servers", None)
 
-        if "image_generation" in features and features["image_generation"]:
-            form_data = await chat_image_generation_handler(
-                request, form_data, extra_params, user
-            )
+    log.debug(f"{tool_ids=}")
+    log.debug(f"{direct_tool_servers=}")
 
-        if "code_interpreter" in features and features["code_interpreter"]:
-            form_data["messages"] = add_or_update_user_message(
-                (
-                    request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE
-                    if request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE != ""
-                    else DEFAULT_CODE_INTERPRETER_PROMPT
-                ),
-                form_data["messages"],
-            )
+    # Memory lookup, web search, image generation and MCP tool loading do not
+    # depend on each other: run them concurrently, then apply their results
+    # to the messages in a fixed order.
+    feature_stages = StageGraph(event_emitter, started_at=payload_started_at)
+
+    if features.get("memory"):
+        feature_stages.add(
+            "memory",
+            lambda emitter: get_memory_context(request, form_data, user),
+        )
+
+    if features.get("web_search"):
+        feature_stages.add(
+            "web_search",
+            lambda emitter: chat_web_search_handler(
+                request,
+                form_data,
+                {**extra_params, "__event_emitter__": emitter},
+                user,
+            ),
+        )
+
+    if features.get("image_generation"):
+        feature_stages.add(
+            "image_generation",
+            lambda emitter: get_image_generation_context(
+                request,
+                form_data,
+                {**extra_params, "__event_emitter__": emitter},
+                user,
+            ),
+        )
+
+    if tool_ids:
+        feature_stages.add(
+            "mcp_tools",
+            lambda emitter: get_mcp_tools(
+                request, tool_ids, user, extra_params, emitter
+            ),
+        )
+
+    feature_results = await feature_stages.run()
+
+    if "memory" in feature_results:
+        form_data["messages"] = add_or_update_system_message(
+            f"User Context:\n{feature_results['memory']}\n",
+            form_data["messages"],
+            append=True,
+        )
+
+    if feature_results.get("image_generation"):
+        form_data["messages"] = add_or_update_system_message(
+            feature_results["image_generation"], form_data["messages"]
+        )
+
+    if features.get("code_interpreter"):
+        form_data["messages"] = add_or_update_user_message(
+            (
+                request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE
+                if request.app.state.config.CODE_INTERPRETER_PROMPT_TEMPLATE != ""
+                else DEFAULT_CODE_INTERPRETER_PROMPT
+            ),
+            form_data["messages"],
+        )
 
-    tool_ids = form_data.pop("tool_ids", None)
     files = form_data.pop("files", None)
 
     prompt = get_last_user_message(form_data["messages"])
@@ -1319,196 +1561,106 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     }
     form_data["metadata"] = metadata
 
-    # Server side tools
-    tool_ids = metadata.get("tool_ids", None)
-    # Client side tools
-    direct_tool_servers = metadata.get("tool_servers", None)
-
-    log.debug(f"{tool_ids=}")
-    log.debug(f"{direct_tool_servers=}")
-
-    tools_dict = {}
-
-    mcp_clients = {}
-    mcp_tools_dict = {}
-
-    if tool_ids:
-        for tool_id in tool_ids:
-            if tool_id.startswith("server:mcp:"):
-                try:
-                    server_id = tool_id[len("server:mcp:") :]
-
-                    mcp_server_connection = None
-                    for (
-                        server_connection
-                    ) in request.app.state.config.TOOL_SERVER_CONNECTIONS:
-                        if (
-                            server_connection.get("type", "") == "mcp"
-                            and server_connection.get("info", {}).get("id") == server_id
-                        ):
-                            mcp_server_connection = server_connection
-                            break
-
-                    if not mcp_server_connection:
-                        log.error(f"MCP server with id {server_id} not found")
-                        continue
-
-                    auth_type = mcp_server_connection.get("auth_type", "")
-                    headers = {}
-                    if auth_type == "bearer":
-                        headers["Authorization"] = (
-                            f"Bearer {mcp_server_connection.get('key', '')}"
-                        )
-                    elif auth_type == "none":
-                        # No authentication
-                        pass
-                    elif auth_type == "session":
-                        headers["Authorization"] = (
-                            f"Bearer {request.state.token.credentials}"
-                        )
-                    elif auth_type == "system_oauth":
-                        oauth_token = extra_params.get("__oauth_token__", None)
-                        if oauth_token:
-                            headers["Authorization"] = (
-                                f"Bearer {oauth_token.get('access_token', '')}"
-                            )
-                    elif auth_type == "oauth_2.1":
-                        try:
-                            splits = server_id.split(":")
-                            server_id = splits[-1] if len(splits) > 1 else server_id
-
-                            oauth_token = await request.app.state.oauth_client_manager.get_oauth_token(
-                                user.id, f"mcp:{server_id}"
-                            )
-
-                            if oauth_token:
-                                headers["Authorization"] = (
-                                    f"Bearer {oauth_token.get('access_token', '')}"
-                                )
-                        except Exception as e:
-                            log.error(f"Error getting OAuth token: {e}")
-                            oauth_token = None
-
-                    connection_headers = mcp_server_connection.get("headers", None)
-                    if connection_headers and isinstance(connection_headers, dict):
-                        for key, value in connection_headers.items():
-                            headers[key] = value
-
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
-                    )
-
-                    function_name_filter_list = mcp_server_connection.get(
-                        "config", {}
-                    ).get("function_name_filter_list", "")
-
-                    if isinstance(function_name_filter_list, str):
-                        function_name_filter_list = function_name_filter_list.split(",")
+    native_function_calling = (
+        metadata.get("params", {}).get("function_calling") == "native"
+    )
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
-                    for tool_spec in tool_specs:
+    # Tool loading, (default mode) tool calling and file retrieval
+    payload_stages = StageGraph(event_emitter, started_at=payload_started_at)
 
-                        def make_tool_function(client, function_name):
-                            async def tool_function(**kwargs):
-                                return await client.call_tool(
-                                    function_name,
-                                    function_args=kwargs,
-                                )
+    async def load_tools(emitter):
+        tools_dict = {}
 
-                            return tool_function
+        if tool_ids:
+            tools_dict = await get_tools(
+                request,
+                tool_ids,
+                user,
+                {
+                    **extra_params,
+                    "__model__": models[task_model_id],
+                    "__messages__": form_data["messages"],
+                    "__files__": metadata.get("files", []),
+                },
+            )
 
-                        if function_name_filter_list:
-                            if not is_string_allowed(
-                                tool_spec["name"], function_name_filter_list
-                            ):
-                                # Skip this function
-                                continue
+            if feature_results.get("mcp_tools"):
+                tools_dict = {**tools_dict, **feature_results["mcp_tools"]}
 
-                        tool_function = make_tool_function(
-                            mcp_clients[server_id], tool_spec["name"]
-                        )
+        if direct_tool_servers:
+            for tool_server in direct_tool_servers:
+                tool_specs = tool_server.pop("specs", [])
 
-                        mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
-                            "spec": {
-                                **tool_spec,
-                                "name": f"{server_id}_{tool_spec['name']}",
-                            },
-                            "callable": tool_function,
-                            "type": "mcp",
-                            "client": mcp_clients[server_id],
-                            "direct": False,
-                        }
-                except Exception as e:
-                    log.debug(e)
-                    if event_emitter:
-                        await event_emitter(
-                            {
-                                "type": "chat:message:error",
-                                "data": {
-                                    "error": {
-                                        "content": f"Failed to connect to MCP server '{server_id}'"
-                                    }
-                                },
-                            }
-                        )
-                    continue
-
-        tools_dict = await get_tools(
-            request,
-            tool_ids,
-            user,
-            {
-                **extra_params,
-                "__model__": models[task_model_id],
-                "__messages__": form_data["messages"],
-                "__files__": metadata.get("files", []),
-            },
-        )
-
-        if mcp_tools_dict:
-            tools_dict = {**tools_dict, **mcp_tools_dict}
+                for tool in tool_specs:
+                    tools_dict[tool["name"]] = {
+                        "spec": tool,
+                        "direct": True,
+                        "server": tool_server,
+                    }
 
-    if direct_tool_servers:
-        for tool_server in direct_tool_servers:
-            tool_specs = tool_server.pop("specs", [])
+        return tools_dict
 
-            for tool in tool_specs:
-                tools_dict[tool["name"]] = {
-                    "spec": tool,
-                    "direct": True,
-                    "server": tool_server,
-                }
+    async def call_tools(emitter):
+        tools_dict = await payload_stages.wait("tools")
+        if not tools_dict:
+            return []
 
-    if mcp_clients:
-        metadata["mcp_clients"] = mcp_clients
+        # If the function calling is not native, then call the tools function calling handler
+        try:
+            _, flags = await chat_completion_tools_handler(
+                request,
+                form_data,
+                {**extra_params, "__event_emitter__": emitter},
+                user,
+                models,
+                tools_dict,
+            )
+            return flags.get("sources", [])
+        except Exception as e:
+            log.exception(e)
+            return []
 
-    if tools_dict:
-        if metadata.get("params", {}).get("function_calling") == "native":
-            # If the function calling is native, then call the tools function calling handler
-            metadata["tools"] = tools_dict
-            form_data["tools"] = [
-                {"type": "function", "function": tool.get("spec", {})}
+    async def retrieve_files(emitter):
+        if "tool_calling" in payload_stages:
+            tools_dict = await payload_stages.wait("tools")
+            if any(
+                tool.get("metadata", {}).get("file_handler", False)
                 for tool in tools_dict.values()
-            ]
-        else:
-            # If the function calling is not native, then call the tools function calling handler
-            try:
-                form_data, flags = await chat_completion_tools_handler(
-                    request, form_data, extra_params, user, models, tools_dict
-                )
-                sources.extend(flags.get("sources", []))
-            except Exception as e:
-                log.exception(e)
+            ):
+                # A file handler tool may take the files over, in which case
+                # they must not be retrieved.
+                await payload_stages.wait("tool_calling")
 
-    try:
-        form_data, flags = await chat_completion_files_handler(
-            request, form_data, extra_params, user
-        )
-        sources.extend(flags.get("sources", []))
-    except Exception as e:
-        log.exception(e)
+        try:
+            _, flags = await chat_completion_files_handler(
+                request,
+                form_data,
+                {**extra_params, "__event_emitter__": emitter},
+                user,
+            )
+            return flags.get("sources", [])
+        except Exception as e:
+            log.exception(e)
+            return []
+
+    payload_stages.add("tools", load_tools)
+    if not native_function_calling:
+        payload_stages.add("tool_calling", call_tools, deps=("tools",))
+    payload_stages.add("files", retrieve_files)
+
+    payload_results = await payload_stages.run()
+
+    tools_dict = payload_results["tools"]
+    if tools_dict and native_function_calling:
+        # If the function calling is native, then call the tools function calling handler
+        metadata["tools"] = tools_dict
+        form_data["tools"] = [
+            {"type": "function", "function": tool.get("spec", {})}
+            for tool in tools_dict.values()
+        ]
+
+    sources.extend(payload_results.get("tool_calling", []))
+    sources.extend(payload_results["files"])
 
     # If context is not empty, insert it into the messages
     if len(sources) > 0:
@@ -1578,16 +1730,81 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     return form_data, metadata, events
 
 
+def get_pending_background_tasks(
+    tasks: Optional[dict], chat, message_id: str
+) -> Optional[dict]:
+    """
+    The requested background tasks whose results the chat doesn't have yet.
+    Title and tags are only requested with the first response, so a chat
+    that already has another response (a regeneration) keeps its title.
+    """
+    if not tasks or chat is None:
+        return tasks
+
+    pending = dict(tasks)
+    messages_map = chat.chat.get("history", {}).get("messages", {}) or {}
+
+    if chat.chat.get("title", "New Chat") != "New Chat" and any(
+        id != message_id and message.get("role") == "assistant"
+        for id, message in messages_map.items()
+    ):
+        pending.pop(TASKS.TITLE_GENERATION, None)
+    if (chat.meta or {}).get("tags"):
+        pending.pop(TASKS.TAGS_GENERATION, None)
+    if messages_map.get(message_id, {}).get("followUps"):
+        pending.pop(TASKS.FOLLOW_UP_GENERATION, None)
+    return pending
+
+
+def get_combined_task_response(combined: dict, task: str) -> Optional[dict]:
+    """
+    A task's result from the combined call, shaped like its own completion.
+    """
+    if task not in combined:
+        return None
+    output = {COMBINED_TASK_OUTPUTS[task]["key"]: combined[task]}
+    return {"choices": [{"message": {"content": json.dumps(output)}}]}
+
+
 async def process_chat_response(
-    request, response, form_data, user, metadata, model, events, tasks
+    request,
+    response,
+    form_data,
+    user,
+    metadata,
+    model,
+    events,
+    tasks,
+    release_interactive=None,
 ):
     async def background_tasks_handler():
+        # The answer is complete, so give its interactive slot back before
+        # queuing for a background one; holding both can deadlock the
+        # worker-wide budget
+        if release_interactive:
+            release_interactive()
+
+        # Title, tags and follow-ups wait behind interactive work, and are
+        # skipped when the worker is too busy for them
+        try:
+            async with ADMISSION_CONTROLLER.slot(BACKGROUND):
+                await run_background_tasks()
+        except AdmissionRejected as e:
+            log.warning(f"Skipping background tasks: {e}")
+
+    async def run_background_tasks():
         message = None
         messages = []
 
         if "chat_id" in metadata and not metadata["chat_id"].startswith("local:"):
-            messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
+            chat = Chats.get_chat_by_id(metadata["chat_id"])
+            messages_map = (
+                chat.chat.get("history", {}).get("messages", {}) or {} if chat else None
+            )
             message = messages_map.get(metadata["message_id"]) if messages_map else None
+            pending_tasks = get_pending_background_tasks(
+                tasks, chat, metadata["message_id"]
+            )
 
             message_list = get_message_list(messages_map, metadata["message_id"])
 
@@ -1627,14 +1844,60 @@ async def process_chat_response(
             messages = form_data.get("messages", [])
             if message:
                 message["model"] = form_data.get("model")
+            pending_tasks = tasks
 
         if message and "model" in message:
-            if tasks and messages:
+            if pending_tasks and messages:
+                # Title, tags and follow-ups in one structured-output call
+                # where the task model supports it; tasks it leaves out or
+                # doesn't answer are generated on their own below
+                combined = {}
+                combined_tasks = [
+                    task
+                    for task in (
+                        TASKS.TITLE_GENERATION,
+                        TASKS.TAGS_GENERATION,
+                        TASKS.FOLLOW_UP_GENERATION,
+                    )
+                    if pending_tasks.get(task)
+                    and (
+                        task == TASKS.FOLLOW_UP_GENERATION
+                        or not metadata.get("chat_id", "").startswith("local:")
+                    )
+                ]
                 if (
-                    TASKS.FOLLOW_UP_GENERATION in tasks
-                    and tasks[TASKS.FOLLOW_UP_GENERATION]
+                    len(combined_tasks) > 1
+                    and request.app.state.config.ENABLE_COMBINED_TASKS_GENERATION
                 ):
-                    res = await generate_follow_ups(
+                    try:
+                        res = await generate_combined_tasks(
+                            request,
+                            {
+                                "model": message["model"],
+                                "messages": messages,
+                                "tasks": combined_tasks,
+                                "chat_id": metadata["chat_id"],
+                            },
+                            user,
+                        )
+                        if isinstance(res, dict) and len(res.get("choices", [])) == 1:
+                            response_message = res["choices"][0].get("message", {})
+                            combined = parse_combined_tasks_output(
+                                response_message.get("content")
+                                or response_message.get("reasoning_content")
+                                or "",
+                                combined_tasks,
+                            )
+                    except Exception as e:
+                        log.debug(f"Generating background tasks separately: {e}")
+
+                if (
+                    TASKS.FOLLOW_UP_GENERATION in pending_tasks
+                    and pending_tasks[TASKS.FOLLOW_UP_GENERATION]
+                ):
+                    res = get_combined_task_response(
+                        combined, TASKS.FOLLOW_UP_GENERATION
+                    ) or await generate_follow_ups(
                         request,
                         {
                             "model": message["model"],
@@ -1690,14 +1953,16 @@ async def process_chat_response(
                 if not metadata.get("chat_id", "").startswith(
                     "local:"
                 ):  # Only update titles and tags for non-temp chats
-                    if TASKS.TITLE_GENERATION in tasks:
+                    if TASKS.TITLE_GENERATION in pending_tasks:
                         user_message = get_last_user_message(messages)
                         if user_message and len(user_message) > 100:
                             user_message = user_message[:100] + "..."
 
                         title = None
-                        if tasks[TASKS.TITLE_GENERATION]:
-                            res = await generate_title(
+                        if pending_tasks[TASKS.TITLE_GENERATION]:
+                            res = get_combined_task_response(
+                                combined, TASKS.TITLE_GENERATION
+                            ) or await generate_title(
                                 request,
                                 {
                                     "model": message["model"],
@@ -1760,8 +2025,13 @@ async def process_chat_response(
                                 }
                             )
 
-                    if TASKS.TAGS_GENERATION in tasks and tasks[TASKS.TAGS_GENERATION]:
-                        res = await generate_chat_tags(
+                    if (
+                        TASKS.TAGS_GENERATION in pending_tasks
+                        and pending_tasks[TASKS.TAGS_GENERATION]
+                    ):
+                        res = get_combined_task_response(
+                            combined, TASKS.TAGS_GENERATION
+                        ) or await generate_chat_tags(
                             request,
                             {
                                 "model": message["model"],
@@ -2847,10 +3117,9 @@ async def process_chat_response(
 
                     tools = metadata.get("tools", {})
 
-                    results = []
+                    invocations = []
 
                     for tool_call in response_tool_calls:
-                        tool_call_id = tool_call.get("id", "")
                         tool_function_name = tool_call.get("function", {}).get(
                             "name", ""
                         )
@@ -2882,39 +3151,34 @@ async def process_chat_response(
                             tool_function_params
                         )
 
-                        tool_result = None
-                        tool = None
-                        tool_type = None
-                        direct_tool = False
-
-                        if tool_function_name in tools:
-                            tool = tools[tool_function_name]
-                            spec = tool.get("spec", {})
-
-                            tool_type = tool.get("type", "")
-                            direct_tool = tool.get("direct", False)
+                        if tool_function_name not in tools:
+                            continue
 
-                            try:
+                        def make_tool_invocation(
+                            tool, tool_function_name, tool_function_params
+                        ):
+                            async def invoke():
+                                spec = tool.get("spec", {})
                                 allowed_params = (
                                     spec.get("parameters", {})
                                     .get("properties", {})
                                     .keys()
                                 )
 
-                                tool_function_params = {
+                                tool_function_params_allowed = {
                                     k: v
                                     for k, v in tool_function_params.items()
                                     if k in allowed_params
                                 }
 
-                                if direct_tool:
-                                    tool_result = await event_caller(
+                                if tool.get("direct", False):
+                                    return await event_caller(
                                         {
                                             "type": "execute:tool",
                                             "data": {
                                                 "id": str(uuid4()),
                                                 "name": tool_function_name,
-                                                "params": tool_function_params,
+                                                "params": tool_function_params_allowed,
                                                 "server": tool.get("server", {}),
                                                 "session_id": metadata.get(
                                                     "session_id", None
@@ -2923,23 +3187,53 @@ async def process_chat_response(
                                         }
                                     )
 
-                                else:
-                                    tool_function = get_updated_tool_function(
-                                        function=tool["callable"],
-                                        extra_params={
-                                            "__messages__": form_data.get(
-                                                "messages", []
-                                            ),
-                                            "__files__": metadata.get("files", []),
-                                        },
-                                    )
+                                tool_function = get_updated_tool_function(
+                                    function=tool["callable"],
+                                    extra_params={
+                                        "__messages__": form_data.get("messages", []),
+                                        "__files__": metadata.get("files", []),
+                                    },
+                                )
 
-                                    tool_result = await tool_function(
-                                        **tool_function_params
-                                    )
+                                return await tool_function(
+                                    **tool_function_params_allowed
+                                )
 
-                            except Exception as e:
-                                tool_result = str(e)
+                            return invoke
+
+                        invocations.append(
+                            (
+                                tools[tool_function_name],
+                                tool_function_name,
+                                make_tool_invocation(
+                                    tools[tool_function_name],
+                                    tool_function_name,
+                                    tool_function_params,
+                                ),
+                            )
+                        )
+
+                    # Independent calls run concurrently; results are passed
+                    # back to the model in the order it requested them.
+                    tool_results = iter(await execute_tool_calls(invocations))
+
+                    results = []
+
+                    for tool_call in response_tool_calls:
+                        tool_call_id = tool_call.get("id", "")
+                        tool_function_name = tool_call.get("function", {}).get(
+                            "name", ""
+                        )
+
+                        tool_result = None
+                        tool_type = None
+                        direct_tool = False
+
+                        if tool_function_name in tools:
+                            tool = tools[tool_function_name]
+                            tool_type = tool.get("type", "")
+                            direct_tool = tool.get("direct", False)
+                            tool_result = next(tool_results)
 
                         tool_result, tool_result_files, tool_result_embeds = (
                             process_tool_result(
@@ -0,0 +1,160 @@
+import asyncio
+import copy
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS, ENABLE_FORWARD_USER_INFO_HEADERS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+
+class ModelDiscoveryCache:
+    """
+    Stale-while-revalidate cache for the model lists of upstream connections.
+
+    Only the very first load waits on the upstreams. Once a list has been
+    fetched it is served immediately; when it is older than `ttl` a single
+    background refresh is started and callers keep getting the last good list
+    until it completes, so one slow or dead connection never stalls the model
+    picker. Per-connection health is tracked alongside, and a connection that
+    fails a refresh keeps contributing its last good response.
+    """
+
+    def __init__(self, name: str, ttl: Optional[int]):
+        self.name = name
+        self.ttl = ttl
+
+        self._entries: dict[str, dict] = {}
+        self._refreshes: dict[str, asyncio.Task] = {}
+        self._connections: dict[tuple[int, str], dict] = {}
+        # Bumped by `invalidate` so refreshes started before it are discarded
+        self._generation = 0
+
+    def _is_stale(self, entry: dict) -> bool:
+        if self.ttl is None:
+            return False
+        return time.monotonic() - entry["refreshed_at"] >= self.ttl
+
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        # Callers replace top-level lists (e.g. access filtering); never let
+        # that leak into the shared entry.
+        if isinstance(value, dict):
+            return {
+                key: (list(item) if isinstance(item, list) else item)
+                for key, item in value.items()
+            }
+        return value
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        generation = self._generation
+        try:
+            value = await fetch()
+            if generation == self._generation:
+                self._entries[key] = {
+                    "value": value,
+                    "refreshed_at": time.monotonic(),
+                }
+            return value
+        finally:
+            if self._refreshes.get(key) is asyncio.current_task():
+                del self._refreshes[key]
+
+    def _start_refresh(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = self._refreshes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, fetch))
+            task.add_done_callback(self._log_refresh_error)
+            self._refreshes[key] = task
+        return task
+
+    def _log_refresh_error(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            log.error(f"{self.name} model refresh failed: {task.exception()}")
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            # Nothing to serve yet; concurrent callers share one fetch.
+            value = await asyncio.shield(self._start_refresh(key, fetch))
+            return self._copy(value)
+
+        if self._is_stale(entry):
+            self._start_refresh(key, fetch)
+        return self._copy(entry["value"])
+
+    def invalidate(self):
+        """
+        Drop every cached list, e.g. after the connections were reconfigured.
+        Refreshes still in flight finish for their callers but are not cached.
+        """
+        self._generation += 1
+        self._entries.clear()
+        self._refreshes.clear()
+        self._connections.clear()
+
+    async def fetch_connection(
+        self, idx: int, url: str, request: Awaitable[Optional[Any]]
+    ) -> Optional[Any]:
+        """
+        Await one connection's model list, recording its health. A failed
+        connection falls back to its last good response.
+        """
+        connection = self._connections.setdefault(
+            (idx, url),
+            {
+                "idx": idx,
+                "url": url,
+                "healthy": None,
+                "last_refresh_at": None,
+                "last_success_at": None,
+                "last_error": None,
+                "latency_ms": None,
+                "response": None,
+            },
+        )
+
+        start = time.perf_counter()
+        try:
+            response = await request
+            error = None if response else "No response"
+        except Exception as e:
+            response = None
+            error = str(e)
+
+        connection["latency_ms"] = round((time.perf_counter() - start) * 1000.0, 2)
+        connection["last_refresh_at"] = int(time.time())
+
+        if error is None:
+            connection["healthy"] = True
+            connection["last_success_at"] = connection["last_refresh_at"]
+            connection["last_error"] = None
+            connection["response"] = copy.deepcopy(response)
+            return response
+
+        connection["healthy"] = False
+        connection["last_error"] = error
+        if connection["response"] is not None:
+            log.warning(
+                f"{self.name} connection {idx} ({url}) failed, serving last good model list"
+            )
+            return copy.deepcopy(connection["response"])
+        return None
+
+    def get_connections(self) -> list[dict]:
+        return [
+            {key: value for key, value in connection.items() if key != "response"}
+            for connection in self._connections.values()
+        ]
+
+
+def get_models_cache_key(prefix: str, user) -> str:
+    # The model list is shared by every user, unless user info is forwarded
+    # upstream, in which case each user may legitimately see a different list.
+    if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+        return f"{prefix}_{user.id}"
+    return prefix
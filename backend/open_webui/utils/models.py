@@ -369,6 +369,8 @@ def get_filtered_models(models, user):
     ) and not BYPASS_MODEL_ACCESS_CONTROL:
         filtered_models = []
         user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+        # One query for the whole catalog instead of one lookup per model
+        model_access_records = Models.get_model_access_records()
         for model in models:
             if model.get("arena"):
                 if has_access(
@@ -382,15 +384,16 @@ def get_filtered_models(models, user):
                     filtered_models.append(model)
                 continue
 
-            model_info = Models.get_model_by_id(model["id"])
-            if model_info:
+            model_access = model_access_records.get(model["id"])
+            if model_access:
+                owner_id, access_control = model_access
                 if (
                     (user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL)
-                    or user.id == model_info.user_id
+                    or user.id == owner_id
                     or has_access(
                         user.id,
                         type="read",
-                        access_control=model_info.access_control,
+                        access_control=access_control,
                         user_group_ids=user_group_ids,
                     )
                 ):
@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from open_webui.constants import ERROR_MESSAGES
+
+
+def encode_cursor(cursor: Optional[tuple[int, str]]) -> Optional[str]:
+    """Encode a (timestamp, id) keyset cursor as an opaque URL-safe string."""
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[tuple[int, str]]:
+    if not cursor:
+        return None
+    try:
+        timestamp, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(timestamp), str(id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid cursor"),
+        )
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from opentelemetry import metrics
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+
+stage_duration_histogram = meter.create_histogram(
+    name="webui.chat.payload.stage.duration",
+    description="Time spent in each chat payload pre-processing stage",
+    unit="ms",
+)
+stage_finished_histogram = meter.create_histogram(
+    name="webui.chat.payload.stage.finished",
+    description="Time from the start of pre-processing until a stage finished, "
+    "i.e. its contribution to time-to-first-token",
+    unit="ms",
+)
+
+
+class StageEventSequencer:
+    """
+    Keeps events of concurrently running stages in stage order.
+
+    The earliest unfinished stage emits straight through; events of later
+    stages are buffered and flushed, in order, once every stage before them
+    has finished. The client therefore sees the same event order as if the
+    stages had run one after another, while the first stage still streams
+    its progress live.
+    """
+
+    def __init__(self, event_emitter: Optional[Callable], stage_names: list[str]):
+        self.event_emitter = event_emitter
+        self.stage_names = stage_names
+
+        self._head = 0
+        self._finished: set[str] = set()
+        self._buffers: dict[str, list] = {name: [] for name in stage_names}
+        self._lock = asyncio.Lock()
+
+    def _is_head(self, name: str) -> bool:
+        return (
+            self._head < len(self.stage_names) and self.stage_names[self._head] == name
+        )
+
+    def get_emitter(self, name: str) -> Optional[Callable]:
+        if not self.event_emitter:
+            return self.event_emitter
+
+        async def emitter(event):
+            async with self._lock:
+                if self._is_head(name):
+                    await self.event_emitter(event)
+                else:
+                    self._buffers[name].append(event)
+
+        return emitter
+
+    async def finish(self, name: str):
+        async with self._lock:
+            self._finished.add(name)
+            while (
+                self._head < len(self.stage_names)
+                and self.stage_names[self._head] in self._finished
+            ):
+                self._head += 1
+                if self._head < len(self.stage_names):
+                    for event in self._buffers.pop(self.stage_names[self._head]):
+                        await self.event_emitter(event)
+
+
+class StageGraph:
+    """
+    Runs chat payload pre-processing stages as a dependency graph.
+
+    Every stage starts as soon as the stages it depends on have finished, so
+    independent work (memory lookup, web search, tool loading, file retrieval)
+    overlaps instead of adding up. Stages receive an event emitter that keeps
+    their events in registration order, and may `wait` on other stages for
+    dependencies only known at run time. Per-stage durations are recorded.
+    """
+
+    def __init__(
+        self,
+        event_emitter: Optional[Callable] = None,
+        started_at: Optional[float] = None,
+    ):
+        self.event_emitter = event_emitter
+        # `time.perf_counter()` reference for `finished_ms`, e.g. when the
+        # request started rather than when this graph started.
+        self.started_at = started_at
+
+        self._stages: dict[str, tuple[Callable, tuple[str, ...]]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.timings: dict[str, dict[str, float]] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[Optional[Callable]], Awaitable[Any]],
+        deps: tuple[str, ...] = (),
+    ):
+        """
+        Register `fn(event_emitter)` as stage `name`. Dependencies that were
+        not registered (e.g. a disabled feature) are ignored.
+        """
+        self._stages[name] = (fn, deps)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    async def wait(self, name: str) -> Any:
+        task = self._tasks.get(name)
+        if task is None:
+            return None
+        return await asyncio.shield(task)
+
+    async def run(self) -> dict[str, Any]:
+        sequencer = StageEventSequencer(self.event_emitter, list(self._stages))
+        started_at = self.started_at or time.perf_counter()
+
+        async def run_stage(name, fn, deps):
+            for dep in deps:
+                await self.wait(dep)
+
+            start = time.perf_counter()
+            try:
+                return await fn(sequencer.get_emitter(name))
+            finally:
+                end = time.perf_counter()
+                self.timings[name] = {
+                    "duration_ms": round((end - start) * 1000.0, 2),
+                    "finished_ms": round((end - started_at) * 1000.0, 2),
+                }
+                stage_duration_histogram.record(
+                    self.timings[name]["duration_ms"], {"stage": name}
+                )
+                stage_finished_histogram.record(
+                    self.timings[name]["finished_ms"], {"stage": name}
+                )
+                await sequencer.finish(name)
+
+        for name, (fn, deps) in self._stages.items():
+            self._tasks[name] = asyncio.create_task(run_stage(name, fn, deps))
+
+        try:
+            results = await asyncio.gather(*self._tasks.values())
+        except BaseException:
+            for task in self._tasks.values():
+                task.cancel()
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+            raise
+
+        log.debug(f"payload stage timings: {self.timings}")
+        return dict(zip(self._tasks.keys(), results))
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from opentelemetry import metrics
+
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    AIOHTTP_CLIENT_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_DNS_TTL,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+meter = metrics.get_meter(__name__)
+
+connections_created_counter = meter.create_counter(
+    name="webui.http_client.connections.created",
+    description="New upstream connections opened by pooled sessions",
+    unit="1",
+)
+connections_reused_counter = meter.create_counter(
+    name="webui.http_client.connections.reused",
+    description="Requests served on a kept-alive upstream connection",
+    unit="1",
+)
+connections_queued_counter = meter.create_counter(
+    name="webui.http_client.connections.queued",
+    description="Requests that waited for a free connection (pool saturated)",
+    unit="1",
+)
+queue_wait_histogram = meter.create_histogram(
+    name="webui.http_client.connections.queue_wait",
+    description="Time spent waiting for a free pooled connection",
+    unit="ms",
+)
+
+
+class ClientSessionPool:
+    """
+    Long-lived aiohttp sessions, one per upstream (namespace + origin).
+
+    Creating a `ClientSession` per request throws away keep-alive connections
+    and the DNS cache on every chat completion. Sessions handed out here are
+    shared for the lifetime of the app and closed from the lifespan handler.
+    Responses obtained from them must be released, not the session closed.
+    """
+
+    def __init__(
+        self,
+        limit: int = AIOHTTP_CLIENT_POOL_LIMIT,
+        limit_per_host: int = AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = AIOHTTP_CLIENT_POOL_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache: int = AIOHTTP_CLIENT_POOL_DNS_TTL,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+
+        self._sessions: dict[tuple[str, str], aiohttp.ClientSession] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def _trace_config(self, namespace: str) -> aiohttp.TraceConfig:
+        stats = self._stats.setdefault(
+            namespace, {"created": 0, "reused": 0, "queued": 0, "queue_wait_ms": 0.0}
+        )
+        attributes = {"pool": namespace}
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx, params):
+            stats["created"] += 1
+            connections_created_counter.add(1, attributes)
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats["reused"] += 1
+            connections_reused_counter.add(1, attributes)
+
+        async def on_connection_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+
+        async def on_connection_queued_end(session, ctx, params):
+            elapsed_ms = (time.perf_counter() - ctx.queued_at) * 1000.0
+            stats["queued"] += 1
+            stats["queue_wait_ms"] += elapsed_ms
+            connections_queued_counter.add(1, attributes)
+            queue_wait_histogram.record(elapsed_ms, attributes)
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        return trace_config
+
+    def get_session(
+        self, namespace: str, url: Optional[str] = None, trust_env: bool = True
+    ) -> aiohttp.ClientSession:
+        """
+        Return the shared session for the upstream serving `url`, or one
+        session for all upstreams of `namespace` when `url` is None (e.g.
+        arbitrary web pages, which would otherwise leave a session behind
+        per site).
+        """
+        if url is None:
+            origin = "*"
+        else:
+            parsed_url = urlparse(url)
+            origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        key = (namespace, origin)
+
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.ttl_dns_cache,
+                ),
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+                # Shared between users: never keep upstream cookies around.
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trace_configs=[self._trace_config(namespace)],
+                trust_env=trust_env,
+            )
+            self._sessions[key] = session
+        return session
+
+    def get_stats(self) -> dict:
+        stats = {namespace: dict(values) for namespace, values in self._stats.items()}
+        for (namespace, origin), session in self._sessions.items():
+            connector = session.connector
+            if connector is None or session.closed:
+                continue
+            in_use = len(connector._acquired)
+            pool = stats.setdefault(namespace, {})
+            pool.setdefault("upstreams", {})[origin] = {
+                "in_use": in_use,
+                "limit": connector.limit,
+                "limit_per_host": connector.limit_per_host,
+                "saturated": bool(connector.limit) and in_use >= connector.limit,
+            }
+        return stats
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await asyncio.gather(
+            *(session.close() for session in sessions if not session.closed),
+            return_exceptions=True,
+        )
+
+
+HTTP_SESSION_POOL = ClientSessionPool()
+
+
+def get_pooled_session(
+    namespace: str, url: Optional[str] = None, trust_env: bool = True
+) -> aiohttp.ClientSession:
+    return HTTP_SESSION_POOL.get_session(namespace, url, trust_env=trust_env)
+
+
+async def release_response(response: Optional[aiohttp.ClientResponse]):
+    """
+    Hand the connection back to the pool. Partially read bodies (e.g. a client
+    that disconnected mid-stream) make aiohttp drop the connection instead.
+    """
+    if response:
+        response.release()
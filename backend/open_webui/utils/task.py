@@ -1,3 +1,4 @@
+import json
 import logging
 import math
 import re
@@ -6,10 +7,19 @@ from typing import Optional, Any
 import uuid
 
 
-from open_webui.utils.misc import get_last_user_message, get_messages_content
+from open_webui.utils.misc import (
+    get_content_from_message,
+    get_last_user_message,
+    get_messages_content,
+)
 
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    TASK_HISTORY_TOKEN_BUDGETS,
+    ENABLE_TASK_HISTORY_SUMMARIES,
+)
 from open_webui.config import DEFAULT_RAG_TEMPLATE
+from open_webui.constants import TASKS
 
 
 log = logging.getLogger(__name__)
@@ -183,6 +193,145 @@ def replace_messages_variable(
     return template
 
 
+# Tokens of chat history each task prompt may carry, 0 for all of it
+DEFAULT_TASK_HISTORY_BUDGETS = {
+    TASKS.TITLE_GENERATION: 1500,
+    TASKS.TAGS_GENERATION: 1500,
+    TASKS.FOLLOW_UP_GENERATION: 3000,
+    TASKS.QUERY_GENERATION: 2000,
+    TASKS.COMBINED_GENERATION: 3000,
+}
+TASK_HISTORY_BUDGETS = {
+    **DEFAULT_TASK_HISTORY_BUDGETS,
+    **(TASK_HISTORY_TOKEN_BUDGETS or {}),
+}
+
+# Role prefix and separator of a rendered message
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast token estimate, about four bytes of UTF-8 per token: close for
+    English, on the safe side for other scripts.
+    """
+    return math.ceil(len(text.encode("utf-8")) / 4)
+
+
+def get_task_history_budget(task: str) -> int:
+    try:
+        return max(int(TASK_HISTORY_BUDGETS.get(task) or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def truncate_middle(text: str, max_tokens: int) -> str:
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    half = max(len(text) * max_tokens // tokens // 2, 1)
+    return f"{text[:half]}...{text[-half:]}"
+
+
+# Characters of a turn read for its summary line
+SUMMARY_SCAN_CHARS = 1024
+
+
+def summarize_turn(role: str, text: str) -> str:
+    """
+    One line standing for an older turn: its first sentence, shortened.
+    This is a cheap extractive cut of the start of the turn rather than a
+    model call, so it is simply redone whenever the window is built.
+    """
+    cut = len(text) > SUMMARY_SCAN_CHARS
+    text = " ".join(text[:SUMMARY_SCAN_CHARS].split())
+    sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+    if len(sentence) > 120 or (cut and sentence == text):
+        sentence = sentence[:117] + "..."
+    return f"{role.upper()}: {sentence}"
+
+
+def window_messages(
+    messages: list[dict],
+    max_tokens: int,
+    summarize: bool = ENABLE_TASK_HISTORY_SUMMARIES,
+) -> list[dict]:
+    """
+    The most recent messages fitting `max_tokens`, in their order. The last
+    message and the last user message are always kept, shortened in the
+    middle if need be. With `summarize`, a quarter of the budget goes to a
+    system message with one line per older turn that didn't fit, newest
+    first as far as it allows. A `max_tokens` of 0 keeps every message.
+    """
+    if not max_tokens or not messages:
+        return messages
+
+    texts = [get_content_from_message(message) or "" for message in messages]
+    costs = [estimate_tokens(text) + MESSAGE_TOKEN_OVERHEAD for text in texts]
+    if sum(costs) <= max_tokens:
+        return messages
+
+    summary_budget = max_tokens // 4 if summarize else 0
+    budget = max_tokens - summary_budget
+
+    last_user = next(
+        (
+            idx
+            for idx in range(len(messages) - 1, -1, -1)
+            if messages[idx].get("role") == "user"
+        ),
+        None,
+    )
+    required = {len(messages) - 1, last_user} - {None}
+
+    kept = {}
+    share = budget // len(required)
+    for idx in required:
+        if costs[idx] > share:
+            kept[idx] = {
+                **messages[idx],
+                "content": truncate_middle(
+                    texts[idx], max(share - MESSAGE_TOKEN_OVERHEAD, 1)
+                ),
+            }
+            budget -= share
+        else:
+            kept[idx] = messages[idx]
+            budget -= costs[idx]
+
+    for idx in range(len(messages) - 1, -1, -1):
+        if idx in kept:
+            continue
+        if costs[idx] > budget:
+            break
+        kept[idx] = messages[idx]
+        budget -= costs[idx]
+
+    windowed = [kept[idx] for idx in sorted(kept)]
+
+    lines = []
+    for idx in range(len(messages) - 1, -1, -1):
+        if idx in kept or not texts[idx].strip():
+            continue
+        line = summarize_turn(messages[idx].get("role", "assistant"), texts[idx])
+        cost = estimate_tokens(line) + 1
+        if cost > summary_budget:
+            break
+        lines.append(line)
+        summary_budget -= cost
+
+    if lines:
+        windowed.insert(
+            0,
+            {
+                "role": "system",
+                "content": "Summary of earlier messages:\n"
+                + "\n".join(reversed(lines)),
+            },
+        )
+    return windowed
+
+
 # {{prompt:middletruncate:8000}}
 
 
@@ -262,6 +411,114 @@ def tags_generation_template(
     return template
 
 
+# Output of each task in a combined title/tags/follow-ups request
+COMBINED_TASK_OUTPUTS = {
+    TASKS.TITLE_GENERATION: {
+        "key": "title",
+        "description": "a concise, 3-5 word title with an emoji summarizing the chat history. It should clearly represent the main theme, without quotation marks or special formatting.",
+        "schema": {"type": "string"},
+        "example": '"🍪 Perfect Chocolate Chip Recipe"',
+    },
+    TASKS.TAGS_GENERATION: {
+        "key": "tags",
+        "description": '1-3 broad tags categorizing the main themes of the chat history (e.g. Science, Technology, Philosophy, Arts, Politics, Business, Health, Sports, Entertainment, Education), along with 1-3 more specific subtopic tags. Use only ["General"] if the content is too short or too diverse.',
+        "schema": {"type": "array", "items": {"type": "string"}},
+        "example": '["tag1", "tag2", "tag3"]',
+    },
+    TASKS.FOLLOW_UP_GENERATION: {
+        "key": "follow_ups",
+        "description": "3-5 relevant follow-up questions the user might naturally ask next, written from the user's point of view and directed to the assistant. Keep them concise, related to the discussed topics, and do not repeat what was already covered.",
+        "schema": {"type": "array", "items": {"type": "string"}},
+        "example": '["Question 1?", "Question 2?", "Question 3?"]',
+    },
+}
+
+
+def combined_tasks_generation_template(
+    template: str, tasks: list[str], messages: list[dict], user: Optional[Any] = None
+) -> str:
+    outputs = [COMBINED_TASK_OUTPUTS[task] for task in tasks]
+    template = template.replace(
+        "{{TASKS}}",
+        "\n".join(
+            f'- "{output["key"]}": {output["description"]}' for output in outputs
+        ),
+    )
+    template = template.replace(
+        "{{OUTPUT}}",
+        "{ "
+        + ", ".join(f'"{output["key"]}": {output["example"]}' for output in outputs)
+        + " }",
+    )
+
+    prompt = get_last_user_message(messages)
+    template = replace_prompt_variable(template, prompt)
+    template = replace_messages_variable(template, messages)
+
+    template = prompt_template(template, user)
+    return template
+
+
+def combined_tasks_response_format(tasks: list[str]) -> dict:
+    outputs = [COMBINED_TASK_OUTPUTS[task] for task in tasks]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "chat_tasks",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {output["key"]: output["schema"] for output in outputs},
+                "required": [output["key"] for output in outputs],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def parse_combined_tasks_output(content: str, tasks: list[str]) -> dict:
+    """
+    `{task: value}` for the tasks the model answered with the expected type;
+    the others are left out, to be generated on their own.
+    """
+    try:
+        output = json.loads(content[content.find("{") : content.rfind("}") + 1])
+    except Exception:
+        return {}
+    if not isinstance(output, dict):
+        return {}
+
+    results = {}
+    for task in tasks:
+        value = output.get(COMBINED_TASK_OUTPUTS[task]["key"])
+        if COMBINED_TASK_OUTPUTS[task]["schema"]["type"] == "string":
+            if isinstance(value, str) and value.strip():
+                results[task] = value.strip()
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            results[task] = value
+    return results
+
+
+def supports_json_schema_output(model: dict) -> bool:
+    capabilities = ((model.get("info") or {}).get("meta") or {}).get(
+        "capabilities"
+    ) or {}
+    if "json_schema" in capabilities:
+        return bool(capabilities["json_schema"])
+
+    # Ollama takes the schema as its `format`
+    if model.get("owned_by") == "ollama":
+        return True
+
+    try:
+        from open_webui.services.model_registry import get_model_registry
+
+        spec = get_model_registry().get_model(model.get("id"))
+        return bool(spec and spec.supports_json_schema)
+    except Exception:
+        return False
+
+
 def image_prompt_generation_template(
     template: str, messages: list[dict], user: Optional[Any] = None
 ) -> str:
@@ -2,6 +2,7 @@ import inspect
 import logging
 import re
 import inspect
+import hashlib
 import aiohttp
 import asyncio
 import yaml
@@ -38,11 +39,14 @@ from open_webui.utils.misc import is_string_allowed
 from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.session_pool import get_pooled_session
 from open_webui.env import (
     SRC_LOG_LEVELS,
-    AIOHTTP_CLIENT_TIMEOUT,
     AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA,
     AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    TOOL_CALL_MAX_CONCURRENCY,
+    TOOL_CALL_MAX_CONCURRENCY_PER_TOOL,
+    TOOL_CALL_TIMEOUT,
 )
 
 import copy
@@ -228,6 +232,11 @@ async def get_tools(
                             "spec": spec,
                             # Misc info
                             "type": "external",
+                            "metadata": {
+                                "parallel": tool_server_connection.get(
+                                    "config", {}
+                                ).get("parallel_tool_calls", True),
+                            },
                         }
 
                         # Handle function name collisions
@@ -306,6 +315,14 @@ async def get_tools(
                         "file_handler": hasattr(module, "file_handler")
                         and module.file_handler,
                         "citation": hasattr(module, "citation") and module.citation,
+                        "parallel": getattr(
+                            getattr(module, "valves", None),
+                            "parallel_tool_calls",
+                            getattr(module, "parallel_tool_calls", True),
+                        ),
+                        "max_concurrency": getattr(
+                            module, "max_concurrent_tool_calls", None
+                        ),
                     },
                 }
 
@@ -322,6 +339,67 @@ async def get_tools(
     return tools_dict
 
 
+async def execute_tool_calls(
+    tool_calls: list[tuple[Optional[dict], str, Callable[[], Awaitable[Any]]]],
+    max_concurrency: int = TOOL_CALL_MAX_CONCURRENCY,
+    max_concurrency_per_tool: int = TOOL_CALL_MAX_CONCURRENCY_PER_TOOL,
+    timeout: Optional[int] = TOOL_CALL_TIMEOUT,
+) -> list[Any]:
+    """
+    Execute `(tool, name, invoke)` tool calls and return their results in call
+    order.
+
+    Independent calls run concurrently, bounded by `max_concurrency` overall
+    and by `max_concurrency_per_tool` for calls to the same function; a
+    tool's own `max_concurrency` can only lower that cap. Tools whose
+    metadata sets `parallel` to False (the `parallel_tool_calls` module
+    attribute or valve, or the tool server's connection config) run on their
+    own, after every earlier call has finished. Errors and timeouts are
+    returned as the call's result, like the sequential loops did.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tool_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def run(tool: Optional[dict], name: str, invoke):
+        tool_metadata = (tool or {}).get("metadata", {})
+        tool_semaphore = tool_semaphores.get(name)
+        if tool_semaphore is None:
+            limit = max_concurrency_per_tool
+            if tool_metadata.get("max_concurrency"):
+                limit = max(min(int(tool_metadata["max_concurrency"]), limit), 1)
+            tool_semaphore = tool_semaphores[name] = asyncio.Semaphore(limit)
+
+        async with semaphore, tool_semaphore:
+            try:
+                if timeout:
+                    return await asyncio.wait_for(invoke(), timeout=timeout)
+                return await invoke()
+            except asyncio.TimeoutError:
+                log.warning(f"Tool call {name} timed out after {timeout}s")
+                return f"Tool call {name} timed out after {timeout} seconds"
+            except Exception as e:
+                return str(e)
+
+    results = [None] * len(tool_calls)
+    pending = []
+
+    async def flush():
+        values = await asyncio.gather(*(coroutine for _, coroutine in pending))
+        for (idx, _), value in zip(pending, values):
+            results[idx] = value
+        pending.clear()
+
+    for idx, (tool, name, invoke) in enumerate(tool_calls):
+        if (tool or {}).get("metadata", {}).get("parallel", True):
+            pending.append((idx, run(tool, name, invoke)))
+        else:
+            await flush()
+            results[idx] = await run(tool, name, invoke)
+
+    await flush()
+    return results
+
+
 def parse_description(docstring: str | None) -> str:
     """
     Parse a function's docstring to extract the description.
@@ -725,6 +803,7 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
                 "idx": idx,
                 "url": server.get("url"),
                 "openapi": openapi_data,
+                "spec_hash": get_openapi_spec_hash(openapi_data),
                 "info": response.get("info"),
                 "specs": response.get("specs"),
             }
@@ -733,6 +812,61 @@ async def get_tool_servers_data(servers: List[Dict[str, Any]]) -> List[Dict[str,
     return results
 
 
+def get_openapi_spec_hash(openapi: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(openapi, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def compile_openapi_operations(openapi: dict) -> dict[str, dict]:
+    """
+    Index an OpenAPI document by operationId: HTTP method, path template,
+    where each parameter goes and whether the operation takes a JSON body.
+    """
+    operations = {}
+    for route_path, methods in openapi.get("paths", {}).items():
+        for http_method, operation in methods.items():
+            if not isinstance(operation, dict):
+                continue
+
+            operation_id = operation.get("operationId")
+            if not operation_id or operation_id in operations:
+                continue
+
+            operations[operation_id] = {
+                "method": http_method.lower(),
+                "path": route_path,
+                "parameters": {
+                    param["name"]: param["in"]
+                    for param in operation.get("parameters", [])
+                },
+                "has_body": bool(operation.get("requestBody", {}).get("content")),
+            }
+    return operations
+
+
+# (server id, url) -> (spec hash, compiled operations)
+TOOL_SERVER_OPERATIONS: dict[tuple[str, str], tuple[str, dict[str, dict]]] = {}
+
+
+def get_tool_server_operations(server_data: Dict[str, Any]) -> dict[str, dict]:
+    """
+    Compiled operation index for a tool server, rebuilt only when the hash of
+    its OpenAPI document changes.
+    """
+    openapi = server_data.get("openapi", {})
+    spec_hash = server_data.get("spec_hash") or get_openapi_spec_hash(openapi)
+
+    key = (str(server_data.get("id")), str(server_data.get("url")))
+    cached = TOOL_SERVER_OPERATIONS.get(key)
+    if cached and cached[0] == spec_hash:
+        return cached[1]
+
+    operations = compile_openapi_operations(openapi)
+    TOOL_SERVER_OPERATIONS[key] = (spec_hash, operations)
+    return operations
+
+
 async def execute_tool_server(
     url: str,
     headers: Dict[str, str],
@@ -743,48 +877,24 @@ async def execute_tool_server(
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     error = None
     try:
-        openapi = server_data.get("openapi", {})
-        paths = openapi.get("paths", {})
-
-        matching_route = None
-        for route_path, methods in paths.items():
-            for http_method, operation in methods.items():
-                if isinstance(operation, dict) and operation.get("operationId") == name:
-                    matching_route = (route_path, methods)
-                    break
-            if matching_route:
-                break
-
-        if not matching_route:
+        operation = get_tool_server_operations(server_data).get(name)
+        if not operation:
             raise Exception(f"No matching route found for operationId: {name}")
 
-        route_path, methods = matching_route
-
-        method_entry = None
-        for http_method, operation in methods.items():
-            if operation.get("operationId") == name:
-                method_entry = (http_method.lower(), operation)
-                break
-
-        if not method_entry:
-            raise Exception(f"No matching method found for operationId: {name}")
-
-        http_method, operation = method_entry
+        http_method = operation["method"]
 
         path_params = {}
         query_params = {}
         body_params = {}
 
-        for param in operation.get("parameters", []):
-            param_name = param["name"]
-            param_in = param["in"]
+        for param_name, param_in in operation["parameters"].items():
             if param_name in params:
                 if param_in == "path":
                     path_params[param_name] = params[param_name]
                 elif param_in == "query":
                     query_params[param_name] = params[param_name]
 
-        final_url = f"{url}{route_path}"
+        final_url = f"{url}{operation['path']}"
         for key, value in path_params.items():
             final_url = final_url.replace(f"{{{key}}}", str(value))
 
@@ -792,54 +902,38 @@ async def execute_tool_server(
             query_string = "&".join(f"{k}={v}" for k, v in query_params.items())
             final_url = f"{final_url}?{query_string}"
 
-        if operation.get("requestBody", {}).get("content"):
+        if operation["has_body"]:
             if params:
                 body_params = params
 
-        async with aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        ) as session:
-            request_method = getattr(session, http_method.lower())
-
-            if http_method in ["post", "put", "patch", "delete"]:
-                async with request_method(
-                    final_url,
-                    json=body_params,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
+        # Shared per tool server, so repeated calls reuse kept-alive connections.
+        session = get_pooled_session("tool_server", final_url)
+        request_method = getattr(session, http_method)
 
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
-
-                    response_headers = response.headers
-                    return (response_data, response_headers)
-            else:
-                async with request_method(
-                    final_url,
-                    headers=headers,
-                    cookies=cookies,
-                    ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
-                    allow_redirects=False,
-                ) as response:
-                    if response.status >= 400:
-                        text = await response.text()
-                        raise Exception(f"HTTP error {response.status}: {text}")
-
-                    try:
-                        response_data = await response.json()
-                    except Exception:
-                        response_data = await response.text()
-
-                    response_headers = response.headers
-                    return (response_data, response_headers)
+        if http_method in ["post", "put", "patch", "delete"]:
+            request_kwargs = {"json": body_params}
+        else:
+            request_kwargs = {}
+
+        async with request_method(
+            final_url,
+            headers=headers,
+            cookies=cookies,
+            ssl=AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+            allow_redirects=False,
+            **request_kwargs,
+        ) as response:
+            if response.status >= 400:
+                text = await response.text()
+                raise Exception(f"HTTP error {response.status}: {text}")
+
+            try:
+                response_data = await response.json()
+            except Exception:
+                response_data = await response.text()
+
+            response_headers = response.headers
+            return (response_data, response_headers)
 
     except Exception as err:
         error = str(err)
@@ -0,0 +1,186 @@
+"""
+Unit tests for per-class admission control
+"""
+
+import asyncio
+import gc
+import threading
+
+import pytest
+from fastapi.responses import StreamingResponse
+from open_webui.utils.admission import (
+    BACKGROUND,
+    FILES,
+    INTERACTIVE,
+    AdmissionController,
+    AdmissionRejected,
+)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_early():
+    controller = AdmissionController(
+        {INTERACTIVE: {"limit": 1, "max_queue": 1, "queue_timeout": 5}}
+    )
+    await controller.acquire(INTERACTIVE)
+    queued = asyncio.create_task(controller.acquire(INTERACTIVE))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire(INTERACTIVE)
+    assert exc_info.value.reason == "queue_full"
+    assert exc_info.value.http_exception().status_code == 429
+    assert exc_info.value.http_exception().headers["Retry-After"] == "2"
+
+    controller.release(INTERACTIVE, 0.1)
+    await queued
+    stats = controller.get_stats()["classes"][INTERACTIVE]
+    assert stats["active"] == 1
+    assert stats["rejected"] == 1
+    assert stats["waited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_is_rejected():
+    controller = AdmissionController(
+        {BACKGROUND: {"limit": 1, "max_queue": 4, "queue_timeout": 0.05}}
+    )
+    await controller.acquire(BACKGROUND)
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        await controller.acquire(BACKGROUND)
+    assert exc_info.value.reason == "queue_timeout"
+
+    stats = controller.get_stats()["classes"][BACKGROUND]
+    assert stats["timed_out"] == 1
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_budget_goes_to_interactive_first():
+    controller = AdmissionController(max_concurrency=1)
+    order = []
+
+    async def run(name):
+        async with controller.slot(name):
+            order.append(name)
+
+    await controller.acquire(FILES)
+    waiting = [asyncio.create_task(run(BACKGROUND))]
+    await asyncio.sleep(0)
+    waiting.append(asyncio.create_task(run(INTERACTIVE)))
+    await asyncio.sleep(0)
+
+    controller.release(FILES, 0.0)
+    await asyncio.gather(*waiting)
+
+    assert order == [INTERACTIVE, BACKGROUND]
+    assert controller.get_stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController({INTERACTIVE: {"limit": 1}})
+    await controller.acquire(INTERACTIVE)
+
+    waiter = asyncio.create_task(controller.acquire(INTERACTIVE))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    controller.release(INTERACTIVE, 0.0)
+    stats = controller.get_stats()["classes"][INTERACTIVE]
+    assert stats["active"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_threadpool_work_is_not_queued():
+    controller = AdmissionController({FILES: {"limit": 2}})
+    controller.try_acquire(FILES)
+    controller.try_acquire(FILES)
+
+    with pytest.raises(AdmissionRejected) as exc_info:
+        controller.try_acquire(FILES)
+    assert exc_info.value.reason == "busy"
+
+    # Released from a worker thread, the slot is free again right away
+    thread = threading.Thread(target=controller.release, args=(FILES, 0.0))
+    thread.start()
+    thread.join()
+    controller.try_acquire(FILES)
+
+    stats = controller.get_stats()["classes"][FILES]
+    assert stats["active"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_disabled_controller_only_counts():
+    controller = AdmissionController({FILES: {"limit": 1}}, enabled=False)
+    for _ in range(3):
+        controller.try_acquire(FILES)
+
+    stats = controller.get_stats()["classes"][FILES]
+    assert stats["active"] == 3
+    assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_slot_is_released_once_before_background_work():
+    controller = AdmissionController(max_concurrency=1)
+    await controller.acquire(INTERACTIVE)
+    release = controller.lease(INTERACTIVE, 0.0)
+
+    async def body():
+        yield "data: done"
+
+    response = controller.release_after(release, StreamingResponse(body()))
+    assert [chunk async for chunk in response.body_iterator] == ["data: done"]
+
+    # The background slot fits the worker-wide budget once the stream is out
+    await asyncio.wait_for(controller.acquire(BACKGROUND), 1)
+    release()
+    controller.release(BACKGROUND, 0.0)
+
+    stats = controller.get_stats()
+    assert stats["active"] == 0
+    assert stats["classes"][INTERACTIVE]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unsent_stream_still_releases_its_slot():
+    controller = AdmissionController({INTERACTIVE: {"limit": 2}})
+
+    async def body():
+        yield "data: done"
+
+    # The client leaves before the body is iterated: the background task runs
+    await controller.acquire(INTERACTIVE)
+    release = controller.lease(INTERACTIVE, 0.0)
+    response = controller.release_after(release, StreamingResponse(body()))
+    await response.background()
+    assert controller.get_stats()["classes"][INTERACTIVE]["active"] == 0
+
+    # The response is dropped without being sent at all
+    await controller.acquire(INTERACTIVE)
+    release = controller.lease(INTERACTIVE, 0.0)
+    controller.release_after(release, StreamingResponse(body()))
+    gc.collect()
+    stats = controller.get_stats()["classes"][INTERACTIVE]
+    assert stats["active"] == 0
+    assert stats["completed"] == 2
+
+
+def test_budget_overrides_keep_their_types():
+    controller = AdmissionController(
+        {
+            FILES: {"queue_timeout": "2.5", "limit": "3"},
+            BACKGROUND: {"queue_timeout": 2.9, "max_queue": "many"},
+        }
+    )
+    stats = controller.get_stats()["classes"]
+    assert stats[FILES]["queue_timeout"] == 2.5
+    assert stats[FILES]["limit"] == 3
+    assert stats[BACKGROUND]["queue_timeout"] == 2.9
+    assert stats[BACKGROUND]["max_queue"] == 64
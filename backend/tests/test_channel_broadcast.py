@@ -0,0 +1,108 @@
+"""
+Unit tests for the channel event fan-out
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from open_webui.socket.utils import AsyncLocalDict, ChannelBroadcast
+
+
+class FakeSocketServer:
+    def __init__(self):
+        self.emits = []
+
+    async def emit(self, event, data, to=None):
+        self.emits.append((event, to))
+
+
+class FakeChannels:
+    def __init__(self, members):
+        self.members = members
+        self.loads = 0
+        self.reactivations = 0
+
+    def get_members_by_channel_id(self, channel_id):
+        self.loads += 1
+        return [
+            SimpleNamespace(user_id=user_id, is_active=is_active)
+            for user_id, is_active in self.members.items()
+        ]
+
+    def reactivate_members(self, channel_id):
+        self.reactivations += 1
+        count = sum(not is_active for is_active in self.members.values())
+        self.members = {user_id: True for user_id in self.members}
+        return count
+
+
+def make_broadcast(members):
+    sio = FakeSocketServer()
+    channels = FakeChannels(members)
+    broadcast = ChannelBroadcast(
+        sio,
+        AsyncLocalDict(),
+        load_members=channels.get_members_by_channel_id,
+        reactivate_members=channels.reactivate_members,
+    )
+    return broadcast, sio, channels
+
+
+@pytest.mark.asyncio
+async def test_members_are_cached_between_messages():
+    broadcast, sio, channels = make_broadcast({"u0": True, "u1": True, "u2": True})
+    channel = SimpleNamespace(id="c1", type="group")
+
+    for _ in range(10):
+        members = await broadcast.on_new_message(channel, "u0")
+        await broadcast.emit("events:channel", {}, channel.id)
+
+    assert sorted(members["user_ids"]) == ["u0", "u1", "u2"]
+    assert channels.loads == 1
+    assert channels.reactivations == 0
+    assert sio.emits == [("events:channel", "channel:c1")] * 10
+
+    stats = broadcast.get_stats()
+    assert stats["messages"] == 10
+    assert stats["emits"] == 10
+    assert stats["avg_members_per_message"] == 3
+
+    # Membership changes drop the cached list
+    channels.members["u3"] = True
+    await broadcast.invalidate(channel.id)
+    members = await broadcast.on_new_message(channel, "u3")
+    assert "u3" in members["user_ids"]
+    assert channels.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_inactive_members_are_reactivated_in_one_write():
+    broadcast, sio, channels = make_broadcast({"u0": True, "u1": False, "u2": False})
+    channel = SimpleNamespace(id="dm", type="dm")
+
+    await broadcast.on_new_message(channel, "u0")
+    await broadcast.on_new_message(channel, "u0")
+
+    assert channels.reactivations == 1
+    assert broadcast.get_stats()["db_writes"] == 1
+    assert all(channels.members.values())
+
+
+@pytest.mark.asyncio
+async def test_standard_channels_are_not_reactivated():
+    broadcast, sio, channels = make_broadcast({"u0": True, "u1": False})
+    channel = SimpleNamespace(id="c1", type=None)
+
+    await broadcast.on_new_message(channel, "u0")
+
+    assert channels.reactivations == 0
+
+
+@pytest.mark.asyncio
+async def test_emit_to_users_is_a_single_emit():
+    broadcast, sio, channels = make_broadcast({})
+
+    await broadcast.emit_to_users("events", {}, ["u0", "u1", "u2"])
+    await broadcast.emit_to_users("events", {}, [])
+
+    assert sio.emits == [("events", ["user:u0", "user:u1", "user:u2"])]
@@ -0,0 +1,147 @@
+"""
+Unit tests for the aggregated channel sidebar state
+"""
+
+import time
+from contextlib import contextmanager
+
+import pytest
+from open_webui.models import channels as channels_module
+from open_webui.models import groups as groups_module
+from open_webui.models import messages as messages_module
+from open_webui.models import users as users_module
+from open_webui.models.channels import (
+    Channel,
+    ChannelMember,
+    Channels,
+    CreateChannelForm,
+)
+from open_webui.models.groups import Group, GroupMember
+from open_webui.models.messages import Message, MessageForm, MessageReaction, Messages
+from open_webui.models.users import User, Users
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    engine = create_engine("sqlite://")
+    for table in (User, Group, GroupMember, Channel, ChannelMember, Message):
+        table.__table__.create(engine)
+    MessageReaction.__table__.create(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    for module in (channels_module, groups_module, messages_module, users_module):
+        monkeypatch.setattr(module, "get_db", get_db)
+
+    with get_db() as session:
+        for idx in range(3):
+            session.add(
+                User(
+                    id=f"u{idx}",
+                    name=f"User {idx}",
+                    email=f"u{idx}@example.com",
+                    role="user",
+                    profile_image_url="",
+                    last_active_at=int(time.time()) if idx == 2 else 0,
+                    created_at=0,
+                    updated_at=0,
+                )
+            )
+        session.commit()
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def send(channel_id, user_id, content, parent_id=None):
+    return Messages.insert_new_message(
+        MessageForm(content=content, parent_id=parent_id), channel_id, user_id
+    )
+
+
+def get_sidebar(user_id):
+    return {
+        channel.id: channel for channel in Channels.get_channel_list_by_user_id(user_id)
+    }
+
+
+def test_sidebar_matches_message_counts(statements):
+    general = Channels.insert_new_channel(CreateChannelForm(name="general"), "u1")
+    group = Channels.insert_new_channel(
+        CreateChannelForm(name="team", type="group", user_ids=["u1"]), "u0"
+    )
+    dm = Channels.insert_new_channel(
+        CreateChannelForm(type="dm", user_ids=["u2"]), "u0"
+    )
+
+    send(general.id, "u1", "hello")
+    first = send(group.id, "u1", "one")
+    send(group.id, "u1", "two")
+    send(group.id, "u0", "mine")
+    reply = send(group.id, "u1", "in a thread", parent_id=first.id)
+    send(dm.id, "u2", "ping")
+
+    sidebar = get_sidebar("u0")
+    assert set(sidebar) == {general.id, group.id, dm.id}
+    assert sidebar[general.id].unread_count == 0  # not a member
+    assert sidebar[group.id].unread_count == 2
+    assert sidebar[dm.id].unread_count == 1
+    for channel_id, channel in sidebar.items():
+        last_message = Messages.get_last_message_by_channel_id(channel_id)
+        assert channel.last_message_at == last_message.created_at
+
+    Channels.update_member_last_read_at(dm.id, "u0")
+    Messages.delete_message_by_id(first.id)
+    Messages.delete_replies_by_id(first.id)
+
+    sidebar = get_sidebar("u0")
+    assert sidebar[dm.id].unread_count == 0
+    assert sidebar[group.id].unread_count == 1
+    assert (
+        sidebar[group.id].last_message_at
+        == Messages.get_last_message_by_channel_id(group.id).created_at
+        < reply.created_at
+    )
+
+
+def test_sidebar_queries_do_not_grow_with_channels(statements):
+    for idx in range(20):
+        channel = Channels.insert_new_channel(
+            CreateChannelForm(name=f"team-{idx}", type="group", user_ids=["u1"]), "u0"
+        )
+        send(channel.id, "u1", "hello")
+    dm = Channels.insert_new_channel(
+        CreateChannelForm(type="dm", user_ids=["u2"]), "u0"
+    )
+
+    statements.clear()
+    sidebar = get_sidebar("u0")
+    assert len(sidebar) == 21
+    assert all(
+        channel.unread_count == 1 for channel in sidebar.values() if channel.id != dm.id
+    )
+    # Group memberships, member channels and standard channels
+    assert len(statements) == 3
+
+    user_ids = Channels.get_member_user_ids_by_channel_ids([dm.id])
+    assert sorted(user_ids[dm.id]) == ["u0", "u2"]
+    (active,) = [
+        user
+        for user in Users.get_users_by_user_ids(["u0", "u2"])
+        if Users.is_active(user)
+    ]
+    assert active.id == "u2"
@@ -0,0 +1,111 @@
+"""
+Unit tests for combined title/tags/follow-up generation
+"""
+
+import json
+from types import SimpleNamespace
+
+from open_webui.config import DEFAULT_COMBINED_TASKS_GENERATION_PROMPT_TEMPLATE
+from open_webui.constants import TASKS
+from open_webui.utils.middleware import (
+    get_combined_task_response,
+    get_pending_background_tasks,
+)
+from open_webui.utils.task import (
+    combined_tasks_generation_template,
+    combined_tasks_response_format,
+    parse_combined_tasks_output,
+    supports_json_schema_output,
+)
+
+MESSAGES = [
+    {"role": "user", "content": "How do I bake cookies?"},
+    {"role": "assistant", "content": "Mix butter, sugar and flour."},
+]
+
+
+def test_prompt_and_schema_cover_only_the_requested_tasks():
+    tasks = [TASKS.TITLE_GENERATION, TASKS.FOLLOW_UP_GENERATION]
+
+    prompt = combined_tasks_generation_template(
+        DEFAULT_COMBINED_TASKS_GENERATION_PROMPT_TEMPLATE, tasks, MESSAGES
+    )
+    assert '"title"' in prompt and '"follow_ups"' in prompt
+    assert '"tags"' not in prompt
+    assert "Mix butter, sugar and flour." in prompt
+    assert "{{" not in prompt
+
+    schema = combined_tasks_response_format(tasks)["json_schema"]["schema"]
+    assert schema["required"] == ["title", "follow_ups"]
+    assert schema["properties"]["follow_ups"]["type"] == "array"
+
+
+def test_only_well_typed_answers_are_kept():
+    tasks = [
+        TASKS.TITLE_GENERATION,
+        TASKS.TAGS_GENERATION,
+        TASKS.FOLLOW_UP_GENERATION,
+    ]
+    content = (
+        'Sure! {"title": " 🍪 Cookies ", "tags": "Baking", "follow_ups": ["Why?"]}'
+    )
+
+    assert parse_combined_tasks_output(content, tasks) == {
+        TASKS.TITLE_GENERATION: "🍪 Cookies",
+        TASKS.FOLLOW_UP_GENERATION: ["Why?"],
+    }
+    assert parse_combined_tasks_output("not json", tasks) == {}
+
+    res = get_combined_task_response(
+        {TASKS.FOLLOW_UP_GENERATION: ["Why?"]}, TASKS.FOLLOW_UP_GENERATION
+    )
+    content = res["choices"][0]["message"]["content"]
+    assert json.loads(content) == {"follow_ups": ["Why?"]}
+    assert get_combined_task_response({}, TASKS.TITLE_GENERATION) is None
+
+
+def test_json_schema_support_follows_the_model_capabilities():
+    assert supports_json_schema_output(
+        {"id": "m", "info": {"meta": {"capabilities": {"json_schema": True}}}}
+    )
+    assert not supports_json_schema_output(
+        {
+            "id": "m",
+            "owned_by": "ollama",
+            "info": {"meta": {"capabilities": {"json_schema": False}}},
+        }
+    )
+    assert supports_json_schema_output({"id": "llama3", "owned_by": "ollama"})
+
+
+def test_tasks_with_existing_results_are_skipped():
+    tasks = {
+        TASKS.TITLE_GENERATION: True,
+        TASKS.TAGS_GENERATION: True,
+        TASKS.FOLLOW_UP_GENERATION: True,
+    }
+    chat = SimpleNamespace(
+        chat={
+            "title": "🍪 Cookies",
+            "history": {
+                "messages": {
+                    "u1": {"role": "user"},
+                    "a1": {"role": "assistant", "followUps": ["Why?"]},
+                    "a2": {"role": "assistant"},
+                }
+            },
+        },
+        meta={"tags": ["baking"]},
+    )
+
+    # A regenerated first response only needs follow-ups
+    assert get_pending_background_tasks(tasks, chat, "a2") == {
+        TASKS.FOLLOW_UP_GENERATION: True
+    }
+
+    chat.chat["title"] = "New Chat"
+    chat.meta = {}
+    assert get_pending_background_tasks(tasks, chat, "a1") == {
+        TASKS.TITLE_GENERATION: True,
+        TASKS.TAGS_GENERATION: True,
+    }
@@ -0,0 +1,192 @@
+"""
+Unit tests for page-streaming document indexing
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+from open_webui.retrieval.loaders.main import Loader
+from open_webui.routers import retrieval
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.collections = {}
+        self.inserts = []
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, items):
+        self.collections.setdefault(collection_name, []).extend(items)
+        self.inserts.append(len(items))
+
+    def get(self, collection_name):
+        items = self.collections.get(collection_name, [])
+        return SimpleNamespace(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+    def update_metadata(self, collection_name, metadatas):
+        for item in self.collections[collection_name]:
+            if item["id"] in metadatas:
+                item["metadata"] = metadatas[item["id"]]
+        return True
+
+    def delete(self, collection_name, ids):
+        self.collections[collection_name] = [
+            item for item in self.collections[collection_name] if item["id"] not in ids
+        ]
+
+
+class NoMetadataUpdateVectorDB(FakeVectorDB):
+    def update_metadata(self, collection_name, metadatas):
+        return False
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    vector_db = FakeVectorDB()
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", vector_db)
+
+    async def embedding_function(texts, prefix=None, user=None):
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(
+        retrieval, "get_request_embedding_function", lambda request: embedding_function
+    )
+    return vector_db
+
+
+@pytest.fixture
+def request_():
+    config = SimpleNamespace(
+        TEXT_SPLITTER="character",
+        CHUNK_SIZE=20,
+        CHUNK_OVERLAP=0,
+        RAG_EMBEDDING_ENGINE="",
+        RAG_EMBEDDING_MODEL="test",
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+
+def get_pages(count, consumed):
+    for idx in range(count):
+        consumed.append(idx)
+        yield Document(
+            page_content=f"page {idx} first part\n\npage {idx} second part",
+            metadata={"page": idx},
+        )
+
+
+def test_chunks_are_indexed_while_pages_arrive(request_, vector_db):
+    consumed, progress_updates = [], []
+
+    def on_progress(progress):
+        progress_updates.append((len(consumed), progress))
+
+    progress = retrieval.save_doc_stream_to_vector_db(
+        request_,
+        get_pages(5, consumed),
+        "file-1",
+        metadata={"file_id": "1"},
+        batch_size=4,
+        on_progress=on_progress,
+    )
+
+    # The first batch was written after two pages, not after all five
+    assert progress_updates[0][0] == 2
+    assert vector_db.inserts == [4, 4, 2]
+    assert progress["pages"] == 5
+    assert progress["chunks"] == 10
+    assert progress["first_chunk_ms"] is not None
+
+    items = vector_db.collections["file-1"]
+    assert [item["metadata"]["page"] for item in items[:4]] == [0, 0, 1, 1]
+    assert all(item["metadata"]["file_id"] == "1" for item in items)
+
+
+def test_partial_collection_is_removed_on_failure(request_, vector_db):
+    def failing_pages():
+        yield from get_pages(3, [])
+        raise RuntimeError("parser crashed")
+
+    with pytest.raises(RuntimeError):
+        retrieval.save_doc_stream_to_vector_db(
+            request_, failing_pages(), "file-2", batch_size=2
+        )
+
+    assert vector_db.inserts
+    assert "file-2" not in vector_db.collections
+
+
+def test_empty_documents_are_rejected(request_, vector_db):
+    with pytest.raises(ValueError):
+        retrieval.save_doc_stream_to_vector_db(request_, iter([]), "file-3")
+
+
+class FakeFiles:
+    def __init__(self, vector_db):
+        self.vector_db = vector_db
+        self.updates = []
+
+    def update_file_data_by_id(self, id, data):
+        self.updates.append(("data", data["content"], sum(self.vector_db.inserts)))
+
+    def update_file_hash_by_id(self, id, hash):
+        self.updates.append(("hash", hash, sum(self.vector_db.inserts)))
+
+    def update_file_metadata_by_id(self, id, meta):
+        pass
+
+
+@pytest.mark.parametrize("vector_db_class", [FakeVectorDB, NoMetadataUpdateVectorDB])
+def test_streamed_file_chunks_carry_the_file_hash(
+    request_, monkeypatch, vector_db_class
+):
+    vector_db = vector_db_class()
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", vector_db)
+
+    async def embedding_function(texts, prefix=None, user=None):
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(
+        retrieval, "get_request_embedding_function", lambda request: embedding_function
+    )
+    files = FakeFiles(vector_db)
+    monkeypatch.setattr(retrieval, "Files", files)
+    monkeypatch.setattr(retrieval, "update_file_status", lambda *args, **kwargs: None)
+
+    pages = list(get_pages(50, []))
+    loader = SimpleNamespace(lazy_load=lambda *args: iter(pages))
+    file = SimpleNamespace(
+        id="1", filename="big.pdf", user_id="u", meta={"content_type": "x"}
+    )
+
+    result = retrieval.process_file_stream(request_, file, loader, "big.pdf", "file-1")
+
+    text_content = " ".join(page.page_content for page in pages)
+    hash = retrieval.calculate_sha256_string(text_content)
+    assert result["content"] == text_content
+    # Stored once the pages are read, before the last batch is indexed
+    assert files.updates == [("data", text_content, 64), ("hash", hash, 64)]
+
+    items = vector_db.collections["file-1"]
+    assert len(items) == 100
+    assert all(item["metadata"]["hash"] == hash for item in items)
+
+
+def test_loader_lazy_load_yields_documents(tmp_path, monkeypatch):
+    monkeypatch.setattr("open_webui.retrieval.loaders.main.EXTRACTION_POOL.workers", 0)
+    path = tmp_path / "notes.txt"
+    path.write_text("streamed text")
+
+    docs = list(Loader().lazy_load("notes.txt", "text/plain", str(path)))
+
+    assert [doc.page_content for doc in docs] == ["streamed text"]
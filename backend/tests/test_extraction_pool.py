@@ -0,0 +1,136 @@
+"""
+Unit tests for the document extraction process pool
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from open_webui.retrieval.loaders.extraction_pool import (
+    ExtractionPool,
+    ExtractionTimeoutError,
+    ExtractionWorkerError,
+    extract_file,
+)
+
+
+def wait_for_file(path):
+    while not os.path.exists(path):
+        time.sleep(0.05)
+    return time.time(), "released"
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(workers=2, timeout=30, memory_limit=0, pdf_pages_per_job=2)
+    yield pool
+    pool.close()
+
+
+def test_text_file_is_extracted_in_a_worker(pool, tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("Hello from the worker")
+
+    (doc,) = pool.extract("notes.txt", "text/plain", str(path))
+
+    assert doc.page_content == "Hello from the worker"
+    assert pool.get_stats()["completed"] == 1
+
+
+def test_worker_uses_the_callers_engine(pool, tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("name,size\nlamp,3\n")
+
+    # Tika reads text files as plain text, unlike the default CSV loader
+    (doc,) = pool.extract(
+        "a.csv",
+        "text/csv",
+        str(path),
+        engine="tika",
+        loader_kwargs={"TIKA_SERVER_URL": "http://localhost:9998"},
+    )
+    assert doc.page_content == "name,size\nlamp,3\n"
+
+    (doc,) = pool.extract("a.csv", "text/csv", str(path))
+    assert doc.page_content == "name: lamp\nsize: 3"
+
+
+def test_large_pdf_is_split_into_ordered_page_jobs(pool, tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+
+    path = tmp_path / "blank.pdf"
+    writer = pypdf.PdfWriter()
+    for _ in range(5):
+        writer.add_blank_page(width=72, height=72)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+    docs = pool.extract("blank.pdf", "application/pdf", str(path), is_pdf=True)
+
+    assert [doc.metadata["page"] for doc in docs] == [0, 1, 2, 3, 4]
+    assert all(doc.metadata["total_pages"] == 5 for doc in docs)
+    assert pool.get_stats()["submitted"] == 3
+
+
+def test_crashed_worker_is_replaced(pool, tmp_path):
+    with pytest.raises(ExtractionWorkerError):
+        pool.run([(os._exit, (1,))])
+    assert pool.get_stats()["restarts"] >= 1
+
+    path = tmp_path / "after.txt"
+    path.write_text("still working")
+    (result,) = pool.run([(extract_file, ("after.txt", "text/plain", str(path)))])
+    assert result[0].page_content == "still working"
+
+
+def test_runaway_job_times_out(tmp_path):
+    pool = ExtractionPool(workers=1, timeout=1, memory_limit=0, pdf_pages_per_job=0)
+    try:
+        start = time.monotonic()
+        with pytest.raises(ExtractionTimeoutError):
+            pool.run([(time.sleep, (30,))])
+        assert time.monotonic() - start < 10
+        assert pool.get_stats()["timed_out"] == 1
+    finally:
+        pool.close()
+
+
+def test_timed_out_job_leaves_other_jobs_running(tmp_path):
+    pool = ExtractionPool(workers=2, timeout=10, memory_limit=0, pdf_pages_per_job=0)
+    flag = tmp_path / "flag"
+    notes = tmp_path / "notes.txt"
+    notes.write_text("warm")
+    outcomes = {}
+
+    def run(name, jobs):
+        try:
+            outcomes[name] = pool.run(jobs)
+        except Exception as e:
+            outcomes[name] = e
+
+    try:
+        # Start one worker so the waiting job below does not pay for a spawn
+        pool.run([(extract_file, ("notes.txt", "text/plain", str(notes)))])
+
+        runaway = threading.Thread(target=run, args=("runaway", [(time.sleep, (30,))]))
+        runaway.start()
+        time.sleep(5)
+        waiting = threading.Thread(
+            target=run, args=("waiting", [(wait_for_file, (str(flag),))])
+        )
+        waiting.start()
+
+        # The waiting job is still in flight when the runaway one is killed
+        runaway.join()
+        flag.touch()
+        waiting.join()
+
+        assert isinstance(outcomes["runaway"], ExtractionTimeoutError)
+        assert outcomes["waiting"] == ["released"]
+        stats = pool.get_stats()
+        assert stats["timed_out"] == 1
+        assert stats["restarts"] == 1
+        assert stats["completed"] == 2
+    finally:
+        pool.close()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the keyset-paginated file listing and its glob-to-LIKE
+translation
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from open_webui.models import files as files_module
+from open_webui.models.files import File, Files, glob_to_like
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://")
+    File.__table__.create(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(files_module, "get_db", get_db)
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    with get_db() as session:
+        for idx in range(7):
+            session.add(
+                File(
+                    id=f"f{idx}",
+                    user_id="u1" if idx < 6 else "u2",
+                    filename=f"Report-{idx}.txt" if idx % 2 else f"notes-{idx}.md",
+                    data={"status": "completed", "content": f"text {idx}"},
+                    meta={"name": f"file {idx}"},
+                    # Files share timestamps to exercise the id tiebreak
+                    created_at=idx // 3,
+                    updated_at=0,
+                )
+            )
+        session.commit()
+
+    statements.clear()
+    return statements
+
+
+def test_pages_are_stable_across_equal_timestamps(db):
+    ids, cursor = [], None
+    while True:
+        files, cursor = Files.get_file_list(cursor=cursor, limit=2)
+        ids.extend(file.id for file in files)
+        if cursor is None:
+            break
+
+    assert ids == ["f6", "f5", "f4", "f3", "f2", "f1", "f0"]
+
+
+def test_last_page_boundary(db):
+    files, cursor = Files.get_file_list(user_id="u1", limit=3)
+    assert [file.id for file in files] == ["f5", "f4", "f3"]
+    assert cursor == (1, "f3")
+
+    # A full last page still hands out a cursor, whose page is empty
+    files, cursor = Files.get_file_list(user_id="u1", cursor=cursor, limit=3)
+    assert [file.id for file in files] == ["f2", "f1", "f0"]
+    files, cursor = Files.get_file_list(user_id="u1", cursor=cursor, limit=3)
+    assert files == [] and cursor is None
+
+    files, cursor = Files.get_file_list(user_id="u1", limit=4)
+    files, cursor = Files.get_file_list(user_id="u1", cursor=cursor, limit=4)
+    assert [file.id for file in files] == ["f1", "f0"]
+    assert cursor is None
+
+
+def test_listing_without_content_projects_the_status(db):
+    files, _ = Files.get_file_list(filename="report-*", content=False)
+
+    assert [file.id for file in files] == ["f5", "f3", "f1"]
+    assert all(file.data == {"status": "completed"} for file in files)
+    assert files[0].meta == {"name": "file 5"}
+    # Only the status fields are read from the data column
+    assert len(db) == 1 and "file.data AS" not in db[0]
+
+    files, _ = Files.get_file_list(filename="report-*")
+    assert files[0].data["content"] == "text 5"
+    assert "file.data AS" in db[1]
+
+
+def test_glob_wildcards():
+    assert glob_to_like("*.txt") == ("%.txt", True)
+    assert glob_to_like("report-?.pdf") == ("report-_.pdf", True)
+
+
+def test_glob_escapes_like_metacharacters():
+    assert glob_to_like("100%_done\\*") == ("100\\%\\_done\\\\%", True)
+
+
+def test_glob_character_class_is_widened():
+    assert glob_to_like("doc_[12].txt") == ("doc\\__.txt", False)
+    assert glob_to_like("[!a]*") == ("_%", False)
+
+
+def test_glob_unterminated_bracket_is_literal():
+    assert glob_to_like("a[") == ("a[", True)
@@ -0,0 +1,113 @@
+"""
+Unit tests for push-based file processing status
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from open_webui.utils.file_status import FileStatusBroker
+
+
+@pytest.mark.asyncio
+async def test_broker_dispatches_to_subscribers():
+    broker = FileStatusBroker()
+    await broker.start()
+
+    queue = broker.subscribe(["a", "b"])
+    broker.publish("a", "pending")
+    broker.publish("c", "completed")
+    broker.publish("b", "failed", "boom")
+
+    first = await asyncio.wait_for(queue.get(), timeout=1)
+    second = await asyncio.wait_for(queue.get(), timeout=1)
+
+    assert first == {"file_id": "a", "status": "pending"}
+    assert second == {"file_id": "b", "status": "failed", "error": "boom"}
+    assert queue.empty()
+
+    broker.unsubscribe(queue, ["a", "b"])
+    assert broker._subscribers == {}
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_publish_from_worker_thread():
+    broker = FileStatusBroker()
+    await broker.start()
+
+    queue = broker.subscribe(["a"])
+    thread = threading.Thread(target=broker.publish, args=("a", "completed"))
+    thread.start()
+    thread.join()
+
+    event = await asyncio.wait_for(queue.get(), timeout=1)
+    assert event == {"file_id": "a", "status": "completed"}
+    await broker.stop()
+
+
+def test_broker_publish_without_loop_is_noop():
+    broker = FileStatusBroker()
+    broker.publish("a", "completed")
+
+
+@pytest.mark.asyncio
+async def test_broker_publishes_through_redis():
+    published = []
+
+    class FakeRedis:
+        async def publish(self, channel, message):
+            published.append((channel, json.loads(message)))
+
+    broker = FileStatusBroker()
+    broker._loop = asyncio.get_running_loop()
+    broker._redis = FakeRedis()
+
+    broker.publish("a", "completed")
+    await asyncio.sleep(0)
+
+    assert published[0][0].endswith(":files:status")
+    assert published[0][1] == {"file_id": "a", "status": "completed"}
+
+
+@pytest.mark.asyncio
+async def test_broker_resubscribes_after_a_dropped_connection(monkeypatch):
+    from types import SimpleNamespace
+
+    from open_webui.utils import file_status
+
+    monkeypatch.setattr(file_status, "REDIS_LISTENER_MIN_BACKOFF", 0.01)
+    monkeypatch.setattr(
+        file_status.Files,
+        "get_files_by_ids",
+        lambda ids: [SimpleNamespace(id="a", data={"status": "completed"})],
+    )
+    subscriptions = []
+
+    class FakePubSub:
+        async def subscribe(self, channel):
+            subscriptions.append(channel)
+
+        async def listen(self):
+            if len(subscriptions) == 1:
+                raise ConnectionError("connection reset")
+            yield {"type": "subscribe", "data": 1}
+            await asyncio.Event().wait()
+
+        async def reset(self):
+            pass
+
+    class FakeRedis:
+        def pubsub(self):
+            return FakePubSub()
+
+    broker = FileStatusBroker()
+    queue = broker.subscribe(["a"])
+    await broker.start(FakeRedis())
+
+    # The completion published while disconnected is read back from the DB
+    event = await asyncio.wait_for(queue.get(), timeout=1)
+    assert event == {"file_id": "a", "status": "completed"}
+    assert len(subscriptions) == 2
+    await broker.stop()
@@ -0,0 +1,257 @@
+"""
+Unit tests for chunk-level re-indexing of updated files
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.routers import retrieval
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.collections = {}
+        self.embedded = []
+        self.supports_metadata_updates = True
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def insert(self, collection_name, items):
+        self.collections.setdefault(collection_name, {}).update(
+            {item["id"]: item for item in items}
+        )
+
+    def query(self, collection_name, filter, limit=None):
+        items = [
+            item
+            for item in self.collections.get(collection_name, {}).values()
+            if all(item["metadata"].get(k) == v for k, v in filter.items())
+        ][:limit]
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+    def delete(self, collection_name, ids=None, filter=None):
+        if filter:
+            ids = self.query(collection_name, filter).ids[0]
+        for id in ids or []:
+            self.collections[collection_name].pop(id, None)
+
+    def update_metadata(self, collection_name, metadatas):
+        if not self.supports_metadata_updates:
+            return False
+        for id, metadata in metadatas.items():
+            self.collections[collection_name][id]["metadata"] = metadata
+        return True
+
+    def texts(self, collection_name):
+        return sorted(
+            item["text"] for item in self.collections[collection_name].values()
+        )
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    vector_db = FakeVectorDB()
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", vector_db)
+
+    async def embedding_function(texts, prefix=None, user=None):
+        vector_db.embedded.extend(texts)
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(
+        retrieval, "get_request_embedding_function", lambda request: embedding_function
+    )
+    return vector_db
+
+
+@pytest.fixture
+def request_():
+    config = SimpleNamespace(
+        TEXT_SPLITTER="character",
+        CHUNK_SIZE=12,
+        CHUNK_OVERLAP=0,
+        RAG_EMBEDDING_ENGINE="",
+        RAG_EMBEDDING_MODEL="test",
+    )
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+
+def get_docs(*paragraphs):
+    return [Document(page_content="\n\n".join(paragraphs), metadata={"file_id": "f"})]
+
+
+def test_only_changed_chunks_are_embedded(request_, vector_db):
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two", "charlie 3"), "file-f", "f"
+    )
+    assert len(vector_db.embedded) == 3
+    vector_db.embedded.clear()
+
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo 2", "delta four"), "file-f", "f"
+    )
+
+    assert changes == {"kept": 1, "added": 2, "removed": 2}
+    assert sorted(vector_db.embedded) == ["bravo 2", "delta four"]
+    assert vector_db.texts("file-f") == ["alpha one", "bravo 2", "delta four"]
+
+
+def test_duplicate_chunks_are_matched_one_to_one(request_, vector_db):
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("same text", "same text"), "file-f", "f"
+    )
+
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("same text"), "file-f", "f"
+    )
+
+    assert changes == {"kept": 1, "added": 0, "removed": 1}
+    assert vector_db.texts("file-f") == ["same text"]
+
+
+def test_other_files_in_the_collection_are_untouched(request_, vector_db):
+    vector_db.insert(
+        "knowledge",
+        [{"id": "other", "text": "other file", "metadata": {"file_id": "g"}}],
+    )
+    # Legacy chunk without a stored chunk hash
+    vector_db.insert(
+        "knowledge",
+        [{"id": "legacy", "text": "alpha one", "metadata": {"file_id": "f"}}],
+    )
+
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "knowledge", "f"
+    )
+
+    assert changes == {"kept": 1, "added": 1, "removed": 0}
+    assert vector_db.texts("knowledge") == ["alpha one", "bravo two", "other file"]
+
+
+def test_kept_chunks_get_the_new_file_hash(request_, vector_db):
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "knowledge", "f", {"hash": "v1"}
+    )
+
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo 2"), "knowledge", "f", {"hash": "v2"}
+    )
+
+    assert changes == {"kept": 1, "added": 1, "removed": 1}
+    hashes = [
+        item["metadata"]["hash"] for item in vector_db.collections["knowledge"].values()
+    ]
+    assert hashes == ["v2", "v2"]
+
+
+def test_file_is_replaced_without_metadata_updates(request_, vector_db):
+    vector_db.supports_metadata_updates = False
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "knowledge", "f", {"hash": "v1"}
+    )
+    vector_db.embedded.clear()
+
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo 2"), "knowledge", "f", {"hash": "v2"}
+    )
+
+    assert changes == {"kept": 0, "added": 2, "removed": 2}
+    assert sorted(vector_db.embedded) == ["alpha one", "bravo 2"]
+    assert vector_db.texts("knowledge") == ["alpha one", "bravo 2"]
+
+
+def test_file_is_replaced_when_its_chunks_are_truncated(
+    request_, vector_db, monkeypatch
+):
+    monkeypatch.setattr(retrieval, "VECTOR_SYNC_QUERY_LIMIT", 2)
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two", "charlie 3"), "file-f", "f"
+    )
+
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "file-f", "f"
+    )
+
+    assert changes == {"kept": 0, "added": 2, "removed": 2}
+    assert vector_db.texts("file-f") == ["alpha one", "bravo two"]
+
+
+def test_chunks_of_another_embedding_model_are_embedded_again(request_, vector_db):
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "file-f", "f"
+    )
+    vector_db.embedded.clear()
+
+    request_.app.state.config.RAG_EMBEDDING_MODEL = "other"
+    changes = retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "file-f", "f"
+    )
+
+    assert changes == {"kept": 0, "added": 2, "removed": 2}
+    assert sorted(vector_db.embedded) == ["alpha one", "bravo two"]
+    models = [
+        item["metadata"]["embedding_config"]["model"]
+        for item in vector_db.collections["file-f"].values()
+    ]
+    assert models == ["other", "other"]
+
+
+@pytest.mark.parametrize("supports_metadata_updates", [True, False])
+def test_knowledge_file_update_embeds_only_what_it_must(
+    request_, vector_db, monkeypatch, supports_metadata_updates
+):
+    from open_webui.routers import knowledge as knowledge_router
+
+    vector_db.supports_metadata_updates = supports_metadata_updates
+    request_.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL = False
+    file = SimpleNamespace(
+        id="f", filename="notes.txt", user_id="u", meta={}, data={"content": ""}
+    )
+    files = SimpleNamespace(
+        get_file_by_id=lambda id: file,
+        update_file_data_by_id=lambda id, data: None,
+        update_file_hash_by_id=lambda id, hash: None,
+        update_file_metadata_by_id=lambda id, meta: None,
+    )
+    knowledge = SimpleNamespace(id="k", user_id="u", model_dump=lambda: {})
+    monkeypatch.setattr(retrieval, "Files", files)
+    monkeypatch.setattr(retrieval, "update_file_status", lambda *args: None)
+    monkeypatch.setattr(knowledge_router, "Files", files)
+    monkeypatch.setattr(
+        knowledge_router,
+        "Knowledges",
+        SimpleNamespace(
+            get_knowledge_by_id=lambda id: knowledge,
+            get_file_metadatas_by_id=lambda id: [],
+        ),
+    )
+    monkeypatch.setattr(knowledge_router, "KnowledgeFilesResponse", SimpleNamespace)
+
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo two"), "k", "f", {"hash": "v1"}
+    )
+    # The file's own collection already holds the edited version
+    retrieval.sync_docs_to_vector_db(
+        request_, get_docs("alpha one", "bravo 2"), "file-f", "f"
+    )
+    vector_db.embedded.clear()
+
+    knowledge_router.update_file_from_knowledge_by_id(
+        request_,
+        "k",
+        knowledge_router.KnowledgeFileIdForm(file_id="f"),
+        user=SimpleNamespace(id="u", role="admin"),
+    )
+
+    # Without in-place metadata updates the file is re-embedded in full
+    expected = ["bravo 2"] if supports_metadata_updates else ["alpha one", "bravo 2"]
+    assert sorted(vector_db.embedded) == expected
+    assert vector_db.texts("k") == ["alpha one", "bravo 2"]
+    hashes = {item["metadata"]["hash"] for item in vector_db.collections["k"].values()}
+    assert hashes != {"v1"} and len(hashes) == 1
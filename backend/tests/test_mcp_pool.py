@@ -0,0 +1,130 @@
+"""
+Unit tests for the pooled MCP sessions
+"""
+
+import anyio
+import pytest
+from mcp import types
+from open_webui.utils.mcp.pool import MCPSessionPool
+
+
+class FakeMCPClient:
+    instances = []
+
+    def __init__(self):
+        self.connected = False
+        self.list_calls = 0
+        self.message_handler = None
+        self.fail_next_call = None
+        FakeMCPClient.instances.append(self)
+
+    async def connect(self, url, headers=None, message_handler=None):
+        if url == "http://down":
+            raise ConnectionError("connection refused")
+        self.connected = True
+        self.message_handler = message_handler
+
+    async def list_tool_specs(self):
+        self.list_calls += 1
+        return [{"name": "echo", "description": "", "parameters": {}}]
+
+    async def call_tool(self, function_name, function_args):
+        if self.fail_next_call:
+            error, self.fail_next_call = self.fail_next_call, None
+            raise error
+        return [{"type": "text", "text": function_args["text"]}]
+
+    async def ping(self):
+        pass
+
+    async def disconnect(self):
+        self.connected = False
+
+
+@pytest.fixture
+def pool():
+    FakeMCPClient.instances = []
+    return MCPSessionPool(
+        idle_timeout=300,
+        keepalive_interval=0,
+        tool_specs_ttl=300,
+        client_factory=FakeMCPClient,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused_per_auth_identity(pool):
+    headers = {"Authorization": "Bearer a"}
+    client = await pool.get_client("srv", "http://mcp", headers)
+    await pool.get_client("srv", "http://mcp", dict(headers))
+    await pool.get_client("srv", "http://mcp", {"Authorization": "Bearer b"})
+
+    assert len(FakeMCPClient.instances) == 2
+    assert await client.call_tool("echo", {"text": "hi"}) == [
+        {"type": "text", "text": "hi"}
+    ]
+
+    stats = pool.get_stats()["srv"]
+    assert stats["connects"] == 2
+    assert stats["reused"] == 1
+    assert stats["sessions"] == 2
+
+    await pool.close()
+    assert not any(c.connected for c in FakeMCPClient.instances)
+
+
+@pytest.mark.asyncio
+async def test_tool_specs_are_cached_until_list_changed(pool):
+    client = await pool.get_client("srv", "http://mcp")
+    fake = FakeMCPClient.instances[0]
+
+    await client.list_tool_specs()
+    await client.list_tool_specs()
+    assert fake.list_calls == 1
+
+    await fake.message_handler(
+        types.ServerNotification(
+            types.ToolListChangedNotification(method="notifications/tools/list_changed")
+        )
+    )
+    await client.list_tool_specs()
+    assert fake.list_calls == 2
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_closed_session_is_reconnected(pool):
+    client = await pool.get_client("srv", "http://mcp")
+    FakeMCPClient.instances[0].fail_next_call = anyio.ClosedResourceError()
+
+    assert await client.call_tool("echo", {"text": "again"}) == [
+        {"type": "text", "text": "again"}
+    ]
+    assert len(FakeMCPClient.instances) == 2
+    assert not FakeMCPClient.instances[0].connected
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_raised_and_not_pooled(pool):
+    with pytest.raises(ConnectionError):
+        await pool.get_client("srv", "http://down")
+
+    assert pool.get_stats()["srv"]["sessions"] == 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_reaped(pool):
+    pool.idle_timeout = 0.01
+    await pool.get_client("srv", "http://mcp")
+
+    await anyio.sleep(0.02)
+    await pool.reap()
+
+    stats = pool.get_stats()["srv"]
+    assert stats["reaped"] == 1
+    assert stats["sessions"] == 0
+    assert not FakeMCPClient.instances[0].connected
@@ -0,0 +1,124 @@
+"""
+Unit tests for the batched channel message page loader
+"""
+
+from contextlib import contextmanager
+
+import pytest
+from open_webui.models import messages as messages_module
+from open_webui.models.messages import Message, MessageReaction, Messages
+from open_webui.models.users import User
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine("sqlite://")
+    for table in (User, Message, MessageReaction):
+        table.__table__.create(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(messages_module, "get_db", get_db)
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    with get_db() as session:
+        for idx in range(3):
+            session.add(
+                User(
+                    id=f"u{idx}",
+                    name=f"User {idx}",
+                    email=f"u{idx}@example.com",
+                    role="user",
+                )
+            )
+        for idx in range(10):
+            session.add(
+                Message(
+                    id=f"m{idx:02d}",
+                    user_id=f"u{idx % 3}",
+                    channel_id="c",
+                    reply_to_id="m00" if idx == 9 else None,
+                    content=f"message {idx}",
+                    # Two messages share a timestamp to exercise the id tiebreak
+                    created_at=min(idx, 8) * 100,
+                    updated_at=0,
+                )
+            )
+        for idx in range(4):
+            session.add(
+                Message(
+                    id=f"r{idx}",
+                    user_id="u1",
+                    channel_id="c",
+                    parent_id="m05",
+                    content=f"reply {idx}",
+                    created_at=1000 + idx,
+                    updated_at=0,
+                )
+            )
+        for idx, user_id in enumerate(["u0", "u1", "u2"]):
+            session.add(
+                MessageReaction(
+                    id=f"x{idx}",
+                    user_id=user_id,
+                    message_id="m05",
+                    name="thumbsup" if idx < 2 else "eyes",
+                    created_at=idx,
+                )
+            )
+        session.commit()
+
+    statements.clear()
+    return statements
+
+
+def test_page_is_assembled_in_constant_queries(db):
+    page, cursor = Messages.get_message_page_by_channel_id("c", limit=5)
+
+    assert [message.id for message in page] == ["m09", "m08", "m07", "m06", "m05"]
+    # page, replied-to messages, authors, thread stats, reactions
+    assert len(db) == 5
+
+    m05 = page[-1]
+    assert (m05.reply_count, m05.latest_reply_at) == (4, 1003)
+    assert [(r.name, r.count) for r in m05.reactions] == [("thumbsup", 2), ("eyes", 1)]
+    assert m05.user.name == "User 2"
+    assert page[0].reply_to_message.id == "m00"
+    assert page[0].reply_to_message.user.name == "User 0"
+
+
+def test_keyset_cursor_continues_after_ties(db):
+    first, cursor = Messages.get_message_page_by_channel_id("c", limit=1)
+    assert cursor == (800, "m09")
+
+    ids = [first[0].id]
+    while cursor:
+        page, cursor = Messages.get_message_page_by_channel_id(
+            "c", limit=3, cursor=cursor
+        )
+        ids.extend(message.id for message in page)
+
+    assert ids == [f"m{idx:02d}" for idx in reversed(range(10))]
+
+
+def test_thread_page_ends_with_parent(db):
+    page, cursor = Messages.get_message_page_by_parent_id("c", "m05", limit=10)
+
+    assert [message.id for message in page] == ["r3", "r2", "r1", "r0", "m05"]
+    assert cursor is None
+    assert all(message.reply_count == 0 for message in page)
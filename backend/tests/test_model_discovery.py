@@ -0,0 +1,111 @@
+"""
+Unit tests for stale-while-revalidate model discovery
+"""
+
+import asyncio
+
+import pytest
+from open_webui.utils.model_discovery import ModelDiscoveryCache
+
+
+@pytest.mark.asyncio
+async def test_first_load_is_shared_between_callers():
+    cache = ModelDiscoveryCache("test", ttl=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"data": ["a"]}
+
+    results = await asyncio.gather(*(cache.get("key", fetch) for _ in range(5)))
+
+    assert calls == 1
+    assert all(result == {"data": ["a"]} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshing():
+    cache = ModelDiscoveryCache("test", ttl=0)
+    release = asyncio.Event()
+    version = 0
+
+    async def fetch():
+        nonlocal version
+        if version:
+            await release.wait()
+        version += 1
+        return {"data": [version]}
+
+    assert await cache.get("key", fetch) == {"data": [1]}
+
+    # Refresh is blocked upstream, the stale list is returned immediately.
+    assert await asyncio.wait_for(cache.get("key", fetch), timeout=0.1) == {"data": [1]}
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert await cache.get("key", fetch) == {"data": [2]}
+
+
+@pytest.mark.asyncio
+async def test_returned_value_does_not_alias_cache():
+    cache = ModelDiscoveryCache("test", ttl=60)
+
+    async def fetch():
+        return {"data": ["a", "b"]}
+
+    models = await cache.get("key", fetch)
+    models["data"] = ["a"]
+    models_again = await cache.get("key", fetch)
+    models_again["data"].append("c")
+
+    assert await cache.get("key", fetch) == {"data": ["a", "b"]}
+
+
+@pytest.mark.asyncio
+async def test_failed_connection_serves_last_good_response():
+    cache = ModelDiscoveryCache("test", ttl=60)
+
+    async def ok():
+        return {"data": [{"id": "m"}]}
+
+    async def fail():
+        raise RuntimeError("connection refused")
+
+    assert await cache.fetch_connection(0, "http://a", ok()) == {"data": [{"id": "m"}]}
+    assert await cache.fetch_connection(0, "http://a", fail()) == {
+        "data": [{"id": "m"}]
+    }
+    assert await cache.fetch_connection(1, "http://b", fail()) is None
+
+    connections = {c["url"]: c for c in cache.get_connections()}
+    assert connections["http://a"]["healthy"] is False
+    assert connections["http://a"]["last_error"] == "connection refused"
+    assert connections["http://a"]["last_success_at"] is not None
+    assert connections["http://b"]["last_success_at"] is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_flight_during_invalidation_is_not_cached():
+    cache = ModelDiscoveryCache("test", ttl=0)
+    release = asyncio.Event()
+    lists = iter([["old"], ["stale"], ["new"]])
+
+    async def fetch():
+        value = {"data": next(lists)}
+        if value["data"] == ["stale"]:
+            await release.wait()
+        return value
+
+    assert await cache.get("key", fetch) == {"data": ["old"]}
+    assert await cache.get("key", fetch) == {"data": ["old"]}
+    await asyncio.sleep(0)
+
+    cache.invalidate()
+    assert await cache.get("key", fetch) == {"data": ["new"]}
+
+    # The refresh started before the invalidation completes afterwards
+    release.set()
+    await asyncio.sleep(0.01)
+    assert cache._entries["key"]["value"] == {"data": ["new"]}
@@ -0,0 +1,152 @@
+"""
+Unit tests for the per-worker copy of the shared model catalog
+"""
+
+import pytest
+from open_webui.socket import utils as socket_utils
+from open_webui.socket.utils import VersionedRedisDict
+
+
+class FakeRedis:
+    """String and hash commands of a single Redis server."""
+
+    def __init__(self):
+        self.strings = {}
+        self.hashes = {}
+        self.calls = []
+
+    def get(self, name):
+        self.calls.append("get")
+        return self.strings.get(name)
+
+    def setnx(self, name, value):
+        self.calls.append("setnx")
+        if name in self.strings:
+            return False
+        self.strings[name] = str(value)
+        return True
+
+    def incr(self, name):
+        self.calls.append("incr")
+        value = int(self.strings.get(name, 0)) + 1
+        self.strings[name] = str(value)
+        return value
+
+    def hset(self, name, key=None, value=None, mapping=None):
+        self.calls.append("hset")
+        fields = self.hashes.setdefault(name, {})
+        if mapping:
+            fields.update(mapping)
+        else:
+            fields[key] = value
+        return 1
+
+    def hdel(self, name, key):
+        self.calls.append("hdel")
+        return 1 if self.hashes.get(name, {}).pop(key, None) is not None else 0
+
+    def hgetall(self, name):
+        self.calls.append("hgetall")
+        return dict(self.hashes.get(name, {}))
+
+    def delete(self, name):
+        self.calls.append("delete")
+        self.hashes.pop(name, None)
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: self.commands.append(
+                    (name, args, kwargs)
+                )
+
+            def execute(self):
+                return [
+                    getattr(redis, name)(*args, **kwargs)
+                    for name, args, kwargs in self.commands
+                ]
+
+        return Pipeline()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(socket_utils, "get_redis_connection", lambda *a, **kw: redis)
+    return redis
+
+
+def test_reads_are_served_locally_until_the_version_moves(redis):
+    worker_a = VersionedRedisDict("models", "redis://", check_interval=0)
+    worker_b = VersionedRedisDict("models", "redis://", check_interval=0)
+
+    worker_a.set({"llama": {"id": "llama"}, "qwen": {"id": "qwen"}})
+    assert worker_b["llama"] == {"id": "llama"}
+
+    redis.calls.clear()
+    for _ in range(10):
+        assert "qwen" in worker_b
+        assert len(worker_b.items()) == 2
+    # Only the version counter is read
+    assert set(redis.calls) == {"get"}
+    assert worker_b.get_stats()["reloads"] == 1
+
+    worker_a["qwen"] = {"id": "qwen", "name": "Qwen"}
+    assert worker_b["qwen"]["name"] == "Qwen"
+
+    del worker_a["llama"]
+    assert "llama" not in worker_b
+    assert worker_b.get("llama") is None
+    with pytest.raises(KeyError):
+        del worker_b["llama"]
+
+    worker_b.clear()
+    assert len(worker_a) == 0
+
+
+def test_version_is_checked_once_per_interval(redis):
+    worker_a = VersionedRedisDict("models", "redis://", check_interval=60)
+    worker_b = VersionedRedisDict("models", "redis://", check_interval=60)
+
+    worker_a.set({"llama": {"id": "llama"}})
+    assert worker_b.keys() == ["llama"]
+
+    worker_a["qwen"] = {"id": "qwen"}
+    redis.calls.clear()
+    assert worker_b.keys() == ["llama"]
+    assert redis.calls == []
+
+    # Own writes are visible right away
+    assert sorted(worker_a.keys()) == ["llama", "qwen"]
+
+
+def test_partial_write_after_a_foreign_write_reloads(redis):
+    worker_a = VersionedRedisDict("models", "redis://", check_interval=60)
+    worker_b = VersionedRedisDict("models", "redis://", check_interval=60)
+
+    worker_a.set({"llama": {"id": "llama"}})
+    assert worker_b.keys() == ["llama"]
+
+    worker_a["qwen"] = {"id": "qwen"}
+    worker_b["mistral"] = {"id": "mistral"}
+
+    assert sorted(worker_b.keys()) == ["llama", "mistral", "qwen"]
+
+
+def test_hash_without_a_version_is_loaded_once(redis):
+    redis.hashes["models"] = {"llama": '{"id": "llama"}'}
+    worker = VersionedRedisDict("models", "redis://", check_interval=0)
+
+    for _ in range(5):
+        assert worker["llama"] == {"id": "llama"}
+
+    assert worker.get_stats()["reloads"] == 1
+    assert redis.strings["models:version"] == "0"
+
+    worker["qwen"] = {"id": "qwen"}
+    assert worker.get_stats()["version"] == "1"
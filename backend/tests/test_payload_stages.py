@@ -0,0 +1,114 @@
+"""
+Unit tests for the concurrent chat payload pre-processing stages
+"""
+
+import asyncio
+import time
+
+import pytest
+from open_webui.utils.payload_stages import StageGraph
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_overlap():
+    graph = StageGraph()
+
+    def stage(result):
+        async def fn(emitter):
+            await asyncio.sleep(0.05)
+            return result
+
+        return fn
+
+    graph.add("memory", stage("context"))
+    graph.add("web_search", stage("files"))
+    graph.add("tools", stage({"search": {}}))
+
+    start = time.perf_counter()
+    results = await graph.run()
+
+    assert time.perf_counter() - start < 0.12
+    assert results == {
+        "memory": "context",
+        "web_search": "files",
+        "tools": {"search": {}},
+    }
+    assert set(graph.timings) == {"memory", "web_search", "tools"}
+
+
+@pytest.mark.asyncio
+async def test_dependencies_and_runtime_waits():
+    order = []
+    graph = StageGraph()
+
+    async def tools(emitter):
+        await asyncio.sleep(0.02)
+        order.append("tools")
+        return {"a": {}}
+
+    async def tool_calling(emitter):
+        order.append("tool_calling")
+        return ["source"]
+
+    async def files(emitter):
+        assert await graph.wait("tools") == {"a": {}}
+        assert await graph.wait("missing") is None
+        order.append("files")
+        return []
+
+    graph.add("tools", tools)
+    graph.add("tool_calling", tool_calling, deps=("tools", "disabled"))
+    graph.add("files", files)
+
+    results = await graph.run()
+
+    assert order[0] == "tools"
+    assert results["tool_calling"] == ["source"]
+
+
+@pytest.mark.asyncio
+async def test_events_are_emitted_in_stage_order():
+    events = []
+
+    async def event_emitter(event):
+        events.append(event)
+
+    graph = StageGraph(event_emitter)
+
+    async def slow(emitter):
+        await emitter("slow:start")
+        await asyncio.sleep(0.03)
+        await emitter("slow:done")
+
+    async def fast(emitter):
+        await emitter("fast:start")
+        await emitter("fast:done")
+
+    graph.add("slow", slow)
+    graph.add("fast", fast)
+    await graph.run()
+
+    assert events == ["slow:start", "slow:done", "fast:start", "fast:done"]
+
+
+@pytest.mark.asyncio
+async def test_stage_errors_cancel_the_graph():
+    cancelled = asyncio.Event()
+    graph = StageGraph()
+
+    async def fail(emitter):
+        raise ValueError("tool server unreachable")
+
+    async def slow(emitter):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    graph.add("slow", slow)
+    graph.add("tools", fail)
+
+    with pytest.raises(ValueError):
+        await graph.run()
+    assert cancelled.is_set()
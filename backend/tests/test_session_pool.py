@@ -0,0 +1,56 @@
+"""
+Unit tests for the pooled upstream aiohttp sessions
+"""
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from open_webui.utils.session_pool import ClientSessionPool, release_response
+
+
+@pytest_asyncio.fixture
+async def upstream():
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}"
+
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_shared_per_upstream(upstream):
+    pool = ClientSessionPool()
+
+    session = pool.get_session("openai", f"{upstream}/v1")
+    assert pool.get_session("openai", f"{upstream}/v1/chat/completions") is session
+    assert pool.get_session("ollama", upstream) is not session
+
+    await pool.close()
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_released_connections_are_reused(upstream):
+    pool = ClientSessionPool()
+
+    for _ in range(3):
+        session = pool.get_session("openai", upstream)
+        r = await session.post(f"{upstream}/chat/completions", data="{}")
+        assert (await r.json()) == {"ok": True}
+        await release_response(r)
+
+    stats = pool.get_stats()["openai"]
+    assert stats["created"] == 1
+    assert stats["reused"] == 2
+    assert stats["upstreams"][upstream]["in_use"] == 0
+
+    await pool.close()
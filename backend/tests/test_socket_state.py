@@ -0,0 +1,168 @@
+"""
+Unit tests for the async socket state store and model usage tracking
+"""
+
+import asyncio
+
+import pytest
+from open_webui.socket.utils import AsyncLocalDict, AsyncRedisDict, ModelUsageTracker
+
+
+class FakeRedis:
+    """Hash, sorted set and pub/sub commands of a single Redis server."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sorted_sets = {}
+        self.channels = {}
+        self.calls = []
+
+    async def hset(self, name, key, value):
+        self.calls.append("hset")
+        self.hashes.setdefault(name, {})[key] = value
+
+    async def hmget(self, name, keys):
+        self.calls.append("hmget")
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+    async def hdel(self, name, key):
+        self.calls.append("hdel")
+        return 1 if self.hashes.get(name, {}).pop(key, None) is not None else 0
+
+    async def hexists(self, name, key):
+        self.calls.append("hexists")
+        return key in self.hashes.get(name, {})
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def __getattr__(self, name):
+                return lambda *args: self.commands.append((name, args))
+
+            async def execute(self):
+                return [getattr(redis, name)(*args) for name, args in self.commands]
+
+        return Pipeline()
+
+    async def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+
+    def zremrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        cutoff = float(max.lstrip("("))
+        for member in [m for m, score in members.items() if score < cutoff]:
+            del members[member]
+
+    def zrange(self, name, start, end):
+        members = self.sorted_sets.get(name, {})
+        return sorted(members, key=members.get)
+
+    async def publish(self, channel, message):
+        for queue in self.channels.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+
+    def pubsub(self):
+        redis = self
+
+        class PubSub:
+            def __init__(self):
+                self.queue = asyncio.Queue()
+
+            async def subscribe(self, channel):
+                redis.channels.setdefault(channel, []).append(self.queue)
+
+            async def listen(self):
+                while True:
+                    yield await self.queue.get()
+
+        return PubSub()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_near_cache_is_invalidated_across_workers():
+    redis = FakeRedis()
+    worker_a = AsyncRedisDict("sessions", redis, cache_size=10)
+    worker_b = AsyncRedisDict("sessions", redis, cache_size=10)
+
+    # Starts the invalidation listeners
+    assert await worker_a.get("s1") is None
+    assert await worker_b.get("s1") is None
+    await settle()
+
+    await worker_a.set("s1", {"id": "u1"})
+    assert await worker_b.get("s1") == {"id": "u1"}
+
+    redis.calls.clear()
+    assert await worker_b.get("s1") == {"id": "u1"}
+    assert await worker_a.get("s1") == {"id": "u1"}
+    assert redis.calls == []
+
+    await worker_a.set("s1", {"id": "u2"})
+    await settle()
+    assert await worker_b.get("s1") == {"id": "u2"}
+
+    assert await worker_a.delete("s1")
+    await settle()
+    assert await worker_b.get("s1") is None
+    assert worker_b.get_stats()["invalidations"] >= 2
+
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_get_many_is_one_round_trip():
+    redis = FakeRedis()
+    pool = AsyncRedisDict("sessions", redis)
+    for idx in range(5):
+        await pool.set(f"s{idx}", {"id": f"u{idx % 2}"})
+
+    redis.calls.clear()
+    users = await pool.get_many(["s0", "s1", "missing", "s4", "s0"])
+
+    assert [user["id"] if user else None for user in users] == [
+        "u0",
+        "u1",
+        None,
+        "u0",
+        "u0",
+    ]
+    assert redis.calls == ["hmget"]
+
+
+@pytest.mark.asyncio
+async def test_local_values_are_copies():
+    pool = AsyncLocalDict()
+    user = {"id": "u1", "roles": ["user"]}
+    await pool.set("s1", user)
+
+    user["roles"].append("admin")
+    (await pool.get("s1"))["roles"].append("admin")
+    (await pool.get_many(["s1"]))[0]["roles"].append("admin")
+    (await pool.items())[0][1]["roles"].append("admin")
+
+    assert await pool.get("s1") == {"id": "u1", "roles": ["user"]}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("redis", [None, FakeRedis()], ids=["local", "redis"])
+async def test_usage_expires_per_model(redis):
+    tracker = ModelUsageTracker(redis=redis, timeout=0.2)
+
+    await tracker.touch("llama")
+    await tracker.touch("qwen")
+    assert sorted(await tracker.get_models_in_use()) == ["llama", "qwen"]
+
+    await asyncio.sleep(0.3)
+    await tracker.touch("llama")
+
+    assert await tracker.get_models_in_use() == ["llama"]
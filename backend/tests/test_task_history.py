@@ -0,0 +1,80 @@
+"""
+Unit tests for token-budgeted chat history in task prompts
+"""
+
+from open_webui.constants import TASKS
+from open_webui.utils.task import (
+    estimate_tokens,
+    get_task_history_budget,
+    summarize_turn,
+    title_generation_template,
+    window_messages,
+)
+
+
+def make_chat(turns, words=200):
+    messages = []
+    for turn in range(turns):
+        messages.append(
+            {"role": "user", "content": f"Question {turn}. " + "word " * words}
+        )
+        messages.append(
+            {"role": "assistant", "content": f"Answer {turn}. " + "word " * words}
+        )
+    return messages
+
+
+def test_short_chats_are_left_alone():
+    messages = make_chat(2, words=10)
+    assert window_messages(messages, 1000) is messages
+    assert window_messages(make_chat(50), 0) == make_chat(50)
+
+
+def test_long_chats_keep_the_newest_messages_within_budget():
+    messages = make_chat(50)
+    windowed = window_messages(messages, 1000, summarize=False)
+
+    assert windowed == messages[-len(windowed) :]
+    assert windowed[-2]["role"] == "user"
+    total = sum(estimate_tokens(m["content"]) + 4 for m in windowed)
+    assert total <= 1000
+
+
+def test_older_turns_are_summarized():
+    messages = make_chat(50)
+    windowed = window_messages(messages, 1000)
+
+    summary = windowed[0]
+    assert summary["role"] == "system"
+    assert "USER: Question 48." in summary["content"]
+    assert "word word" not in summary["content"]
+    assert windowed[-1] == messages[-1]
+
+    prompt = title_generation_template("{{prompt}}\n{{MESSAGES}}", windowed)
+    assert prompt.startswith("Question 49.")
+    assert estimate_tokens(prompt) <= 1100
+
+
+def test_oversized_last_message_is_shortened():
+    messages = [
+        {"role": "user", "content": "Summarize this: " + "x" * 40000},
+    ]
+    windowed = window_messages(messages, 500)
+
+    assert len(windowed) == 1
+    assert windowed[0]["content"].startswith("Summarize this: ")
+    assert estimate_tokens(windowed[0]["content"]) <= 500
+
+
+def test_budgets_are_per_task():
+    assert get_task_history_budget(TASKS.FOLLOW_UP_GENERATION) > 0
+    assert get_task_history_budget("title_generation") == get_task_history_budget(
+        TASKS.TITLE_GENERATION
+    )
+    assert get_task_history_budget(TASKS.EMOJI_GENERATION) == 0
+
+
+def test_summaries_only_read_the_start_of_a_turn():
+    long_turn = "Intro. " + "word " * 100000
+    assert summarize_turn("user", long_turn) == "USER: Intro."
+    assert summarize_turn("user", " " * 2000 + long_turn).endswith("...")
@@ -0,0 +1,230 @@
+"""
+Unit tests for the distributed task registry
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from open_webui import tasks as tasks_module
+from open_webui.tasks import (
+    REDIS_PUBSUB_CHANNEL,
+    REDIS_TASK_OWNERS_KEY,
+    REDIS_TASKS_KEY,
+    WORKER_ID,
+    create_task,
+    list_task_ids_by_item_id,
+    list_tasks,
+    redis_reap_tasks,
+    stop_task,
+)
+from redis.exceptions import WatchError
+
+
+class FakeRedis:
+    """Hash, sorted set and publish commands of a single Redis server."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.sorted_sets = {}
+        self.published = []
+        # Bumped on every write, for WATCH
+        self.versions = {}
+
+    def _touch(self, name):
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def _bound(self, value, default):
+        if value in ("-inf", "+inf"):
+            return default
+        if isinstance(value, str) and value.startswith("("):
+            return float(value[1:]) - 1e-9
+        return float(value)
+
+    async def zadd(self, name, mapping):
+        self._touch(name)
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+
+    async def zrem(self, name, *members):
+        self._touch(name)
+        for member in members:
+            self.sorted_sets.get(name, {}).pop(member, None)
+
+    async def zscore(self, name, member):
+        return self.sorted_sets.get(name, {}).get(member)
+
+    async def zrangebyscore(self, name, min, max):
+        low = self._bound(min, float("-inf"))
+        high = self._bound(max, float("inf"))
+        members = self.sorted_sets.get(name, {})
+        return [
+            m for m in sorted(members, key=members.get) if low <= members[m] <= high
+        ]
+
+    async def zremrangebyscore(self, name, min, max):
+        self._touch(name)
+        for member in await self.zrangebyscore(name, min, max):
+            del self.sorted_sets[name][member]
+
+    async def hset(self, name, key=None, value=None, mapping=None):
+        self._touch(name)
+        self.hashes.setdefault(name, {}).update(mapping or {key: value})
+
+    async def hget(self, name, key):
+        return self.hashes.get(name, {}).get(key)
+
+    async def hmget(self, name, keys):
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+    async def hdel(self, name, *keys):
+        self._touch(name)
+        for key in keys:
+            self.hashes.get(name, {}).pop(key, None)
+
+    async def expire(self, name, seconds):
+        pass
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def pipeline(self):
+        redis = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+                self.watched = None
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                self.watched = None
+
+            async def watch(self, *names):
+                self.watched = {name: redis.versions.get(name) for name in names}
+                self.immediate = True
+
+            def multi(self):
+                self.immediate = False
+
+            def __getattr__(self, name):
+                if self.watched is not None and self.immediate:
+                    return getattr(redis, name)
+                return lambda *args, **kwargs: self.commands.append(
+                    (name, args, kwargs)
+                )
+
+            async def execute(self):
+                commands, self.commands = self.commands, []
+                watched, self.watched = self.watched, None
+                if watched and any(
+                    redis.versions.get(name) != version
+                    for name, version in watched.items()
+                ):
+                    raise WatchError()
+                return [
+                    await getattr(redis, name)(*args, **kwargs)
+                    for name, args, kwargs in commands
+                ]
+
+        return Pipeline()
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    monkeypatch.setattr(tasks_module, "TASK_HEARTBEAT_INTERVAL", 0.05)
+    monkeypatch.setattr(tasks_module, "TASK_HEARTBEAT_TIMEOUT", 0.15)
+    monkeypatch.setattr(tasks_module, "heartbeat_connections", [])
+    monkeypatch.setattr(tasks_module, "heartbeat_task", None)
+    yield FakeRedis()
+    tasks_module.stop_heartbeat()
+
+
+def add_remote_task(redis, task_id, worker_id, item_id, heartbeat):
+    redis.sorted_sets.setdefault(REDIS_TASKS_KEY, {})[task_id] = heartbeat
+    redis.sorted_sets.setdefault(tasks_module.get_item_tasks_key(item_id), {})[
+        task_id
+    ] = heartbeat
+    redis.hashes.setdefault(REDIS_TASK_OWNERS_KEY, {})[task_id] = json.dumps(
+        {"worker_id": worker_id, "item_id": item_id}
+    )
+
+
+@pytest.mark.asyncio
+async def test_running_tasks_keep_their_heartbeat(redis):
+    done = asyncio.Event()
+    task_id, task = await create_task(redis, done.wait(), "chat-1")
+
+    assert await list_tasks(redis) == [task_id]
+    assert await list_task_ids_by_item_id(redis, "chat-1") == [task_id]
+    owner = json.loads(redis.hashes[REDIS_TASK_OWNERS_KEY][task_id])
+    assert owner == {"worker_id": WORKER_ID, "item_id": "chat-1"}
+
+    # Outlives the heartbeat timeout
+    await asyncio.sleep(0.3)
+    assert await list_task_ids_by_item_id(redis, "chat-1") == [task_id]
+
+    done.set()
+    await task
+    await asyncio.sleep(0.01)
+    assert await list_tasks(redis) == []
+    assert await list_task_ids_by_item_id(redis, "chat-1") == []
+
+
+@pytest.mark.asyncio
+async def test_tasks_of_dead_workers_are_hidden_and_reaped(redis):
+    add_remote_task(redis, "ghost", "dead-worker", "chat-1", time.time() - 60)
+    add_remote_task(redis, "live", "other-worker", "chat-1", time.time())
+
+    assert await list_tasks(redis) == ["live"]
+    assert await list_task_ids_by_item_id(redis, "chat-1") == ["live"]
+    assert (await stop_task(redis, "ghost"))["status"] is False
+
+    assert await redis_reap_tasks(redis) == 1
+    assert "ghost" not in redis.hashes[REDIS_TASK_OWNERS_KEY]
+    assert list(redis.sorted_sets[REDIS_TASKS_KEY]) == ["live"]
+
+
+@pytest.mark.asyncio
+async def test_task_revived_while_reaping_keeps_its_owner(redis):
+    add_remote_task(redis, "slow", "busy-worker", "chat-1", time.time() - 60)
+    hmget = redis.hmget
+
+    async def hmget_then_heartbeat(name, keys):
+        owners = await hmget(name, keys)
+        # The owner's heartbeat lands between the check and the delete
+        await redis.zadd(REDIS_TASKS_KEY, {"slow": time.time()})
+        await redis.zadd(
+            tasks_module.get_item_tasks_key("chat-1"), {"slow": time.time()}
+        )
+        return owners
+
+    redis.hmget = hmget_then_heartbeat
+
+    assert await redis_reap_tasks(redis) == 0
+    assert "slow" in redis.hashes[REDIS_TASK_OWNERS_KEY]
+    assert await list_task_ids_by_item_id(redis, "chat-1") == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_stop_is_routed_to_the_owning_worker(redis):
+    add_remote_task(redis, "remote", "other-worker", "chat-1", time.time())
+
+    result = await stop_task(redis, "remote")
+
+    assert result["status"] is True
+    assert redis.published == [
+        (
+            f"{REDIS_PUBSUB_CHANNEL}:other-worker",
+            {"action": "stop", "task_id": "remote"},
+        )
+    ]
+
+    # Local tasks are cancelled without a round trip
+    task_id, task = await create_task(redis, asyncio.sleep(10), "chat-2")
+    result = await stop_task(redis, task_id)
+    assert result["status"] is True
+    assert task.cancelled()
+    assert len(redis.published) == 1
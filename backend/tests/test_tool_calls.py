@@ -0,0 +1,100 @@
+"""
+Unit tests for concurrent tool call execution
+"""
+
+import asyncio
+import time
+
+import pytest
+from open_webui.utils.tools import execute_tool_calls
+
+
+def make_call(name, delay, result, log=None, metadata=None):
+    async def invoke():
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return result
+
+    return ({"metadata": metadata or {}}, name, invoke)
+
+
+@pytest.mark.asyncio
+async def test_independent_calls_run_concurrently_in_order():
+    start = time.perf_counter()
+    results = await execute_tool_calls(
+        [make_call(f"tool_{idx}", 0.1 - idx * 0.02, idx) for idx in range(5)]
+    )
+
+    assert results == [0, 1, 2, 3, 4]
+    assert time.perf_counter() - start < 0.25
+
+
+@pytest.mark.asyncio
+async def test_per_tool_limit_serializes_same_tool():
+    log = []
+    await execute_tool_calls(
+        [make_call("search", 0.01, idx, log) for idx in range(3)],
+        max_concurrency_per_tool=1,
+    )
+
+    assert log == [("start", "search"), ("end", "search")] * 3
+
+
+@pytest.mark.asyncio
+async def test_tool_limit_cannot_raise_the_per_tool_cap():
+    log = []
+    await execute_tool_calls(
+        [
+            make_call("search", 0.01, idx, log, {"max_concurrency": 8})
+            for idx in range(3)
+        ],
+        max_concurrency_per_tool=1,
+    )
+
+    assert log == [("start", "search"), ("end", "search")] * 3
+
+
+@pytest.mark.asyncio
+async def test_non_parallel_tool_runs_alone():
+    log = []
+    results = await execute_tool_calls(
+        [
+            make_call("a", 0.02, "a", log),
+            make_call("exclusive", 0.01, "x", log, {"parallel": False}),
+            make_call("b", 0.01, "b", log),
+        ]
+    )
+
+    assert results == ["a", "x", "b"]
+    assert log == [
+        ("start", "a"),
+        ("end", "a"),
+        ("start", "exclusive"),
+        ("end", "exclusive"),
+        ("start", "b"),
+        ("end", "b"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_errors_and_timeouts_become_results():
+    async def fail():
+        raise ValueError("bad arguments")
+
+    results = await execute_tool_calls(
+        [
+            make_call("slow", 1, "never"),
+            (None, "broken", fail),
+            make_call("fast", 0, "ok"),
+        ],
+        timeout=0.05,
+    )
+
+    assert results == [
+        "Tool call slow timed out after 0.05 seconds",
+        "bad arguments",
+        "ok",
+    ]
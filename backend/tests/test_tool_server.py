@@ -0,0 +1,129 @@
+"""
+Unit tests for OpenAPI tool server execution
+"""
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from open_webui.utils.session_pool import HTTP_SESSION_POOL
+from open_webui.utils.tools import (
+    TOOL_SERVER_OPERATIONS,
+    compile_openapi_operations,
+    execute_tool_server,
+    get_openapi_spec_hash,
+    get_tool_server_operations,
+)
+
+OPENAPI = {
+    "paths": {
+        "/items/{item_id}": {
+            "parameters": [],
+            "get": {
+                "operationId": "get_item",
+                "parameters": [
+                    {"name": "item_id", "in": "path"},
+                    {"name": "verbose", "in": "query"},
+                ],
+            },
+            "put": {
+                "operationId": "update_item",
+                "parameters": [{"name": "item_id", "in": "path"}],
+                "requestBody": {"content": {"application/json": {}}},
+            },
+        }
+    }
+}
+
+
+def get_server_data(url, openapi=OPENAPI):
+    return {
+        "id": "test",
+        "url": url,
+        "openapi": openapi,
+        "spec_hash": get_openapi_spec_hash(openapi),
+    }
+
+
+@pytest_asyncio.fixture
+async def tool_server():
+    async def get_item(request):
+        return web.json_response(
+            {
+                "id": request.match_info["item_id"],
+                "verbose": request.query.get("verbose"),
+            }
+        )
+
+    async def update_item(request):
+        return web.json_response(
+            {"id": request.match_info["item_id"], "body": await request.json()}
+        )
+
+    app = web.Application()
+    app.router.add_get("/items/{item_id}", get_item)
+    app.router.add_put("/items/{item_id}", update_item)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}"
+
+    await HTTP_SESSION_POOL.close()
+    await runner.cleanup()
+
+
+def test_operations_are_indexed_by_operation_id():
+    operations = compile_openapi_operations(OPENAPI)
+
+    assert operations["get_item"] == {
+        "method": "get",
+        "path": "/items/{item_id}",
+        "parameters": {"item_id": "path", "verbose": "query"},
+        "has_body": False,
+    }
+    assert operations["update_item"]["method"] == "put"
+    assert operations["update_item"]["has_body"] is True
+
+
+def test_index_is_rebuilt_only_when_spec_changes():
+    TOOL_SERVER_OPERATIONS.clear()
+    server_data = get_server_data("http://tools")
+
+    operations = get_tool_server_operations(server_data)
+    assert get_tool_server_operations(dict(server_data)) is operations
+
+    changed = {"paths": {"/ping": {"get": {"operationId": "ping"}}}}
+    assert list(
+        get_tool_server_operations(get_server_data("http://tools", changed))
+    ) == ["ping"]
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_server_reuses_pooled_connection(tool_server):
+    server_data = get_server_data(tool_server)
+
+    data, _ = await execute_tool_server(
+        tool_server, {}, {}, "get_item", {"item_id": 1, "verbose": "yes"}, server_data
+    )
+    assert data == {"id": "1", "verbose": "yes"}
+
+    data, _ = await execute_tool_server(
+        tool_server, {}, {}, "update_item", {"item_id": 2, "name": "x"}, server_data
+    )
+    assert data == {"id": "2", "body": {"item_id": 2, "name": "x"}}
+
+    stats = HTTP_SESSION_POOL.get_stats()["tool_server"]
+    assert stats["created"] == 1
+    assert stats["reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_operation_returns_error(tool_server):
+    data, headers = await execute_tool_server(
+        tool_server, {}, {}, "missing", {}, get_server_data(tool_server)
+    )
+
+    assert headers is None
+    assert "No matching route found" in data["error"]
@@ -0,0 +1,119 @@
+"""
+Unit tests for the fetched web page cache and per-domain fetch limits
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from open_webui.retrieval.web.page_cache import PageCache
+from open_webui.retrieval.web.utils import SafeWebBaseLoader
+from open_webui.utils.session_pool import HTTP_SESSION_POOL
+
+PAGE = (
+    "<html lang='en'><head><title>Cached page</title></head>"
+    "<body><p>Hello from the stub</p></body></html>"
+)
+
+
+@pytest_asyncio.fixture
+async def page_server():
+    stats = {"requests": 0, "not_modified": 0, "active": 0, "max_active": 0}
+
+    async def page(request):
+        stats["requests"] += 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(
+            text=PAGE, content_type="text/html", headers={"ETag": '"v1"'}
+        )
+
+    async def slow(request):
+        stats["active"] += 1
+        stats["max_active"] = max(stats["max_active"], stats["active"])
+        await asyncio.sleep(0.02)
+        stats["active"] -= 1
+        return web.Response(text=PAGE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/page", page)
+    app.router.add_get("/slow/{idx}", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", stats
+
+    await HTTP_SESSION_POOL.close()
+    await runner.cleanup()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = PageCache(str(tmp_path), max_size=1024 * 1024, ttl=60)
+    monkeypatch.setattr("open_webui.retrieval.web.utils.WEB_PAGE_CACHE", cache)
+    return cache
+
+
+def get_loader(urls, requests_per_second=2):
+    return SafeWebBaseLoader(
+        web_paths=urls,
+        requests_per_second=requests_per_second,
+        continue_on_failure=True,
+        show_progress=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pages_are_served_from_cache_and_revalidated(page_server, cache):
+    base_url, stats = page_server
+    url = f"{base_url}/page"
+
+    (doc,) = await get_loader([url]).aload()
+    assert "Hello from the stub" in doc.page_content
+    assert doc.metadata["title"] == "Cached page"
+    assert stats["requests"] == 1
+
+    (doc,) = await get_loader([url]).aload()
+    assert doc.metadata["title"] == "Cached page"
+    assert stats["requests"] == 1
+
+    cache.ttl = 0
+    (doc,) = await get_loader([url]).aload()
+    assert "Hello from the stub" in doc.page_content
+    assert stats["not_modified"] == 1
+
+    result = cache.get_stats()
+    assert (result["hits"], result["revalidated"], result["misses"]) == (1, 1, 1)
+    assert result["bytes_saved"] == 2 * len(PAGE)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_by_size(tmp_path):
+    cache = PageCache(str(tmp_path), max_size=300, ttl=60)
+
+    for idx in range(3):
+        await cache.set(f"https://example.com/{idx}", {"text": "x" * 100})
+
+    assert await cache.get("https://example.com/0") is None
+    assert (await cache.get("https://example.com/2"))["text"] == "x" * 100
+    assert cache.get_stats()["size"] <= 300
+    assert cache.stats["evictions"] >= 1
+
+    reloaded = PageCache(str(tmp_path), max_size=300, ttl=60)
+    assert (await reloaded.get("https://example.com/2"))["text"] == "x" * 100
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_per_domain(page_server, cache):
+    base_url, stats = page_server
+    urls = [f"{base_url}/slow/{idx}" for idx in range(4)]
+
+    docs = await get_loader(urls, requests_per_second=1).aload()
+
+    assert len(docs) == 4
+    assert stats["max_active"] == 1
@@ -0,0 +1,151 @@
+"""
+Unit tests for the async web search engine clients
+"""
+
+import json
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from open_webui.retrieval.web.brave import search_brave_async
+from open_webui.retrieval.web.client import (
+    SEARCH_CLIENTS,
+    SEARCH_RESULTS_CACHE,
+    RateLimiter,
+    SearchEngineClient,
+    SearchEngineUnavailable,
+    search_with_cache,
+)
+from open_webui.retrieval.web.searxng import search_searxng_async
+from open_webui.retrieval.web.serper import search_serper_async
+from open_webui.utils.session_pool import HTTP_SESSION_POOL
+
+TESTDATA_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "open_webui", "retrieval", "web", "testdata"
+)
+
+
+@pytest_asyncio.fixture
+async def search_server():
+    requests = []
+
+    async def handler(request):
+        requests.append((request.method, request.match_info["engine"]))
+        with open(
+            os.path.join(TESTDATA_DIR, f"{request.match_info['engine']}.json")
+        ) as f:
+            return web.json_response(json.load(f))
+
+    app = web.Application()
+    app.router.add_route("*", "/{engine}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", requests
+
+    await HTTP_SESSION_POOL.close()
+    await runner.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def reset_clients():
+    SEARCH_CLIENTS.clear()
+    SEARCH_RESULTS_CACHE.clear()
+
+
+@pytest.mark.asyncio
+async def test_async_engines_parse_testdata(search_server):
+    base_url, requests = search_server
+
+    brave = await search_brave_async("key", "python", 3, url=f"{base_url}/brave")
+    searxng = await search_searxng_async(f"{base_url}/searxng", "python", 3)
+    serper = await search_serper_async("key", "python", 3, url=f"{base_url}/serper")
+
+    assert len(brave) == len(searxng) == len(serper) == 3
+    assert all(result.link.startswith("http") for result in brave + searxng + serper)
+    assert requests == [("GET", "brave"), ("GET", "searxng"), ("POST", "serper")]
+
+    stats = HTTP_SESSION_POOL.get_stats()["web_search"]
+    assert stats["created"] == 1
+    assert stats["reused"] == 2
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_per_engine_query_and_count():
+    calls = []
+
+    async def search():
+        calls.append(1)
+        return ["result"]
+
+    assert await search_with_cache("brave", "python", 5, search) == ["result"]
+    assert await search_with_cache("brave", "python", 5, search) == ["result"]
+    await search_with_cache("brave", "python", 10, search)
+    await search_with_cache("searxng", "python", 5, search)
+
+    assert len(calls) == 3
+    assert SEARCH_CLIENTS["brave"].stats["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_scoped_to_the_engine_settings(monkeypatch):
+    from open_webui.routers import retrieval
+
+    config = SimpleNamespace(
+        WEB_SEARCH_RESULT_COUNT=5,
+        WEB_SEARCH_DOMAIN_FILTER_LIST=[],
+        SEARXNG_QUERY_URL="http://searxng-a/search",
+    )
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+    calls = []
+
+    async def search():
+        calls.append(1)
+        return ["result"]
+
+    monkeypatch.setattr(retrieval, "get_async_search", lambda *args: search)
+
+    await retrieval.search_web_async(request, "searxng", "scoped")
+    await retrieval.search_web_async(request, "searxng", "scoped")
+    config.SEARXNG_QUERY_URL = "http://searxng-b/search"
+    await retrieval.search_web_async(request, "searxng", "scoped")
+    assert len(calls) == 2
+
+    # External engines get the user and chat, so their results are not shared
+    await retrieval.search_web_async(request, "external", "scoped")
+    await retrieval.search_web_async(request, "external", "scoped")
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_repeated_failures():
+    client = SearchEngineClient("brave", rate_limit=0, failure_threshold=2)
+
+    async def fail():
+        raise ConnectionError("unreachable")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await client.run(fail)
+
+    with pytest.raises(SearchEngineUnavailable):
+        await client.run(fail)
+    assert client.get_stats()["state"] == "open"
+    assert client.stats["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=20, burst=1)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        await limiter.acquire()
+
+    assert time.perf_counter() - start >= 0.09
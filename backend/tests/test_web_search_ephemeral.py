@@ -0,0 +1,65 @@
+"""
+Unit tests for in-process ranking of web search results
+"""
+
+import time
+
+import pytest
+from langchain_core.documents import Document
+from open_webui.retrieval.ephemeral import TTLCache, rank_docs, rank_top_k
+
+
+def test_rank_top_k_scores_best_query_match():
+    queries = [[1.0, 0.0], [0.0, 1.0]]
+    chunks = [[1.0, 1.0], [0.0, 2.0], [-1.0, 0.0], [3.0, 0.1]]
+
+    ranked = rank_top_k(queries, chunks, k=2)
+
+    assert [idx for idx, _ in ranked] == [1, 3]
+    assert ranked[0][1] == pytest.approx(1.0)
+    assert rank_top_k(queries, chunks, k=10)[-1][0] == 2
+    assert rank_top_k(queries, [], k=2) == []
+
+
+@pytest.mark.asyncio
+async def test_rank_docs_embeds_with_prefixes():
+    calls = []
+    vectors = {"cats": [1.0, 0.0], "dogs": [0.0, 1.0], "cat query": [0.9, 0.1]}
+
+    async def embedding_function(texts, prefix=None):
+        calls.append((len(texts), prefix))
+        return [vectors[text] for text in texts]
+
+    docs = [
+        Document(page_content="dogs", metadata={"source": "b"}),
+        Document(page_content="cats", metadata={"source": "a"}),
+    ]
+    ranked = await rank_docs(
+        ["cat query"],
+        docs,
+        embedding_function,
+        k=1,
+        query_prefix="q:",
+        content_prefix="d:",
+    )
+
+    assert [doc.metadata["source"] for doc in ranked] == ["a"]
+    assert "score" in ranked[0].metadata
+    assert calls == [(2, "d:"), (1, "q:")]
+
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", {"docs": [1]})
+    cache.set("b", {"docs": [2]})
+
+    cached = cache.get("a")
+    cached["docs"].append(3)
+    assert cache.get("a") == {"docs": [1]}
+
+    cache.set("c", {"docs": [3]})
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    time.sleep(0.06)
+    assert cache.get("a") is None